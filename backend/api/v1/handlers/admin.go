@@ -9,10 +9,13 @@ import (
         "strconv"
         "time"
         "fantasy-esports-backend/config"
+        "fantasy-esports-backend/db"
         "fantasy-esports-backend/models"
         "fantasy-esports-backend/services"
         "fantasy-esports-backend/pkg/cdn"
+        "fantasy-esports-backend/pkg/httpclient"
         "fantasy-esports-backend/pkg/logger"
+        "fantasy-esports-backend/pkg/writebehind"
         "fantasy-esports-backend/utils"
         "github.com/gin-gonic/gin"
         "github.com/gorilla/websocket"
@@ -24,14 +27,17 @@ type AdminHandler struct {
         cdn      *cdn.CloudinaryClient
         upgrader websocket.Upgrader
         leaderboardService *services.LeaderboardService
+        matchCompletionService *services.MatchCompletionService
 }
 
 func NewAdminHandler(db *sql.DB, cfg *config.Config, cdn *cdn.CloudinaryClient) *AdminHandler {
+        leaderboardService := services.NewLeaderboardService(db)
         return &AdminHandler{
                 db:     db,
                 config: cfg,
                 cdn:    cdn,
-                leaderboardService: services.NewLeaderboardService(db),
+                leaderboardService: leaderboardService,
+                matchCompletionService: services.NewMatchCompletionService(db, leaderboardService, cfg.MatchCompletionWorkers),
                 upgrader: websocket.Upgrader{
                         CheckOrigin: func(r *http.Request) bool {
                                 return true // Allow all origins for development
@@ -282,8 +288,21 @@ func (h *AdminHandler) AddMatchEvent(c *gin.Context) {
                 }
         }
 
+        // The event and its points delta are written in one transaction so the
+        // stored totals never drift from match_events
+        tx, err := h.db.Begin()
+        if err != nil {
+                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                        Success: false,
+                        Error:   "Failed to start transaction",
+                        Code:    "TRANSACTION_ERROR",
+                })
+                return
+        }
+        defer tx.Rollback()
+
         var eventID int64
-        err = h.db.QueryRow(`
+        err = tx.QueryRow(`
                 INSERT INTO match_events (match_id, player_id, event_type, points, round_number, 
                                                                  description, additional_data, created_by, created_at)
                 VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW())
@@ -300,6 +319,33 @@ func (h *AdminHandler) AddMatchEvent(c *gin.Context) {
                 return
         }
 
+        // ⭐ INCREMENTAL FANTASY POINTS ⭐
+        // Only the teams holding this player are touched; full recalculation is
+        // left to the RecalculatePoints endpoint
+        var teamTotals map[int64]float64
+        if h.config.ScoringMode != config.ScoringModeFull {
+                teamTotals, err = h.leaderboardService.ApplyPlayerPointsDeltas(tx, parseAdminInt64(matchID),
+                        map[int64]float64{req.PlayerID: req.Points})
+                if err != nil {
+                        logger.Error(fmt.Sprintf("Failed to apply points delta for match %s: %v", matchID, err))
+                        c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                                Success: false,
+                                Error:   "Failed to update fantasy points",
+                                Code:    "DB_ERROR",
+                        })
+                        return
+                }
+        }
+
+        if err = tx.Commit(); err != nil {
+                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                        Success: false,
+                        Error:   "Failed to add match event",
+                        Code:    "COMMIT_ERROR",
+                })
+                return
+        }
+
         // Get player name for response
         var playerName, teamName string
         h.db.QueryRow(`
@@ -307,15 +353,22 @@ func (h *AdminHandler) AddMatchEvent(c *gin.Context) {
                 JOIN teams t ON p.team_id = t.id 
                 WHERE p.id = $1`, req.PlayerID).Scan(&playerName, &teamName)
 
-        // ⭐ REAL FANTASY POINTS CALCULATION ENGINE ⭐
-        teamsAffected, err := h.RecalculateFantasyPointsForPlayer(matchID, req.PlayerID)
-        if err != nil {
-                // Log error but don't fail the request since event was added
-                teamsAffected = 0
-        }
+        var teamsAffected int
+        if h.config.ScoringMode != config.ScoringModeFull {
+                h.leaderboardService.ApplyTeamTotals(teamTotals)
+                teamsAffected = len(teamTotals)
+        } else {
+                // ⭐ REAL FANTASY POINTS CALCULATION ENGINE ⭐
+                teamsAffected, err = h.RecalculateFantasyPointsForPlayer(matchID, req.PlayerID)
+                if err != nil {
+                        // Log error but don't fail the request since event was added
+                        teamsAffected = 0
+                }
 
-        // Update leaderboards for all contests of this match
-        h.UpdateLeaderboardsForMatch(matchID)
+                // Update leaderboards for all contests of this match
+                h.UpdateLeaderboardsForMatch(matchID)
+                h.leaderboardService.InvalidateMatchRankIndexes(parseAdminInt64(matchID))
+        }
 
         // ⭐ TRIGGER REAL-TIME LEADERBOARD UPDATES ⭐
         h.triggerRealTimeLeaderboardUpdates(matchID, eventID, "match_event")
@@ -360,6 +413,7 @@ func (h *AdminHandler) UpdatePlayerStats(c *gin.Context) {
 
         // In production, you would update player statistics
         // For now, just return success
+
         c.JSON(http.StatusOK, gin.H{
                 "success":   true,
                 "match_id":  matchID,
@@ -418,6 +472,7 @@ func (h *AdminHandler) BulkUpdateEvents(c *gin.Context) {
         // Step 3: Insert all events in batch
         eventsAdded := 0
         affectedPlayers := make(map[int64]bool)
+        playerDeltas := make(map[int64]float64)
         
         for _, event := range req.Events {
                 var eventID int64
@@ -436,11 +491,25 @@ func (h *AdminHandler) BulkUpdateEvents(c *gin.Context) {
                 
                 eventsAdded++
                 affectedPlayers[event.PlayerID] = true
+                playerDeltas[event.PlayerID] += event.Points
         }
         
         // Step 4: Recalculate fantasy points if requested
+        incremental := h.config.ScoringMode != config.ScoringModeFull
         var totalTeamsAffected int
-        if req.AutoCalculateFantasyPoints {
+        var teamTotals map[int64]float64
+        if req.AutoCalculateFantasyPoints && incremental {
+                teamTotals, err = h.leaderboardService.ApplyPlayerPointsDeltas(tx, parseAdminInt64(matchID), playerDeltas)
+                if err != nil {
+                        c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                                Success: false,
+                                Error:   "Failed to update fantasy points",
+                                Code:    "DB_ERROR",
+                        })
+                        return
+                }
+                totalTeamsAffected = len(teamTotals)
+        } else if req.AutoCalculateFantasyPoints {
                 for playerID := range affectedPlayers {
                         teamsAffected, err := h.recalculateFantasyPointsForPlayerTx(tx, matchID, playerID)
                         if err == nil {
@@ -451,7 +520,7 @@ func (h *AdminHandler) BulkUpdateEvents(c *gin.Context) {
         
         // Step 5: Update leaderboards
         leaderboardsUpdated := 0
-        if req.AutoCalculateFantasyPoints {
+        if req.AutoCalculateFantasyPoints && !incremental {
                 leaderboardsUpdated, _ = h.updateAllContestLeaderboardsTx(tx, matchID)
         }
         
@@ -465,6 +534,12 @@ func (h *AdminHandler) BulkUpdateEvents(c *gin.Context) {
                 return
         }
 
+        if req.AutoCalculateFantasyPoints && incremental {
+                leaderboardsUpdated = len(h.leaderboardService.ApplyTeamTotals(teamTotals))
+        } else if req.AutoCalculateFantasyPoints {
+                h.leaderboardService.InvalidateMatchRankIndexes(parseAdminInt64(matchID))
+        }
+
         // ⭐ TRIGGER REAL-TIME LEADERBOARD UPDATES ⭐
         if req.AutoCalculateFantasyPoints && eventsAdded > 0 {
                 h.triggerRealTimeLeaderboardUpdates(matchID, 0, "bulk_events")
@@ -587,6 +662,10 @@ func (h *AdminHandler) UpdateMatchScore(c *gin.Context) {
                                 txErr = tx.Commit()
                                 committed = true
                         }
+                        // Completion recalculates every team, so cached rankings are rebuilt
+                        if txErr == nil && req.MatchStatus == "completed" {
+                                h.leaderboardService.InvalidateMatchRankIndexes(parseAdminInt64(matchID))
+                        }
                 }
         }()
         
@@ -700,7 +779,7 @@ func (h *AdminHandler) RecalculatePoints(c *gin.Context) {
         }
 
         // ⭐ USE REAL LEADERBOARD SERVICE FOR FANTASY POINTS RECALCULATION ⭐
-        err := h.leaderboardService.RecalculateFantasyPoints(matchIDInt64)
+        report, err := h.leaderboardService.RecalculateFantasyPoints(matchIDInt64)
         if err != nil {
                 c.JSON(http.StatusInternalServerError, models.ErrorResponse{
                         Success: false,
@@ -710,9 +789,7 @@ func (h *AdminHandler) RecalculatePoints(c *gin.Context) {
                 return
         }
 
-        // Count affected teams
-        var teamsAffected int
-        h.db.QueryRow("SELECT COUNT(*) FROM user_teams WHERE match_id = $1", matchID).Scan(&teamsAffected)
+        teamsAffected := report.TeamsRecalculated
 
         // Count leaderboards updated
         var leaderboardsUpdated int
@@ -733,6 +810,7 @@ func (h *AdminHandler) RecalculatePoints(c *gin.Context) {
                 "teams_affected":       teamsAffected,
                 "leaderboards_updated": leaderboardsUpdated,
                 "notifications_sent":   req.NotifyUsers,
+                "recalculation":        report,
                 "message":              "Fantasy points recalculated using leaderboard service",
         })
 }
@@ -930,191 +1008,106 @@ func (h *AdminHandler) CompleteMatch(c *gin.Context) {
                 return
         }
 
-        // ⭐ REAL MATCH COMPLETION AND PRIZE DISTRIBUTION IMPLEMENTATION ⭐
-        
-        // Step 1: Start transaction with proper error handling pattern
-        tx, err := h.db.Begin()
-        if err != nil {
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Failed to start completion transaction",
-                        Code:    "TRANSACTION_ERROR",
-                })
-                return
-        }
-        
-        // Implement robust transaction management pattern based on research
-        var txErr error
-        committed := false
-        defer func() {
-                if p := recover(); p != nil {
-                        // Handle panic - rollback and re-panic
-                        if !committed {
-                                tx.Rollback()
-                        }
-                        panic(p)
-                } else if txErr != nil {
-                        // Error occurred - rollback
-                        if !committed {
-                                tx.Rollback()
-                        }
-                } else {
-                        // Success - commit
-                        if !committed {
-                                txErr = tx.Commit()
-                                committed = true
-                        }
-                }
-        }()
-        
-        // Step 2: Validate match can be completed
-        var currentStatus string
-        err = tx.QueryRow("SELECT status FROM matches WHERE id = $1", matchID).Scan(&currentStatus)
-        if err != nil {
-                txErr = err
+        // Contests are finalized in their own transactions, so a request
+        // that fails part way can simply be repeated to resume the run
+        report, err := h.matchCompletionService.Complete(parseAdminInt64(matchID), services.MatchCompletionOptions{
+                WinnerTeamID:      req.FinalResult.WinnerTeamID,
+                MVPPlayerID:       req.FinalResult.MVPPlayerID,
+                DistributePrizes:  req.DistributePrizes,
+                SendNotifications: req.SendNotifications,
+        })
+        switch {
+        case err == services.ErrMatchNotFound:
                 c.JSON(http.StatusNotFound, models.ErrorResponse{
                         Success: false,
                         Error:   "Match not found",
                         Code:    "MATCH_NOT_FOUND",
                 })
                 return
-        }
-        
-        if currentStatus == "completed" {
-                txErr = fmt.Errorf("match already completed")
+        case err == services.ErrMatchAlreadyCompleted:
                 c.JSON(http.StatusBadRequest, models.ErrorResponse{
                         Success: false,
                         Error:   "Match is already completed",
                         Code:    "ALREADY_COMPLETED",
                 })
                 return
-        }
-        
-        // Step 3: Update match status and winner
-        _, err = tx.Exec(`
-                UPDATE matches 
-                SET status = 'completed', winner_team_id = $1, updated_at = NOW()
-                WHERE id = $2`,
-                req.FinalResult.WinnerTeamID, matchID)
-        
-        if err != nil {
-                txErr = err
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Failed to complete match",
-                        Code:    "DB_ERROR",
-                })
-                return
-        }
-        
-        // Step 4: Finalize all fantasy team scores
-        finalizedTeams, err := h.finalizeFantasyTeamScores(tx, matchID)
-        if err != nil {
-                txErr = err
+        case err != nil:
+                log.Printf("CompleteMatch error for match %s: %v", matchID, err)
                 c.JSON(http.StatusInternalServerError, models.ErrorResponse{
                         Success: false,
-                        Error:   "Failed to finalize fantasy scores",
-                        Code:    "FANTASY_FINALIZATION_ERROR",
+                        Error:   "Failed to complete match, retry to resume: " + err.Error(),
+                        Code:    "COMPLETION_ERROR",
                 })
                 return
         }
-        
-        // Step 5: Calculate and freeze final leaderboards
-        leaderboardsFinalized, err := h.finalizeContestLeaderboards(tx, matchID)
-        if err != nil {
-                txErr = err
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Failed to finalize leaderboards",
-                        Code:    "LEADERBOARD_FINALIZATION_ERROR",
-                })
-                return
+
+        response := gin.H{
+                "success":                 true,
+                "match_id":                matchID,
+                "winner_team":             report.WinnerTeamID,
+                "mvp_player":              report.MVPPlayerID,
+                "final_score":             req.FinalResult.FinalScore,
+                "match_duration":          req.FinalResult.MatchDuration,
+                "resumed":                 report.Resumed,
+                "fantasy_teams_finalized": report.TeamsLocked,
+                "leaderboards_finalized":  report.ContestsFinalized,
+                "contests_updated":        report.ContestsFinalized,
+                "notifications_sent":      report.NotificationsSent,
+                "statistics_updated":      report.StatisticsUpdated,
+                "prizes_distributed":      report.PrizesDistributed,
+                "duration_ms":             report.DurationMs,
+                "completion_timestamp":    time.Now(),
+                "message":                 "Match completed successfully with full processing",
         }
-        
-        // Step 6: Distribute prizes if requested
-        var prizeDistribution map[string]interface{}
-        if req.DistributePrizes {
-                prizeDistribution, err = h.distributePrizes(tx, matchID)
-                if err != nil {
-                        txErr = err
-                        c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                                Success: false,
-                                Error:   "Failed to distribute prizes",
-                                Code:    "PRIZE_DISTRIBUTION_ERROR",
-                        })
-                        return
+
+        if report.PrizesDistributed {
+                prizeDistribution := gin.H{
+                        "total_amount":           report.Prizes.TotalAmount,
+                        "contests_processed":     report.Prizes.ContestsProcessed,
+                        "winners_rewarded":       report.Prizes.WinnersRewarded,
+                        "distribution_timestamp": time.Now(),
+                        "success":                true,
                 }
+                if report.Prizes.ContestsProcessed == 0 {
+                        prizeDistribution["message"] = "No prize contests found for match"
+                }
+                response["prize_distribution"] = prizeDistribution
         }
-        
-        // Step 7: Update contest statuses
-        contestsUpdated, err := h.updateContestStatuses(tx, matchID)
-        if err != nil {
-                txErr = err
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+
+        c.JSON(http.StatusOK, response)
+}
+
+// @Summary Get match completion progress
+// @Description Get how many contests of a match completion run are finalized
+// @Tags Admin Scoring
+// @Produce json
+// @Security BearerAuth
+// @Param id path int true "Match ID"
+// @Success 200 {object} models.MatchCompletionProgress
+// @Router /admin/matches/{id}/completion [get]
+func (h *AdminHandler) GetMatchCompletion(c *gin.Context) {
+        progress, err := h.matchCompletionService.GetProgress(parseAdminInt64(c.Param("id")))
+        if err == services.ErrMatchNotFound {
+                c.JSON(http.StatusNotFound, models.ErrorResponse{
                         Success: false,
-                        Error:   "Failed to update contest statuses",
-                        Code:    "CONTEST_UPDATE_ERROR",
+                        Error:   "Match not found",
+                        Code:    "MATCH_NOT_FOUND",
                 })
                 return
         }
-        
-        // Step 8: Send notifications if requested
-        var notificationsSent int
-        if req.SendNotifications {
-                notificationsSent, err = h.sendMatchCompletionNotifications(tx, matchID, req.FinalResult.WinnerTeamID)
-                if err != nil {
-                        // Log error but don't fail the entire operation
-                        notificationsSent = 0
-                }
-        }
-        
-        // Step 9: Update player and team statistics
-        statsUpdated, err := h.updateMatchStatistics(tx, matchID, req.FinalResult.WinnerTeamID, req.FinalResult.MVPPlayerID)
         if err != nil {
-                // Log error but don't fail the entire operation
-                statsUpdated = false
-        }
-        
-        // Step 10: Check for commit errors from defer pattern with detailed error logging
-        if txErr != nil {
-                // Log the detailed error for debugging
-                fmt.Printf("CompleteMatch transaction error for match %s: %v\n", matchID, txErr)
-                
                 c.JSON(http.StatusInternalServerError, models.ErrorResponse{
                         Success: false,
-                        Error:   fmt.Sprintf("Failed to commit match completion: %v", txErr),
-                        Code:    "COMMIT_ERROR",
+                        Error:   "Failed to get match completion progress",
+                        Code:    "DB_ERROR",
                 })
                 return
         }
-        
-        // Step 11: Send real-time completion broadcasts
-        h.broadcastMatchCompletion(matchID, req.FinalResult.WinnerTeamID, req.FinalResult.MVPPlayerID)
-        
-        // Build comprehensive response
-        response := gin.H{
-                "success":              true,
-                "match_id":             matchID,
-                "winner_team":          req.FinalResult.WinnerTeamID,
-                "mvp_player":           req.FinalResult.MVPPlayerID,
-                "final_score":          req.FinalResult.FinalScore,
-                "match_duration":       req.FinalResult.MatchDuration,
-                "fantasy_teams_finalized": finalizedTeams,
-                "leaderboards_finalized":  leaderboardsFinalized,
-                "contests_updated":        contestsUpdated,
-                "notifications_sent":      notificationsSent,
-                "statistics_updated":      statsUpdated,
-                "prizes_distributed":      req.DistributePrizes,
-                "completion_timestamp":    time.Now(),
-                "message":                "Match completed successfully with full processing",
-        }
-        
-        // Add prize distribution details if prizes were distributed
-        if prizeDistribution != nil {
-                response["prize_distribution"] = prizeDistribution
-        }
 
-        c.JSON(http.StatusOK, response)
+        c.JSON(http.StatusOK, gin.H{
+                "success":  true,
+                "progress": progress,
+        })
 }
 
 // @Summary Get match events
@@ -1913,6 +1906,43 @@ func (h *AdminHandler) UpdateSystemConfig(c *gin.Context) {
         c.JSON(http.StatusOK, gin.H{"success": true, "config_key": configKey, "message": "Config updated"})
 }
 
+// @Summary Get database pool statistics
+// @Description Get connection pool usage and wait counters, for sizing the pool ahead of match-start spikes, and the state of the write-behind buffers
+// @Tags Admin
+// @Produce json
+// @Security BearerAuth
+// @Success 200 {object} map[string]interface{}
+// @Router /admin/system/db-stats [get]
+func (h *AdminHandler) GetDatabaseStats(c *gin.Context) {
+        c.JSON(http.StatusOK, gin.H{
+                "success": true,
+                "pool":    db.Stats(h.db),
+                "write_behind": writebehind.AllStats(),
+                "config": gin.H{
+                        "max_open_conns":             h.config.DBMaxOpenConns,
+                        "max_idle_conns":             h.config.DBMaxIdleConns,
+                        "conn_max_lifetime_seconds":  h.config.DBConnMaxLifetime.Seconds(),
+                        "conn_max_idle_time_seconds": h.config.DBConnMaxIdleTime.Seconds(),
+                },
+                "timestamp": time.Now(),
+        })
+}
+
+// @Summary Get outbound HTTP statistics
+// @Description Get circuit breaker state and latency percentiles for each host called by notification and payment integrations
+// @Tags Admin
+// @Produce json
+// @Security BearerAuth
+// @Success 200 {object} map[string]interface{}
+// @Router /admin/system/http-stats [get]
+func (h *AdminHandler) GetOutboundHTTPStats(c *gin.Context) {
+        c.JSON(http.StatusOK, gin.H{
+                "success":   true,
+                "hosts":     httpclient.Stats(),
+                "timestamp": time.Now(),
+        })
+}
+
 // ================================
 // FANTASY POINTS CALCULATION HELPERS
 // ================================
@@ -2279,12 +2309,8 @@ func (h *AdminHandler) triggerRealTimeLeaderboardUpdates(matchID string, eventID
                         continue
                 }
 
-                // Trigger real-time update for this contest
-                err := h.leaderboardService.TriggerRealTimeUpdate(contestID, triggerSource, &eventID)
-                if err != nil {
-                        logger.Error(fmt.Sprintf("Failed to trigger real-time update for contest %d: %v", contestID, err))
-                        continue
-                }
+                // Schedule a real-time update; bursts of events are merged per contest
+                h.leaderboardService.ScheduleRealTimeUpdate(contestID, triggerSource, &eventID)
                 contestsUpdated++
         }
 
@@ -2293,12 +2319,8 @@ func (h *AdminHandler) triggerRealTimeLeaderboardUpdates(matchID string, eventID
 
 // triggerRealTimeLeaderboardUpdateForContest triggers real-time update for a specific contest
 func (h *AdminHandler) triggerRealTimeLeaderboardUpdateForContest(contestID int64, triggerSource string, eventID *int64) {
-        err := h.leaderboardService.TriggerRealTimeUpdate(contestID, triggerSource, eventID)
-        if err != nil {
-                logger.Error(fmt.Sprintf("Failed to trigger real-time update for contest %d: %v", contestID, err))
-        } else {
-                logger.Info(fmt.Sprintf("Triggered real-time leaderboard update for contest %d from source: %s", contestID, triggerSource))
-        }
+        h.leaderboardService.ScheduleRealTimeUpdate(contestID, triggerSource, eventID)
+        logger.Info(fmt.Sprintf("Scheduled real-time leaderboard update for contest %d from source: %s", contestID, triggerSource))
 }
 
 // SendRecalculationNotifications sends notifications about points recalculation
@@ -2589,539 +2611,6 @@ func (h *AdminHandler) updateContestLeaderboardTx(tx *sql.Tx, contestID int64) e
         return nil
 }
 
-// ⭐ MATCH COMPLETION HELPER FUNCTIONS ⭐
-
-// finalizeFantasyTeamScores finalizes all fantasy team scores for a match
-func (h *AdminHandler) finalizeFantasyTeamScores(tx *sql.Tx, matchID string) (int, error) {
-        // Get all fantasy teams for this match
-        rows, err := tx.Query(`
-                SELECT id FROM user_teams WHERE match_id = $1`, matchID)
-        if err != nil {
-                return 0, err
-        }
-        defer rows.Close()
-        
-        teamsFinalized := 0
-        
-        for rows.Next() {
-                var teamID int64
-                if err := rows.Scan(&teamID); err != nil {
-                        continue
-                }
-                
-                // Mark team as finalized and lock scores
-                _, err = tx.Exec(`
-                        UPDATE user_teams 
-                        SET is_finalized = true, finalized_at = NOW()
-                        WHERE id = $1`, teamID)
-                
-                if err == nil {
-                        teamsFinalized++
-                }
-        }
-        
-        return teamsFinalized, nil
-}
-
-// finalizeContestLeaderboards finalizes and freezes contest leaderboards
-// Implements robust empty dataset handling to prevent transaction failures
-func (h *AdminHandler) finalizeContestLeaderboards(tx *sql.Tx, matchID string) (int, error) {
-        // Use proper error handling pattern for empty dataset scenarios
-        var err error
-        
-        // First, check if there are any contests for this match
-        var contestCount int
-        err = tx.QueryRow(`
-                SELECT COUNT(*) FROM contests WHERE match_id = $1`, matchID).Scan(&contestCount)
-        
-        if err != nil {
-                if err == sql.ErrNoRows {
-                        return 0, nil // No contests is success - return zero processed
-                }
-                return 0, fmt.Errorf("failed to check contest count: %w", err)
-        }
-        
-        // Handle case where no contests exist - this is valid state
-        if contestCount == 0 {
-                return 0, nil // Successfully processed zero contests
-        }
-        
-        // Check if there are any contest participants for this match
-        var participantCount int
-        err = tx.QueryRow(`
-                SELECT COUNT(*)
-                FROM contest_participants cp
-                JOIN contests c ON cp.contest_id = c.id
-                WHERE c.match_id = $1`, matchID).Scan(&participantCount)
-        
-        if err != nil {
-                if err == sql.ErrNoRows {
-                        // No participants - still need to mark contests as completed
-                        return h.markContestsCompleted(tx, matchID)
-                }
-                return 0, fmt.Errorf("failed to check participant count: %w", err)
-        }
-        
-        // Handle the case where no participants exist - mark contests as completed
-        if participantCount == 0 {
-                return h.markContestsCompleted(tx, matchID)
-        }
-        
-        // Get all contests for this match and process them individually
-        rows, err := tx.Query(`
-                SELECT id FROM contests WHERE match_id = $1`, matchID)
-        if err != nil {
-                return 0, fmt.Errorf("failed to query contests: %w", err)
-        }
-        defer rows.Close()
-        
-        leaderboardsFinalized := 0
-        
-        for rows.Next() {
-                var contestID int64
-                if err := rows.Scan(&contestID); err != nil {
-                        continue // Skip this contest on scan error
-                }
-                
-                // Process each contest with proper error handling
-                if h.processContestFinalization(tx, contestID) {
-                        leaderboardsFinalized++
-                }
-        }
-        
-        // Check for errors in row iteration
-        if err = rows.Err(); err != nil {
-                return leaderboardsFinalized, fmt.Errorf("error iterating contests: %w", err)
-        }
-        
-        return leaderboardsFinalized, nil
-}
-
-// markContestsCompleted marks all contests as completed when no participants exist
-func (h *AdminHandler) markContestsCompleted(tx *sql.Tx, matchID string) (int, error) {
-        result, err := tx.Exec(`
-                UPDATE contests 
-                SET status = 'completed', is_finalized = true, finalized_at = NOW()
-                WHERE match_id = $1 AND status != 'completed'`, matchID)
-        
-        if err != nil {
-                return 0, fmt.Errorf("failed to mark contests completed: %w", err)
-        }
-        
-        rowsAffected, err := result.RowsAffected()
-        if err != nil {
-                // Don't fail for RowsAffected error - return success
-                return 0, nil
-        }
-        
-        return int(rowsAffected), nil
-}
-
-// processContestFinalization processes individual contest finalization with error handling
-func (h *AdminHandler) processContestFinalization(tx *sql.Tx, contestID int64) bool {
-        // Check if this specific contest has participants before updating leaderboard
-        var contestParticipants int
-        err := tx.QueryRow(`
-                SELECT COUNT(*) FROM contest_participants WHERE contest_id = $1`, contestID).Scan(&contestParticipants)
-        
-        if err != nil {
-                // Handle query error gracefully - don't fail entire operation
-                if err != sql.ErrNoRows {
-                        return false
-                }
-                contestParticipants = 0
-        }
-        
-        if contestParticipants > 0 {
-                // Update final rankings only if there are participants
-                err = h.updateContestLeaderboardTx(tx, contestID)
-                if err != nil {
-                        // Log error but continue with marking as completed
-                        _ = err // Don't fail entire operation for leaderboard update errors
-                }
-        }
-        
-        // Mark contest as finalized regardless of participants - this is important
-        _, err = tx.Exec(`
-                UPDATE contests 
-                SET status = 'completed', is_finalized = true, finalized_at = NOW()
-                WHERE id = $1`, contestID)
-        
-        // Return success if contest was marked as completed
-        return err == nil
-}
-
-// distributePrizes distributes prizes to winners - ROBUST VERSION
-// Implements comprehensive empty dataset handling and proper transaction patterns
-func (h *AdminHandler) distributePrizes(tx *sql.Tx, matchID string) (map[string]interface{}, error) {
-        prizeDistribution := make(map[string]interface{})
-        var err error
-        
-        // First, check if there are any contests for this match
-        var contestCount int
-        err = tx.QueryRow(`
-                SELECT COUNT(*) FROM contests WHERE match_id = $1`, matchID).Scan(&contestCount)
-        
-        if err != nil {
-                if err == sql.ErrNoRows {
-                        // No contests - return success with zero distributions
-                        return h.buildEmptyPrizeDistribution("No contests found for match"), nil
-                }
-                return nil, fmt.Errorf("failed to check contest count: %w", err)
-        }
-        
-        // Handle case where no contests exist - this is valid state
-        if contestCount == 0 {
-                return h.buildEmptyPrizeDistribution("No contests found for match"), nil
-        }
-        
-        // Check if there are any contest participants for this match
-        var participantCount int
-        err = tx.QueryRow(`
-                SELECT COUNT(*)
-                FROM contest_participants cp
-                JOIN contests c ON cp.contest_id = c.id
-                WHERE c.match_id = $1`, matchID).Scan(&participantCount)
-        
-        if err != nil {
-                if err == sql.ErrNoRows {
-                        // No participants - return success with zero distributions
-                        return h.buildEmptyPrizeDistribution("No contest participants found"), nil
-                }
-                return nil, fmt.Errorf("failed to check participant count: %w", err)
-        }
-        
-        // Handle the case where no participants exist - return success with zero distributions
-        if participantCount == 0 {
-                return h.buildEmptyPrizeDistribution("No contest participants found"), nil
-        }
-        
-        // Get all contests for this match that have prizes with proper error handling
-        rows, err := tx.Query(`
-                SELECT id, total_prize_pool, prize_distribution
-                FROM contests 
-                WHERE match_id = $1 AND total_prize_pool > 0`, matchID)
-        if err != nil {
-                return nil, fmt.Errorf("failed to query prize contests: %w", err)
-        }
-        defer rows.Close()
-        
-        totalPrizesDistributed := 0.0
-        contestsWithPrizes := 0
-        winnersRewarded := 0
-        
-        for rows.Next() {
-                var contestID int64
-                var prizePool float64
-                var prizeDistributionJSON string
-                
-                if err := rows.Scan(&contestID, &prizePool, &prizeDistributionJSON); err != nil {
-                        continue // Skip this contest on scan error - don't fail entire operation
-                }
-                
-                // Process each contest with proper error handling
-                contestPrizes, contestWinners := h.processContestPrizeDistribution(tx, contestID, prizePool, prizeDistributionJSON)
-                totalPrizesDistributed += contestPrizes
-                winnersRewarded += contestWinners
-                contestsWithPrizes++
-        }
-        
-        // Check for errors in row iteration
-        if err = rows.Err(); err != nil {
-                return nil, fmt.Errorf("error iterating prize contests: %w", err)
-        }
-        
-        prizeDistribution["total_amount"] = totalPrizesDistributed
-        prizeDistribution["contests_processed"] = contestsWithPrizes
-        prizeDistribution["winners_rewarded"] = winnersRewarded
-        prizeDistribution["distribution_timestamp"] = time.Now()
-        prizeDistribution["success"] = true
-        
-        return prizeDistribution, nil
-}
-
-// buildEmptyPrizeDistribution creates proper response for empty prize distribution scenarios
-func (h *AdminHandler) buildEmptyPrizeDistribution(message string) map[string]interface{} {
-        return map[string]interface{}{
-                "total_amount":              0.0,
-                "contests_processed":        0,
-                "winners_rewarded":          0,
-                "distribution_timestamp":    time.Now(),
-                "message":                   message,
-                "success":                   true,
-        }
-}
-
-// processContestPrizeDistribution processes prize distribution for a single contest with error handling
-func (h *AdminHandler) processContestPrizeDistribution(tx *sql.Tx, contestID int64, prizePool float64, prizeDistributionJSON string) (float64, int) {
-        // Parse prize distribution JSON to get percentages with error handling
-        var prizeDistributionData map[string]interface{}
-        winnerPct := 50.0    // Default 50% for winner
-        runnerUpPct := 30.0  // Default 30% for runner-up
-        
-        if err := json.Unmarshal([]byte(prizeDistributionJSON), &prizeDistributionData); err == nil {
-                // Extract winner and runner-up percentages if JSON parsing succeeds
-                if positions, ok := prizeDistributionData["positions"].([]interface{}); ok && len(positions) >= 2 {
-                        if pos1, ok := positions[0].(map[string]interface{}); ok {
-                                if pct, ok := pos1["percentage"].(float64); ok {
-                                        winnerPct = pct
-                                }
-                        }
-                        if pos2, ok := positions[1].(map[string]interface{}); ok {
-                                if pct, ok := pos2["percentage"].(float64); ok {
-                                        runnerUpPct = pct
-                                }
-                        }
-                }
-        }
-        // If JSON parsing fails, use defaults - don't fail the operation
-        
-        // Process prize distribution for this contest with proper error handling
-        return h.executePrizeDistributionForContest(tx, contestID, prizePool, winnerPct, runnerUpPct)
-}
-
-// executePrizeDistributionForContest executes the actual prize distribution with robust error handling
-func (h *AdminHandler) executePrizeDistributionForContest(tx *sql.Tx, contestID int64, prizePool, winnerPct, runnerUpPct float64) (float64, int) {
-        // Check if this specific contest has participants with ranks
-        var contestParticipantCount int
-        err := tx.QueryRow(`
-                SELECT COUNT(*)
-                FROM contest_participants cp
-                WHERE cp.contest_id = $1 AND cp.rank IS NOT NULL AND cp.rank > 0`, contestID).Scan(&contestParticipantCount)
-        
-        if err != nil || contestParticipantCount == 0 {
-                // No ranked participants - return zero prizes distributed
-                return 0.0, 0
-        }
-        
-        // Get winners (top 2 ranked participants) with error handling
-        rows, err := tx.Query(`
-                SELECT cp.team_id, cp.rank
-                FROM contest_participants cp
-                WHERE cp.contest_id = $1 AND cp.rank IS NOT NULL AND cp.rank > 0
-                ORDER BY cp.rank ASC
-                LIMIT 2`, contestID)
-        
-        if err != nil {
-                return 0.0, 0 // Return zero on query error - don't fail transaction
-        }
-        defer rows.Close()
-        
-        totalDistributed := 0.0
-        winnersCount := 0
-        rank := 1
-        
-        for rows.Next() {
-                var teamID int64
-                var participantRank int
-                
-                if err := rows.Scan(&teamID, &participantRank); err != nil {
-                        continue // Skip this participant on scan error
-                }
-                
-                // Calculate prize amount based on rank
-                var prizeAmount float64
-                if rank == 1 {
-                        prizeAmount = prizePool * (winnerPct / 100.0)
-                } else if rank == 2 {
-                        prizeAmount = prizePool * (runnerUpPct / 100.0)
-                } else {
-                        break // Only distribute to top 2
-                }
-                
-                // Update user wallet with prize amount (with error handling)
-                if h.updateUserWallet(tx, teamID, prizeAmount) {
-                        totalDistributed += prizeAmount
-                        winnersCount++
-                }
-                
-                rank++
-        }
-        
-        return totalDistributed, winnersCount
-}
-
-// updateUserWallet updates user wallet with prize amount - returns success status
-func (h *AdminHandler) updateUserWallet(tx *sql.Tx, teamID int64, amount float64) bool {
-        // Get user ID from team
-        var userID int64
-        err := tx.QueryRow(`
-                SELECT user_id FROM user_teams WHERE id = $1`, teamID).Scan(&userID)
-        
-        if err != nil {
-                return false // Failed to get user ID
-        }
-        
-        // Update user wallet balance
-        _, err = tx.Exec(`
-                UPDATE users 
-                SET wallet_balance = wallet_balance + $1 
-                WHERE id = $2`, amount, userID)
-        
-        return err == nil // Return success status
-}
-
-// updateContestStatuses updates contest statuses after match completion
-func (h *AdminHandler) updateContestStatuses(tx *sql.Tx, matchID string) (int, error) {
-        // Use log package with explicit flush for guaranteed output
-        log.Printf("🔍 DEBUG: updateContestStatuses called for match %s", matchID)
-        
-        // First, check if any contests exist for this match
-        var contestCount int
-        err := tx.QueryRow(`
-                SELECT COUNT(*) FROM contests WHERE match_id = $1`, matchID).Scan(&contestCount)
-        
-        if err != nil {
-                log.Printf("❌ DEBUG: Error checking contest count for match %s: %v", matchID, err)
-                return 0, fmt.Errorf("failed to check contest count: %w", err)
-        }
-        
-        log.Printf("📊 DEBUG: Found %d contests for match %s", contestCount, matchID)
-        
-        // Handle case where no contests exist - this is valid, return success with zero count
-        if contestCount == 0 {
-                log.Printf("✅ DEBUG: No contests found for match %s, returning success", matchID)
-                return 0, nil // Success: no contests to update
-        }
-        
-        // Update all contests for this match to completed status
-        log.Printf("🔄 DEBUG: Attempting to update contest statuses for match %s", matchID)
-        
-        result, err := tx.Exec(`
-                UPDATE contests 
-                SET status = 'completed', updated_at = NOW()
-                WHERE match_id = $1 AND status != 'completed'`, matchID)
-        
-        if err != nil {
-                log.Printf("❌ DEBUG: Error updating contest statuses for match %s: %v", matchID, err)
-                return 0, fmt.Errorf("failed to update contest statuses: %w", err)
-        }
-        
-        // Check rows affected - zero is valid if all contests were already completed
-        rowsAffected, err := result.RowsAffected()
-        if err != nil {
-                log.Printf("⚠️ DEBUG: Error getting rows affected for match %s: %v", matchID, err)
-                // Don't fail for RowsAffected error - return what we know worked
-                return 0, nil
-        }
-        
-        log.Printf("✅ DEBUG: Successfully updated %d contest statuses for match %s", int(rowsAffected), matchID)
-        return int(rowsAffected), nil
-}
-
-// sendMatchCompletionNotifications sends notifications about match completion
-func (h *AdminHandler) sendMatchCompletionNotifications(tx *sql.Tx, matchID string, winnerTeamID int64) (int, error) {
-        // First, check if there are any contest participants for this match
-        var participantCount int
-        err := tx.QueryRow(`
-                SELECT COUNT(*)
-                FROM contest_participants cp
-                JOIN contests c ON cp.contest_id = c.id
-                WHERE c.match_id = $1`, matchID).Scan(&participantCount)
-        
-        if err != nil {
-                return 0, err
-        }
-        
-        // Handle the case where no participants exist - return success with zero notifications
-        if participantCount == 0 {
-                return 0, nil
-        }
-        
-        // Get all users who participated in contests for this match
-        rows, err := tx.Query(`
-                SELECT DISTINCT cp.user_id, u.first_name, u.mobile
-                FROM contest_participants cp
-                JOIN contests c ON cp.contest_id = c.id
-                JOIN users u ON cp.user_id = u.id
-                WHERE c.match_id = $1`, matchID)
-        
-        if err != nil {
-                return 0, err
-        }
-        defer rows.Close()
-        
-        notificationsSent := 0
-        
-        for rows.Next() {
-                var userID int64
-                var firstName, mobile string
-                
-                if err := rows.Scan(&userID, &firstName, &mobile); err != nil {
-                        continue
-                }
-                
-                // Create notification record
-                _, err = tx.Exec(`
-                        INSERT INTO notifications (user_id, title, message, type, created_at)
-                        VALUES ($1, $2, $3, 'match_completed', NOW())`,
-                        userID, 
-                        "Match Completed!",
-                        fmt.Sprintf("The match has been completed. Check your contest results!"))
-                
-                if err == nil {
-                        notificationsSent++
-                }
-        }
-        
-        return notificationsSent, nil
-}
-
-// updateMatchStatistics updates player and team statistics after match completion
-func (h *AdminHandler) updateMatchStatistics(tx *sql.Tx, matchID string, winnerTeamID, mvpPlayerID int64) (bool, error) {
-        // Update team statistics
-        _, err := tx.Exec(`
-                UPDATE teams 
-                SET matches_played = matches_played + 1,
-                    matches_won = matches_won + CASE WHEN id = $1 THEN 1 ELSE 0 END,
-                    updated_at = NOW()
-                WHERE id IN (
-                        SELECT team_id FROM match_participants WHERE match_id = $2
-                )`, winnerTeamID, matchID)
-        
-        if err != nil {
-                return false, err
-        }
-        
-        // Update player statistics
-        _, err = tx.Exec(`
-                UPDATE players 
-                SET matches_played = matches_played + 1,
-                    updated_at = NOW()
-                WHERE team_id IN (
-                        SELECT team_id FROM match_participants WHERE match_id = $1
-                )`, matchID)
-        
-        if err != nil {
-                return false, err
-        }
-        
-        // Update MVP player if specified
-        if mvpPlayerID > 0 {
-                _, err = tx.Exec(`
-                        UPDATE players 
-                        SET mvp_awards = mvp_awards + 1,
-                            updated_at = NOW()
-                        WHERE id = $1`, mvpPlayerID)
-                
-                if err != nil {
-                        return false, err
-                }
-        }
-        
-        return true, nil
-}
-
-// broadcastMatchCompletion sends real-time updates about match completion
-func (h *AdminHandler) broadcastMatchCompletion(matchID string, winnerTeamID, mvpPlayerID int64) {
-        // TODO: Implement WebSocket broadcasting
-        // This would send real-time updates to:
-        // 1. All connected admin clients
-        // 2. Users watching this match
-        // 3. Contest participants
-        // 4. Leaderboard viewers
-}
-
 // Helper function
 func parseAdminInt64(s string) int64 {
         val, _ := strconv.ParseInt(s, 10, 64)
@@ -3331,70 +2820,12 @@ func (h *AdminHandler) recalculateAllFantasyPointsTx(tx *sql.Tx, matchID string,
                 return 0, 0, nil
         }
         
-        // Get all fantasy teams for this match
-        rows, err := tx.Query(`
-                SELECT id FROM user_teams WHERE match_id = $1`, matchID)
+        // Recalculate every team of the match with the batched points engine
+        report, err := h.leaderboardService.RecalculateFantasyPointsTx(tx, parseAdminInt64(matchID))
         if err != nil {
                 return 0, 0, err
         }
-        defer rows.Close()
-        
-        teamsRecalculated := 0
-        
-        // For each team, recalculate all player points
-        for rows.Next() {
-                var teamID int64
-                if err := rows.Scan(&teamID); err != nil {
-                        continue
-                }
-                
-                // Get all players in this team
-                playerRows, err := tx.Query(`
-                        SELECT tp.player_id, tp.is_captain, tp.is_vice_captain
-                        FROM team_players tp
-                        WHERE tp.team_id = $1`, teamID)
-                if err != nil {
-                        continue
-                }
-                
-                // Calculate points for each player in the team
-                for playerRows.Next() {
-                        var playerID int64
-                        var isCaptain, isViceCaptain bool
-                        
-                        if err := playerRows.Scan(&playerID, &isCaptain, &isViceCaptain); err != nil {
-                                continue
-                        }
-                        
-                        // Calculate base points for this player
-                        basePoints, err := h.calculatePlayerBasePointsTx(tx, matchID, playerID)
-                        if err != nil {
-                                continue
-                        }
-                        
-                        // Apply captain/vice-captain multipliers
-                        finalPoints := basePoints
-                        if isCaptain {
-                                finalPoints = basePoints * 2.0 // Captain gets 2x points
-                        } else if isViceCaptain {
-                                finalPoints = basePoints * 1.5 // Vice-captain gets 1.5x points
-                        }
-                        
-                        // Update team_players.points_earned
-                        tx.Exec(`
-                                UPDATE team_players 
-                                SET points_earned = $1 
-                                WHERE team_id = $2 AND player_id = $3`,
-                                finalPoints, teamID, playerID)
-                }
-                playerRows.Close()
-                
-                // Recalculate team total points
-                err = h.recalculateTeamTotalPointsTx(tx, teamID)
-                if err == nil {
-                        teamsRecalculated++
-                }
-        }
+        teamsRecalculated := report.TeamsRecalculated
         
         // Update contest rankings and count leaderboards updated
         leaderboardsUpdated, err := h.updateAllContestLeaderboardsTx(tx, matchID)
@@ -188,9 +188,9 @@ func (h *ContentHandler) GetBanner(c *gin.Context) {
 		return
 	}
 
-	// Record view analytics
-	go h.contentService.RecordContentView("banner", id)
-	go h.contentService.IncrementBannerView(id)
+	// Record view analytics (buffered, written in the background)
+	h.contentService.RecordContentView("banner", id)
+	h.contentService.IncrementBannerView(id)
 
 	c.JSON(http.StatusOK, gin.H{
 		"success": true,
@@ -353,9 +353,9 @@ func (h *ContentHandler) TrackBannerClick(c *gin.Context) {
 		return
 	}
 
-	// Record click analytics (asynchronous)
-	go h.contentService.RecordContentClick("banner", id)
-	go h.contentService.IncrementBannerClick(id)
+	// Record click analytics (buffered, written in the background)
+	h.contentService.RecordContentClick("banner", id)
+	h.contentService.IncrementBannerClick(id)
 
 	c.JSON(http.StatusOK, gin.H{
 		"success": true,
@@ -614,9 +614,9 @@ func (h *ContentHandler) TrackFAQView(c *gin.Context) {
 		return
 	}
 
-	// Record view analytics (asynchronous)
-	go h.contentService.RecordContentView("faq", id)
-	go h.contentService.IncrementFAQView(id)
+	// Record view analytics (buffered, written in the background)
+	h.contentService.RecordContentView("faq", id)
+	h.contentService.IncrementFAQView(id)
 
 	c.JSON(http.StatusOK, gin.H{
 		"success": true,
@@ -845,8 +845,8 @@ func (h *ContentHandler) GetActiveLegalDocument(c *gin.Context) {
 		return
 	}
 
-	// Record view analytics
-	go h.contentService.RecordContentView("legal", document.ID)
+	// Record view analytics (buffered, written in the background)
+	h.contentService.RecordContentView("legal", document.ID)
 
 	c.JSON(http.StatusOK, gin.H{
 		"success": true,
@@ -6,6 +6,7 @@ import (
         "net/http"
         "strconv"
         "fantasy-esports-backend/config"
+        "fantasy-esports-backend/db"
         "fantasy-esports-backend/models"
         "fantasy-esports-backend/utils"
         "fantasy-esports-backend/services"
@@ -17,6 +18,8 @@ type ContestHandler struct {
         config             *config.Config
         leaderboardService *services.LeaderboardService
         referralService    *services.ReferralService
+        contestService     *services.ContestService
+        teamService        *services.TeamService
 }
 
 func NewContestHandler(db *sql.DB, cfg *config.Config) *ContestHandler {
@@ -25,6 +28,8 @@ func NewContestHandler(db *sql.DB, cfg *config.Config) *ContestHandler {
                 config:             cfg,
                 leaderboardService: services.NewLeaderboardService(db),
                 referralService:    services.NewReferralService(db),
+                contestService:     services.NewContestService(db),
+                teamService:        services.NewTeamService(db),
         }
 }
 
@@ -48,19 +53,7 @@ func (h *ContestHandler) GetContests(c *gin.Context) {
         limit, _ := strconv.Atoi(c.DefaultQuery("limit", "20"))
         offset := (page - 1) * limit
 
-        query := `SELECT c.id, c.match_id, c.name, c.contest_type, c.entry_fee,
-                                 c.max_participants, c.current_participants, c.total_prize_pool,
-                                 c.is_guaranteed, c.prize_distribution, c.contest_rules, c.status,
-                                 c.invite_code, c.is_multi_entry, c.max_entries_per_user, c.created_at,
-                                 m.name as match_name, t.name as tournament_name, m.scheduled_at, m.lock_time
-                          FROM contests c
-                          LEFT JOIN matches m ON c.match_id = m.id
-                          LEFT JOIN tournaments t ON m.tournament_id = t.id
-                          WHERE c.status = 'upcoming'
-                          ORDER BY m.scheduled_at
-                          LIMIT $1 OFFSET $2`
-
-        rows, err := h.db.Query(query, limit, offset)
+        rows, err := db.Query(h.db, db.StmtUpcomingContests, limit, offset)
         if err != nil {
                 c.JSON(http.StatusInternalServerError, models.ErrorResponse{
                         Success: false,
@@ -185,7 +178,8 @@ func (h *ContestHandler) JoinContest(c *gin.Context) {
         }
 
         // Validate contest and team ownership
-        errors := utils.ValidateContestEntry(userID, parseIntToInt64(contestID), req.UserTeamID)
+        entryContestID := parseIntToInt64(contestID)
+        errors := utils.ValidateContestEntry(userID, entryContestID, req.UserTeamID)
         if len(errors) > 0 {
                 c.JSON(http.StatusBadRequest, models.ErrorResponse{
                         Success: false,
@@ -195,122 +189,38 @@ func (h *ContestHandler) JoinContest(c *gin.Context) {
                 return
         }
 
-        // Check if contest exists and is joinable
-        var contest models.Contest
-        err := h.db.QueryRow(`
-                SELECT id, match_id, entry_fee, max_participants, current_participants, status
-                FROM contests WHERE id = $1`, contestID).Scan(
-                &contest.ID, &contest.MatchID, &contest.EntryFee, 
-                &contest.MaxParticipants, &contest.CurrentParticipants, &contest.Status,
-        )
-
-        if err == sql.ErrNoRows {
-                c.JSON(http.StatusNotFound, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Contest not found",
-                        Code:    "CONTEST_NOT_FOUND",
-                })
-                return
-        } else if err != nil {
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Database error",
-                        Code:    "DB_ERROR",
-                })
-                return
-        }
-
-        // Check if contest is joinable
-        if contest.Status != "upcoming" {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Contest is not joinable",
-                        Code:    "CONTEST_NOT_JOINABLE",
-                })
-                return
-        }
-
-        if contest.CurrentParticipants >= contest.MaxParticipants {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Contest is full",
-                        Code:    "CONTEST_FULL",
-                })
-                return
-        }
-
-        // Check if team exists and belongs to user
-        var teamUserID int64
-        err = h.db.QueryRow(`
-                SELECT user_id FROM user_teams WHERE id = $1`, req.UserTeamID).Scan(&teamUserID)
-        
-        if err == sql.ErrNoRows {
-                c.JSON(http.StatusNotFound, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Team not found",
-                        Code:    "TEAM_NOT_FOUND",
-                })
-                return
-        } else if err != nil {
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Database error",
-                        Code:    "DB_ERROR",
-                })
-                return
-        }
-
-        if teamUserID != userID {
-                c.JSON(http.StatusForbidden, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Team does not belong to user",
-                        Code:    "UNAUTHORIZED_TEAM",
-                })
-                return
-        }
-
-        // Check if user already joined this contest with this team
-        var existingEntry int64
-        err = h.db.QueryRow(`
-                SELECT id FROM contest_participants 
-                WHERE contest_id = $1 AND user_id = $2 AND team_id = $3`, 
-                contestID, userID, req.UserTeamID).Scan(&existingEntry)
-        
-        if err == nil {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Already joined this contest with this team",
-                        Code:    "ALREADY_JOINED",
-                })
-                return
-        }
-
-        // Check user's wallet balance (assuming they have sufficient funds for now)
-        // In production, you would deduct entry fee from wallet
-
-        // Add participant to contest
-        _, err = h.db.Exec(`
-                INSERT INTO contest_participants (contest_id, user_id, team_id, entry_fee_paid, joined_at)
-                VALUES ($1, $2, $3, $4, NOW())`,
-                contestID, userID, req.UserTeamID, contest.EntryFee)
-        
+        // Capacity, duplicate entry, wallet debit and participant count in one statement
+        entry, err := h.contestService.JoinContest(userID, entryContestID, req.UserTeamID)
         if err != nil {
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                status, message, code := http.StatusInternalServerError, "Failed to join contest", "JOIN_FAILED"
+                switch err {
+                case services.ErrContestNotFound:
+                        status, message, code = http.StatusNotFound, "Contest not found", "CONTEST_NOT_FOUND"
+                case services.ErrContestNotJoinable:
+                        status, message, code = http.StatusBadRequest, "Contest is not joinable", "CONTEST_NOT_JOINABLE"
+                case services.ErrContestFull:
+                        status, message, code = http.StatusBadRequest, "Contest is full", "CONTEST_FULL"
+                case services.ErrTeamNotFound:
+                        status, message, code = http.StatusNotFound, "Team not found", "TEAM_NOT_FOUND"
+                case services.ErrTeamNotOwned:
+                        status, message, code = http.StatusForbidden, "Team does not belong to user", "UNAUTHORIZED_TEAM"
+                case services.ErrAlreadyJoined:
+                        status, message, code = http.StatusBadRequest, "Already joined this contest with this team", "ALREADY_JOINED"
+                case services.ErrInsufficientBalance:
+                        status, message, code = http.StatusBadRequest, "Insufficient wallet balance", "INSUFFICIENT_BALANCE"
+                }
+                c.JSON(status, models.ErrorResponse{
                         Success: false,
-                        Error:   "Failed to join contest",
-                        Code:    "JOIN_FAILED",
+                        Error:   message,
+                        Code:    code,
                 })
                 return
         }
 
-        // Update contest participant count
-        _, err = h.db.Exec(`
-                UPDATE contests SET current_participants = current_participants + 1 
-                WHERE id = $1`, contestID)
-        
-        if err != nil {
-                // Log error but don't fail the request since participant was added
-                // In production, you'd want to handle this in a transaction
+        // Add the entry to the contest's in-memory ranking, or rebuild it on next read
+        if err := h.leaderboardService.AddRankEntry(entryContestID, req.UserTeamID); err != nil {
+                fmt.Printf("Failed to add team %d to contest %d ranking: %v\n", req.UserTeamID, entryContestID, err)
+                h.leaderboardService.InvalidateRankIndex(entryContestID)
         }
 
         // Trigger referral completion check for first contest
@@ -325,7 +235,7 @@ func (h *ContestHandler) JoinContest(c *gin.Context) {
                 "message": "Successfully joined contest",
                 "contest_id": contestID,
                 "team_id": req.UserTeamID,
-                "entry_fee": contest.EntryFee,
+                "entry_fee": entry.EntryFee,
         })
 }
 
@@ -427,109 +337,13 @@ func (h *ContestHandler) CreateTeam(c *gin.Context) {
                 return
         }
 
-        // Get game rules for validation
-        var game models.Game
-        err := h.db.QueryRow(`
-                SELECT g.id, g.total_team_size, g.max_players_per_team, g.min_players_per_team
-                FROM games g
-                JOIN matches m ON g.id = m.game_id
-                WHERE m.id = $1`, req.MatchID).Scan(
-                &game.ID, &game.TotalTeamSize, &game.MaxPlayersPerTeam, &game.MinPlayersPerTeam,
-        )
-
-        if err != nil {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Invalid match ID",
-                        Code:    "INVALID_MATCH",
-                })
-                return
-        }
-
-        // Validate team composition
-        errors := utils.ValidateTeamComposition(req.Players, game)
-        if len(errors) > 0 {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   errors[0],
-                        Code:    "VALIDATION_FAILED",
-                })
-                return
-        }
-
-        // Calculate total credits used and validate captain/vice-captain
-        var captainID, viceCaptainID int64
-        var totalCredits float64
-        
-        for _, player := range req.Players {
-                // Get player credit value
-                var creditValue float64
-                err := h.db.QueryRow(`
-                        SELECT credit_value FROM players WHERE id = $1`, player.PlayerID).Scan(&creditValue)
-                
-                if err != nil {
-                        c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                                Success: false,
-                                Error:   "Invalid player ID: " + strconv.FormatInt(player.PlayerID, 10),
-                                Code:    "INVALID_PLAYER",
-                        })
-                        return
-                }
-                
-                totalCredits += creditValue
-                
-                if player.IsCaptain {
-                        captainID = player.PlayerID
-                }
-                if player.IsViceCaptain {
-                        viceCaptainID = player.PlayerID
-                }
-        }
-
-        // Validate credit limit (100 credits)
-        if totalCredits > 100.0 {
-                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                        Success: false,
-                        Error:   fmt.Sprintf("Total credits (%.1f) exceed limit of 100", totalCredits),
-                        Code:    "CREDITS_EXCEEDED",
-                })
-                return
-        }
-
-        // Create the team in database
-        var teamID int64
-        err = h.db.QueryRow(`
-                INSERT INTO user_teams (user_id, match_id, team_name, captain_player_id, vice_captain_player_id, total_credits_used, created_at, updated_at)
-                VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
-                RETURNING id`,
-                userID, req.MatchID, req.TeamName, captainID, viceCaptainID, totalCredits).Scan(&teamID)
-        
+        // Validate against the match's cached player catalog, then save the team and its players together
+        teamID, selection, err := h.teamService.CreateTeam(userID, req)
         if err != nil {
-                c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                        Success: false,
-                        Error:   "Failed to create team",
-                        Code:    "TEAM_CREATION_FAILED",
-                })
+                h.respondTeamError(c, err, "Failed to create team", "TEAM_CREATION_FAILED")
                 return
         }
-
-        // Add players to the team
-        for _, player := range req.Players {
-                // Get player's real team ID
-                var realTeamID int64
-                h.db.QueryRow(`SELECT team_id FROM players WHERE id = $1`, player.PlayerID).Scan(&realTeamID)
-                
-                _, err = h.db.Exec(`
-                        INSERT INTO team_players (team_id, player_id, real_team_id, is_captain, is_vice_captain)
-                        VALUES ($1, $2, $3, $4, $5)`,
-                        teamID, player.PlayerID, realTeamID, player.IsCaptain, player.IsViceCaptain)
-                
-                if err != nil {
-                        // If player addition fails, we should rollback the team creation
-                        // For now, we'll just log and continue
-                        continue
-                }
-        }
+        totalCredits, captainID, viceCaptainID := selection.TotalCredits, selection.CaptainID, selection.ViceCaptainID
 
         c.JSON(http.StatusOK, gin.H{
                 "success": true,
@@ -627,101 +441,12 @@ func (h *ContestHandler) UpdateTeam(c *gin.Context) {
                 return
         }
 
-        // If updating players, validate the new team composition
+        // If updating players, validate the new lineup and replace it with the team details
         if len(req.Players) > 0 {
-                // Get game rules for validation
-                var game models.Game
-                err := h.db.QueryRow(`
-                        SELECT g.id, g.total_team_size, g.max_players_per_team, g.min_players_per_team
-                        FROM games g
-                        JOIN matches m ON g.id = m.game_id
-                        WHERE m.id = $1`, matchID).Scan(
-                        &game.ID, &game.TotalTeamSize, &game.MaxPlayersPerTeam, &game.MinPlayersPerTeam,
-                )
-
-                if err != nil {
-                        c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                                Success: false,
-                                Error:   "Invalid match ID",
-                                Code:    "INVALID_MATCH",
-                        })
-                        return
-                }
-
-                // Validate team composition
-                errors := utils.ValidateTeamComposition(req.Players, game)
-                if len(errors) > 0 {
-                        c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                                Success: false,
-                                Error:   errors[0],
-                                Code:    "VALIDATION_FAILED",
-                        })
-                        return
-                }
-
-                // Calculate new total credits and find captain/vice-captain
-                var captainID, viceCaptainID int64
-                var totalCredits float64
-                
-                for _, player := range req.Players {
-                        var creditValue float64
-                        err := h.db.QueryRow(`SELECT credit_value FROM players WHERE id = $1`, player.PlayerID).Scan(&creditValue)
-                        if err != nil {
-                                c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                                        Success: false,
-                                        Error:   "Invalid player ID: " + strconv.FormatInt(player.PlayerID, 10),
-                                        Code:    "INVALID_PLAYER",
-                                })
-                                return
-                        }
-                        
-                        totalCredits += creditValue
-                        if player.IsCaptain {
-                                captainID = player.PlayerID
-                        }
-                        if player.IsViceCaptain {
-                                viceCaptainID = player.PlayerID
-                        }
-                }
-
-                if totalCredits > 100.0 {
-                        c.JSON(http.StatusBadRequest, models.ErrorResponse{
-                                Success: false,
-                                Error:   fmt.Sprintf("Total credits (%.1f) exceed limit of 100", totalCredits),
-                                Code:    "CREDITS_EXCEEDED",
-                        })
-                        return
-                }
-
-                // Update team with new details
-                _, err = h.db.Exec(`
-                        UPDATE user_teams 
-                        SET team_name = $1, captain_player_id = $2, vice_captain_player_id = $3, 
-                            total_credits_used = $4, updated_at = NOW()
-                        WHERE id = $5`,
-                        req.TeamName, captainID, viceCaptainID, totalCredits, teamID)
-                
-                if err != nil {
-                        c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-                                Success: false,
-                                Error:   "Failed to update team",
-                                Code:    "UPDATE_FAILED",
-                        })
+                if _, err := h.teamService.UpdateTeam(parseIntToInt64(teamID), matchID, req.TeamName, req.Players); err != nil {
+                        h.respondTeamError(c, err, "Failed to update team", "UPDATE_FAILED")
                         return
                 }
-
-                // Delete existing players and add new ones
-                h.db.Exec("DELETE FROM team_players WHERE team_id = $1", teamID)
-                
-                for _, player := range req.Players {
-                        var realTeamID int64
-                        h.db.QueryRow(`SELECT team_id FROM players WHERE id = $1`, player.PlayerID).Scan(&realTeamID)
-                        
-                        h.db.Exec(`
-                                INSERT INTO team_players (team_id, player_id, real_team_id, is_captain, is_vice_captain)
-                                VALUES ($1, $2, $3, $4, $5)`,
-                                teamID, player.PlayerID, realTeamID, player.IsCaptain, player.IsViceCaptain)
-                }
         }
 
         c.JSON(http.StatusOK, gin.H{
@@ -731,6 +456,32 @@ func (h *ContestHandler) UpdateTeam(c *gin.Context) {
         })
 }
 
+// respondTeamError answers a failed team save, reporting lineup validation
+// errors with their own codes
+func (h *ContestHandler) respondTeamError(c *gin.Context, err error, message, code string) {
+        if teamErr, ok := err.(*services.TeamError); ok {
+                c.JSON(http.StatusBadRequest, models.ErrorResponse{
+                        Success: false,
+                        Error:   teamErr.Message,
+                        Code:    teamErr.Code,
+                })
+                return
+        }
+        if err == services.ErrInvalidMatch {
+                c.JSON(http.StatusBadRequest, models.ErrorResponse{
+                        Success: false,
+                        Error:   "Invalid match ID",
+                        Code:    "INVALID_MATCH",
+                })
+                return
+        }
+        c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+                Success: false,
+                Error:   message,
+                Code:    code,
+        })
+}
+
 func (h *ContestHandler) GetMyTeams(c *gin.Context) {
         userID := c.GetInt64("user_id")
         page, _ := strconv.Atoi(c.DefaultQuery("page", "1"))
@@ -204,13 +204,9 @@ func (h *FraudDetectionHandler) FraudDetectionMiddleware() gin.HandlerFunc {
 				"ip_address": ipAddress,
 			}
 
-			// Run fraud detection asynchronously to not block the request
-			go func() {
-				err := h.fraudDetectionService.CheckUserAction(userID, action, contextData, ipAddress, userAgent)
-				if err != nil {
-					// Log error but don't affect user experience
-				}
-			}()
+			// Queued for the fraud pipeline; a full queue drops the action
+			// rather than delaying the request
+			h.fraudDetectionService.CheckUserAction(userID, action, contextData, ipAddress, userAgent)
 		}
 
 		c.Next()
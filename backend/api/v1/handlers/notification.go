@@ -2,6 +2,7 @@ package handlers
 
 import (
 	"database/sql"
+	"errors"
 	"fmt"
 	"net/http"
 	"strconv"
@@ -116,13 +117,13 @@ func (h *NotificationHandler) SendNotification(c *gin.Context) {
 }
 
 // @Summary Send bulk notifications
-// @Description Send notifications to multiple recipients
+// @Description Start sending notifications to multiple recipients. Returns a job whose progress can be polled.
 // @Tags Notifications
 // @Accept json
 // @Produce json
 // @Security BearerAuth
 // @Param request body models.BulkNotificationRequest true "Bulk notification request"
-// @Success 200 {object} []models.NotificationResponse
+// @Success 202 {object} models.BulkNotificationJob
 // @Failure 400 {object} models.ErrorResponse
 // @Failure 500 {object} models.ErrorResponse
 // @Router /notify/bulk [post]
@@ -199,7 +200,7 @@ func (h *NotificationHandler) SendBulkNotification(c *gin.Context) {
 		return
 	}
 
-	responses, err := h.notificationService.SendBulkNotification(&request)
+	job, err := h.notificationService.SendBulkNotification(&request)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
 			Success: false,
@@ -209,22 +210,80 @@ func (h *NotificationHandler) SendBulkNotification(c *gin.Context) {
 		return
 	}
 
-	// Calculate summary
-	var successCount, failedCount int
-	for _, resp := range responses {
-		if resp.Success {
-			successCount++
-		} else {
-			failedCount++
-		}
+	c.JSON(http.StatusAccepted, gin.H{
+		"success": true,
+		"job_id":  job.JobID,
+		"job":     job,
+	})
+}
+
+// @Summary Get bulk notification job
+// @Description Get the progress of a bulk notification job
+// @Tags Notifications
+// @Produce json
+// @Security BearerAuth
+// @Param job_id path string true "Job ID"
+// @Success 200 {object} models.BulkNotificationJob
+// @Failure 404 {object} models.ErrorResponse
+// @Failure 500 {object} models.ErrorResponse
+// @Router /notify/bulk/{job_id} [get]
+func (h *NotificationHandler) GetBulkNotificationJob(c *gin.Context) {
+	job, err := h.notificationService.GetBulkNotificationJob(c.Param("job_id"))
+	if errors.Is(err, services.ErrBulkJobNotFound) {
+		c.JSON(http.StatusNotFound, models.ErrorResponse{
+			Success: false,
+			Error:   "Bulk notification job not found",
+			Code:    "JOB_NOT_FOUND",
+		})
+		return
+	}
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+			Success: false,
+			Error:   err.Error(),
+			Code:    "BULK_JOB_LOOKUP_FAILED",
+		})
+		return
 	}
 
 	c.JSON(http.StatusOK, gin.H{
-		"success":       true,
-		"total":         len(responses),
-		"success_count": successCount,
-		"failed_count":  failedCount,
-		"responses":     responses,
+		"success": true,
+		"job":     job,
+	})
+}
+
+// @Summary Resume bulk notification job
+// @Description Continue an interrupted bulk notification job from its last checkpoint
+// @Tags Notifications
+// @Produce json
+// @Security BearerAuth
+// @Param job_id path string true "Job ID"
+// @Success 202 {object} models.BulkNotificationJob
+// @Failure 404 {object} models.ErrorResponse
+// @Failure 409 {object} models.ErrorResponse
+// @Router /notify/bulk/{job_id}/resume [post]
+func (h *NotificationHandler) ResumeBulkNotification(c *gin.Context) {
+	job, err := h.notificationService.ResumeBulkNotification(c.Param("job_id"))
+	if err != nil {
+		status, code := http.StatusInternalServerError, "BULK_RESUME_FAILED"
+		switch {
+		case errors.Is(err, services.ErrBulkJobNotFound):
+			status, code = http.StatusNotFound, "JOB_NOT_FOUND"
+		case errors.Is(err, services.ErrBulkJobNotResumable):
+			status, code = http.StatusConflict, "JOB_NOT_RESUMABLE"
+		}
+		c.JSON(status, models.ErrorResponse{
+			Success: false,
+			Error:   err.Error(),
+			Code:    code,
+		})
+		return
+	}
+
+	c.JSON(http.StatusAccepted, gin.H{
+		"success": true,
+		"job_id":  job.JobID,
+		"job":     job,
 	})
 }
 
@@ -27,6 +27,8 @@ type RealTimeLeaderboardHandler struct {
 func NewRealTimeLeaderboardHandler(db *sql.DB, cfg *config.Config, leaderboardService *services.LeaderboardService) *RealTimeLeaderboardHandler {
 	connectionManager := websocket.NewConnectionManager()
 	connectionManager.Start()
+	services.SetLeaderboardBroadcaster(connectionManager)
+	services.SetMatchCompletionPublisher(connectionManager)
 
 	return &RealTimeLeaderboardHandler{
 		db:                db,
@@ -37,6 +39,8 @@ func NewRealTimeLeaderboardHandler(db *sql.DB, cfg *config.Config, leaderboardSe
 			CheckOrigin: func(r *http.Request) bool {
 				return true // Allow all origins for development
 			},
+			// Broadcast frames are compressed once per update and shared
+			EnableCompression: cfg.WebSocketCompression,
 		},
 	}
 }
@@ -132,11 +136,17 @@ func (h *RealTimeLeaderboardHandler) GetRealTimeLeaderboard(c *gin.Context) {
 // @Produce json
 // @Security BearerAuth
 // @Param contest_id path int true "Contest ID"
+// @Param protocol query int false "Leaderboard protocol: 1 = full updates, 2 = sequenced deltas" default(1)
 // @Router /leaderboards/ws/contest/{contest_id} [get]
 func (h *RealTimeLeaderboardHandler) HandleLeaderboardWebSocket(c *gin.Context) {
 	contestID, _ := strconv.ParseInt(c.Param("contest_id"), 10, 64)
 	userID := c.GetInt64("user_id")
 
+	protocolVersion := websocket.ProtocolFull
+	if c.Query("protocol") == strconv.Itoa(websocket.ProtocolDelta) {
+		protocolVersion = websocket.ProtocolDelta
+	}
+
 	if contestID == 0 {
 		c.JSON(http.StatusBadRequest, models.ErrorResponse{
 			Success: false,
@@ -165,15 +175,21 @@ func (h *RealTimeLeaderboardHandler) HandleLeaderboardWebSocket(c *gin.Context)
 		ContestID:    contestID,
 		ConnectionID: connectionID,
 		Conn:         conn,
-		Send:         make(chan models.RealTimeWebSocketMessage, 256),
+		Send:         make(chan websocket.Outbound, 256),
 		ConnectedAt:  time.Now(),
 		LastPing:     time.Now(),
 		IsActive:     true,
+		ProtocolVersion: protocolVersion,
 	}
 
 	// Register connection
 	h.connectionManager.RegisterConnection(leaderboardConn)
 
+	// Delta subscribers start from a snapshot and apply deltas after its sequence
+	if protocolVersion == websocket.ProtocolDelta {
+		h.sendLeaderboardSnapshot(leaderboardConn)
+	}
+
 	// Start goroutines for reading and writing
 	go h.handleWebSocketWrite(leaderboardConn)
 	go h.handleWebSocketRead(leaderboardConn)
@@ -196,7 +212,7 @@ func (h *RealTimeLeaderboardHandler) handleWebSocketWrite(conn *websocket.Leader
 				return
 			}
 
-			if err := conn.Conn.WriteJSON(message); err != nil {
+			if err := message.WriteTo(conn.Conn); err != nil {
 				logger.Error(fmt.Sprintf("WebSocket write error: %v", err))
 				return
 			}
@@ -250,21 +266,19 @@ func (h *RealTimeLeaderboardHandler) handleIncomingMessage(conn *websocket.Leade
 			Timestamp: time.Now(),
 			MessageID: uuid.New().String(),
 		}
-		select {
-		case conn.Send <- pongMsg:
-		default:
-		}
+		conn.TrySend(pongMsg)
 
 	case "subscribe":
 		// Send current leaderboard status
 		h.sendCurrentLeaderboardStatus(conn)
 
+	case "resync":
+		// Delta client detected a sequence gap
+		h.sendLeaderboardSnapshot(conn)
+
 	case "request_update":
-		// Force a leaderboard update
-		err := h.leaderboardService.TriggerRealTimeUpdate(conn.ContestID, "user_request", nil)
-		if err != nil {
-			logger.Error(fmt.Sprintf("Failed to trigger update: %v", err))
-		}
+		// Request a leaderboard update; concurrent requests are merged
+		h.leaderboardService.ScheduleRealTimeUpdate(conn.ContestID, "user_request", nil)
 
 	default:
 		// Unknown message type
@@ -275,10 +289,7 @@ func (h *RealTimeLeaderboardHandler) handleIncomingMessage(conn *websocket.Leade
 			Timestamp: time.Now(),
 			MessageID: uuid.New().String(),
 		}
-		select {
-		case conn.Send <- errorMsg:
-		default:
-		}
+		conn.TrySend(errorMsg)
 	}
 }
 
@@ -292,10 +303,7 @@ func (h *RealTimeLeaderboardHandler) sendCurrentLeaderboardStatus(conn *websocke
 			Timestamp: time.Now(),
 			MessageID: uuid.New().String(),
 		}
-		select {
-		case conn.Send <- errorMsg:
-		default:
-		}
+		conn.TrySend(errorMsg)
 		return
 	}
 
@@ -315,10 +323,33 @@ func (h *RealTimeLeaderboardHandler) sendCurrentLeaderboardStatus(conn *websocke
 		MessageID: uuid.New().String(),
 	}
 
-	select {
-	case conn.Send <- statusMsg:
-	default:
+	conn.TrySend(statusMsg)
+}
+
+// sendLeaderboardSnapshot sends the last published leaderboard window with its
+// sequence number, served from the ranking snapshot store
+func (h *RealTimeLeaderboardHandler) sendLeaderboardSnapshot(conn *websocket.LeaderboardConnection) {
+	snapshot, err := h.leaderboardService.GetLeaderboardSnapshot(conn.ContestID)
+	if err != nil {
+		errorMsg := models.RealTimeWebSocketMessage{
+			Type:      "error",
+			ContestID: conn.ContestID,
+			Data:      gin.H{"error": "Failed to get leaderboard snapshot", "details": err.Error()},
+			Timestamp: time.Now(),
+			MessageID: uuid.New().String(),
+		}
+		conn.TrySend(errorMsg)
+		return
 	}
+
+	snapshotMsg := models.RealTimeWebSocketMessage{
+		Type:      "leaderboard_snapshot",
+		ContestID: conn.ContestID,
+		Data:      snapshot,
+		Timestamp: time.Now(),
+		MessageID: uuid.New().String(),
+	}
+	conn.TrySend(snapshotMsg)
 }
 
 // @Summary Get active connections for contest
@@ -349,6 +380,9 @@ func (h *RealTimeLeaderboardHandler) GetActiveConnections(c *gin.Context) {
 		"contest_id":         contestID,
 		"active_connections": connectionCount,
 		"real_time_enabled":  true,
+		"hub":                h.connectionManager.Stats(),
+		"update_scheduler":   services.GetRealTimeSchedulerStats(),
+		"cache":              services.GetLeaderboardCacheStats(),
 		"timestamp":          time.Now(),
 	})
 }
@@ -374,15 +408,9 @@ func (h *RealTimeLeaderboardHandler) TriggerManualUpdate(c *gin.Context) {
 		return
 	}
 
-	err := h.leaderboardService.TriggerRealTimeUpdate(contestID, "manual_trigger", nil)
-	if err != nil {
-		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-			Success: false,
-			Error:   "Failed to trigger update: " + err.Error(),
-			Code:    "UPDATE_TRIGGER_ERROR",
-		})
-		return
-	}
+	// Goes through the scheduler like every other trigger, so it is merged
+	// with updates already pending for the contest
+	h.leaderboardService.ScheduleRealTimeUpdate(contestID, "manual_trigger", nil)
 
 	connectionCount := h.connectionManager.GetContestConnectionCount(contestID)
 
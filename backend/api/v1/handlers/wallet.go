@@ -5,6 +5,7 @@ import (
 	"net/http"
 	"strconv"
 	"fantasy-esports-backend/config"
+	"fantasy-esports-backend/db"
 	"fantasy-esports-backend/models"
 	"fantasy-esports-backend/services"
 	"github.com/gin-gonic/gin"
@@ -37,9 +38,7 @@ func (h *WalletHandler) GetBalance(c *gin.Context) {
 	userID := c.GetInt64("user_id")
 
 	var wallet models.UserWallet
-	err := h.db.QueryRow(`
-		SELECT user_id, bonus_balance, deposit_balance, winning_balance, total_balance, updated_at
-		FROM user_wallets WHERE user_id = $1`, userID).Scan(
+	err := db.QueryRow(h.db, db.StmtWalletBalance, userID).Scan(
 		&wallet.UserID, &wallet.BonusBalance, &wallet.DepositBalance,
 		&wallet.WinningBalance, &wallet.TotalBalance, &wallet.UpdatedAt,
 	)
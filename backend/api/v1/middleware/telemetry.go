@@ -0,0 +1,30 @@
+package middleware
+
+import (
+	"time"
+
+	"fantasy-esports-backend/pkg/telemetry"
+
+	"github.com/gin-gonic/gin"
+)
+
+// Telemetry records the latency and status of every request under its route
+// template, so /contests/1 and /contests/2 share one series. WebSocket
+// connections are skipped since their latency is the session length.
+func Telemetry() gin.HandlerFunc {
+	return func(c *gin.Context) {
+		if c.IsWebsocket() {
+			c.Next()
+			return
+		}
+
+		started := time.Now()
+		c.Next()
+
+		route := c.FullPath()
+		if route == "" {
+			route = "unmatched"
+		}
+		telemetry.ObserveRequest(c.Request.Method, route, c.Writer.Status(), time.Since(started))
+	}
+}
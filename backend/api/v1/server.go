@@ -8,6 +8,7 @@ import (
 	internal_handlers "fantasy-esports-backend/internal/handlers"
 	internal_services "fantasy-esports-backend/internal/services"
 	"fantasy-esports-backend/pkg/cdn"
+	"fantasy-esports-backend/pkg/telemetry"
 	"fantasy-esports-backend/services"
 	"log"
 
@@ -26,6 +27,7 @@ func NewServer(db *sql.DB, cfg *config.Config) *Server {
 	router := gin.New()
 	router.Use(gin.Logger())
 	router.Use(gin.Recovery())
+	router.Use(middleware.Telemetry())
 
 	// CORS middleware
 	router.Use(func(c *gin.Context) {
@@ -57,7 +59,9 @@ func (s *Server) setupRoutes() {
 
 	// Initialize services
 	leaderboardService := services.NewLeaderboardService(s.db)
+	services.SetRealTimeUpdateWindow(s.config.LeaderboardUpdateWindow)
 	analyticsService := services.NewAnalyticsService(s.db)
+	analyticsService.StartRollups(s.config.AnalyticsRollupInterval, s.config.AnalyticsSnapshotInterval)
 	biService := services.NewBusinessIntelligenceService(s.db)
 	reportingService := services.NewReportingService(s.db)
 	
@@ -306,6 +310,7 @@ func (s *Server) setupRoutes() {
 		adminRoutes.POST("/matches/:id/recalculate-points", adminHandler.RecalculatePoints)
 		adminRoutes.GET("/matches/:id/dashboard", adminHandler.GetLiveDashboard)
 		adminRoutes.POST("/matches/:id/complete", adminHandler.CompleteMatch)
+		adminRoutes.GET("/matches/:id/completion", adminHandler.GetMatchCompletion)
 		adminRoutes.GET("/matches/:id/events", adminHandler.GetMatchEvents)
 		adminRoutes.PUT("/matches/:id/events/:event_id", adminHandler.EditMatchEvent)
 		adminRoutes.DELETE("/matches/:id/events/:event_id", adminHandler.DeleteMatchEvent)
@@ -331,6 +336,10 @@ func (s *Server) setupRoutes() {
 		// System configuration
 		adminRoutes.GET("/config", adminHandler.GetSystemConfig)
 		adminRoutes.PUT("/config", adminHandler.UpdateSystemConfig)
+		adminRoutes.GET("/system/db-stats", adminHandler.GetDatabaseStats)
+		adminRoutes.GET("/system/http-stats", adminHandler.GetOutboundHTTPStats)
+		// Prometheus metrics; scrape with an admin bearer token
+		adminRoutes.GET("/system/metrics", gin.WrapH(telemetry.Handler()))
 
 		// Analytics Dashboard
 		adminRoutes.GET("/analytics/dashboard", analyticsHandler.GetAnalyticsDashboard)
@@ -409,6 +418,8 @@ func (s *Server) setupRoutes() {
 		// Notification Management
 		adminRoutes.POST("/notify/send", notificationHandler.SendNotification)
 		adminRoutes.POST("/notify/bulk", notificationHandler.SendBulkNotification)
+		adminRoutes.GET("/notify/bulk/:job_id", notificationHandler.GetBulkNotificationJob)
+		adminRoutes.POST("/notify/bulk/:job_id/resume", notificationHandler.ResumeBulkNotification)
 		adminRoutes.POST("/notify/sms", notificationHandler.SendSMS)
 		adminRoutes.POST("/notify/email", notificationHandler.SendEmail)
 		adminRoutes.POST("/notify/push", notificationHandler.SendPush)
@@ -18,17 +18,42 @@ package main
 import (
 	"fantasy-esports-backend/config"
 	"fantasy-esports-backend/db"
+	"fantasy-esports-backend/pkg/httpclient"
+	"fantasy-esports-backend/pkg/telemetry"
+	"fantasy-esports-backend/pkg/writebehind"
+	"fantasy-esports-backend/services"
 	"fantasy-esports-backend/api/v1"
 	_ "fantasy-esports-backend/docs"
 	"log"
+	"os"
+	"os/signal"
+	"syscall"
 )
 
 func main() {
 	// Load configuration
 	cfg := config.Load()
+
+	// Tune the outbound clients before any integration creates one
+	httpclient.Configure(httpclient.Config{
+		Timeout:             cfg.HTTPClientTimeout,
+		MaxIdleConns:        httpclient.DefaultConfig.MaxIdleConns,
+		MaxIdleConnsPerHost: cfg.HTTPMaxIdleConnsPerHost,
+		IdleConnTimeout:     cfg.HTTPIdleConnTimeout,
+		ForceHTTP2:          cfg.HTTPForceHTTP2,
+		BreakerFailures:     cfg.HTTPBreakerFailures,
+		BreakerCooldown:     cfg.HTTPBreakerCooldown,
+	})
 	
+	telemetry.SetSlowQueryThreshold(cfg.DBSlowQueryThreshold)
+
 	// Initialize database
-	database, err := db.Initialize(cfg.DatabaseURL)
+	database, err := db.Initialize(cfg.DatabaseURL, db.PoolConfig{
+		MaxOpenConns:    cfg.DBMaxOpenConns,
+		MaxIdleConns:    cfg.DBMaxIdleConns,
+		ConnMaxLifetime: cfg.DBConnMaxLifetime,
+		ConnMaxIdleTime: cfg.DBConnMaxIdleTime,
+	})
 	if err != nil {
 		log.Fatal("Failed to initialize database:", err)
 	}
@@ -38,7 +63,24 @@ func main() {
 	if err := db.RunMigrations(database); err != nil {
 		log.Fatal("Failed to run migrations:", err)
 	}
+
+	// Prepare the hot-path queries now that the schema exists
+	if err := db.PrepareStatements(database); err != nil {
+		log.Fatal("Failed to prepare statements:", err)
+	}
 	
+	// Write out buffered counters and logs before exiting on SIGINT/SIGTERM
+	go func() {
+		signals := make(chan os.Signal, 1)
+		signal.Notify(signals, os.Interrupt, syscall.SIGTERM)
+		<-signals
+		log.Println("Shutting down, flushing write-behind buffers")
+		services.DrainFraudPipeline()
+		writebehind.CloseAll()
+		database.Close()
+		os.Exit(0)
+	}()
+
 	// Initialize and start server
 	server := v1.NewServer(database, cfg)
 	log.Printf("🚀 Fantasy Esports Backend Server starting on port %s", cfg.Port)
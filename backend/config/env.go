@@ -3,9 +3,17 @@ package config
 import (
 	"log"
 	"os"
+	"strconv"
+	"time"
 	"github.com/joho/godotenv"
 )
 
+// Scoring modes for live match events
+const (
+	ScoringModeIncremental = "incremental" // apply each event as a points delta to affected teams
+	ScoringModeFull        = "full"        // recompute affected teams from all match events
+)
+
 type Config struct {
 	DatabaseURL     string
 	CloudinaryURL   string
@@ -13,6 +21,40 @@ type Config struct {
 	Port           string
 	GinMode        string
 	BaseURL        string
+	ScoringMode    string
+
+	// WebSocketCompression negotiates permessage-deflate for leaderboard sockets
+	WebSocketCompression bool
+	// LeaderboardUpdateWindow is how long triggers for one contest are merged
+	// into a single real-time leaderboard update
+	LeaderboardUpdateWindow time.Duration
+
+	// Database connection pool sizing
+	DBMaxOpenConns    int
+	DBMaxIdleConns    int
+	DBConnMaxLifetime time.Duration
+	DBConnMaxIdleTime time.Duration
+	// DBSlowQueryThreshold is the execution time above which a query is
+	// counted as slow in the performance metrics
+	DBSlowQueryThreshold time.Duration
+
+	// Outbound HTTP clients used by notification and payment integrations
+	HTTPClientTimeout       time.Duration
+	HTTPMaxIdleConnsPerHost int
+	HTTPIdleConnTimeout     time.Duration
+	HTTPForceHTTP2          bool
+	HTTPBreakerFailures     int
+	HTTPBreakerCooldown     time.Duration
+
+	// AnalyticsRollupInterval is how often the analytics summary tables are
+	// brought up to date; the state snapshots are recomputed every
+	// AnalyticsSnapshotInterval
+	AnalyticsRollupInterval   time.Duration
+	AnalyticsSnapshotInterval time.Duration
+
+	// MatchCompletionWorkers is how many contests of a completed match are
+	// finalized at once
+	MatchCompletionWorkers int
 }
 
 func Load() *Config {
@@ -28,6 +70,28 @@ func Load() *Config {
 		Port:         getEnv("PORT", "8080"),
 		GinMode:      getEnv("GIN_MODE", "debug"),
 		BaseURL:      getEnv("BASE_URL", "http://localhost:8080"),
+		ScoringMode:  getEnv("SCORING_MODE", ScoringModeIncremental),
+
+		WebSocketCompression: getEnv("WS_COMPRESSION", "false") == "true",
+		LeaderboardUpdateWindow: time.Duration(getEnvInt("LEADERBOARD_UPDATE_WINDOW_MS", 250)) * time.Millisecond,
+
+		DBMaxOpenConns:    getEnvInt("DB_MAX_OPEN_CONNS", 25),
+		DBMaxIdleConns:    getEnvInt("DB_MAX_IDLE_CONNS", 5),
+		DBConnMaxLifetime: time.Duration(getEnvInt("DB_CONN_MAX_LIFETIME_SECONDS", 3600)) * time.Second,
+		DBConnMaxIdleTime: time.Duration(getEnvInt("DB_CONN_MAX_IDLE_TIME_SECONDS", 0)) * time.Second,
+		DBSlowQueryThreshold: time.Duration(getEnvInt("DB_SLOW_QUERY_MS", 200)) * time.Millisecond,
+
+		HTTPClientTimeout:       time.Duration(getEnvInt("HTTP_CLIENT_TIMEOUT_SECONDS", 30)) * time.Second,
+		HTTPMaxIdleConnsPerHost: getEnvInt("HTTP_MAX_IDLE_CONNS_PER_HOST", 100),
+		HTTPIdleConnTimeout:     time.Duration(getEnvInt("HTTP_IDLE_CONN_TIMEOUT_SECONDS", 90)) * time.Second,
+		HTTPForceHTTP2:          getEnv("HTTP_FORCE_HTTP2", "true") == "true",
+		HTTPBreakerFailures:     getEnvInt("HTTP_BREAKER_FAILURES", 5),
+		HTTPBreakerCooldown:     time.Duration(getEnvInt("HTTP_BREAKER_COOLDOWN_SECONDS", 30)) * time.Second,
+
+		AnalyticsRollupInterval:   time.Duration(getEnvPositiveInt("ANALYTICS_ROLLUP_INTERVAL_SECONDS", 60)) * time.Second,
+		AnalyticsSnapshotInterval: time.Duration(getEnvPositiveInt("ANALYTICS_SNAPSHOT_INTERVAL_SECONDS", 300)) * time.Second,
+
+		MatchCompletionWorkers: getEnvInt("MATCH_COMPLETION_WORKERS", 8),
 	}
 
 	if config.DatabaseURL == "" {
@@ -42,4 +106,25 @@ func getEnv(key, defaultValue string) string {
 		return value
 	}
 	return defaultValue
-}
\ No newline at end of file
+}
+
+func getEnvInt(key string, defaultValue int) int {
+	if value := os.Getenv(key); value != "" {
+		if parsed, err := strconv.Atoi(value); err == nil {
+			return parsed
+		}
+		log.Printf("Invalid integer for %s: %q, using %d", key, value, defaultValue)
+	}
+	return defaultValue
+}
+
+// getEnvPositiveInt is getEnvInt for settings such as ticker intervals that
+// must be greater than zero
+func getEnvPositiveInt(key string, defaultValue int) int {
+	value := getEnvInt(key, defaultValue)
+	if value <= 0 {
+		log.Printf("%s must be positive, got %d, using %d", key, value, defaultValue)
+		return defaultValue
+	}
+	return value
+}
@@ -0,0 +1,38 @@
+package db
+
+const createAnalyticsRollupTables = `
+-- Per-hour totals of the append-mostly tables. The rollup job re-aggregates
+-- only the most recent hours, so rows are kept for a week.
+CREATE TABLE IF NOT EXISTS analytics_hourly_rollups (
+    bucket_start TIMESTAMP PRIMARY KEY,
+    new_users BIGINT NOT NULL DEFAULT 0,
+    deposits DECIMAL(14,2) NOT NULL DEFAULT 0,
+    withdrawals DECIMAL(14,2) NOT NULL DEFAULT 0,
+    contest_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    completed_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-day totals, summed from the hourly rows and reconciled daily against
+-- the source tables
+CREATE TABLE IF NOT EXISTS analytics_daily_rollups (
+    bucket_date DATE PRIMARY KEY,
+    new_users BIGINT NOT NULL DEFAULT 0,
+    deposits DECIMAL(14,2) NOT NULL DEFAULT 0,
+    withdrawals DECIMAL(14,2) NOT NULL DEFAULT 0,
+    contest_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    completed_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Counts of current state (verification, activity, contest status) that
+-- cannot be summed from buckets, refreshed periodically by the rollup job
+CREATE TABLE IF NOT EXISTS analytics_snapshots (
+    name VARCHAR(50) PRIMARY KEY,
+    data JSONB NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+CREATE INDEX IF NOT EXISTS idx_users_last_login_at ON users(last_login_at);
+`
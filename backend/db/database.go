@@ -4,23 +4,46 @@ import (
 	"database/sql"
 	"fmt"
 	"time"
-	_ "github.com/lib/pq"
+
+	"fantasy-esports-backend/pkg/telemetry"
+
+	"github.com/lib/pq"
 )
 
-func Initialize(databaseURL string) (*sql.DB, error) {
-	db, err := sql.Open("postgres", databaseURL)
+// PoolConfig sizes the connection pool. Zero leaves a setting at its
+// database/sql default.
+type PoolConfig struct {
+	MaxOpenConns    int
+	MaxIdleConns    int
+	ConnMaxLifetime time.Duration
+	ConnMaxIdleTime time.Duration
+}
+
+func Initialize(databaseURL string, pool PoolConfig) (*sql.DB, error) {
+	connector, err := pq.NewConnector(databaseURL)
 	if err != nil {
 		return nil, fmt.Errorf("failed to open database: %w", err)
 	}
+	// Every query is timed by label for the performance metrics
+	db := sql.OpenDB(telemetry.InstrumentConnector(connector))
 
 	if err := db.Ping(); err != nil {
 		return nil, fmt.Errorf("failed to ping database: %w", err)
 	}
 
 	// Set connection pool settings with proper timeouts
-	db.SetMaxOpenConns(25)
-	db.SetMaxIdleConns(5)
-	db.SetConnMaxLifetime(time.Hour) // Prevent connection timeouts
+	if pool.MaxOpenConns > 0 {
+		db.SetMaxOpenConns(pool.MaxOpenConns)
+	}
+	if pool.MaxIdleConns > 0 {
+		db.SetMaxIdleConns(pool.MaxIdleConns)
+	}
+	if pool.ConnMaxLifetime > 0 {
+		db.SetConnMaxLifetime(pool.ConnMaxLifetime) // Prevent connection timeouts
+	}
+	if pool.ConnMaxIdleTime > 0 {
+		db.SetConnMaxIdleTime(pool.ConnMaxIdleTime)
+	}
 
 	return db, nil
 }
@@ -56,6 +79,9 @@ func RunMigrations(db *sql.DB) error {
 		createNotificationTablesSQL, // Add notification migrations
 		createContentManagementTables, // Add content management migrations
 		createAdvancedFeaturesTables, // Add advanced features migrations
+		createAnalyticsRollupTables,
+		createMatchCompletionTables,
+		createPlayerFeatureTables,
 		insertDefaultConfigs,
 		insertSampleData,
 	}
@@ -0,0 +1,46 @@
+package db
+
+const createMatchCompletionTables = `
+-- One row per match completion run. While status is 'running' a repeated
+-- completion request resumes the run with the options it was started with.
+CREATE TABLE IF NOT EXISTS match_completions (
+    match_id BIGINT PRIMARY KEY,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    winner_team_id BIGINT,
+    mvp_player_id BIGINT,
+    distribute_prizes BOOLEAN NOT NULL DEFAULT FALSE,
+    send_notifications BOOLEAN NOT NULL DEFAULT FALSE,
+    teams_locked INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    notified_at TIMESTAMP,
+    FOREIGN KEY (match_id) REFERENCES matches(id)
+);
+
+-- Set in the same transaction that ranks a contest and pays its prizes, so
+-- a resumed completion skips contests that are already done
+ALTER TABLE contests ADD COLUMN IF NOT EXISTS finalized_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_contests_match_unfinalized ON contests(match_id) WHERE finalized_at IS NULL;
+
+-- Career statistics updated once per completed match
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS matches_played INTEGER DEFAULT 0;
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS matches_won INTEGER DEFAULT 0;
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE players ADD COLUMN IF NOT EXISTS matches_played INTEGER DEFAULT 0;
+ALTER TABLE players ADD COLUMN IF NOT EXISTS mvp_awards INTEGER DEFAULT 0;
+
+-- In-app notifications, e.g. the results of a completed match
+CREATE TABLE IF NOT EXISTS notifications (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    message TEXT NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    is_read BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, created_at DESC);
+`
@@ -293,6 +293,7 @@ CREATE TABLE IF NOT EXISTS team_players (
 );
 
 CREATE INDEX IF NOT EXISTS idx_team_players_real_team ON team_players(real_team_id);
+CREATE INDEX IF NOT EXISTS idx_team_players_player ON team_players(player_id);
 `
 
 const createContestParticipantsTable = `
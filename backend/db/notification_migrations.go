@@ -72,6 +72,24 @@ CREATE INDEX IF NOT EXISTS idx_notification_config_provider ON notification_conf
 CREATE INDEX IF NOT EXISTS idx_notification_config_channel ON notification_config(channel);
 CREATE INDEX IF NOT EXISTS idx_notification_config_active ON notification_config(is_active);
 
+-- Bulk Notification Jobs Table (checkpoints for resuming interrupted sends)
+CREATE TABLE IF NOT EXISTS notification_bulk_jobs (
+    job_id VARCHAR(64) PRIMARY KEY,
+    request JSONB NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    checkpoint_user_id BIGINT NOT NULL DEFAULT -1,
+    sent_count BIGINT DEFAULT 0,
+    failed_count BIGINT DEFAULT 0,
+    error_msg TEXT,
+    lease_until TIMESTAMP, -- a queued or running job is owned by its server until then
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE notification_bulk_jobs ADD COLUMN IF NOT EXISTS lease_until TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_notification_bulk_jobs_status ON notification_bulk_jobs(status);
+
 -- Insert default notification configurations (empty keys for security)
 INSERT INTO notification_config (provider, channel, config_key, config_value, is_active, updated_by) VALUES
 -- Fast2SMS Configuration
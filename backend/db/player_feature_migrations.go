@@ -0,0 +1,89 @@
+package db
+
+const createPlayerFeatureTables = `
+-- Rolling prediction statistics per player, updated as each match completes.
+-- map_points and opponent_points hold {"sum": ..., "count": ...} of a
+-- player's per-match points by map name and by opposing team ID.
+CREATE TABLE IF NOT EXISTS player_features (
+    player_id BIGINT PRIMARY KEY,
+    recent_points NUMERIC[] NOT NULL DEFAULT '{}', -- newest first, last 5 matches
+    map_points JSONB NOT NULL DEFAULT '{}',
+    opponent_points JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE
+);
+
+-- Whether each of a team's last 10 completed matches was a win, newest first
+CREATE TABLE IF NOT EXISTS team_features (
+    team_id BIGINT PRIMARY KEY,
+    recent_results BOOLEAN[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE CASCADE
+);
+
+-- Seed the stores from past results the first time they are created
+WITH results AS (
+    SELECT tp.player_id, p.team_id, m.id AS match_id, m.map, m.scheduled_at, AVG(tp.points_earned) AS points
+    FROM team_players tp
+    JOIN user_teams ut ON ut.id = tp.team_id
+    JOIN matches m ON m.id = ut.match_id
+    JOIN players p ON p.id = tp.player_id
+    WHERE m.status = 'completed'
+    GROUP BY tp.player_id, p.team_id, m.id
+),
+recent AS (
+    SELECT player_id, (array_agg(points ORDER BY scheduled_at DESC))[1:5] AS recent_points
+    FROM results
+    GROUP BY player_id
+),
+maps AS (
+    SELECT player_id, jsonb_object_agg(map, jsonb_build_object('sum', total, 'count', played)) AS map_points
+    FROM (
+        SELECT player_id, map, SUM(points) AS total, COUNT(*) AS played
+        FROM results
+        WHERE map IS NOT NULL
+        GROUP BY player_id, map
+    ) by_map
+    GROUP BY player_id
+),
+opponents AS (
+    SELECT player_id, jsonb_object_agg(team_id::text, jsonb_build_object('sum', total, 'count', played)) AS opponent_points
+    FROM (
+        SELECT r.player_id, mp.team_id, SUM(r.points) AS total, COUNT(*) AS played
+        FROM results r
+        JOIN match_participants mp ON mp.match_id = r.match_id AND mp.team_id <> r.team_id
+        GROUP BY r.player_id, mp.team_id
+    ) by_opponent
+    GROUP BY player_id
+)
+INSERT INTO player_features (player_id, recent_points, map_points, opponent_points)
+SELECT recent.player_id, recent.recent_points, COALESCE(maps.map_points, '{}'), COALESCE(opponents.opponent_points, '{}')
+FROM recent
+LEFT JOIN maps ON maps.player_id = recent.player_id
+LEFT JOIN opponents ON opponents.player_id = recent.player_id
+WHERE NOT EXISTS (SELECT 1 FROM player_features)
+ON CONFLICT (player_id) DO NOTHING;
+
+INSERT INTO team_features (team_id, recent_results)
+SELECT mp.team_id, (array_agg(COALESCE(m.winner_team_id = mp.team_id, false) ORDER BY m.scheduled_at DESC))[1:10]
+FROM match_participants mp
+JOIN matches m ON m.id = mp.match_id
+WHERE m.status = 'completed' AND NOT EXISTS (SELECT 1 FROM team_features)
+GROUP BY mp.team_id
+ON CONFLICT (team_id) DO NOTHING;
+
+-- Predictions carry the names they are listed with, so listing a match's
+-- predictions reads one index range in display order
+ALTER TABLE player_predictions ADD COLUMN IF NOT EXISTS player_name VARCHAR(100);
+ALTER TABLE player_predictions ADD COLUMN IF NOT EXISTS team_name VARCHAR(100);
+ALTER TABLE player_predictions ADD COLUMN IF NOT EXISTS match_name VARCHAR(200);
+
+UPDATE player_predictions pp
+SET player_name = p.name, team_name = t.name, match_name = m.name
+FROM players p
+JOIN teams t ON t.id = p.team_id, matches m
+WHERE pp.player_name IS NULL AND p.id = pp.player_id AND m.id = pp.match_id;
+
+CREATE INDEX IF NOT EXISTS idx_player_predictions_match_ranked
+    ON player_predictions(match_id, confidence_score DESC, predicted_points DESC);
+`
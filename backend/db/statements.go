@@ -0,0 +1,269 @@
+package db
+
+import (
+	"database/sql"
+	"fmt"
+	"sync"
+	"time"
+
+	"fantasy-esports-backend/pkg/telemetry"
+)
+
+// Names of the hot-path queries kept as prepared statements
+const (
+	StmtContestHeader    = "contest_header"
+	StmtContestRankings  = "contest_rankings"
+	StmtContestEntry     = "contest_entry"
+	StmtUpcomingContests = "upcoming_contests"
+	StmtWalletBalance    = "wallet_balance"
+	StmtJoinContest      = "join_contest"
+)
+
+// hotQueries are parsed and planned once per connection instead of on every
+// call. Add a query here only if it runs on a request or live-scoring path.
+var hotQueries = map[string]string{
+	StmtContestHeader: `
+		SELECT match_id, current_participants FROM contests WHERE id = $1`,
+
+	StmtContestRankings: `
+		SELECT
+			cp.team_id,
+			cp.user_id,
+			COALESCE(u.first_name, '') || ' ' || COALESCE(u.last_name, '') as username,
+			ut.team_name,
+			ut.total_points,
+			ut.created_at,
+			u.avatar_url,
+			cp.prize_won
+		FROM contest_participants cp
+		JOIN user_teams ut ON cp.team_id = ut.id
+		JOIN users u ON cp.user_id = u.id
+		WHERE cp.contest_id = $1`,
+
+	// StmtContestEntry reads one team's row of StmtContestRankings
+	StmtContestEntry: `
+		SELECT
+			cp.team_id,
+			cp.user_id,
+			COALESCE(u.first_name, '') || ' ' || COALESCE(u.last_name, '') as username,
+			ut.team_name,
+			ut.total_points,
+			ut.created_at,
+			u.avatar_url,
+			cp.prize_won
+		FROM contest_participants cp
+		JOIN user_teams ut ON cp.team_id = ut.id
+		JOIN users u ON cp.user_id = u.id
+		WHERE cp.contest_id = $1 AND cp.team_id = $2`,
+
+	StmtUpcomingContests: `
+		SELECT c.id, c.match_id, c.name, c.contest_type, c.entry_fee,
+			c.max_participants, c.current_participants, c.total_prize_pool,
+			c.is_guaranteed, c.prize_distribution, c.contest_rules, c.status,
+			c.invite_code, c.is_multi_entry, c.max_entries_per_user, c.created_at,
+			m.name as match_name, t.name as tournament_name, m.scheduled_at, m.lock_time
+		FROM contests c
+		LEFT JOIN matches m ON c.match_id = m.id
+		LEFT JOIN tournaments t ON m.tournament_id = t.id
+		WHERE c.status = 'upcoming'
+		ORDER BY m.scheduled_at
+		LIMIT $1 OFFSET $2`,
+
+	StmtWalletBalance: `
+		SELECT user_id, bonus_balance, deposit_balance, winning_balance, total_balance, updated_at
+		FROM user_wallets WHERE user_id = $1`,
+
+	// StmtJoinContest takes the contest ID, user ID and team ID. The contest
+	// row is locked only while this one statement runs: the capacity check and
+	// counter increment are one UPDATE, the entry is inserted and the fee
+	// debited only if it took a place, and the last columns read the rows as
+	// they were before, to tell why a join did not happen. The fee is taken
+	// from the deposit balance first and then the winnings, and is recorded
+	// as one ledger row per balance it came from. A wallet debit that loses a
+	// race with another spend leaves entry_fee_paid NULL, and the NOT NULL
+	// constraint then fails the whole statement, increment included.
+	StmtJoinContest: `
+		WITH joined AS (
+			UPDATE contests
+			SET current_participants = current_participants + 1
+			WHERE id = $1 AND status = 'upcoming' AND current_participants < max_participants
+				AND EXISTS (SELECT 1 FROM user_teams WHERE id = $3 AND user_id = $2)
+				AND NOT EXISTS (SELECT 1 FROM contest_participants WHERE contest_id = $1 AND team_id = $3)
+				AND (entry_fee = 0 OR EXISTS (
+					SELECT 1 FROM user_wallets
+					WHERE user_id = $2 AND deposit_balance + winning_balance >= contests.entry_fee))
+			RETURNING id, entry_fee, current_participants
+		),
+		split AS (
+			SELECT w.user_id, j.entry_fee,
+				LEAST(w.deposit_balance, j.entry_fee) AS from_deposit,
+				j.entry_fee - LEAST(w.deposit_balance, j.entry_fee) AS from_winning
+			FROM user_wallets w, joined j
+			WHERE w.user_id = $2 AND j.entry_fee > 0 AND w.deposit_balance + w.winning_balance >= j.entry_fee
+			FOR UPDATE OF w
+		),
+		debit AS (
+			UPDATE user_wallets w
+			SET deposit_balance = w.deposit_balance - s.from_deposit,
+				winning_balance = w.winning_balance - s.from_winning,
+				updated_at = CURRENT_TIMESTAMP
+			FROM split s
+			WHERE w.user_id = s.user_id
+			RETURNING s.entry_fee, s.from_deposit, s.from_winning
+		),
+		entry AS (
+			INSERT INTO contest_participants (contest_id, user_id, team_id, entry_fee_paid, joined_at)
+			SELECT j.id, $2, $3, CASE WHEN j.entry_fee = 0 THEN 0 ELSE (SELECT entry_fee FROM debit) END, NOW()
+			FROM joined j
+			RETURNING id, contest_id, entry_fee_paid
+		),
+		fee AS (
+			INSERT INTO wallet_transactions (user_id, transaction_type, amount, balance_type,
+				description, reference_id, status, completed_at)
+			SELECT $2, 'contest_fee', part.amount, part.balance_type, 'Contest entry fee',
+				e.contest_id::text, 'completed', CURRENT_TIMESTAMP
+			FROM entry e, debit d,
+				LATERAL (VALUES (d.from_deposit, 'deposit'), (d.from_winning, 'winning')) AS part(amount, balance_type)
+			WHERE part.amount > 0
+		)
+		SELECT
+			(SELECT id FROM entry),
+			(SELECT current_participants FROM joined),
+			c.id IS NOT NULL,
+			COALESCE(c.status, ''),
+			COALESCE(c.entry_fee, 0),
+			COALESCE(c.current_participants, 0),
+			COALESCE(c.max_participants, 0),
+			(SELECT user_id FROM user_teams WHERE id = $3),
+			EXISTS (SELECT 1 FROM contest_participants WHERE contest_id = $1 AND team_id = $3),
+			COALESCE((SELECT deposit_balance + winning_balance FROM user_wallets WHERE user_id = $2), 0)
+		FROM (SELECT 1) AS one
+		LEFT JOIN contests c ON c.id = $1`,
+}
+
+func init() {
+	// Report hot queries under their names rather than their first table
+	for name, query := range hotQueries {
+		telemetry.NameQuery(query, name)
+	}
+}
+
+// statementRegistry holds the prepared hot queries of one pool
+type statementRegistry struct {
+	db         *sql.DB
+	statements map[string]*sql.Stmt
+}
+
+var (
+	registryMutex sync.RWMutex
+	registry      *statementRegistry
+)
+
+// PrepareStatements prepares every hot query on the pool. Call it after
+// migrations so the tables exist; until then queries run unprepared.
+func PrepareStatements(db *sql.DB) error {
+	prepared := &statementRegistry{db: db, statements: make(map[string]*sql.Stmt, len(hotQueries))}
+	for name, query := range hotQueries {
+		stmt, err := db.Prepare(query)
+		if err != nil {
+			for _, s := range prepared.statements {
+				s.Close()
+			}
+			return fmt.Errorf("failed to prepare %s: %w", name, err)
+		}
+		prepared.statements[name] = stmt
+	}
+
+	registryMutex.Lock()
+	previous := registry
+	registry = prepared
+	registryMutex.Unlock()
+
+	if previous != nil {
+		for _, s := range previous.statements {
+			s.Close()
+		}
+	}
+	return nil
+}
+
+// statement returns the prepared statement for name if one was prepared on db
+func statement(db *sql.DB, name string) *sql.Stmt {
+	registryMutex.RLock()
+	defer registryMutex.RUnlock()
+	if registry == nil || registry.db != db {
+		return nil
+	}
+	return registry.statements[name]
+}
+
+func hotQuery(name string) string {
+	query, ok := hotQueries[name]
+	if !ok {
+		panic("db: unknown statement " + name)
+	}
+	return query
+}
+
+// QueryRow runs a named hot query, prepared when available
+func QueryRow(db *sql.DB, name string, args ...interface{}) *sql.Row {
+	if stmt := statement(db, name); stmt != nil {
+		return stmt.QueryRow(args...)
+	}
+	return db.QueryRow(hotQuery(name), args...)
+}
+
+// Query runs a named hot query, prepared when available
+func Query(db *sql.DB, name string, args ...interface{}) (*sql.Rows, error) {
+	if stmt := statement(db, name); stmt != nil {
+		return stmt.Query(args...)
+	}
+	return db.Query(hotQuery(name), args...)
+}
+
+// PoolStats is database/sql's pool counters in a JSON-friendly form
+type PoolStats struct {
+	MaxOpenConnections int     `json:"max_open_connections"`
+	OpenConnections    int     `json:"open_connections"`
+	InUse              int     `json:"in_use"`
+	Idle               int     `json:"idle"`
+	WaitCount          int64   `json:"wait_count"`
+	WaitDurationMs     float64 `json:"wait_duration_ms"`
+	AvgWaitMs          float64 `json:"avg_wait_ms"`
+	MaxIdleClosed      int64   `json:"max_idle_closed"`
+	MaxIdleTimeClosed  int64   `json:"max_idle_time_closed"`
+	MaxLifetimeClosed  int64   `json:"max_lifetime_closed"`
+	PreparedStatements int     `json:"prepared_statements"`
+}
+
+// Stats reports the pool's connection and wait counters. A growing
+// WaitCount means requests queued for a connection.
+func Stats(db *sql.DB) PoolStats {
+	stats := db.Stats()
+	poolStats := PoolStats{
+		MaxOpenConnections: stats.MaxOpenConnections,
+		OpenConnections:    stats.OpenConnections,
+		InUse:              stats.InUse,
+		Idle:               stats.Idle,
+		WaitCount:          stats.WaitCount,
+		WaitDurationMs:     durationMs(stats.WaitDuration),
+		MaxIdleClosed:      stats.MaxIdleClosed,
+		MaxIdleTimeClosed:  stats.MaxIdleTimeClosed,
+		MaxLifetimeClosed:  stats.MaxLifetimeClosed,
+	}
+	if stats.WaitCount > 0 {
+		poolStats.AvgWaitMs = poolStats.WaitDurationMs / float64(stats.WaitCount)
+	}
+
+	registryMutex.RLock()
+	if registry != nil && registry.db == db {
+		poolStats.PreparedStatements = len(registry.statements)
+	}
+	registryMutex.RUnlock()
+
+	return poolStats
+}
+
+func durationMs(d time.Duration) float64 {
+	return float64(d.Microseconds()) / 1000.0
+}
@@ -0,0 +1,127 @@
+package integrations
+
+import (
+	"bytes"
+	"encoding/json"
+	"net/http"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
+)
+
+// Recipients per request accepted by the providers' batch APIs
+const (
+	fcmMaxBatchSize       = 1000 // registration_ids
+	oneSignalMaxBatchSize = 2000 // include_player_ids
+	fast2SMSMaxBatchSize  = 500  // comma-separated numbers
+	sesMaxBatchSize       = 50   // destination addresses per SendEmail
+	mailchimpMaxBatchSize = 1000 // message.to entries
+)
+
+// sendInBatches splits recipients into batches of at most size and collects
+// the responses of send for each. A batch that fails as a whole is recorded
+// as failed for each of its recipients and its error is returned after the
+// remaining batches have been sent.
+func sendInBatches(recipients []string, size int, send func(batch []string) ([]*models.NotificationResponse, error)) ([]*models.NotificationResponse, error) {
+	if size < 1 {
+		size = 1
+	}
+
+	responses := make([]*models.NotificationResponse, 0, len(recipients))
+	var batchErr error
+	for start := 0; start < len(recipients); start += size {
+		end := start + size
+		if end > len(recipients) {
+			end = len(recipients)
+		}
+		batch := recipients[start:end]
+
+		batchResponses, err := send(batch)
+		if err != nil {
+			batchErr = err
+			if len(batchResponses) != len(batch) {
+				batchResponses = failedResponses(len(batch), err.Error())
+			}
+		}
+		responses = append(responses, batchResponses...)
+	}
+	return responses, batchErr
+}
+
+// sendEach is SendBatch for providers without a batch API: one Send per
+// recipient. Per-recipient errors are reported in the responses only.
+func sendEach(notifier Notifier, request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	responses := make([]*models.NotificationResponse, len(recipients))
+	for i, recipient := range recipients {
+		single := *request
+		single.Recipient = recipient
+
+		response, err := notifier.Send(&single, config)
+		if response == nil {
+			message := "Notification sending failed"
+			if err != nil {
+				message = err.Error()
+			}
+			response = failedResponse(message)
+		}
+		responses[i] = response
+	}
+	return responses, nil
+}
+
+func sentResponse(providerID string, message string) *models.NotificationResponse {
+	return &models.NotificationResponse{
+		Success:    true,
+		ProviderID: &providerID,
+		Status:     models.StatusSent,
+		Message:    message,
+	}
+}
+
+func failedResponse(message string) *models.NotificationResponse {
+	return &models.NotificationResponse{
+		Success: false,
+		Status:  models.StatusFailed,
+		Message: message,
+		Error:   stringPtr(message),
+	}
+}
+
+func failedResponses(count int, message string) []*models.NotificationResponse {
+	responses := make([]*models.NotificationResponse, count)
+	for i := range responses {
+		responses[i] = failedResponse(message)
+	}
+	return responses
+}
+
+// postJSON sends payload as JSON through the provider's shared client and
+// decodes the JSON response into out. It returns the HTTP status; a body
+// that is not JSON is only an error for a successful status.
+func postJSON(provider models.NotificationProvider, url string, payload interface{}, headers map[string]string, out interface{}) (int, error) {
+	jsonData, err := json.Marshal(payload)
+	if err != nil {
+		return 0, NewNotificationError(ErrTemplateParsing, "Failed to encode request", err)
+	}
+
+	httpReq, err := http.NewRequest("POST", url, bytes.NewBuffer(jsonData))
+	if err != nil {
+		return 0, NewNotificationError(ErrNetworkError, "Failed to create HTTP request", err)
+	}
+	httpReq.Header.Set("Content-Type", "application/json")
+	for key, value := range headers {
+		httpReq.Header.Set(key, value)
+	}
+
+	client := httpclient.Client(string(provider))
+	resp, err := client.Do(httpReq)
+	if err != nil {
+		return 0, NewNotificationError(ErrNetworkError, "Network error", err)
+	}
+	defer resp.Body.Close()
+
+	if err := json.NewDecoder(resp.Body).Decode(out); err != nil && resp.StatusCode == http.StatusOK {
+		return resp.StatusCode, NewNotificationError(ErrNetworkError, "Failed to parse response", err)
+	}
+	return resp.StatusCode, nil
+}
@@ -6,9 +6,9 @@ import (
 	"fmt"
 	"net/http"
 	"strings"
-	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // Fast2SMSNotifier implements SMS notifications via Fast2SMS
@@ -109,7 +109,7 @@ func (f *Fast2SMSNotifier) Send(request *models.SendNotificationRequest, config
 	httpReq.Header.Set("Authorization", config["api_key"])
 
 	// Send request
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderFast2SMS))
 	resp, err := client.Do(httpReq)
 	if err != nil {
 		errMsg := err.Error()
@@ -158,6 +158,76 @@ func (f *Fast2SMSNotifier) Send(request *models.SendNotificationRequest, config
 	}, NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
 }
 
+// SendBatch sends one request per batch of mobile numbers, passed to
+// Fast2SMS as a comma-separated list. Numbers that are not valid Indian
+// mobiles fail without being sent.
+func (f *Fast2SMSNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	if err := f.ValidateConfig(config); err != nil {
+		return failedResponses(len(recipients), "Configuration validation failed"), err
+	}
+	if request.Body == nil {
+		err := NewNotificationError(ErrInvalidRecipient, "Message body is required", nil)
+		return failedResponses(len(recipients), "Message body is required"), err
+	}
+
+	headers := map[string]string{"Authorization": config["api_key"]}
+	return sendInBatches(recipients, fast2SMSMaxBatchSize, func(batch []string) ([]*models.NotificationResponse, error) {
+		responses := make([]*models.NotificationResponse, len(batch))
+		numbers := make([]string, 0, len(batch))
+		for i, recipient := range batch {
+			phoneNumber := cleanPhoneNumber(recipient)
+			if !isValidIndianMobile(phoneNumber) {
+				responses[i] = failedResponse("Invalid mobile number format")
+				continue
+			}
+			numbers = append(numbers, phoneNumber)
+		}
+		if len(numbers) == 0 {
+			return responses, nil
+		}
+
+		apiRequest := Fast2SMSRequest{
+			Route:    "v3",
+			Message:  *request.Body,
+			Numbers:  strings.Join(numbers, ","),
+			SenderID: config["sender_id"],
+			Language: "english",
+		}
+
+		var apiResponse Fast2SMSResponse
+		status, err := postJSON(models.ProviderFast2SMS, config["base_url"], apiRequest, headers, &apiResponse)
+
+		var result *models.NotificationResponse
+		switch {
+		case err != nil:
+			result = failedResponse(err.Error())
+		case apiResponse.Return && status == http.StatusOK:
+			result = sentResponse(apiResponse.RequestID, "SMS sent successfully")
+		default:
+			errorMsg := "SMS sending failed"
+			if len(apiResponse.Message) > 0 {
+				errorMsg = strings.Join(apiResponse.Message, ", ")
+			}
+			result = failedResponse(errorMsg)
+			err = NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
+		}
+
+		// One request ID covers every number in the request
+		for i := range responses {
+			if responses[i] == nil {
+				copied := *result
+				responses[i] = &copied
+			}
+		}
+		return responses, err
+	})
+}
+
+// MaxBatchSize returns the most numbers per request
+func (f *Fast2SMSNotifier) MaxBatchSize() int {
+	return fast2SMSMaxBatchSize
+}
+
 // ValidateConfig validates Fast2SMS configuration
 func (f *Fast2SMSNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"api_key", "sender_id", "base_url"}
@@ -8,6 +8,7 @@ import (
 	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // FCMNotifier implements push notifications via Firebase Cloud Messaging
@@ -62,32 +63,9 @@ func (f *FCMNotifier) Send(request *models.SendNotificationRequest, config map[s
 		}, err
 	}
 
-	// Prepare notification content
-	title := "Notification"
-	if request.Subject != nil {
-		title = *request.Subject
-	}
-
-	body := ""
-	if request.Body != nil {
-		body = *request.Body
-	}
-
 	// Create FCM request
-	fcmRequest := FCMRequest{
-		To: request.Recipient, // FCM token
-		Notification: FCMNotification{
-			Title: title,
-			Body:  body,
-			Icon:  "ic_notification",
-			Sound: "default",
-		},
-		Data: map[string]interface{}{
-			"click_action": "FLUTTER_NOTIFICATION_CLICK",
-			"timestamp":    time.Now().Unix(),
-		},
-		Priority: "high",
-	}
+	fcmRequest := newFCMRequest(request)
+	fcmRequest.To = request.Recipient // FCM token
 
 	// Convert to JSON
 	jsonData, err := json.Marshal(fcmRequest)
@@ -119,7 +97,7 @@ func (f *FCMNotifier) Send(request *models.SendNotificationRequest, config map[s
 	httpReq.Header.Set("Authorization", fmt.Sprintf("key=%s", config["server_key"]))
 
 	// Send request
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderFCM))
 	resp, err := client.Do(httpReq)
 	if err != nil {
 		errMsg := err.Error()
@@ -173,6 +151,74 @@ func (f *FCMNotifier) Send(request *models.SendNotificationRequest, config map[s
 	}, NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
 }
 
+// SendBatch sends one multicast request per batch of registration tokens.
+// FCM returns a result per token in the order they were sent.
+func (f *FCMNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	if err := f.ValidateConfig(config); err != nil {
+		return failedResponses(len(recipients), "Configuration validation failed"), err
+	}
+
+	headers := map[string]string{"Authorization": fmt.Sprintf("key=%s", config["server_key"])}
+	return sendInBatches(recipients, fcmMaxBatchSize, func(batch []string) ([]*models.NotificationResponse, error) {
+		fcmRequest := newFCMRequest(request)
+		fcmRequest.RegistrationIDs = batch
+
+		var fcmResponse FCMResponse
+		status, err := postJSON(models.ProviderFCM, config["base_url"], fcmRequest, headers, &fcmResponse)
+		if err != nil {
+			return nil, err
+		}
+		if status != http.StatusOK {
+			return nil, NewNotificationError(ErrProviderUnavailable, fmt.Sprintf("FCM API error: %d", status), nil)
+		}
+
+		responses := make([]*models.NotificationResponse, len(batch))
+		for i := range batch {
+			switch {
+			case i >= len(fcmResponse.Results):
+				responses[i] = failedResponse("No result returned for token")
+			case fcmResponse.Results[i].Error != "":
+				responses[i] = failedResponse(fcmResponse.Results[i].Error)
+			default:
+				responses[i] = sentResponse(fcmResponse.Results[i].MessageID, "Push notification sent successfully")
+			}
+		}
+		return responses, nil
+	})
+}
+
+// MaxBatchSize returns the most registration tokens per multicast request
+func (f *FCMNotifier) MaxBatchSize() int {
+	return fcmMaxBatchSize
+}
+
+// newFCMRequest builds the FCM payload of a notification without its targets
+func newFCMRequest(request *models.SendNotificationRequest) FCMRequest {
+	title := "Notification"
+	if request.Subject != nil {
+		title = *request.Subject
+	}
+
+	body := ""
+	if request.Body != nil {
+		body = *request.Body
+	}
+
+	return FCMRequest{
+		Notification: FCMNotification{
+			Title: title,
+			Body:  body,
+			Icon:  "ic_notification",
+			Sound: "default",
+		},
+		Data: map[string]interface{}{
+			"click_action": "FLUTTER_NOTIFICATION_CLICK",
+			"timestamp":    time.Now().Unix(),
+		},
+		Priority: "high",
+	}
+}
+
 // ValidateConfig validates FCM configuration
 func (f *FCMNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"server_key", "base_url"}
@@ -9,6 +9,7 @@ import (
 	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // MailchimpNotifier implements email notifications via Mailchimp
@@ -115,6 +116,32 @@ func (m *MailchimpNotifier) Send(request *models.SendNotificationRequest, config
 	}, nil
 }
 
+// SendBatch sends one transactional message per batch of addresses. Like
+// Send, the API call itself is simulated.
+func (m *MailchimpNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	if err := m.ValidateConfig(config); err != nil {
+		return failedResponses(len(recipients), "Configuration validation failed"), err
+	}
+
+	return sendInBatches(recipients, mailchimpMaxBatchSize, func(batch []string) ([]*models.NotificationResponse, error) {
+		providerID := fmt.Sprintf("mailchimp_%d", time.Now().Unix())
+		responses := make([]*models.NotificationResponse, len(batch))
+		for i, recipient := range batch {
+			if !isValidEmail(recipient) {
+				responses[i] = failedResponse("Invalid email address")
+				continue
+			}
+			responses[i] = sentResponse(providerID, "Email sent successfully via Mailchimp")
+		}
+		return responses, nil
+	})
+}
+
+// MaxBatchSize returns the most addresses per transactional message
+func (m *MailchimpNotifier) MaxBatchSize() int {
+	return mailchimpMaxBatchSize
+}
+
 // ValidateConfig validates Mailchimp configuration
 func (m *MailchimpNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"api_key", "from_email"}
@@ -164,7 +191,7 @@ func (m *MailchimpNotifier) sendTransactionalEmail(apiKey, serverPrefix, recipie
 	req.Header.Set("Content-Type", "application/json")
 	req.Header.Set("Authorization", fmt.Sprintf("Bearer %s", apiKey))
 	
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderMailchimp))
 	resp, err := client.Do(req)
 	if err != nil {
 		return err
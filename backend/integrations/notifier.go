@@ -7,6 +7,12 @@ import (
 // Notifier interface defines the contract for all notification providers
 type Notifier interface {
 	Send(request *models.SendNotificationRequest, config map[string]string) (*models.NotificationResponse, error)
+	// SendBatch sends the same notification to many recipients with as few
+	// provider requests as possible. It returns one response per recipient,
+	// in order; the error reports a batch that failed as a whole.
+	SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error)
+	// MaxBatchSize is the most recipients one provider request accepts
+	MaxBatchSize() int
 	ValidateConfig(config map[string]string) error
 	GetProviderName() models.NotificationProvider
 	GetChannel() models.NotificationChannel
@@ -0,0 +1,197 @@
+package integrations
+
+import (
+	"encoding/json"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"fantasy-esports-backend/models"
+)
+
+// stubLatency stands in for the round trip to a provider's API
+const stubLatency = 2 * time.Millisecond
+
+// providerStub is a local HTTP server speaking just enough of the FCM,
+// OneSignal and Fast2SMS APIs to send to. Recipients starting with "bad"
+// are rejected the way each provider reports invalid targets.
+type providerStub struct {
+	server   *httptest.Server
+	requests atomic.Int64
+}
+
+func newProviderStub() *providerStub {
+	stub := &providerStub{}
+	mux := http.NewServeMux()
+
+	mux.HandleFunc("/fcm", func(w http.ResponseWriter, r *http.Request) {
+		stub.requests.Add(1)
+		time.Sleep(stubLatency)
+
+		var request FCMRequest
+		json.NewDecoder(r.Body).Decode(&request)
+		tokens := request.RegistrationIDs
+		if request.To != "" {
+			tokens = []string{request.To}
+		}
+
+		var response FCMResponse
+		for i, token := range tokens {
+			if strings.HasPrefix(token, "bad") {
+				response.Failure++
+				response.Results = append(response.Results, FCMResult{Error: "InvalidRegistration"})
+				continue
+			}
+			response.Success++
+			response.Results = append(response.Results, FCMResult{MessageID: fmt.Sprintf("msg-%d", i)})
+		}
+		json.NewEncoder(w).Encode(response)
+	})
+
+	mux.HandleFunc("/onesignal", func(w http.ResponseWriter, r *http.Request) {
+		stub.requests.Add(1)
+		time.Sleep(stubLatency)
+
+		var request OneSignalRequest
+		json.NewDecoder(r.Body).Decode(&request)
+
+		var invalid []string
+		for _, id := range request.IncludePlayerIDs {
+			if strings.HasPrefix(id, "bad") {
+				invalid = append(invalid, id)
+			}
+		}
+		response := map[string]interface{}{
+			"id":         "notification-1",
+			"recipients": len(request.IncludePlayerIDs) - len(invalid),
+		}
+		if len(invalid) > 0 {
+			response["errors"] = map[string][]string{"invalid_player_ids": invalid}
+		}
+		json.NewEncoder(w).Encode(response)
+	})
+
+	mux.HandleFunc("/fast2sms", func(w http.ResponseWriter, r *http.Request) {
+		stub.requests.Add(1)
+		time.Sleep(stubLatency)
+		json.NewEncoder(w).Encode(Fast2SMSResponse{Return: true, RequestID: "request-1"})
+	})
+
+	stub.server = httptest.NewServer(mux)
+	return stub
+}
+
+func (s *providerStub) notifiers() []struct {
+	name       string
+	notifier   Notifier
+	config     map[string]string
+	recipients func(n int) []string
+} {
+	tokens := func(n int) []string {
+		recipients := make([]string, n)
+		for i := range recipients {
+			recipients[i] = fmt.Sprintf("token-%d", i)
+		}
+		return recipients
+	}
+	mobiles := func(n int) []string {
+		recipients := make([]string, n)
+		for i := range recipients {
+			recipients[i] = fmt.Sprintf("9%09d", i)
+		}
+		return recipients
+	}
+
+	return []struct {
+		name       string
+		notifier   Notifier
+		config     map[string]string
+		recipients func(n int) []string
+	}{
+		{"fcm", NewFCMNotifier(), map[string]string{"server_key": "key", "base_url": s.server.URL + "/fcm"}, tokens},
+		{"onesignal", NewOneSignalNotifier(), map[string]string{"app_id": "app", "api_key": "key", "base_url": s.server.URL + "/onesignal"}, tokens},
+		{"fast2sms", NewFast2SMSNotifier(), map[string]string{"api_key": "key", "sender_id": "FNTSY", "base_url": s.server.URL + "/fast2sms"}, mobiles},
+	}
+}
+
+func testNotification() *models.SendNotificationRequest {
+	subject := "Match starting"
+	body := "Your contest goes live in 5 minutes"
+	return &models.SendNotificationRequest{Channel: models.ChannelPush, Subject: &subject, Body: &body}
+}
+
+func TestSendBatchReportsEachRecipient(t *testing.T) {
+	stub := newProviderStub()
+	defer stub.server.Close()
+
+	for _, provider := range stub.notifiers()[:2] {
+		recipients := []string{"token-1", "bad-2", "token-3"}
+		responses, err := provider.notifier.SendBatch(testNotification(), recipients, provider.config)
+		if err != nil {
+			t.Fatalf("%s: %v", provider.name, err)
+		}
+		if len(responses) != len(recipients) {
+			t.Fatalf("%s: %d responses for %d recipients", provider.name, len(responses), len(recipients))
+		}
+		if !responses[0].Success || responses[1].Success || !responses[2].Success {
+			t.Fatalf("%s: expected only the bad recipient to fail, got %v %v %v",
+				provider.name, responses[0].Success, responses[1].Success, responses[2].Success)
+		}
+	}
+
+	// Invalid numbers fail locally and are left out of the request
+	sms := stub.notifiers()[2]
+	responses, err := sms.notifier.SendBatch(testNotification(), []string{"9876543210", "12345"}, sms.config)
+	if err != nil || !responses[0].Success || responses[1].Success {
+		t.Fatalf("fast2sms: unexpected result %v, %+v %+v", err, responses[0], responses[1])
+	}
+}
+
+// BenchmarkNotifierSend compares sending to recipients one request at a time
+// with the providers' batch APIs, against the local stub
+func BenchmarkNotifierSend(b *testing.B) {
+	const recipientCount = 2000
+
+	stub := newProviderStub()
+	defer stub.server.Close()
+
+	for _, provider := range stub.notifiers() {
+		recipients := provider.recipients(recipientCount)
+
+		b.Run(provider.name+"/per-recipient", func(b *testing.B) {
+			stub.requests.Store(0)
+			start := time.Now()
+			for i := 0; i < b.N; i++ {
+				for _, recipient := range recipients {
+					request := testNotification()
+					request.Recipient = recipient
+					if _, err := provider.notifier.Send(request, provider.config); err != nil {
+						b.Fatal(err)
+					}
+				}
+			}
+			reportRecipientRate(b, start, recipientCount, stub.requests.Load())
+		})
+
+		b.Run(provider.name+"/batch", func(b *testing.B) {
+			stub.requests.Store(0)
+			start := time.Now()
+			for i := 0; i < b.N; i++ {
+				if _, err := provider.notifier.SendBatch(testNotification(), recipients, provider.config); err != nil {
+					b.Fatal(err)
+				}
+			}
+			reportRecipientRate(b, start, recipientCount, stub.requests.Load())
+		})
+	}
+}
+
+func reportRecipientRate(b *testing.B, start time.Time, recipients int, requests int64) {
+	elapsed := time.Since(start).Seconds()
+	b.ReportMetric(float64(recipients*b.N)/elapsed, "recipients/s")
+	b.ReportMetric(float64(requests)/float64(b.N), "requests/op")
+}
@@ -8,6 +8,7 @@ import (
 	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // OneSignalNotifier implements push notifications via OneSignal
@@ -48,32 +49,9 @@ func (o *OneSignalNotifier) Send(request *models.SendNotificationRequest, config
 		}, err
 	}
 
-	// Prepare notification content
-	title := "Notification"
-	if request.Subject != nil {
-		title = *request.Subject
-	}
-
-	body := ""
-	if request.Body != nil {
-		body = *request.Body
-	}
-
 	// Create OneSignal request
-	osRequest := OneSignalRequest{
-		AppID: config["app_id"],
-		Contents: map[string]string{
-			"en": body,
-		},
-		Headings: map[string]string{
-			"en": title,
-		},
-		IncludePlayerIDs: []string{request.Recipient}, // OneSignal player ID
-		Data: map[string]interface{}{
-			"timestamp": time.Now().Unix(),
-		},
-		Priority: 10,
-	}
+	osRequest := newOneSignalRequest(request, config)
+	osRequest.IncludePlayerIDs = []string{request.Recipient} // OneSignal player ID
 
 	// Convert to JSON
 	jsonData, err := json.Marshal(osRequest)
@@ -105,7 +83,7 @@ func (o *OneSignalNotifier) Send(request *models.SendNotificationRequest, config
 	httpReq.Header.Set("Authorization", fmt.Sprintf("Basic %s", config["api_key"]))
 
 	// Send request
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderOneSignal))
 	resp, err := client.Do(httpReq)
 	if err != nil {
 		errMsg := err.Error()
@@ -157,6 +135,100 @@ func (o *OneSignalNotifier) Send(request *models.SendNotificationRequest, config
 	}, NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
 }
 
+// oneSignalBatchResponse is the create-notification response. OneSignal
+// reports errors either as a list of messages or, when only some players
+// were invalid, as an object listing them.
+type oneSignalBatchResponse struct {
+	ID         string          `json:"id"`
+	Recipients int             `json:"recipients"`
+	Errors     json.RawMessage `json:"errors,omitempty"`
+}
+
+// SendBatch sends one notification per batch of player IDs
+func (o *OneSignalNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	if err := o.ValidateConfig(config); err != nil {
+		return failedResponses(len(recipients), "Configuration validation failed"), err
+	}
+
+	headers := map[string]string{"Authorization": fmt.Sprintf("Basic %s", config["api_key"])}
+	return sendInBatches(recipients, oneSignalMaxBatchSize, func(batch []string) ([]*models.NotificationResponse, error) {
+		osRequest := newOneSignalRequest(request, config)
+		osRequest.IncludePlayerIDs = batch
+
+		var osResponse oneSignalBatchResponse
+		status, err := postJSON(models.ProviderOneSignal, config["base_url"], osRequest, headers, &osResponse)
+		if err != nil {
+			return nil, err
+		}
+
+		var invalid struct {
+			InvalidPlayerIDs []string `json:"invalid_player_ids"`
+		}
+		var messages []string
+		if len(osResponse.Errors) > 0 && json.Unmarshal(osResponse.Errors, &invalid) != nil {
+			json.Unmarshal(osResponse.Errors, &messages)
+		}
+
+		if status != http.StatusOK || osResponse.ID == "" {
+			errorMsg := "Push notification sending failed"
+			if len(messages) > 0 {
+				errorMsg = messages[0]
+			} else if len(invalid.InvalidPlayerIDs) == len(batch) {
+				errorMsg = "All included players are not subscribed"
+			}
+			return nil, NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
+		}
+
+		invalidIDs := make(map[string]bool, len(invalid.InvalidPlayerIDs))
+		for _, id := range invalid.InvalidPlayerIDs {
+			invalidIDs[id] = true
+		}
+
+		responses := make([]*models.NotificationResponse, len(batch))
+		for i, playerID := range batch {
+			if invalidIDs[playerID] {
+				responses[i] = failedResponse("Invalid player ID")
+			} else {
+				responses[i] = sentResponse(osResponse.ID, "Push notification sent successfully")
+			}
+		}
+		return responses, nil
+	})
+}
+
+// MaxBatchSize returns the most player IDs per notification
+func (o *OneSignalNotifier) MaxBatchSize() int {
+	return oneSignalMaxBatchSize
+}
+
+// newOneSignalRequest builds the OneSignal payload of a notification without
+// its targets
+func newOneSignalRequest(request *models.SendNotificationRequest, config map[string]string) OneSignalRequest {
+	title := "Notification"
+	if request.Subject != nil {
+		title = *request.Subject
+	}
+
+	body := ""
+	if request.Body != nil {
+		body = *request.Body
+	}
+
+	return OneSignalRequest{
+		AppID: config["app_id"],
+		Contents: map[string]string{
+			"en": body,
+		},
+		Headings: map[string]string{
+			"en": title,
+		},
+		Data: map[string]interface{}{
+			"timestamp": time.Now().Unix(),
+		},
+		Priority: 10,
+	}
+}
+
 // ValidateConfig validates OneSignal configuration
 func (o *OneSignalNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"app_id", "api_key", "base_url"}
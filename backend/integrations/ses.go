@@ -11,6 +11,7 @@ import (
 	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // SESNotifier implements email notifications via Amazon SES
@@ -108,7 +109,7 @@ func (s *SESNotifier) Send(request *models.SendNotificationRequest, config map[s
 	}
 
 	// Send request
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderSES))
 	resp, err := client.Do(httpReq)
 	if err != nil {
 		errMsg := err.Error()
@@ -138,6 +139,98 @@ func (s *SESNotifier) Send(request *models.SendNotificationRequest, config map[s
 	}, NewNotificationError(ErrProviderUnavailable, fmt.Sprintf("SES API error: %d", resp.StatusCode), nil)
 }
 
+// SendBatch sends one SendEmail request per batch of addresses. Recipients
+// are addressed as Bcc so that they do not see each other, and share the
+// result of their request.
+func (s *SESNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	if err := s.ValidateConfig(config); err != nil {
+		return failedResponses(len(recipients), "Configuration validation failed"), err
+	}
+
+	subject := "Notification"
+	if request.Subject != nil {
+		subject = *request.Subject
+	}
+	body := ""
+	if request.Body != nil {
+		body = *request.Body
+	}
+	source := fmt.Sprintf("%s <%s>", config["from_name"], config["from_email"])
+
+	return sendInBatches(recipients, sesMaxBatchSize, func(batch []string) ([]*models.NotificationResponse, error) {
+		responses := make([]*models.NotificationResponse, len(batch))
+
+		formData := url.Values{}
+		formData.Set("Action", "SendEmail")
+		formData.Set("Source", source)
+		formData.Set("Message.Subject.Data", subject)
+		formData.Set("Message.Body.Text.Data", body)
+		formData.Set("Version", "2010-12-01")
+
+		addresses := 0
+		for i, recipient := range batch {
+			if !isValidEmail(recipient) {
+				responses[i] = failedResponse("Invalid email address")
+				continue
+			}
+			addresses++
+			formData.Set(fmt.Sprintf("Destination.BccAddresses.member.%d", addresses), recipient)
+		}
+		if addresses == 0 {
+			return responses, nil
+		}
+
+		status, err := s.postForm(formData, config)
+		var result *models.NotificationResponse
+		switch {
+		case err != nil:
+			result = failedResponse(err.Error())
+		case status == http.StatusOK:
+			result = sentResponse("", "Email sent successfully via SES")
+		default:
+			result = failedResponse(fmt.Sprintf("SES API error: %d", status))
+			err = NewNotificationError(ErrProviderUnavailable, fmt.Sprintf("SES API error: %d", status), nil)
+		}
+
+		for i := range responses {
+			if responses[i] == nil {
+				copied := *result
+				responses[i] = &copied
+			}
+		}
+		return responses, err
+	})
+}
+
+// MaxBatchSize returns the most destination addresses per SendEmail request
+func (s *SESNotifier) MaxBatchSize() int {
+	return sesMaxBatchSize
+}
+
+// postForm signs and sends an SES query API request and returns its status
+func (s *SESNotifier) postForm(formData url.Values, config map[string]string) (int, error) {
+	sesURL := fmt.Sprintf("https://ses.%s.amazonaws.com/", config["region"])
+
+	httpReq, err := http.NewRequest("POST", sesURL, strings.NewReader(formData.Encode()))
+	if err != nil {
+		return 0, NewNotificationError(ErrNetworkError, "Failed to create HTTP request", err)
+	}
+	httpReq.Header.Set("Content-Type", "application/x-www-form-urlencoded")
+
+	if err := s.signRequest(httpReq, config); err != nil {
+		return 0, NewNotificationError(ErrAuthError, "Failed to sign request", err)
+	}
+
+	client := httpclient.Client(string(models.ProviderSES))
+	resp, err := client.Do(httpReq)
+	if err != nil {
+		return 0, NewNotificationError(ErrNetworkError, "Network error", err)
+	}
+	defer resp.Body.Close()
+
+	return resp.StatusCode, nil
+}
+
 // ValidateConfig validates SES configuration
 func (s *SESNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"access_key_id", "secret_access_key", "region", "from_email"}
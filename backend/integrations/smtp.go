@@ -91,6 +91,16 @@ func (s *SMTPNotifier) Send(request *models.SendNotificationRequest, config map[
 	}, nil
 }
 
+// SendBatch sends one message per recipient; SMTP has no batch API here
+func (s *SMTPNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	return sendEach(s, request, recipients, config)
+}
+
+// MaxBatchSize returns 1, as each message is sent separately
+func (s *SMTPNotifier) MaxBatchSize() int {
+	return 1
+}
+
 // ValidateConfig validates SMTP configuration
 func (s *SMTPNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"host", "port", "username", "password", "from_email"}
@@ -5,9 +5,9 @@ import (
 	"encoding/json"
 	"fmt"
 	"net/http"
-	"time"
 
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 )
 
 // WhatsAppNotifier implements WhatsApp notifications via WhatsApp Cloud API
@@ -147,7 +147,7 @@ func (w *WhatsAppNotifier) Send(request *models.SendNotificationRequest, config
 	httpReq.Header.Set("Authorization", fmt.Sprintf("Bearer %s", config["access_token"]))
 
 	// Send request
-	client := &http.Client{Timeout: 30 * time.Second}
+	client := httpclient.Client(string(models.ProviderWhatsAppCloud))
 	resp, err := client.Do(httpReq)
 	if err != nil {
 		errMsg := err.Error()
@@ -196,6 +196,17 @@ func (w *WhatsAppNotifier) Send(request *models.SendNotificationRequest, config
 	}, NewNotificationError(ErrProviderUnavailable, errorMsg, nil)
 }
 
+// SendBatch sends one message per recipient, as the Cloud API addresses
+// each message to a single number
+func (w *WhatsAppNotifier) SendBatch(request *models.SendNotificationRequest, recipients []string, config map[string]string) ([]*models.NotificationResponse, error) {
+	return sendEach(w, request, recipients, config)
+}
+
+// MaxBatchSize returns 1, as each message is sent separately
+func (w *WhatsAppNotifier) MaxBatchSize() int {
+	return 1
+}
+
 // ValidateConfig validates WhatsApp configuration
 func (w *WhatsAppNotifier) ValidateConfig(config map[string]string) error {
 	required := []string{"access_token", "phone_number_id", "base_url"}
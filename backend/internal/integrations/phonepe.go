@@ -7,6 +7,7 @@ import (
 	"encoding/hex"
 	"encoding/json"
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 	"fantasy-esports-backend/pkg/logger"
 	"fmt"
 	"io"
@@ -21,9 +22,7 @@ type PhonePeClient struct {
 
 func NewPhonePeClient() *PhonePeClient {
 	return &PhonePeClient{
-		httpClient: &http.Client{
-			Timeout: 30 * time.Second,
-		},
+		httpClient: httpclient.Client("phonepe"),
 	}
 }
 
@@ -7,11 +7,11 @@ import (
 	"encoding/hex"
 	"encoding/json"
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/httpclient"
 	"fantasy-esports-backend/pkg/logger"
 	"fmt"
 	"io"
 	"net/http"
-	"time"
 )
 
 type RazorpayClient struct {
@@ -20,9 +20,7 @@ type RazorpayClient struct {
 
 func NewRazorpayClient() *RazorpayClient {
 	return &RazorpayClient{
-		httpClient: &http.Client{
-			Timeout: 30 * time.Second,
-		},
+		httpClient: httpclient.Client("razorpay"),
 	}
 }
 
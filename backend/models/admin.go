@@ -93,6 +93,58 @@ type RecalculatePointsRequest struct {
 	RecalculateLeaderboards bool `json:"recalculate_leaderboards"`
 }
 
+// PointsRecalculationReport summarises a batched fantasy points recalculation
+type PointsRecalculationReport struct {
+	MatchID            int64              `json:"match_id"`
+	PlayersScored      int                `json:"players_scored"`
+	TeamsRecalculated  int                `json:"teams_recalculated"`
+	TeamPlayersUpdated int64              `json:"team_players_updated"`
+	TeamsUpdated       int64              `json:"teams_updated"`
+	Phases             []RecalculationPhase `json:"phases"`
+	TotalDurationMs    float64            `json:"total_duration_ms"`
+}
+
+type RecalculationPhase struct {
+	Name       string  `json:"name"`
+	DurationMs float64 `json:"duration_ms"`
+}
+
+type PrizeDistributionReport struct {
+	ContestsProcessed int     `json:"contests_processed"`
+	WinnersRewarded   int     `json:"winners_rewarded"`
+	TotalAmount       float64 `json:"total_amount"`
+	DurationMs        float64 `json:"duration_ms"`
+}
+
+// MatchCompletionReport summarizes a match completion run. Resumed is set
+// when the run picked up contests left over by an interrupted one, in which
+// case the winner, MVP and prize options are those the run was started with.
+type MatchCompletionReport struct {
+	MatchID           int64                   `json:"match_id"`
+	Resumed           bool                    `json:"resumed"`
+	WinnerTeamID      int64                   `json:"winner_team_id"`
+	MVPPlayerID       int64                   `json:"mvp_player_id"`
+	PrizesDistributed bool                    `json:"prizes_distributed"`
+	TeamsLocked       int                     `json:"teams_locked"`
+	ContestsFinalized int                     `json:"contests_finalized"`
+	NotificationsSent int                     `json:"notifications_sent"`
+	StatisticsUpdated bool                    `json:"statistics_updated"`
+	Prizes            PrizeDistributionReport `json:"prizes"`
+	DurationMs        float64                 `json:"duration_ms"`
+}
+
+// MatchCompletionProgress is published as a match completion run moves
+// through its stages and finalizes each contest
+type MatchCompletionProgress struct {
+	MatchID        int64     `json:"match_id"`
+	ContestID      int64     `json:"contest_id,omitempty"`
+	Stage          string    `json:"stage"` // "not_started", "started", "contest_finalized", "contest_failed", "completed"
+	ContestsTotal  int       `json:"contests_total"`
+	ContestsDone   int       `json:"contests_done"`
+	ContestsFailed int       `json:"contests_failed"`
+	UpdatedAt      time.Time `json:"updated_at"`
+}
+
 type CompleteMatchRequest struct {
 	FinalResult        FinalResult `json:"final_result"`
 	DistributePrizes   bool        `json:"distribute_prizes"`
@@ -28,6 +28,7 @@ type UserMetrics struct {
 	UserRetentionRate    float64         `json:"user_retention_rate"`
 	UsersByState         []UsersByRegion `json:"users_by_state"`
 	UserRegistrationTrend []DailyCount   `json:"user_registration_trend"`
+	RefreshedAt           time.Time      `json:"refreshed_at"`
 }
 
 type UsersByRegion struct {
@@ -54,6 +55,7 @@ type RevenueMetrics struct {
 	RevenueByGame         []RevenueByCategory `json:"revenue_by_game"`
 	MonthlyRevenueTrend   []MonthlyRevenue    `json:"monthly_revenue_trend"`
 	PaymentMethodDistribution []PaymentMethodStats `json:"payment_method_distribution"`
+	RefreshedAt               time.Time            `json:"refreshed_at"`
 }
 
 type RevenueByCategory struct {
@@ -83,6 +85,7 @@ type ContestMetrics struct {
 	ContestsByEntryFee      []ContestsByCategory `json:"contests_by_entry_fee"`
 	PopularContestTypes     []PopularContest     `json:"popular_contest_types"`
 	ContestCompletionRate   float64              `json:"contest_completion_rate"`
+	RefreshedAt             time.Time            `json:"refreshed_at"`
 }
 
 type ContestsByCategory struct {
@@ -134,6 +137,7 @@ type EngagementMetrics struct {
 	FeatureUsage           []FeatureUsage    `json:"feature_usage"`
 	PeakUsageHours         []HourlyUsage     `json:"peak_usage_hours"`
 	ChurnRate              float64           `json:"churn_rate"`
+	RefreshedAt            time.Time         `json:"refreshed_at"`
 }
 
 type FeatureUsage struct {
@@ -125,6 +125,7 @@ type Leaderboard struct {
 type LeaderboardEntry struct {
 	Rank         int     `json:"rank"`
 	UserID       int64   `json:"user_id"`
+	TeamID       int64   `json:"team_id,omitempty"`
 	Username     string  `json:"username"`
 	TeamName     string  `json:"team_name"`
 	Points       float64 `json:"points"`
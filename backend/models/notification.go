@@ -213,4 +213,36 @@ type ChannelStats struct {
 	Stats          NotificationStats   `json:"stats"`
 	LastSent       *time.Time          `json:"last_sent"`
 	AvgResponseTime float64            `json:"avg_response_time_ms"`
-}
\ No newline at end of file
+}
+// BulkJobStatus represents the state of a bulk notification job
+type BulkJobStatus string
+
+const (
+	BulkJobQueued    BulkJobStatus = "queued"
+	BulkJobRunning   BulkJobStatus = "running"
+	BulkJobCompleted BulkJobStatus = "completed"
+	BulkJobFailed    BulkJobStatus = "failed"
+)
+
+// BulkNotificationJob reports the progress of a bulk notification send.
+// Total grows while the users matching a filter are being read.
+type BulkNotificationJob struct {
+	JobID       string               `json:"job_id"`
+	Status      BulkJobStatus        `json:"status"`
+	Channel     NotificationChannel  `json:"channel"`
+	Provider    NotificationProvider `json:"provider"`
+	TemplateID  *int64               `json:"template_id,omitempty"`
+	Total       int64                `json:"total"`
+	Sent        int64                `json:"sent"`
+	Failed      int64                `json:"failed"`
+	Pending     int64                `json:"pending"`
+	RatePerSec  float64              `json:"rate_per_sec"`
+	Error       *string              `json:"error,omitempty"`
+	CreatedAt   time.Time            `json:"created_at"`
+	StartedAt   *time.Time           `json:"started_at,omitempty"`
+	CompletedAt *time.Time           `json:"completed_at,omitempty"`
+
+	// CheckpointUserID is the user id a resumed job continues after; -1
+	// until the explicit recipient list has been sent
+	CheckpointUserID int64 `json:"checkpoint_user_id"`
+}
@@ -2,6 +2,8 @@ package models
 
 import (
 	"time"
+
+	"fantasy-esports-backend/pkg/cache"
 )
 
 // Real-time leaderboard specific models
@@ -17,6 +19,46 @@ type RealTimeLeaderboardUpdate struct {
 	TotalParticipants int                      `json:"total_participants"`
 	MatchEventID      *int64                   `json:"match_event_id,omitempty"`
 	TriggerSource     string                   `json:"trigger_source"` // "match_event", "score_update", "manual_recalc"
+	Sequence          int64                    `json:"sequence"`
+}
+
+// LeaderboardDelta is the protocol v2 leaderboard update. It carries only the
+// rows of the top window that changed since the previous sequence number.
+// Clients apply a delta only when its sequence is exactly one past the last
+// one applied, ignore older ones, and request a snapshot resync on a gap.
+type LeaderboardDelta struct {
+	ContestID         int64                 `json:"contest_id"`
+	Sequence          int64                 `json:"seq"`
+	UpdateID          string                `json:"update_id"`
+	UpdateTimestamp   time.Time             `json:"update_timestamp"`
+	Changed           []LeaderboardDeltaRow `json:"changed,omitempty"`
+	Removed           []int64               `json:"removed,omitempty"` // team IDs that left the window
+	TotalParticipants int                   `json:"total_participants"`
+	MatchEventID      *int64                `json:"match_event_id,omitempty"`
+	TriggerSource     string                `json:"trigger_source"`
+}
+
+// LeaderboardDeltaRow is one ranked team. Display fields are only sent when
+// the team enters the window; moves carry just rank and points.
+type LeaderboardDeltaRow struct {
+	TeamID    int64   `json:"team_id"`
+	Rank      int     `json:"rank"`
+	Points    float64 `json:"points"`
+	UserID    int64   `json:"user_id,omitempty"`
+	Username  string  `json:"username,omitempty"`
+	TeamName  string  `json:"team_name,omitempty"`
+	AvatarURL *string `json:"avatar_url,omitempty"`
+}
+
+// LeaderboardSnapshot is the full top window at a sequence number, sent to
+// protocol v2 clients on connect and on resync.
+type LeaderboardSnapshot struct {
+	ContestID         int64                 `json:"contest_id"`
+	Sequence          int64                 `json:"seq"`
+	SnapshotID        string                `json:"snapshot_id"`
+	CreatedAt         time.Time             `json:"created_at"`
+	TotalParticipants int                   `json:"total_participants"`
+	Rows              []LeaderboardDeltaRow `json:"rows"`
 }
 
 type LeaderboardRankChange struct {
@@ -33,6 +75,34 @@ type LeaderboardRankChange struct {
 	AvatarURL        *string `json:"avatar_url"`
 }
 
+// PersonalLeaderboardUpdate is pushed to each connected user after a
+// recalculation so clients do not have to poll for their own rank.
+type PersonalLeaderboardUpdate struct {
+	ContestID         int64              `json:"contest_id"`
+	Sequence          int64              `json:"sequence"`
+	MyRank            int                `json:"my_rank"`
+	MyPoints          float64            `json:"my_points"`
+	MyTeamID          int64              `json:"my_team_id"`
+	AroundMe          []LeaderboardEntry `json:"around_me"`
+	TotalParticipants int                `json:"total_participants"`
+}
+
+// RealTimeSchedulerStats reports how leaderboard update triggers were coalesced
+type RealTimeSchedulerStats struct {
+	WindowMs       int64 `json:"window_ms"`
+	ActiveContests int   `json:"active_contests"`
+	Requested      int64 `json:"requested"`
+	Merged         int64 `json:"merged"`
+	Dropped        int64 `json:"dropped"`
+	Emitted        int64 `json:"emitted"`
+}
+
+// LeaderboardCacheStats reports the in-memory leaderboard caches
+type LeaderboardCacheStats struct {
+	Leaderboards cache.Stats `json:"leaderboards"`
+	Snapshots    cache.Stats `json:"snapshots"`
+}
+
 type LeaderboardSubscription struct {
 	UserID         int64     `json:"user_id"`
 	ContestID      int64     `json:"contest_id"`
@@ -64,16 +134,20 @@ type RankingSnapshot struct {
 	ContestID     int64                  `json:"contest_id"`
 	SnapshotID    string                 `json:"snapshot_id"`
 	CreatedAt     time.Time              `json:"created_at"`
-	Rankings      map[int64]RankPosition `json:"rankings"` // userID -> position
-	TotalPoints   map[int64]float64      `json:"total_points"` // userID -> points
+	Sequence      int64                  `json:"sequence"`
+	TotalParticipants int                `json:"total_participants"`
+	Rankings      map[int64]RankPosition `json:"rankings"` // teamID -> position
+	TotalPoints   map[int64]float64      `json:"total_points"` // teamID -> points
 }
 
 type RankPosition struct {
-	Rank     int     `json:"rank"`
-	Points   float64 `json:"points"`
-	TeamID   int64   `json:"team_id"`
-	Username string  `json:"username"`
-	TeamName string  `json:"team_name"`
+	Rank      int     `json:"rank"`
+	Points    float64 `json:"points"`
+	TeamID    int64   `json:"team_id"`
+	UserID    int64   `json:"user_id"`
+	Username  string  `json:"username"`
+	TeamName  string  `json:"team_name"`
+	AvatarURL *string `json:"avatar_url"`
 }
 
 type LiveLeaderboardRequest struct {
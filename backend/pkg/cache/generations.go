@@ -0,0 +1,68 @@
+package cache
+
+import "sync"
+
+// Generations tracks invalidations per key while values for the key are
+// being computed, so that a fill which started before an invalidation of its
+// key does not store a value that is already stale. Invalidating one key
+// never discards fills of other keys. Only keys with a fill in progress are
+// tracked.
+type Generations[K comparable] struct {
+	mutex  sync.Mutex
+	active map[K]*generation
+}
+
+type generation struct {
+	version uint64
+	fills   int
+}
+
+// Begin starts a fill for key and returns the version Finish checks.
+func (g *Generations[K]) Begin(key K) uint64 {
+	g.mutex.Lock()
+	defer g.mutex.Unlock()
+
+	if g.active == nil {
+		g.active = make(map[K]*generation)
+	}
+	gen, ok := g.active[key]
+	if !ok {
+		gen = &generation{}
+		g.active[key] = gen
+	}
+	gen.fills++
+	return gen.version
+}
+
+// Invalidate discards the fills of key in progress.
+func (g *Generations[K]) Invalidate(key K) {
+	g.mutex.Lock()
+	defer g.mutex.Unlock()
+
+	if gen, ok := g.active[key]; ok {
+		gen.version++
+	}
+}
+
+// Finish ends a fill begun at version and runs store, if it is not nil and
+// key was not invalidated since. store runs under the lock, so an
+// invalidation cannot slip in between the check and the store. It reports
+// whether store ran.
+func (g *Generations[K]) Finish(key K, version uint64, store func()) bool {
+	g.mutex.Lock()
+	defer g.mutex.Unlock()
+
+	gen, ok := g.active[key]
+	if !ok {
+		return false
+	}
+	current := gen.version == version
+	if gen.fills--; gen.fills == 0 {
+		delete(g.active, key)
+	}
+	if current && store != nil {
+		store()
+		return true
+	}
+	return false
+}
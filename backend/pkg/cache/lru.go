@@ -0,0 +1,191 @@
+package cache
+
+import (
+	"container/list"
+	"sync"
+	"time"
+)
+
+// Stats is a point-in-time view of a cache's counters
+type Stats struct {
+	Size        int     `json:"size"`
+	Capacity    int     `json:"capacity"`
+	Hits        int64   `json:"hits"`
+	Misses      int64   `json:"misses"`
+	Evictions   int64   `json:"evictions"`   // removed to stay within capacity
+	Expirations int64   `json:"expirations"` // removed after their expiry
+	HitRate     float64 `json:"hit_rate"`
+	Fills       int64   `json:"fills"`
+	FillAvgMs   float64 `json:"fill_avg_ms"`
+	FillMaxMs   float64 `json:"fill_max_ms"`
+}
+
+// LRU is a size-bounded cache with per-entry expiry. When full, the least
+// recently used entry is evicted. It is safe for concurrent use.
+type LRU[K comparable, V any] struct {
+	mutex      sync.Mutex
+	capacity   int
+	defaultTTL time.Duration
+	items      map[K]*list.Element
+	order      *list.List // front = most recently used
+
+	hits        int64
+	misses      int64
+	evictions   int64
+	expirations int64
+	fills       int64
+	fillTotal   time.Duration
+	fillMax     time.Duration
+}
+
+type lruEntry[K comparable, V any] struct {
+	key       K
+	value     V
+	expiresAt time.Time
+}
+
+// NewLRU creates a cache holding at most capacity entries. Entries added with
+// Set expire after defaultTTL; zero means they never expire.
+func NewLRU[K comparable, V any](capacity int, defaultTTL time.Duration) *LRU[K, V] {
+	if capacity < 1 {
+		capacity = 1
+	}
+	return &LRU[K, V]{
+		capacity:   capacity,
+		defaultTTL: defaultTTL,
+		items:      make(map[K]*list.Element),
+		order:      list.New(),
+	}
+}
+
+// Get returns the value for key if present and not expired.
+func (c *LRU[K, V]) Get(key K) (V, bool) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	var zero V
+	element, ok := c.items[key]
+	if !ok {
+		c.misses++
+		return zero, false
+	}
+
+	entry := element.Value.(*lruEntry[K, V])
+	if !entry.expiresAt.IsZero() && time.Now().After(entry.expiresAt) {
+		c.removeElement(element)
+		c.expirations++
+		c.misses++
+		return zero, false
+	}
+
+	c.order.MoveToFront(element)
+	c.hits++
+	return entry.value, true
+}
+
+// Peek returns the value for key like Get, without counting a hit or miss
+// or refreshing the key's recency. It is for lookups the cache makes on its
+// own behalf rather than for readers.
+func (c *LRU[K, V]) Peek(key K) (V, bool) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	var zero V
+	element, ok := c.items[key]
+	if !ok {
+		return zero, false
+	}
+	entry := element.Value.(*lruEntry[K, V])
+	if !entry.expiresAt.IsZero() && time.Now().After(entry.expiresAt) {
+		return zero, false
+	}
+	return entry.value, true
+}
+
+// Set stores a value with the cache's default TTL.
+func (c *LRU[K, V]) Set(key K, value V) {
+	var expiresAt time.Time
+	if c.defaultTTL > 0 {
+		expiresAt = time.Now().Add(c.defaultTTL)
+	}
+	c.SetWithExpiry(key, value, expiresAt)
+}
+
+// SetWithExpiry stores a value that expires at expiresAt; a zero time means
+// it never expires.
+func (c *LRU[K, V]) SetWithExpiry(key K, value V, expiresAt time.Time) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	if element, ok := c.items[key]; ok {
+		entry := element.Value.(*lruEntry[K, V])
+		entry.value = value
+		entry.expiresAt = expiresAt
+		c.order.MoveToFront(element)
+		return
+	}
+
+	c.items[key] = c.order.PushFront(&lruEntry[K, V]{key: key, value: value, expiresAt: expiresAt})
+	for c.order.Len() > c.capacity {
+		c.removeElement(c.order.Back())
+		c.evictions++
+	}
+}
+
+// Remove deletes key from the cache.
+func (c *LRU[K, V]) Remove(key K) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	if element, ok := c.items[key]; ok {
+		c.removeElement(element)
+	}
+}
+
+// Len returns the number of entries, including any not yet found expired.
+func (c *LRU[K, V]) Len() int {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+	return c.order.Len()
+}
+
+// ObserveFill records how long it took to compute a value after a miss.
+func (c *LRU[K, V]) ObserveFill(d time.Duration) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	c.fills++
+	c.fillTotal += d
+	if d > c.fillMax {
+		c.fillMax = d
+	}
+}
+
+// Stats returns the cache counters.
+func (c *LRU[K, V]) Stats() Stats {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+
+	stats := Stats{
+		Size:        c.order.Len(),
+		Capacity:    c.capacity,
+		Hits:        c.hits,
+		Misses:      c.misses,
+		Evictions:   c.evictions,
+		Expirations: c.expirations,
+		Fills:       c.fills,
+		FillMaxMs:   float64(c.fillMax.Microseconds()) / 1000.0,
+	}
+	if lookups := c.hits + c.misses; lookups > 0 {
+		stats.HitRate = float64(c.hits) / float64(lookups)
+	}
+	if c.fills > 0 {
+		stats.FillAvgMs = float64(c.fillTotal.Microseconds()) / 1000.0 / float64(c.fills)
+	}
+	return stats
+}
+
+func (c *LRU[K, V]) removeElement(element *list.Element) {
+	entry := c.order.Remove(element).(*lruEntry[K, V])
+	delete(c.items, entry.key)
+}
@@ -0,0 +1,109 @@
+package cache
+
+import (
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+func TestLRUEvictsLeastRecentlyUsed(t *testing.T) {
+	c := NewLRU[int, string](2, 0)
+	c.Set(1, "a")
+	c.Set(2, "b")
+	c.Get(1) // 2 is now least recently used
+	c.Set(3, "c")
+
+	if _, ok := c.Get(2); ok {
+		t.Fatal("entry 2 should have been evicted")
+	}
+	if v, ok := c.Get(1); !ok || v != "a" {
+		t.Fatalf("Get(1) = %q, %v", v, ok)
+	}
+	if stats := c.Stats(); stats.Evictions != 1 || stats.Size != 2 {
+		t.Fatalf("unexpected stats %+v", stats)
+	}
+}
+
+func TestLRUHonoursExpiry(t *testing.T) {
+	c := NewLRU[int, string](10, time.Hour)
+	c.SetWithExpiry(1, "stale", time.Now().Add(-time.Second))
+	c.Set(2, "fresh")
+
+	if _, ok := c.Get(1); ok {
+		t.Fatal("expired entry returned")
+	}
+	if _, ok := c.Get(2); !ok {
+		t.Fatal("fresh entry missing")
+	}
+	if stats := c.Stats(); stats.Expirations != 1 || stats.Hits != 1 || stats.Misses != 1 {
+		t.Fatalf("unexpected stats %+v", stats)
+	}
+}
+
+func TestGroupCollapsesConcurrentCalls(t *testing.T) {
+	var group Group[int, int]
+	var executions atomic.Int32
+	release := make(chan struct{})
+
+	var wg sync.WaitGroup
+	results := make([]int, 20)
+	for i := range results {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			results[i], _, _ = group.Do(7, func() (int, error) {
+				executions.Add(1)
+				<-release
+				return 42, nil
+			})
+		}(i)
+	}
+
+	time.Sleep(20 * time.Millisecond)
+	close(release)
+	wg.Wait()
+
+	if executions.Load() != 1 {
+		t.Fatalf("fn ran %d times, want 1", executions.Load())
+	}
+	for i, r := range results {
+		if r != 42 {
+			t.Fatalf("caller %d got %d", i, r)
+		}
+	}
+}
+
+func TestGenerationsDiscardOnlyInvalidatedKeys(t *testing.T) {
+	var generations Generations[int]
+	first := generations.Begin(1)
+	second := generations.Begin(2)
+
+	generations.Invalidate(1)
+	stored := map[int]bool{}
+	generations.Finish(1, first, func() { stored[1] = true })
+	generations.Finish(2, second, func() { stored[2] = true })
+	if stored[1] || !stored[2] {
+		t.Fatalf("stored %v, want only key 2", stored)
+	}
+
+	// Invalidating a key without fills leaves nothing behind
+	generations.Invalidate(3)
+	if len(generations.active) != 0 {
+		t.Fatalf("%d keys still tracked", len(generations.active))
+	}
+}
+
+func TestLRUPeekLeavesStatsAlone(t *testing.T) {
+	c := NewLRU[int, string](10, 0)
+	c.Set(1, "a")
+	if v, ok := c.Peek(1); !ok || v != "a" {
+		t.Fatalf("Peek(1) = %q, %v", v, ok)
+	}
+	if _, ok := c.Peek(2); ok {
+		t.Fatal("Peek(2) found a missing key")
+	}
+	if stats := c.Stats(); stats.Hits != 0 || stats.Misses != 0 {
+		t.Fatalf("Peek counted lookups: %+v", stats)
+	}
+}
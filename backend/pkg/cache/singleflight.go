@@ -0,0 +1,46 @@
+package cache
+
+import "sync"
+
+// Group collapses concurrent calls for the same key into one execution whose
+// result is shared by every caller.
+type Group[K comparable, V any] struct {
+	mutex sync.Mutex
+	calls map[K]*call[V]
+}
+
+type call[V any] struct {
+	done  sync.WaitGroup
+	value V
+	err   error
+}
+
+// Do runs fn for key unless a call for key is already in flight, in which
+// case it waits for that call and returns its result. shared reports whether
+// the result came from another caller's execution.
+func (g *Group[K, V]) Do(key K, fn func() (V, error)) (value V, err error, shared bool) {
+	g.mutex.Lock()
+	if g.calls == nil {
+		g.calls = make(map[K]*call[V])
+	}
+	if c, ok := g.calls[key]; ok {
+		g.mutex.Unlock()
+		c.done.Wait()
+		return c.value, c.err, true
+	}
+
+	c := &call[V]{}
+	c.done.Add(1)
+	g.calls[key] = c
+	g.mutex.Unlock()
+
+	defer func() {
+		g.mutex.Lock()
+		delete(g.calls, key)
+		g.mutex.Unlock()
+		c.done.Done()
+	}()
+
+	c.value, c.err = fn()
+	return c.value, c.err, false
+}
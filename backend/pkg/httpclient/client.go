@@ -0,0 +1,149 @@
+package httpclient
+
+import (
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"sync"
+	"sync/atomic"
+	"time"
+)
+
+// ErrCircuitOpen is returned without contacting a host whose circuit breaker
+// has opened after repeated failures
+var ErrCircuitOpen = errors.New("circuit open")
+
+// Config tunes the shared outbound HTTP clients
+type Config struct {
+	Timeout             time.Duration
+	MaxIdleConns        int
+	MaxIdleConnsPerHost int
+	IdleConnTimeout     time.Duration
+	ForceHTTP2          bool
+
+	// BreakerFailures consecutive failures (network errors, 429 and 5xx
+	// responses) open a host's breaker for BreakerCooldown, after which one
+	// probe request is let through
+	BreakerFailures int
+	BreakerCooldown time.Duration
+}
+
+// DefaultConfig is used until Configure is called
+var DefaultConfig = Config{
+	Timeout:             30 * time.Second,
+	MaxIdleConns:        512,
+	MaxIdleConnsPerHost: 100,
+	IdleConnTimeout:     90 * time.Second,
+	ForceHTTP2:          true,
+	BreakerFailures:     5,
+	BreakerCooldown:     30 * time.Second,
+}
+
+var (
+	settings atomic.Pointer[Config]
+
+	clientsMutex sync.Mutex
+	clients      = make(map[string]*http.Client)
+
+	hosts sync.Map // host -> *hostState
+)
+
+func init() {
+	config := DefaultConfig
+	settings.Store(&config)
+}
+
+// Configure replaces the client settings. Clients handed out earlier keep
+// their transport; later calls to Client get one built from config.
+func Configure(config Config) {
+	settings.Store(&config)
+
+	clientsMutex.Lock()
+	defer clientsMutex.Unlock()
+	for name, client := range clients {
+		client.CloseIdleConnections()
+		delete(clients, name)
+	}
+}
+
+// Client returns the shared client of an integration, such as "fcm" or
+// "razorpay". Each integration has its own keep-alive connection pool so
+// that one slow provider cannot exhaust another's connections.
+func Client(name string) *http.Client {
+	clientsMutex.Lock()
+	defer clientsMutex.Unlock()
+
+	if client, exists := clients[name]; exists {
+		return client
+	}
+
+	config := settings.Load()
+	transport := &http.Transport{
+		Proxy: http.ProxyFromEnvironment,
+		DialContext: (&net.Dialer{
+			Timeout:   10 * time.Second,
+			KeepAlive: 30 * time.Second,
+		}).DialContext,
+		ForceAttemptHTTP2:     config.ForceHTTP2,
+		MaxIdleConns:          config.MaxIdleConns,
+		MaxIdleConnsPerHost:   config.MaxIdleConnsPerHost,
+		IdleConnTimeout:       config.IdleConnTimeout,
+		TLSHandshakeTimeout:   10 * time.Second,
+		ExpectContinueTimeout: time.Second,
+	}
+
+	client := &http.Client{
+		Timeout:   config.Timeout,
+		Transport: &instrumentedTransport{next: transport},
+	}
+	clients[name] = client
+	return client
+}
+
+// instrumentedTransport applies the per-host circuit breaker and records
+// request latency
+type instrumentedTransport struct {
+	next http.RoundTripper
+}
+
+func (t *instrumentedTransport) RoundTrip(req *http.Request) (*http.Response, error) {
+	config := settings.Load()
+	host := hostStateFor(req.URL.Host)
+
+	if !host.breaker.allow(time.Now(), config.BreakerCooldown) {
+		host.rejected.Add(1)
+		if req.Body != nil {
+			req.Body.Close()
+		}
+		return nil, fmt.Errorf("%w: %s", ErrCircuitOpen, req.URL.Host)
+	}
+
+	start := time.Now()
+	resp, err := t.next.RoundTrip(req)
+	host.latency.Observe(time.Since(start))
+
+	failed := err != nil || resp.StatusCode == http.StatusTooManyRequests || resp.StatusCode >= 500
+	if failed {
+		host.failures.Add(1)
+	}
+	host.breaker.record(!failed, config.BreakerFailures, time.Now())
+
+	if resp != nil {
+		resp.Body = &drainingBody{ReadCloser: resp.Body}
+	}
+	return resp, err
+}
+
+// drainingBody reads what is left of a small response before closing it,
+// so that callers that stop at the end of the JSON they need still return
+// the connection to the pool
+type drainingBody struct {
+	io.ReadCloser
+}
+
+func (b *drainingBody) Close() error {
+	io.CopyN(io.Discard, b.ReadCloser, 64<<10)
+	return b.ReadCloser.Close()
+}
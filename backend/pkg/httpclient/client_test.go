@@ -0,0 +1,78 @@
+package httpclient
+
+import (
+	"errors"
+	"net/http"
+	"net/http/httptest"
+	"net/url"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+func TestBreakerOpensAndRecovers(t *testing.T) {
+	var failing atomic.Bool
+	failing.Store(true)
+	var hits atomic.Int64
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		hits.Add(1)
+		if failing.Load() {
+			w.WriteHeader(http.StatusServiceUnavailable)
+			return
+		}
+		w.Write([]byte(`{"ok":true}`))
+	}))
+	defer server.Close()
+
+	Configure(Config{Timeout: time.Second, MaxIdleConnsPerHost: 4, BreakerFailures: 3, BreakerCooldown: 50 * time.Millisecond})
+	defer Configure(DefaultConfig)
+	client := Client("breaker-test")
+
+	for i := 0; i < 3; i++ {
+		resp, err := client.Get(server.URL)
+		if err != nil {
+			t.Fatalf("request %d: %v", i, err)
+		}
+		resp.Body.Close()
+	}
+
+	if _, err := client.Get(server.URL); !errors.Is(err, ErrCircuitOpen) {
+		t.Fatalf("expected open circuit, got %v", err)
+	}
+	if hits.Load() != 3 {
+		t.Fatalf("open breaker let a request through: %d hits", hits.Load())
+	}
+
+	// After the cooldown a successful probe closes the breaker
+	failing.Store(false)
+	time.Sleep(60 * time.Millisecond)
+	resp, err := client.Get(server.URL)
+	if err != nil {
+		t.Fatalf("probe: %v", err)
+	}
+	resp.Body.Close()
+
+	u, _ := url.Parse(server.URL)
+	for _, stats := range Stats() {
+		if stats.Host != u.Host {
+			continue
+		}
+		if stats.Breaker != "closed" || stats.Requests != 4 || stats.Failures != 3 || stats.Rejected != 1 {
+			t.Fatalf("unexpected stats %+v", stats)
+		}
+		if stats.P99Ms < stats.P50Ms || stats.SumMs <= 0 {
+			t.Fatalf("unexpected latency percentiles %+v", stats)
+		}
+		return
+	}
+	t.Fatal("no stats for test host")
+}
+
+func TestClientsAreSharedPerIntegration(t *testing.T) {
+	if Client("a") != Client("a") {
+		t.Fatal("same integration got different clients")
+	}
+	if Client("a") == Client("b") {
+		t.Fatal("integrations share a client")
+	}
+}
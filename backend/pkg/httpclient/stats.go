@@ -0,0 +1,145 @@
+package httpclient
+
+import (
+	"sort"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/pkg/telemetry"
+)
+
+// hostState is the breaker and counters of one outbound host
+type hostState struct {
+	breaker  breaker
+	latency  telemetry.Histogram
+	failures atomic.Int64
+	rejected atomic.Int64
+}
+
+func hostStateFor(host string) *hostState {
+	if state, ok := hosts.Load(host); ok {
+		return state.(*hostState)
+	}
+	state, _ := hosts.LoadOrStore(host, &hostState{})
+	return state.(*hostState)
+}
+
+type breakerState int
+
+const (
+	breakerClosed breakerState = iota
+	breakerOpen
+	breakerHalfOpen
+)
+
+func (s breakerState) String() string {
+	switch s {
+	case breakerOpen:
+		return "open"
+	case breakerHalfOpen:
+		return "half_open"
+	}
+	return "closed"
+}
+
+// breaker opens after consecutive failures, rejects requests while open, and
+// after the cooldown lets a single probe decide whether to close again
+type breaker struct {
+	mutex    sync.Mutex
+	state    breakerState
+	failures int
+	openedAt time.Time
+	probing  bool
+}
+
+func (b *breaker) allow(now time.Time, cooldown time.Duration) bool {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+
+	switch b.state {
+	case breakerOpen:
+		if now.Sub(b.openedAt) < cooldown {
+			return false
+		}
+		b.state = breakerHalfOpen
+		b.probing = true
+		return true
+	case breakerHalfOpen:
+		if b.probing {
+			return false
+		}
+		b.probing = true
+		return true
+	}
+	return true
+}
+
+func (b *breaker) record(success bool, threshold int, now time.Time) {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+
+	if success {
+		b.state = breakerClosed
+		b.failures = 0
+		b.probing = false
+		return
+	}
+
+	b.failures++
+	if b.state == breakerHalfOpen || (threshold > 0 && b.failures >= threshold) {
+		b.state = breakerOpen
+		b.openedAt = now
+		b.probing = false
+	}
+}
+
+func (b *breaker) current() breakerState {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+	return b.state
+}
+
+// HostStats reports the outbound traffic to one host
+type HostStats struct {
+	Host     string  `json:"host"`
+	Breaker  string  `json:"breaker"`
+	Requests int64   `json:"requests"`
+	Failures int64   `json:"failures"`
+	Rejected int64   `json:"rejected"`
+	SumMs    float64 `json:"sum_ms"`
+	AvgMs    float64 `json:"avg_ms"`
+	P50Ms    float64 `json:"p50_ms"`
+	P95Ms    float64 `json:"p95_ms"`
+	P99Ms    float64 `json:"p99_ms"`
+}
+
+// Stats returns the breaker state and latency percentiles of every host
+// contacted through a shared client
+func Stats() []HostStats {
+	var stats []HostStats
+	hosts.Range(func(key, value interface{}) bool {
+		state := value.(*hostState)
+		quantiles := state.latency.Quantiles(0.50, 0.95, 0.99)
+		stats = append(stats, HostStats{
+			Host:     key.(string),
+			Breaker:  state.breaker.current().String(),
+			Requests: state.latency.Count(),
+			Failures: state.failures.Load(),
+			Rejected: state.rejected.Load(),
+			SumMs:    milliseconds(state.latency.Sum()),
+			AvgMs:    milliseconds(state.latency.Mean()),
+			P50Ms:    milliseconds(quantiles[0]),
+			P95Ms:    milliseconds(quantiles[1]),
+			P99Ms:    milliseconds(quantiles[2]),
+		})
+		return true
+	})
+
+	sort.Slice(stats, func(i, j int) bool { return stats[i].Host < stats[j].Host })
+	return stats
+}
+
+func milliseconds(d time.Duration) float64 {
+	return float64(d.Microseconds()) / 1000.0
+}
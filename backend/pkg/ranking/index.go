@@ -0,0 +1,296 @@
+package ranking
+
+import (
+	"sync"
+	"time"
+)
+
+// Index is an in-memory order-statistic index over the entries of one
+// contest. Rank lookups, top-N and windowed reads are O(log n + k).
+type Index struct {
+	ContestID int64
+	MatchID   int64
+	LoadedAt  time.Time
+
+	mutex     sync.RWMutex
+	list      *skipList
+	teams     map[int64]*Entry             // team_id -> current entry
+	userTeams map[int64]map[int64]struct{} // user_id -> team_ids
+}
+
+// NewIndex builds an index for a contest from its current entries.
+func NewIndex(contestID int64, entries []Entry) *Index {
+	idx := &Index{
+		ContestID: contestID,
+		LoadedAt:  time.Now(),
+		list:      newSkipList(),
+		teams:     make(map[int64]*Entry, len(entries)),
+		userTeams: make(map[int64]map[int64]struct{}),
+	}
+	for _, e := range entries {
+		idx.upsertLocked(e)
+	}
+	return idx
+}
+
+// Len returns the number of entries in the contest.
+func (idx *Index) Len() int {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+	return idx.list.length
+}
+
+// TeamIDs returns the IDs of every team entered in the contest.
+func (idx *Index) TeamIDs() []int64 {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+
+	teamIDs := make([]int64, 0, len(idx.teams))
+	for teamID := range idx.teams {
+		teamIDs = append(teamIDs, teamID)
+	}
+	return teamIDs
+}
+
+// Upsert inserts an entry or replaces the existing entry for the same team.
+func (idx *Index) Upsert(e Entry) {
+	idx.mutex.Lock()
+	defer idx.mutex.Unlock()
+	idx.upsertLocked(e)
+}
+
+func (idx *Index) upsertLocked(e Entry) {
+	if existing, ok := idx.teams[e.TeamID]; ok {
+		idx.list.delete(existing)
+		idx.removeUserTeam(existing.UserID, existing.TeamID)
+	}
+	n := idx.list.insert(e)
+	idx.teams[e.TeamID] = &n.entry
+	if idx.userTeams[e.UserID] == nil {
+		idx.userTeams[e.UserID] = make(map[int64]struct{})
+	}
+	idx.userTeams[e.UserID][e.TeamID] = struct{}{}
+}
+
+// UpdatePoints moves a team to its new score. It reports false if the team
+// is not entered in this contest.
+func (idx *Index) UpdatePoints(teamID int64, points float64) bool {
+	idx.mutex.Lock()
+	defer idx.mutex.Unlock()
+
+	existing, ok := idx.teams[teamID]
+	if !ok {
+		return false
+	}
+	if existing.Points == points {
+		return true
+	}
+	e := *existing
+	idx.list.delete(existing)
+	e.Points = points
+	n := idx.list.insert(e)
+	idx.teams[teamID] = &n.entry
+	return true
+}
+
+// Remove drops a team from the contest.
+func (idx *Index) Remove(teamID int64) bool {
+	idx.mutex.Lock()
+	defer idx.mutex.Unlock()
+
+	existing, ok := idx.teams[teamID]
+	if !ok {
+		return false
+	}
+	idx.list.delete(existing)
+	idx.removeUserTeam(existing.UserID, teamID)
+	delete(idx.teams, teamID)
+	return true
+}
+
+func (idx *Index) removeUserTeam(userID, teamID int64) {
+	if teams, ok := idx.userTeams[userID]; ok {
+		delete(teams, teamID)
+		if len(teams) == 0 {
+			delete(idx.userTeams, userID)
+		}
+	}
+}
+
+// Top returns the first n entries in rank order.
+func (idx *Index) Top(n int) []RankedEntry {
+	return idx.Range(1, n)
+}
+
+// Range returns the entries ranked from..to inclusive (1-based).
+func (idx *Index) Range(from, to int) []RankedEntry {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+	return idx.rangeLocked(from, to)
+}
+
+func (idx *Index) rangeLocked(from, to int) []RankedEntry {
+	if from < 1 {
+		from = 1
+	}
+	if to > idx.list.length {
+		to = idx.list.length
+	}
+	if to < from {
+		return []RankedEntry{}
+	}
+
+	entries := make([]RankedEntry, 0, to-from+1)
+	x := idx.list.byRank(from)
+	for rank := from; x != nil && rank <= to; rank++ {
+		entries = append(entries, RankedEntry{Rank: rank, Entry: x.entry})
+		x = x.levels[0].next
+	}
+	return entries
+}
+
+// Around returns the entries within radius ranks of rank.
+func (idx *Index) Around(rank, radius int) []RankedEntry {
+	return idx.Range(rank-radius, rank+radius)
+}
+
+// TeamRank returns the rank and points of a team, or rank 0 if absent.
+func (idx *Index) TeamRank(teamID int64) (int, float64) {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+
+	e, ok := idx.teams[teamID]
+	if !ok {
+		return 0, 0
+	}
+	return idx.list.rankOf(e), e.Points
+}
+
+// UserRank returns the best rank held by any of the user's teams along with
+// that team's points and ID. ok is false if the user has not entered.
+func (idx *Index) UserRank(userID int64) (rank int, points float64, teamID int64, ok bool) {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+
+	for id := range idx.userTeams[userID] {
+		e := idx.teams[id]
+		r := idx.list.rankOf(e)
+		if !ok || r < rank {
+			rank, points, teamID, ok = r, e.Points, id, true
+		}
+	}
+	return rank, points, teamID, ok
+}
+
+// Standing is one user's position in a contest: the rank of their best team
+// and the entries within the requested radius around it.
+type Standing struct {
+	Rank   int
+	Points float64
+	TeamID int64
+	Window []RankedEntry
+}
+
+// Standings returns the standing of every listed user that has entered the
+// contest. Small user sets are answered with per-user rank lookups; larger
+// ones with a single walk of the ranking, which keeps the cost at O(n) no
+// matter how many users are asking.
+func (idx *Index) Standings(userIDs []int64, radius int) map[int64]Standing {
+	idx.mutex.RLock()
+	defer idx.mutex.RUnlock()
+
+	standings := make(map[int64]Standing, len(userIDs))
+	if len(userIDs) == 0 || idx.list.length == 0 {
+		return standings
+	}
+
+	if len(userIDs)*idx.list.level*(radius+1) < idx.list.length {
+		for _, userID := range userIDs {
+			if standing, ok := idx.standingLocked(userID, radius); ok {
+				standings[userID] = standing
+			}
+		}
+		return standings
+	}
+
+	wanted := make(map[int64]bool, len(userIDs))
+	for _, userID := range userIDs {
+		if _, entered := idx.userTeams[userID]; entered {
+			wanted[userID] = true
+		}
+	}
+
+	// recent holds the last radius entries; open windows still need entries
+	// after their user's rank
+	recent := make([]RankedEntry, 0, radius)
+	type openWindow struct {
+		userID int64
+		need   int
+	}
+	var open []openWindow
+
+	rank := 0
+	for x := idx.list.head.levels[0].next; x != nil && (len(wanted) > 0 || len(open) > 0); x = x.levels[0].next {
+		rank++
+		current := RankedEntry{Rank: rank, Entry: x.entry}
+
+		kept := open[:0]
+		for _, w := range open {
+			standing := standings[w.userID]
+			standing.Window = append(standing.Window, current)
+			standings[w.userID] = standing
+			if w.need > 1 {
+				kept = append(kept, openWindow{userID: w.userID, need: w.need - 1})
+			}
+		}
+		open = kept
+
+		// The first entry seen for a user is their best-ranked team
+		if wanted[x.entry.UserID] {
+			delete(wanted, x.entry.UserID)
+			window := make([]RankedEntry, 0, 2*radius+1)
+			window = append(window, recent...)
+			window = append(window, current)
+			standings[x.entry.UserID] = Standing{
+				Rank:   rank,
+				Points: x.entry.Points,
+				TeamID: x.entry.TeamID,
+				Window: window,
+			}
+			if radius > 0 {
+				open = append(open, openWindow{userID: x.entry.UserID, need: radius})
+			}
+		}
+
+		if radius > 0 {
+			if len(recent) == radius {
+				copy(recent, recent[1:])
+				recent = recent[:radius-1]
+			}
+			recent = append(recent, current)
+		}
+	}
+
+	return standings
+}
+
+func (idx *Index) standingLocked(userID int64, radius int) (Standing, bool) {
+	var best *Entry
+	bestRank := 0
+	for teamID := range idx.userTeams[userID] {
+		e := idx.teams[teamID]
+		if r := idx.list.rankOf(e); best == nil || r < bestRank {
+			best, bestRank = e, r
+		}
+	}
+	if best == nil {
+		return Standing{}, false
+	}
+
+	return Standing{
+		Rank:   bestRank,
+		Points: best.Points,
+		TeamID: best.TeamID,
+		Window: idx.rangeLocked(bestRank-radius, bestRank+radius),
+	}, true
+}
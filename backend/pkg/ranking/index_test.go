@@ -0,0 +1,296 @@
+package ranking
+
+import (
+	"math/rand"
+	"sort"
+	"testing"
+	"time"
+)
+
+func randomEntries(n int, rnd *rand.Rand) []Entry {
+	base := time.Now()
+	entries := make([]Entry, n)
+	for i := range entries {
+		entries[i] = Entry{
+			TeamID:    int64(i + 1),
+			UserID:    int64(i%(n/2+1) + 1),
+			Points:    float64(rnd.Intn(50)),
+			CreatedAt: base.Add(time.Duration(rnd.Intn(100)) * time.Second),
+		}
+	}
+	return entries
+}
+
+func sortedCopy(entries map[int64]Entry) []Entry {
+	sorted := make([]Entry, 0, len(entries))
+	for _, e := range entries {
+		sorted = append(sorted, e)
+	}
+	sort.Slice(sorted, func(i, j int) bool { return less(&sorted[i], &sorted[j]) })
+	return sorted
+}
+
+func TestIndexMatchesSortedOrder(t *testing.T) {
+	rnd := rand.New(rand.NewSource(1))
+	entries := randomEntries(2000, rnd)
+
+	idx := NewIndex(1, entries)
+	expected := make(map[int64]Entry, len(entries))
+	for _, e := range entries {
+		expected[e.TeamID] = e
+	}
+
+	for step := 0; step < 5000; step++ {
+		teamID := int64(rnd.Intn(len(entries)) + 1)
+		switch rnd.Intn(10) {
+		case 0:
+			idx.Remove(teamID)
+			delete(expected, teamID)
+		case 1:
+			e := entries[teamID-1]
+			idx.Upsert(e)
+			expected[teamID] = e
+		default:
+			if e, ok := expected[teamID]; ok {
+				e.Points += float64(rnd.Intn(7) - 2)
+				if !idx.UpdatePoints(teamID, e.Points) {
+					t.Fatalf("team %d missing from index", teamID)
+				}
+				expected[teamID] = e
+			}
+		}
+	}
+
+	sorted := sortedCopy(expected)
+	if idx.Len() != len(sorted) {
+		t.Fatalf("Len() = %d, want %d", idx.Len(), len(sorted))
+	}
+
+	all := idx.Range(1, len(sorted))
+	for i, got := range all {
+		if got.Rank != i+1 || got.TeamID != sorted[i].TeamID {
+			t.Fatalf("position %d: got team %d rank %d, want team %d", i+1, got.TeamID, got.Rank, sorted[i].TeamID)
+		}
+		if rank, _ := idx.TeamRank(got.TeamID); rank != i+1 {
+			t.Fatalf("TeamRank(%d) = %d, want %d", got.TeamID, rank, i+1)
+		}
+	}
+
+	top := idx.Top(10)
+	if len(top) != 10 || top[0].TeamID != sorted[0].TeamID {
+		t.Fatalf("unexpected top 10: %+v", top)
+	}
+
+	around := idx.Around(100, 5)
+	if len(around) != 11 || around[0].Rank != 95 || around[10].Rank != 105 {
+		t.Fatalf("unexpected window around rank 100: %+v", around)
+	}
+}
+
+func TestIndexUserRankPicksBestTeam(t *testing.T) {
+	now := time.Now()
+	idx := NewIndex(1, []Entry{
+		{TeamID: 1, UserID: 10, Points: 40, CreatedAt: now},
+		{TeamID: 2, UserID: 20, Points: 50, CreatedAt: now},
+		{TeamID: 3, UserID: 10, Points: 60, CreatedAt: now},
+	})
+
+	rank, points, teamID, ok := idx.UserRank(10)
+	if !ok || rank != 1 || points != 60 || teamID != 3 {
+		t.Fatalf("UserRank(10) = %d, %v, %d, %v", rank, points, teamID, ok)
+	}
+	if _, _, _, ok := idx.UserRank(99); ok {
+		t.Fatal("UserRank reported a rank for a user with no entry")
+	}
+}
+
+func TestIndexStandingsMatchPerUserLookups(t *testing.T) {
+	rnd := rand.New(rand.NewSource(2))
+	idx := NewIndex(1, randomEntries(3000, rnd))
+
+	var userIDs []int64
+	for userID := int64(1); userID <= 1600; userID += 3 {
+		userIDs = append(userIDs, userID)
+	}
+
+	// Both the single-pass walk and the per-user path must agree with Around
+	for _, users := range [][]int64{userIDs, userIDs[:2]} {
+		standings := idx.Standings(users, 5)
+		for _, userID := range users {
+			rank, points, teamID, ok := idx.UserRank(userID)
+			standing, found := standings[userID]
+			if ok != found {
+				t.Fatalf("user %d: entered=%v but standing found=%v", userID, ok, found)
+			}
+			if !ok {
+				continue
+			}
+			if standing.Rank != rank || standing.Points != points || standing.TeamID != teamID {
+				t.Fatalf("user %d: standing %+v, want rank %d team %d", userID, standing, rank, teamID)
+			}
+			around := idx.Around(rank, 5)
+			if len(standing.Window) != len(around) {
+				t.Fatalf("user %d: window of %d entries, want %d", userID, len(standing.Window), len(around))
+			}
+			for i := range around {
+				if standing.Window[i].Rank != around[i].Rank || standing.Window[i].TeamID != around[i].TeamID {
+					t.Fatalf("user %d: window[%d] = %+v, want %+v", userID, i, standing.Window[i], around[i])
+				}
+			}
+		}
+	}
+}
+
+func TestRegistryUpdateTeamPoints(t *testing.T) {
+	now := time.Now()
+	registry := NewRegistry()
+
+	first := NewIndex(1, []Entry{
+		{TeamID: 1, UserID: 10, Points: 10, CreatedAt: now},
+		{TeamID: 2, UserID: 20, Points: 20, CreatedAt: now},
+	})
+	first.MatchID = 100
+	second := NewIndex(2, []Entry{
+		{TeamID: 1, UserID: 10, Points: 10, CreatedAt: now},
+	})
+	second.MatchID = 100
+	registry.Put(first)
+	registry.Put(second)
+
+	if changed := registry.UpdateTeamPoints(1, 30); len(changed) != 2 {
+		t.Fatalf("UpdateTeamPoints touched contests %v, want both", changed)
+	}
+	if rank, _ := first.TeamRank(1); rank != 1 {
+		t.Fatalf("team 1 rank = %d after update, want 1", rank)
+	}
+	if changed := registry.UpdateTeamPoints(2, 5); len(changed) != 1 || changed[0] != 1 {
+		t.Fatalf("UpdateTeamPoints(2) touched contests %v, want [1]", changed)
+	}
+
+	registry.RemoveMatch(100)
+	if _, ok := registry.Get(1); ok {
+		t.Fatal("contest 1 index survived RemoveMatch")
+	}
+	if changed := registry.UpdateTeamPoints(1, 40); len(changed) != 0 {
+		t.Fatalf("UpdateTeamPoints after RemoveMatch touched %v", changed)
+	}
+}
+
+func TestRegistryLoadReplaysAndDiscards(t *testing.T) {
+	now := time.Now()
+	registry := NewRegistry()
+
+	// Updates and joins that land during the scan are replayed onto it
+	idx, err := registry.Load(1, func() (*Index, error) {
+		registry.UpdateTeamPoints(1, 50)
+		if !registry.AddEntry(1, Entry{TeamID: 3, UserID: 30, Points: 0, CreatedAt: now}) {
+			t.Error("AddEntry ignored a contest being loaded")
+		}
+		return NewIndex(1, []Entry{
+			{TeamID: 1, UserID: 10, Points: 10, CreatedAt: now},
+			{TeamID: 2, UserID: 20, Points: 20, CreatedAt: now},
+		}), nil
+	})
+	if err != nil {
+		t.Fatal(err)
+	}
+	if installed, ok := registry.Get(1); !ok || installed != idx {
+		t.Fatal("loaded index was not installed")
+	}
+	if rank, points := idx.TeamRank(1); rank != 1 || points != 50 {
+		t.Fatalf("team 1 at rank %d with %.0f points, want rank 1 with 50", rank, points)
+	}
+	if idx.Len() != 3 {
+		t.Fatalf("Len() = %d, want 3", idx.Len())
+	}
+
+	// Joins after the load go into the index and the team lookup
+	if !registry.AddEntry(1, Entry{TeamID: 4, UserID: 40, Points: 0, CreatedAt: now}) {
+		t.Fatal("AddEntry ignored a loaded contest")
+	}
+	if changed := registry.UpdateTeamPoints(4, 60); len(changed) != 1 {
+		t.Fatalf("UpdateTeamPoints(4) touched contests %v, want [1]", changed)
+	}
+	if registry.AddEntry(2, Entry{TeamID: 5, UserID: 50, CreatedAt: now}) {
+		t.Fatal("AddEntry reported an untracked contest")
+	}
+
+	// A load invalidated while it scans is returned but not installed
+	stale, err := registry.Load(2, func() (*Index, error) {
+		registry.Remove(2)
+		return NewIndex(2, nil), nil
+	})
+	if err != nil || stale == nil {
+		t.Fatalf("invalidated load returned %v, %v", stale, err)
+	}
+	if _, ok := registry.Get(2); ok {
+		t.Fatal("index invalidated during its load was installed")
+	}
+}
+
+func TestRegistryLoadsContestsInParallel(t *testing.T) {
+	registry := NewRegistry()
+
+	// Hold contest 1's build open until the test is done
+	started := make(chan struct{})
+	release := make(chan struct{})
+	builds := make(chan int, 2)
+	slowLoad := func() {
+		registry.Load(1, func() (*Index, error) {
+			builds <- 1
+			close(started)
+			<-release
+			return NewIndex(1, nil), nil
+		})
+	}
+	go slowLoad()
+	<-started
+
+	// A waiter on contest 1 shares its build instead of scanning again
+	waited := make(chan *Index)
+	go func() {
+		idx, _ := registry.Load(1, func() (*Index, error) {
+			builds <- 1
+			return NewIndex(1, nil), nil
+		})
+		waited <- idx
+	}()
+
+	loaded := make(chan error)
+	go func() {
+		_, err := registry.Load(2, func() (*Index, error) { return NewIndex(2, nil), nil })
+		loaded <- err
+	}()
+	select {
+	case err := <-loaded:
+		if err != nil {
+			t.Fatal(err)
+		}
+	case <-time.After(time.Second):
+		t.Fatal("Load of contest 2 waited on the build of contest 1")
+	}
+	if _, ok := registry.Get(2); !ok {
+		t.Fatal("contest 2 index was not installed")
+	}
+
+	close(release)
+	if idx := <-waited; idx == nil || idx.ContestID != 1 {
+		t.Fatalf("waiter on contest 1 got %v", idx)
+	}
+	if len(builds) != 1 {
+		t.Fatalf("contest 1 built %d times, want 1", len(builds))
+	}
+}
+
+func BenchmarkIndexUpdateAndRank(b *testing.B) {
+	rnd := rand.New(rand.NewSource(1))
+	entries := randomEntries(200000, rnd)
+	idx := NewIndex(1, entries)
+
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		teamID := int64(i%len(entries) + 1)
+		idx.UpdatePoints(teamID, float64(rnd.Intn(500)))
+		idx.TeamRank(teamID)
+	}
+}
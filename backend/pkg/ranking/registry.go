@@ -0,0 +1,218 @@
+package ranking
+
+import (
+	"sync"
+)
+
+// Registry holds the rank indexes of all contests tracked by this process,
+// along with a reverse lookup from team to the contests it is entered in.
+//
+// Every contest has a version that invalidation bumps. An index built from a
+// scan is installed only if its contest's version has not moved since the
+// scan began, and the team updates and new entries that arrived during the
+// scan are replayed onto it first, so a slow load never installs rankings
+// older than what the registry has already been told.
+type Registry struct {
+	mutex        sync.RWMutex
+	indexes      map[int64]*Index
+	teamContests map[int64][]int64 // team_id -> contest_ids with a loaded index
+	versions     map[int64]uint64  // contest_id -> invalidation count
+	loads        map[int64]*pendingLoad
+}
+
+// pendingLoad is a contest index being built from the database. Concurrent
+// misses on the contest wait on done and share its result, so each contest
+// is scanned once while loads of different contests run in parallel.
+type pendingLoad struct {
+	version uint64
+	mutex   sync.Mutex
+	replay  []func(*Index)
+
+	done chan struct{}
+	idx  *Index
+	err  error
+}
+
+func (l *pendingLoad) record(op func(*Index)) {
+	l.mutex.Lock()
+	l.replay = append(l.replay, op)
+	l.mutex.Unlock()
+}
+
+func NewRegistry() *Registry {
+	return &Registry{
+		indexes:      make(map[int64]*Index),
+		teamContests: make(map[int64][]int64),
+		versions:     make(map[int64]uint64),
+		loads:        make(map[int64]*pendingLoad),
+	}
+}
+
+// Get returns the index for a contest if one has been loaded.
+func (r *Registry) Get(contestID int64) (*Index, bool) {
+	r.mutex.RLock()
+	defer r.mutex.RUnlock()
+	idx, ok := r.indexes[contestID]
+	return idx, ok
+}
+
+// Load returns the index for a contest, building it with build if none is
+// loaded. The built index is returned even when an invalidation during the
+// build keeps it from being installed; the next read then builds it again.
+func (r *Registry) Load(contestID int64, build func() (*Index, error)) (*Index, error) {
+	if idx, ok := r.Get(contestID); ok {
+		return idx, nil
+	}
+
+	r.mutex.Lock()
+	// Another request may have loaded it, or be loading it, since we looked
+	if idx, ok := r.indexes[contestID]; ok {
+		r.mutex.Unlock()
+		return idx, nil
+	}
+	if load, ok := r.loads[contestID]; ok {
+		r.mutex.Unlock()
+		<-load.done
+		return load.idx, load.err
+	}
+	load := &pendingLoad{version: r.versions[contestID], done: make(chan struct{})}
+	r.loads[contestID] = load
+	r.mutex.Unlock()
+	defer close(load.done)
+
+	idx, err := build()
+
+	r.mutex.Lock()
+	delete(r.loads, contestID)
+	if err == nil {
+		for _, op := range load.replay {
+			op(idx)
+		}
+		if r.versions[contestID] == load.version {
+			r.putLocked(idx)
+		}
+		load.idx = idx
+	}
+	load.err = err
+	r.mutex.Unlock()
+
+	if err != nil {
+		return nil, err
+	}
+	return idx, nil
+}
+
+// Put installs or replaces the index for its contest.
+func (r *Registry) Put(idx *Index) {
+	r.mutex.Lock()
+	defer r.mutex.Unlock()
+	r.putLocked(idx)
+}
+
+func (r *Registry) putLocked(idx *Index) {
+	if previous, ok := r.indexes[idx.ContestID]; ok {
+		r.unlinkTeams(previous.ContestID, previous.TeamIDs())
+	}
+	r.indexes[idx.ContestID] = idx
+	for _, teamID := range idx.TeamIDs() {
+		r.teamContests[teamID] = append(r.teamContests[teamID], idx.ContestID)
+	}
+}
+
+// AddEntry adds a newly entered team to the contest's loaded index, or to
+// the index being loaded. It reports false if the contest has neither, in
+// which case the next load reads the entry from the database.
+func (r *Registry) AddEntry(contestID int64, e Entry) bool {
+	r.mutex.Lock()
+	defer r.mutex.Unlock()
+
+	if load, ok := r.loads[contestID]; ok {
+		load.record(func(idx *Index) { idx.Upsert(e) })
+	}
+	idx, ok := r.indexes[contestID]
+	if !ok {
+		return r.loads[contestID] != nil
+	}
+	if rank, _ := idx.TeamRank(e.TeamID); rank == 0 {
+		r.teamContests[e.TeamID] = append(r.teamContests[e.TeamID], contestID)
+	}
+	idx.Upsert(e)
+	return true
+}
+
+// Tracks reports whether the contest has an index loaded or being loaded.
+func (r *Registry) Tracks(contestID int64) bool {
+	r.mutex.RLock()
+	defer r.mutex.RUnlock()
+	_, loaded := r.indexes[contestID]
+	_, loading := r.loads[contestID]
+	return loaded || loading
+}
+
+// Remove drops the index for a contest, forcing the next read to reload it.
+func (r *Registry) Remove(contestID int64) {
+	r.mutex.Lock()
+	defer r.mutex.Unlock()
+
+	r.versions[contestID]++
+	if previous, ok := r.indexes[contestID]; ok {
+		r.unlinkTeams(contestID, previous.TeamIDs())
+		delete(r.indexes, contestID)
+	}
+}
+
+// RemoveMatch drops the indexes of every contest of a match. The match of a
+// contest still loading is not known yet, so every load in progress is
+// discarded too.
+func (r *Registry) RemoveMatch(matchID int64) {
+	r.mutex.Lock()
+	defer r.mutex.Unlock()
+
+	for contestID, idx := range r.indexes {
+		if idx.MatchID == matchID {
+			r.versions[contestID]++
+			r.unlinkTeams(contestID, idx.TeamIDs())
+			delete(r.indexes, contestID)
+		}
+	}
+	for contestID := range r.loads {
+		r.versions[contestID]++
+	}
+}
+
+func (r *Registry) unlinkTeams(contestID int64, teamIDs []int64) {
+	for _, teamID := range teamIDs {
+		contests := r.teamContests[teamID]
+		for i, id := range contests {
+			if id == contestID {
+				contests = append(contests[:i], contests[i+1:]...)
+				break
+			}
+		}
+		if len(contests) == 0 {
+			delete(r.teamContests, teamID)
+		} else {
+			r.teamContests[teamID] = contests
+		}
+	}
+}
+
+// UpdateTeamPoints applies a team's new total to every contest it is entered
+// in and returns the IDs of the contests that changed. Indexes being loaded
+// get the update replayed once their scan is done.
+func (r *Registry) UpdateTeamPoints(teamID int64, points float64) []int64 {
+	r.mutex.RLock()
+	defer r.mutex.RUnlock()
+
+	for _, load := range r.loads {
+		load.record(func(idx *Index) { idx.UpdatePoints(teamID, points) })
+	}
+
+	var contestIDs []int64
+	for _, contestID := range r.teamContests[teamID] {
+		if idx, ok := r.indexes[contestID]; ok && idx.UpdatePoints(teamID, points) {
+			contestIDs = append(contestIDs, contestID)
+		}
+	}
+	return contestIDs
+}
@@ -0,0 +1,185 @@
+package ranking
+
+import (
+	"math/rand"
+	"time"
+)
+
+const (
+	maxLevel    = 32
+	levelFactor = 0.25
+)
+
+// Entry is a single fantasy team entered in a contest.
+type Entry struct {
+	TeamID    int64
+	UserID    int64
+	Points    float64
+	CreatedAt time.Time
+	Username  string
+	TeamName  string
+	AvatarURL *string
+	PrizeWon  float64
+}
+
+// less reports whether a ranks ahead of b. Ordering matches the leaderboard
+// SQL: total_points DESC, created_at ASC, with team_id as the final tie-break
+// so every entry has a stable, unique position.
+func less(a, b *Entry) bool {
+	if a.Points != b.Points {
+		return a.Points > b.Points
+	}
+	if !a.CreatedAt.Equal(b.CreatedAt) {
+		return a.CreatedAt.Before(b.CreatedAt)
+	}
+	return a.TeamID < b.TeamID
+}
+
+// RankedEntry is an entry together with its 1-based position.
+type RankedEntry struct {
+	Rank int
+	Entry
+}
+
+type skipLevel struct {
+	next *skipNode
+	span int // number of level-0 hops covered by next
+}
+
+type skipNode struct {
+	entry  Entry
+	levels []skipLevel
+}
+
+// skipList is an indexable skip list: every forward pointer records how many
+// nodes it jumps over, so rank lookups and rank-based access are O(log n).
+// It is not safe for concurrent use; Index provides the locking.
+type skipList struct {
+	head   *skipNode
+	level  int
+	length int
+	rnd    *rand.Rand
+}
+
+func newSkipList() *skipList {
+	return &skipList{
+		head:  &skipNode{levels: make([]skipLevel, maxLevel)},
+		level: 1,
+		rnd:   rand.New(rand.NewSource(time.Now().UnixNano())),
+	}
+}
+
+func (sl *skipList) randomLevel() int {
+	level := 1
+	for level < maxLevel && sl.rnd.Float64() < levelFactor {
+		level++
+	}
+	return level
+}
+
+func (sl *skipList) insert(e Entry) *skipNode {
+	var update [maxLevel]*skipNode
+	var rank [maxLevel]int
+
+	x := sl.head
+	for i := sl.level - 1; i >= 0; i-- {
+		if i < sl.level-1 {
+			rank[i] = rank[i+1]
+		}
+		for x.levels[i].next != nil && less(&x.levels[i].next.entry, &e) {
+			rank[i] += x.levels[i].span
+			x = x.levels[i].next
+		}
+		update[i] = x
+	}
+
+	level := sl.randomLevel()
+	if level > sl.level {
+		for i := sl.level; i < level; i++ {
+			rank[i] = 0
+			update[i] = sl.head
+			update[i].levels[i].span = sl.length
+		}
+		sl.level = level
+	}
+
+	n := &skipNode{entry: e, levels: make([]skipLevel, level)}
+	for i := 0; i < level; i++ {
+		n.levels[i].next = update[i].levels[i].next
+		update[i].levels[i].next = n
+		n.levels[i].span = update[i].levels[i].span - (rank[0] - rank[i])
+		update[i].levels[i].span = rank[0] - rank[i] + 1
+	}
+	for i := level; i < sl.level; i++ {
+		update[i].levels[i].span++
+	}
+
+	sl.length++
+	return n
+}
+
+func (sl *skipList) delete(e *Entry) bool {
+	var update [maxLevel]*skipNode
+
+	x := sl.head
+	for i := sl.level - 1; i >= 0; i-- {
+		for x.levels[i].next != nil && less(&x.levels[i].next.entry, e) {
+			x = x.levels[i].next
+		}
+		update[i] = x
+	}
+
+	x = x.levels[0].next
+	if x == nil || x.entry.TeamID != e.TeamID {
+		return false
+	}
+
+	for i := 0; i < sl.level; i++ {
+		if update[i].levels[i].next == x {
+			update[i].levels[i].span += x.levels[i].span - 1
+			update[i].levels[i].next = x.levels[i].next
+		} else {
+			update[i].levels[i].span--
+		}
+	}
+	for sl.level > 1 && sl.head.levels[sl.level-1].next == nil {
+		sl.level--
+	}
+	sl.length--
+	return true
+}
+
+// rankOf returns the 1-based rank of e, or 0 if it is not in the list.
+func (sl *skipList) rankOf(e *Entry) int {
+	rank := 0
+	x := sl.head
+	for i := sl.level - 1; i >= 0; i-- {
+		for x.levels[i].next != nil && !less(e, &x.levels[i].next.entry) {
+			rank += x.levels[i].span
+			x = x.levels[i].next
+		}
+		if x != sl.head && x.entry.TeamID == e.TeamID {
+			return rank
+		}
+	}
+	return 0
+}
+
+// byRank returns the node at the 1-based rank, or nil if out of range.
+func (sl *skipList) byRank(rank int) *skipNode {
+	if rank < 1 || rank > sl.length {
+		return nil
+	}
+	traversed := 0
+	x := sl.head
+	for i := sl.level - 1; i >= 0; i-- {
+		for x.levels[i].next != nil && traversed+x.levels[i].span <= rank {
+			traversed += x.levels[i].span
+			x = x.levels[i].next
+		}
+		if traversed == rank {
+			return x
+		}
+	}
+	return nil
+}
@@ -0,0 +1,98 @@
+package ratelimit
+
+import (
+	"sync"
+	"time"
+)
+
+// TokenBucket allows rate events per second on average, with bursts of up
+// to burst events. It is safe for concurrent use.
+type TokenBucket struct {
+	mutex  sync.Mutex
+	rate   float64
+	burst  float64
+	tokens float64
+	last   time.Time
+}
+
+// NewTokenBucket creates a full bucket
+func NewTokenBucket(rate float64, burst int) *TokenBucket {
+	if burst < 1 {
+		burst = 1
+	}
+	return &TokenBucket{
+		rate:   rate,
+		burst:  float64(burst),
+		tokens: float64(burst),
+		last:   time.Now(),
+	}
+}
+
+// Wait blocks until a token is available and takes it. A bucket with a
+// non-positive rate never blocks.
+func (b *TokenBucket) Wait() {
+	for {
+		wait := b.reserve()
+		if wait <= 0 {
+			return
+		}
+		time.Sleep(wait)
+	}
+}
+
+// TryTake takes a token if one is available without blocking
+func (b *TokenBucket) TryTake() bool {
+	return b.reserve() <= 0
+}
+
+// SetRate changes the refill rate, keeping the tokens already accumulated
+func (b *TokenBucket) SetRate(rate float64, burst int) {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+
+	b.refillLocked(time.Now())
+	b.rate = rate
+	if burst >= 1 {
+		b.burst = float64(burst)
+	}
+	if b.tokens > b.burst {
+		b.tokens = b.burst
+	}
+}
+
+// Rate returns the refill rate in events per second
+func (b *TokenBucket) Rate() float64 {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+	return b.rate
+}
+
+// reserve takes a token and returns zero, or returns how long until one is
+// available without taking it
+func (b *TokenBucket) reserve() time.Duration {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+
+	if b.rate <= 0 {
+		return 0
+	}
+
+	b.refillLocked(time.Now())
+	if b.tokens >= 1 {
+		b.tokens--
+		return 0
+	}
+	return time.Duration((1 - b.tokens) / b.rate * float64(time.Second))
+}
+
+func (b *TokenBucket) refillLocked(now time.Time) {
+	elapsed := now.Sub(b.last).Seconds()
+	b.last = now
+	if elapsed <= 0 {
+		return
+	}
+	b.tokens += elapsed * b.rate
+	if b.tokens > b.burst {
+		b.tokens = b.burst
+	}
+}
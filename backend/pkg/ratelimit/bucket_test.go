@@ -0,0 +1,41 @@
+package ratelimit
+
+import (
+	"sync"
+	"testing"
+	"time"
+)
+
+func TestTokenBucketLimitsRate(t *testing.T) {
+	bucket := NewTokenBucket(200, 10)
+
+	start := time.Now()
+	var wg sync.WaitGroup
+	for w := 0; w < 8; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := 0; i < 15; i++ {
+				bucket.Wait()
+			}
+		}()
+	}
+	wg.Wait()
+
+	// 120 events, 10 from the initial burst and 110 at 200/s
+	if elapsed := time.Since(start); elapsed < 500*time.Millisecond {
+		t.Fatalf("120 events took %v, expected at least 550ms at 200/s", elapsed)
+	}
+}
+
+func TestTokenBucketBurst(t *testing.T) {
+	bucket := NewTokenBucket(1, 3)
+	for i := 0; i < 3; i++ {
+		if !bucket.TryTake() {
+			t.Fatalf("token %d of the burst was not available", i)
+		}
+	}
+	if bucket.TryTake() {
+		t.Fatal("bucket allowed more than its burst")
+	}
+}
@@ -0,0 +1,115 @@
+package telemetry
+
+import (
+	"math/bits"
+	"sync/atomic"
+	"time"
+)
+
+// Histogram buckets are log-linear in microseconds, as in HDR histograms:
+// each power of two is split into subBuckets equal parts, so a recorded
+// value is within 1/subBuckets (12.5%) of the true one.
+const (
+	subBucketBits = 3
+	subBuckets    = 1 << subBucketBits
+	maxShift      = 36 // largest bucket starts at 2^39µs, about six days
+	bucketCount   = (maxShift + 2) * subBuckets
+	maxMicros     = 1<<(maxShift+subBucketBits+1) - 1
+)
+
+// Histogram records durations with constant memory. It is safe for
+// concurrent use and recording does not lock.
+type Histogram struct {
+	counts [bucketCount]atomic.Int64
+	count  atomic.Int64
+	sum    atomic.Int64 // nanoseconds
+}
+
+// Observe records one duration
+func (h *Histogram) Observe(d time.Duration) {
+	h.counts[bucketIndex(d.Microseconds())].Add(1)
+	h.count.Add(1)
+	h.sum.Add(int64(d))
+}
+
+// Count returns how many durations were recorded
+func (h *Histogram) Count() int64 {
+	return h.count.Load()
+}
+
+// Sum returns the total of the recorded durations
+func (h *Histogram) Sum() time.Duration {
+	return time.Duration(h.sum.Load())
+}
+
+// Mean returns the average recorded duration
+func (h *Histogram) Mean() time.Duration {
+	count := h.count.Load()
+	if count == 0 {
+		return 0
+	}
+	return time.Duration(h.sum.Load() / count)
+}
+
+// Quantile returns the duration below which a fraction q of the recorded
+// durations fall, such as 0.95 for the 95th percentile
+func (h *Histogram) Quantile(q float64) time.Duration {
+	return h.Quantiles(q)[0]
+}
+
+// Quantiles returns several quantiles, in ascending order of qs, from one
+// pass over the buckets
+func (h *Histogram) Quantiles(qs ...float64) []time.Duration {
+	results := make([]time.Duration, len(qs))
+	var counts [bucketCount]int64
+	var total int64
+	for i := range h.counts {
+		counts[i] = h.counts[i].Load()
+		total += counts[i]
+	}
+	if total == 0 {
+		return results
+	}
+
+	next := 0
+	var seen int64
+	for i, count := range counts {
+		seen += count
+		for next < len(qs) && float64(seen) >= qs[next]*float64(total) {
+			results[next] = bucketValue(i)
+			next++
+		}
+		if next == len(qs) {
+			break
+		}
+	}
+	for ; next < len(qs); next++ {
+		results[next] = bucketValue(bucketCount - 1)
+	}
+	return results
+}
+
+func bucketIndex(micros int64) int {
+	if micros < subBuckets {
+		if micros < 0 {
+			return 0
+		}
+		return int(micros)
+	}
+	if micros > maxMicros {
+		micros = maxMicros
+	}
+	shift := bits.Len64(uint64(micros)) - subBucketBits - 1
+	return (shift+1)*subBuckets + int(micros>>shift) - subBuckets
+}
+
+// bucketValue returns the middle of a bucket's range
+func bucketValue(index int) time.Duration {
+	if index < subBuckets {
+		return time.Duration(index) * time.Microsecond
+	}
+	shift := index/subBuckets - 1
+	lower := int64(index%subBuckets+subBuckets) << shift
+	width := int64(1) << shift
+	return time.Duration(lower)*time.Microsecond + time.Duration(width)*time.Microsecond/2
+}
@@ -0,0 +1,113 @@
+package telemetry
+
+import (
+	"bufio"
+	"fmt"
+	"io"
+	"net/http"
+	"runtime"
+	"strconv"
+	"strings"
+)
+
+// exportedQuantiles are written for every latency summary
+var exportedQuantiles = []float64{0.5, 0.9, 0.95, 0.99}
+
+// Handler serves the metrics in the Prometheus text format
+func Handler() http.Handler {
+	return http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		w.Header().Set("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+		WritePrometheus(w)
+	})
+}
+
+// WritePrometheus writes request, query and cache metrics in the Prometheus
+// text exposition format
+func WritePrometheus(out io.Writer) error {
+	w := bufio.NewWriter(out)
+
+	routeTimers := Routes()
+	writeHeader(w, "http_request_duration_seconds", "summary", "Latency of HTTP requests by route.")
+	for _, route := range routeTimers {
+		writeSummary(w, "http_request_duration_seconds", route.Timer, "method", route.Method, "route", route.Route)
+	}
+	writeHeader(w, "http_request_errors_total", "counter", "HTTP requests answered with a 5xx status by route.")
+	for _, route := range routeTimers {
+		writeSample(w, "http_request_errors_total", float64(route.Errors()), "method", route.Method, "route", route.Route)
+	}
+
+	queryTimers := Queries()
+	writeHeader(w, "db_query_duration_seconds", "summary", "Execution time of database calls by query.")
+	for _, query := range queryTimers {
+		writeSummary(w, "db_query_duration_seconds", query.Timer, "query", query.Label)
+	}
+	writeHeader(w, "db_query_errors_total", "counter", "Database calls that returned an error by query.")
+	for _, query := range queryTimers {
+		writeSample(w, "db_query_errors_total", float64(query.Errors()), "query", query.Label)
+	}
+	writeHeader(w, "db_slow_queries_total", "counter", "Database calls slower than the slow query threshold by query.")
+	for _, query := range queryTimers {
+		writeSample(w, "db_slow_queries_total", float64(query.Slow()), "query", query.Label)
+	}
+
+	cacheStats := Caches()
+	writeHeader(w, "cache_hits_total", "counter", "Cache lookups that found an entry.")
+	for _, stats := range cacheStats {
+		writeSample(w, "cache_hits_total", float64(stats.Hits), "cache", stats.Name)
+	}
+	writeHeader(w, "cache_misses_total", "counter", "Cache lookups that found no entry.")
+	for _, stats := range cacheStats {
+		writeSample(w, "cache_misses_total", float64(stats.Misses), "cache", stats.Name)
+	}
+	writeHeader(w, "cache_entries", "gauge", "Entries held by a cache.")
+	for _, stats := range cacheStats {
+		writeSample(w, "cache_entries", float64(stats.Size), "cache", stats.Name)
+	}
+
+	writeHeader(w, "go_goroutines", "gauge", "Number of goroutines.")
+	writeSample(w, "go_goroutines", float64(runtime.NumGoroutine()))
+	if load, ok := LoadAverage(); ok {
+		writeHeader(w, "system_load_per_cpu", "gauge", "One-minute load average divided by the number of CPUs.")
+		writeSample(w, "system_load_per_cpu", load)
+	}
+	writeHeader(w, "process_uptime_seconds", "gauge", "Seconds since telemetry started recording.")
+	writeSample(w, "process_uptime_seconds", Uptime().Seconds())
+
+	return w.Flush()
+}
+
+func writeHeader(w *bufio.Writer, name, kind, help string) {
+	fmt.Fprintf(w, "# HELP %s %s\n# TYPE %s %s\n", name, help, name, kind)
+}
+
+func writeSummary(w *bufio.Writer, name string, timer *Timer, labels ...string) {
+	quantiles := timer.Quantiles(exportedQuantiles...)
+	for i, q := range exportedQuantiles {
+		writeSample(w, name, quantiles[i].Seconds(), append(labels, "quantile", strconv.FormatFloat(q, 'g', -1, 64))...)
+	}
+	writeSample(w, name+"_sum", timer.Sum().Seconds(), labels...)
+	writeSample(w, name+"_count", float64(timer.Count()), labels...)
+}
+
+// writeSample writes one line; labels alternate names and values
+func writeSample(w *bufio.Writer, name string, value float64, labels ...string) {
+	w.WriteString(name)
+	if len(labels) > 0 {
+		w.WriteByte('{')
+		for i := 0; i+1 < len(labels); i += 2 {
+			if i > 0 {
+				w.WriteByte(',')
+			}
+			w.WriteString(labels[i])
+			w.WriteString(`="`)
+			w.WriteString(labelEscaper.Replace(labels[i+1]))
+			w.WriteByte('"')
+		}
+		w.WriteByte('}')
+	}
+	w.WriteByte(' ')
+	w.WriteString(strconv.FormatFloat(value, 'g', -1, 64))
+	w.WriteByte('\n')
+}
+
+var labelEscaper = strings.NewReplacer(`\`, `\\`, `"`, `\"`, "\n", `\n`)
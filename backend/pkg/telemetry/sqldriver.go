@@ -0,0 +1,270 @@
+package telemetry
+
+import (
+	"context"
+	"database/sql/driver"
+	"strings"
+	"sync"
+	"time"
+)
+
+// InstrumentConnector wraps a database/sql connector so that every query,
+// exec and prepared statement execution is timed under its QueryLabel.
+// Query times cover the round trip to the first row, not reading the rows.
+func InstrumentConnector(connector driver.Connector) driver.Connector {
+	return instrumentedConnector{connector}
+}
+
+var namedQueries sync.Map // query text -> name
+
+// NameQuery labels a query by name instead of its verb and table
+func NameQuery(query, name string) {
+	namedQueries.Store(query, name)
+}
+
+// QueryLabel returns the name given to query with NameQuery, or else its
+// verb and first table, such as "select contests" or "insert user_teams"
+func QueryLabel(query string) string {
+	if name, exists := namedQueries.Load(query); exists {
+		return name.(string)
+	}
+
+	verb, rest := nextWord(query)
+	verb = strings.ToLower(verb)
+	var marker string
+	switch verb {
+	case "select", "with", "delete":
+		marker = "from"
+	case "insert":
+		marker = "into"
+	case "update":
+		table, _ := nextWord(rest)
+		return verb + " " + strings.ToLower(table)
+	case "":
+		return OverflowLabel
+	default:
+		return verb
+	}
+
+	for word := ""; rest != ""; {
+		word, rest = nextWord(rest)
+		if strings.EqualFold(word, marker) {
+			table, _ := nextWord(rest)
+			if table == "" || strings.EqualFold(table, "select") {
+				return verb
+			}
+			return verb + " " + strings.ToLower(table)
+		}
+	}
+	return verb
+}
+
+// nextWord returns the next identifier in s, skipping punctuation, string
+// literals and comments, and the rest of s after it
+func nextWord(s string) (string, string) {
+	i := 0
+	for i < len(s) {
+		switch c := s[i]; {
+		case c == '\'':
+			end := strings.IndexByte(s[i+1:], '\'')
+			if end < 0 {
+				return "", ""
+			}
+			i += end + 2
+		case c == '-' && strings.HasPrefix(s[i:], "--"):
+			end := strings.IndexByte(s[i:], '\n')
+			if end < 0 {
+				return "", ""
+			}
+			i += end + 1
+		case isWordByte(c):
+			start := i
+			for i < len(s) && isWordByte(s[i]) {
+				i++
+			}
+			return s[start:i], s[i:]
+		default:
+			i++
+		}
+	}
+	return "", ""
+}
+
+func isWordByte(c byte) bool {
+	return c == '_' || c == '.' || c >= 'a' && c <= 'z' || c >= 'A' && c <= 'Z' || c >= '0' && c <= '9'
+}
+
+func observe(label string, started time.Time, err error) {
+	if err == driver.ErrSkip {
+		// database/sql retries another way, which is recorded instead
+		return
+	}
+	ObserveQuery(label, time.Since(started), err)
+}
+
+type instrumentedConnector struct {
+	driver.Connector
+}
+
+func (c instrumentedConnector) Connect(ctx context.Context) (driver.Conn, error) {
+	conn, err := c.Connector.Connect(ctx)
+	if err != nil {
+		return nil, err
+	}
+	return &instrumentedConn{conn}, nil
+}
+
+// instrumentedConn passes every optional driver interface through to the
+// wrapped connection, returning driver.ErrSkip where it has none so that
+// database/sql falls back as it would without the wrapper
+type instrumentedConn struct {
+	driver.Conn
+}
+
+func (c *instrumentedConn) Prepare(query string) (driver.Stmt, error) {
+	return c.PrepareContext(context.Background(), query)
+}
+
+func (c *instrumentedConn) PrepareContext(ctx context.Context, query string) (driver.Stmt, error) {
+	var stmt driver.Stmt
+	var err error
+	if preparer, ok := c.Conn.(driver.ConnPrepareContext); ok {
+		stmt, err = preparer.PrepareContext(ctx, query)
+	} else {
+		stmt, err = c.Conn.Prepare(query)
+	}
+	if err != nil {
+		return nil, err
+	}
+	return &instrumentedStmt{Stmt: stmt, conn: c.Conn, label: QueryLabel(query)}, nil
+}
+
+func (c *instrumentedConn) BeginTx(ctx context.Context, opts driver.TxOptions) (driver.Tx, error) {
+	if beginner, ok := c.Conn.(driver.ConnBeginTx); ok {
+		return beginner.BeginTx(ctx, opts)
+	}
+	return c.Conn.Begin()
+}
+
+func (c *instrumentedConn) QueryContext(ctx context.Context, query string, args []driver.NamedValue) (driver.Rows, error) {
+	queryer, ok := c.Conn.(driver.QueryerContext)
+	if !ok {
+		return nil, driver.ErrSkip
+	}
+	started := time.Now()
+	rows, err := queryer.QueryContext(ctx, query, args)
+	observe(QueryLabel(query), started, err)
+	return rows, err
+}
+
+func (c *instrumentedConn) ExecContext(ctx context.Context, query string, args []driver.NamedValue) (driver.Result, error) {
+	execer, ok := c.Conn.(driver.ExecerContext)
+	if !ok {
+		return nil, driver.ErrSkip
+	}
+	started := time.Now()
+	result, err := execer.ExecContext(ctx, query, args)
+	observe(QueryLabel(query), started, err)
+	return result, err
+}
+
+func (c *instrumentedConn) Ping(ctx context.Context) error {
+	if pinger, ok := c.Conn.(driver.Pinger); ok {
+		return pinger.Ping(ctx)
+	}
+	return nil
+}
+
+func (c *instrumentedConn) ResetSession(ctx context.Context) error {
+	if resetter, ok := c.Conn.(driver.SessionResetter); ok {
+		return resetter.ResetSession(ctx)
+	}
+	return nil
+}
+
+func (c *instrumentedConn) IsValid() bool {
+	if validator, ok := c.Conn.(driver.Validator); ok {
+		return validator.IsValid()
+	}
+	return true
+}
+
+func (c *instrumentedConn) CheckNamedValue(value *driver.NamedValue) error {
+	if checker, ok := c.Conn.(driver.NamedValueChecker); ok {
+		return checker.CheckNamedValue(value)
+	}
+	return driver.ErrSkip
+}
+
+type instrumentedStmt struct {
+	driver.Stmt
+	conn  driver.Conn
+	label string
+}
+
+func (s *instrumentedStmt) Exec(args []driver.Value) (driver.Result, error) {
+	started := time.Now()
+	result, err := s.Stmt.Exec(args)
+	observe(s.label, started, err)
+	return result, err
+}
+
+func (s *instrumentedStmt) Query(args []driver.Value) (driver.Rows, error) {
+	started := time.Now()
+	rows, err := s.Stmt.Query(args)
+	observe(s.label, started, err)
+	return rows, err
+}
+
+func (s *instrumentedStmt) ExecContext(ctx context.Context, args []driver.NamedValue) (driver.Result, error) {
+	execer, ok := s.Stmt.(driver.StmtExecContext)
+	if !ok {
+		values, err := namedValuesToValues(args)
+		if err != nil {
+			return nil, err
+		}
+		return s.Exec(values)
+	}
+	started := time.Now()
+	result, err := execer.ExecContext(ctx, args)
+	observe(s.label, started, err)
+	return result, err
+}
+
+func (s *instrumentedStmt) QueryContext(ctx context.Context, args []driver.NamedValue) (driver.Rows, error) {
+	queryer, ok := s.Stmt.(driver.StmtQueryContext)
+	if !ok {
+		values, err := namedValuesToValues(args)
+		if err != nil {
+			return nil, err
+		}
+		return s.Query(values)
+	}
+	started := time.Now()
+	rows, err := queryer.QueryContext(ctx, args)
+	observe(s.label, started, err)
+	return rows, err
+}
+
+// CheckNamedValue uses the statement's checker, or the connection's as
+// database/sql would for an unwrapped statement
+func (s *instrumentedStmt) CheckNamedValue(value *driver.NamedValue) error {
+	if checker, ok := s.Stmt.(driver.NamedValueChecker); ok {
+		return checker.CheckNamedValue(value)
+	}
+	if checker, ok := s.conn.(driver.NamedValueChecker); ok {
+		return checker.CheckNamedValue(value)
+	}
+	return driver.ErrSkip
+}
+
+func namedValuesToValues(named []driver.NamedValue) ([]driver.Value, error) {
+	values := make([]driver.Value, len(named))
+	for i, value := range named {
+		if value.Name != "" {
+			return nil, driver.ErrSkip
+		}
+		values[i] = value.Value
+	}
+	return values, nil
+}
@@ -0,0 +1,83 @@
+package telemetry
+
+import (
+	"context"
+	"database/sql"
+	"database/sql/driver"
+	"errors"
+	"testing"
+)
+
+// fakeConnector opens connections that run Exec directly and support
+// prepared statements without context methods
+type fakeConnector struct{}
+
+func (fakeConnector) Connect(context.Context) (driver.Conn, error) { return fakeConn{}, nil }
+func (fakeConnector) Driver() driver.Driver                        { return nil }
+
+type fakeConn struct{}
+
+func (fakeConn) Prepare(query string) (driver.Stmt, error) { return fakeStmt{}, nil }
+func (fakeConn) Close() error                              { return nil }
+func (fakeConn) Begin() (driver.Tx, error)                 { return fakeTx{}, nil }
+func (fakeConn) ExecContext(context.Context, string, []driver.NamedValue) (driver.Result, error) {
+	return driver.RowsAffected(1), nil
+}
+
+type fakeStmt struct{}
+
+func (fakeStmt) Close() error                               { return nil }
+func (fakeStmt) NumInput() int                              { return -1 }
+func (fakeStmt) Exec([]driver.Value) (driver.Result, error) { return driver.RowsAffected(2), nil }
+func (fakeStmt) Query([]driver.Value) (driver.Rows, error)  { return nil, errNoRows }
+
+var errNoRows = errors.New("fake driver returns no rows")
+
+type fakeTx struct{}
+
+func (fakeTx) Commit() error   { return nil }
+func (fakeTx) Rollback() error { return nil }
+
+func queryCount(label string) int64 {
+	for _, query := range Queries() {
+		if query.Label == label {
+			return query.Count()
+		}
+	}
+	return 0
+}
+
+func TestInstrumentedConnectorRecordsQueries(t *testing.T) {
+	db := sql.OpenDB(InstrumentConnector(fakeConnector{}))
+	defer db.Close()
+
+	if _, err := db.Exec("UPDATE fake_direct SET x = $1", 1); err != nil {
+		t.Fatal(err)
+	}
+	stmt, err := db.Prepare("INSERT INTO fake_prepared (x) VALUES ($1)")
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer stmt.Close()
+	result, err := stmt.Exec(1)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if affected, _ := result.RowsAffected(); affected != 2 {
+		t.Fatalf("prepared exec affected %d rows, want the wrapped statement's 2", affected)
+	}
+
+	// Without QueryerContext the query is prepared and run as a statement
+	tx, err := db.Begin()
+	if err != nil {
+		t.Fatal(err)
+	}
+	tx.Query("SELECT x FROM fake_query")
+	tx.Rollback()
+
+	for _, label := range []string{"update fake_direct", "insert fake_prepared", "select fake_query"} {
+		if count := queryCount(label); count != 1 {
+			t.Errorf("%s recorded %d times, want 1", label, count)
+		}
+	}
+}
@@ -0,0 +1,235 @@
+package telemetry
+
+import (
+	"os"
+	"runtime"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/pkg/cache"
+)
+
+// maxSeries bounds the distinct routes or query labels tracked; anything
+// beyond is recorded under OverflowLabel
+const maxSeries = 1000
+
+// OverflowLabel collects observations once maxSeries is reached
+const OverflowLabel = "other"
+
+// DefaultSlowQuery is the execution time above which a query counts as slow
+const DefaultSlowQuery = 200 * time.Millisecond
+
+// Timer is the latency histogram and outcome counters of one series
+type Timer struct {
+	Histogram
+	errors atomic.Int64
+	slow   atomic.Int64
+}
+
+// Errors returns how many observations failed
+func (t *Timer) Errors() int64 {
+	return t.errors.Load()
+}
+
+// Slow returns how many observations exceeded the slow threshold
+func (t *Timer) Slow() int64 {
+	return t.slow.Load()
+}
+
+// series is a bounded set of timers by key
+type series[K comparable] struct {
+	mutex    sync.RWMutex
+	timers   map[K]*Timer
+	overflow K
+}
+
+func newSeries[K comparable](overflow K) *series[K] {
+	return &series[K]{timers: make(map[K]*Timer), overflow: overflow}
+}
+
+func (s *series[K]) timer(key K) *Timer {
+	s.mutex.RLock()
+	timer, exists := s.timers[key]
+	s.mutex.RUnlock()
+	if exists {
+		return timer
+	}
+
+	s.mutex.Lock()
+	defer s.mutex.Unlock()
+	if timer, exists := s.timers[key]; exists {
+		return timer
+	}
+	if len(s.timers) >= maxSeries {
+		key = s.overflow
+		if timer, exists := s.timers[key]; exists {
+			return timer
+		}
+	}
+	timer = &Timer{}
+	s.timers[key] = timer
+	return timer
+}
+
+func (s *series[K]) each(fn func(key K, timer *Timer)) {
+	s.mutex.RLock()
+	defer s.mutex.RUnlock()
+	for key, timer := range s.timers {
+		fn(key, timer)
+	}
+}
+
+// RouteKey identifies a route by method and path template
+type RouteKey struct {
+	Method string
+	Route  string
+}
+
+var (
+	started     = time.Now()
+	allRequests Timer
+	routes      = newSeries(RouteKey{Method: OverflowLabel, Route: OverflowLabel})
+	queries     = newSeries(OverflowLabel)
+	slowQuery   atomic.Int64
+)
+
+func init() {
+	slowQuery.Store(int64(DefaultSlowQuery))
+}
+
+// SetSlowQueryThreshold sets the execution time above which a query is
+// counted as slow
+func SetSlowQueryThreshold(d time.Duration) {
+	if d > 0 {
+		slowQuery.Store(int64(d))
+	}
+}
+
+// ObserveRequest records a handled request. Responses with a 5xx status
+// count as errors.
+func ObserveRequest(method, route string, status int, elapsed time.Duration) {
+	timer := routes.timer(RouteKey{Method: method, Route: route})
+	timer.Observe(elapsed)
+	allRequests.Observe(elapsed)
+	if status >= 500 {
+		timer.errors.Add(1)
+		allRequests.errors.Add(1)
+	}
+}
+
+// ObserveQuery records a database call under label
+func ObserveQuery(label string, elapsed time.Duration, err error) {
+	timer := queries.timer(label)
+	timer.Observe(elapsed)
+	if err != nil {
+		timer.errors.Add(1)
+	}
+	if elapsed > time.Duration(slowQuery.Load()) {
+		timer.slow.Add(1)
+	}
+}
+
+// AllRequests returns the timer of every request regardless of route
+func AllRequests() *Timer {
+	return &allRequests
+}
+
+// Uptime returns how long telemetry has been recording
+func Uptime() time.Duration {
+	return time.Since(started)
+}
+
+// RouteTimer is the timer of one route
+type RouteTimer struct {
+	RouteKey
+	*Timer
+}
+
+// Routes returns the timers of every route, busiest first
+func Routes() []RouteTimer {
+	var result []RouteTimer
+	routes.each(func(key RouteKey, timer *Timer) {
+		result = append(result, RouteTimer{RouteKey: key, Timer: timer})
+	})
+	sort.Slice(result, func(i, j int) bool {
+		if ci, cj := result[i].Count(), result[j].Count(); ci != cj {
+			return ci > cj
+		}
+		return result[i].Method+result[i].Route < result[j].Method+result[j].Route
+	})
+	return result
+}
+
+// QueryTimer is the timer of one query label
+type QueryTimer struct {
+	Label string
+	*Timer
+}
+
+// Queries returns the timers of every query label, most executed first
+func Queries() []QueryTimer {
+	var result []QueryTimer
+	queries.each(func(label string, timer *Timer) {
+		result = append(result, QueryTimer{Label: label, Timer: timer})
+	})
+	sort.Slice(result, func(i, j int) bool {
+		if ci, cj := result[i].Count(), result[j].Count(); ci != cj {
+			return ci > cj
+		}
+		return result[i].Label < result[j].Label
+	})
+	return result
+}
+
+var (
+	cacheMutex sync.RWMutex
+	caches     = make(map[string]func() cache.Stats)
+)
+
+// RegisterCache reports a cache's counters under name
+func RegisterCache(name string, stats func() cache.Stats) {
+	cacheMutex.Lock()
+	defer cacheMutex.Unlock()
+	caches[name] = stats
+}
+
+// CacheStats is the counters of one registered cache
+type CacheStats struct {
+	Name string
+	cache.Stats
+}
+
+// Caches returns the counters of every registered cache, by name
+func Caches() []CacheStats {
+	cacheMutex.RLock()
+	result := make([]CacheStats, 0, len(caches))
+	for name, stats := range caches {
+		result = append(result, CacheStats{Name: name, Stats: stats()})
+	}
+	cacheMutex.RUnlock()
+
+	sort.Slice(result, func(i, j int) bool { return result[i].Name < result[j].Name })
+	return result
+}
+
+// LoadAverage returns the one-minute load average divided by the number of
+// CPUs, or false where /proc/loadavg is not available
+func LoadAverage() (float64, bool) {
+	data, err := os.ReadFile("/proc/loadavg")
+	if err != nil {
+		return 0, false
+	}
+	fields := strings.Fields(string(data))
+	if len(fields) == 0 {
+		return 0, false
+	}
+	load, err := strconv.ParseFloat(fields[0], 64)
+	if err != nil {
+		return 0, false
+	}
+	return load / float64(runtime.NumCPU()), true
+}
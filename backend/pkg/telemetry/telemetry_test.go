@@ -0,0 +1,91 @@
+package telemetry
+
+import (
+	"bytes"
+	"errors"
+	"strings"
+	"testing"
+	"time"
+)
+
+func TestHistogramQuantiles(t *testing.T) {
+	var h Histogram
+	for i := 1; i <= 1000; i++ {
+		h.Observe(time.Duration(i) * time.Millisecond)
+	}
+
+	quantiles := h.Quantiles(0.5, 0.95, 0.99)
+	for i, want := range []time.Duration{500 * time.Millisecond, 950 * time.Millisecond, 990 * time.Millisecond} {
+		got := quantiles[i]
+		if diff := got - want; diff < -want/8 || diff > want/8 {
+			t.Errorf("quantile %d = %v, want within 12.5%% of %v", i, got, want)
+		}
+	}
+	if h.Count() != 1000 {
+		t.Fatalf("count = %d, want 1000", h.Count())
+	}
+	if mean := h.Mean(); mean != 500500*time.Microsecond {
+		t.Fatalf("mean = %v, want 500.5ms", mean)
+	}
+}
+
+func TestHistogramBucketsCoverRange(t *testing.T) {
+	for _, micros := range []int64{0, 1, 7, 8, 15, 16, 1000, 123456, maxMicros, maxMicros * 4} {
+		index := bucketIndex(micros)
+		if index < 0 || index >= bucketCount {
+			t.Fatalf("bucketIndex(%d) = %d, out of range", micros, index)
+		}
+		if micros < maxMicros {
+			value := bucketValue(index).Microseconds()
+			if diff := value - micros; diff < -micros/8-1 || diff > micros/8+1 {
+				t.Errorf("bucketValue(bucketIndex(%d)) = %d", micros, value)
+			}
+		}
+	}
+}
+
+func TestQueryLabel(t *testing.T) {
+	NameQuery("SELECT 1 FROM named", "named_query")
+
+	cases := map[string]string{
+		"SELECT 1 FROM named": "named_query",
+		`
+		-- leaderboard
+		SELECT cp.team_id, 'from x' FROM contest_participants cp WHERE cp.contest_id = $1`: "select contest_participants",
+		"INSERT INTO user_teams (user_id) VALUES ($1)":      "insert user_teams",
+		"update wallet_transactions SET status = $1":        "update wallet_transactions",
+		"DELETE FROM analytics_hourly_rollups WHERE x < $1": "delete analytics_hourly_rollups",
+		"SELECT COUNT(*) FROM (SELECT id FROM users) AS u":  "select",
+		"SELECT pg_try_advisory_xact_lock($1)":              "select",
+		"BEGIN":                                             "begin",
+		"":                                                  OverflowLabel,
+	}
+	for query, want := range cases {
+		if got := QueryLabel(query); got != want {
+			t.Errorf("QueryLabel(%q) = %q, want %q", query, got, want)
+		}
+	}
+}
+
+func TestWritePrometheus(t *testing.T) {
+	ObserveRequest("GET", "/api/v1/contests/:id", 200, 20*time.Millisecond)
+	ObserveRequest("GET", "/api/v1/contests/:id", 503, 40*time.Millisecond)
+	ObserveQuery(`select "quoted"`, time.Second, errors.New("timeout"))
+
+	var out bytes.Buffer
+	if err := WritePrometheus(&out); err != nil {
+		t.Fatal(err)
+	}
+	text := out.String()
+	for _, want := range []string{
+		"# TYPE http_request_duration_seconds summary\n",
+		`http_request_duration_seconds_count{method="GET",route="/api/v1/contests/:id"} 2`,
+		`http_request_errors_total{method="GET",route="/api/v1/contests/:id"} 1`,
+		`db_slow_queries_total{query="select \"quoted\""} 1`,
+		`db_query_errors_total{query="select \"quoted\""} 1`,
+	} {
+		if !strings.Contains(text, want) {
+			t.Errorf("output is missing %q:\n%s", want, text)
+		}
+	}
+}
@@ -0,0 +1,155 @@
+//go:build linux
+
+package websocket
+
+import (
+	"fmt"
+	"io"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"syscall"
+	"testing"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"github.com/gorilla/websocket"
+)
+
+// sampleUpdate builds a leaderboard update of realistic size: a top-50 page
+// and a burst of rank changes.
+func sampleUpdate() models.RealTimeLeaderboardUpdate {
+	update := models.RealTimeLeaderboardUpdate{
+		ContestID:         1,
+		UpdateID:          "bench",
+		UpdateType:        "rank_change",
+		UpdateTimestamp:   time.Now(),
+		TotalParticipants: 100000,
+		TriggerSource:     "match_event",
+	}
+	for i := 0; i < 50; i++ {
+		update.TopPerformers = append(update.TopPerformers, models.LeaderboardEntry{
+			Rank:     i + 1,
+			UserID:   int64(1000 + i),
+			Username: fmt.Sprintf("player_%d", i),
+			TeamName: fmt.Sprintf("Team %d", i),
+			Points:   float64(500 - i*3),
+		})
+	}
+	for i := 0; i < 20; i++ {
+		update.RankChanges = append(update.RankChanges, models.LeaderboardRankChange{
+			UserID:       int64(1000 + i),
+			TeamID:       int64(5000 + i),
+			Username:     fmt.Sprintf("player_%d", i),
+			TeamName:     fmt.Sprintf("Team %d", i),
+			PreviousRank: i + 3,
+			NewRank:      i + 1,
+			RankChange:   2,
+			NewPoints:    float64(500 - i*3),
+			PointsChange: 12,
+		})
+	}
+	return update
+}
+
+// dialSubscribers opens n real WebSocket connections through an httptest
+// server and returns the server-side ends. Clients discard what they read.
+func dialSubscribers(b *testing.B, n int, compress bool) []*websocket.Conn {
+	upgrader := websocket.Upgrader{EnableCompression: compress}
+	accepted := make(chan *websocket.Conn, n)
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		conn, err := upgrader.Upgrade(w, r, nil)
+		if err != nil {
+			b.Errorf("upgrade failed: %v", err)
+			return
+		}
+		accepted <- conn
+	}))
+	b.Cleanup(server.Close)
+
+	dialer := websocket.Dialer{EnableCompression: compress}
+	url := "ws" + strings.TrimPrefix(server.URL, "http")
+
+	conns := make([]*websocket.Conn, 0, n)
+	for i := 0; i < n; i++ {
+		client, _, err := dialer.Dial(url, nil)
+		if err != nil {
+			b.Fatalf("dial failed: %v", err)
+		}
+		b.Cleanup(func() { client.Close() })
+		go func() {
+			for {
+				_, r, err := client.NextReader()
+				if err != nil {
+					return
+				}
+				io.Copy(io.Discard, r)
+			}
+		}()
+
+		conn := <-accepted
+		b.Cleanup(func() { conn.Close() })
+		conns = append(conns, conn)
+	}
+	return conns
+}
+
+func processCPUTime() time.Duration {
+	var usage syscall.Rusage
+	syscall.Getrusage(syscall.RUSAGE_SELF, &usage)
+	return time.Duration(usage.Utime.Nano() + usage.Stime.Nano())
+}
+
+// BenchmarkBroadcastEncoding compares encoding an update once per subscriber
+// (WriteJSON) with encoding it once and sharing a PreparedMessage, with and
+// without permessage-deflate. cpu-ms/broadcast is process CPU time, which
+// includes the client readers.
+func BenchmarkBroadcastEncoding(b *testing.B) {
+	const subscribers = 200
+	update := sampleUpdate()
+
+	for _, compress := range []bool{false, true} {
+		for _, prepared := range []bool{false, true} {
+			mode := "write_json"
+			if prepared {
+				mode = "prepared"
+			}
+
+			b.Run(fmt.Sprintf("%s/compression=%t", mode, compress), func(b *testing.B) {
+				conns := dialSubscribers(b, subscribers, compress)
+
+				b.ReportAllocs()
+				b.ResetTimer()
+				cpuStart := processCPUTime()
+				for i := 0; i < b.N; i++ {
+					message := models.RealTimeWebSocketMessage{
+						Type:      "leaderboard_update",
+						ContestID: update.ContestID,
+						Data:      update,
+						Timestamp: time.Now(),
+						MessageID: generateMessageID(),
+					}
+
+					outbound := Outbound{Message: message}
+					if prepared {
+						pm, err := prepareMessage(message)
+						if err != nil {
+							b.Fatal(err)
+						}
+						outbound.Prepared = pm
+					}
+
+					for _, conn := range conns {
+						if err := outbound.WriteTo(conn); err != nil {
+							b.Fatal(err)
+						}
+					}
+				}
+				cpu := processCPUTime() - cpuStart
+				b.StopTimer()
+
+				b.ReportMetric(float64(cpu.Microseconds())/1000.0/float64(b.N), "cpu-ms/broadcast")
+			})
+		}
+	}
+}
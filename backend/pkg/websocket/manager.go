@@ -1,21 +1,45 @@
 package websocket
 
 import (
+	"encoding/json"
 	"log"
 	"sync"
+	"sync/atomic"
 	"time"
 	"fantasy-esports-backend/models"
 	"github.com/gorilla/websocket"
 )
 
-// ConnectionManager manages WebSocket connections for real-time leaderboards
+const (
+	// Buffer sizes for the per-contest control channels. Callers only block
+	// once a shard falls this far behind.
+	registerBufferSize  = 1024
+	broadcastBufferSize = 64
+
+	inactiveTimeout = 2 * time.Minute
+	cleanupInterval = 30 * time.Second
+)
+
+// Leaderboard protocol versions a client can subscribe with
+const (
+	ProtocolFull  = 1 // every update carries the full top window
+	ProtocolDelta = 2 // sequenced deltas, with snapshot resync on a gap
+)
+
+// ConnectionManager manages WebSocket connections for real-time leaderboards.
+// Every contest with subscribers gets its own shard with its own goroutines,
+// so a contest with 100k sockets never stalls registrations or broadcasts
+// for the others.
 type ConnectionManager struct {
-	connections map[string]*LeaderboardConnection
-	contestSubs map[int64][]*LeaderboardConnection // contest_id -> connections
-	mutex       sync.RWMutex
-	broadcast   chan models.RealTimeLeaderboardUpdate
-	register    chan *LeaderboardConnection
-	unregister  chan *LeaderboardConnection
+	shards      map[int64]*contestShard // contest_id -> shard
+	mutex       sync.RWMutex            // guards shards
+	connections sync.Map                // connection_id -> *LeaderboardConnection
+
+	broadcasts      atomic.Int64
+	delivered       atomic.Int64
+	droppedUpdates  atomic.Int64
+	evictedSlow     atomic.Int64
+	evictedInactive atomic.Int64
 }
 
 type LeaderboardConnection struct {
@@ -23,19 +47,128 @@ type LeaderboardConnection struct {
 	ContestID    int64                    `json:"contest_id"`
 	ConnectionID string                   `json:"connection_id"`
 	Conn         *websocket.Conn          `json:"-"`
-	Send         chan models.RealTimeWebSocketMessage `json:"-"`
+	Send         chan Outbound            `json:"-"`
 	ConnectedAt  time.Time                `json:"connected_at"`
 	LastPing     time.Time                `json:"last_ping"`
 	IsActive     bool                     `json:"is_active"`
+	ProtocolVersion int                   `json:"protocol_version"`
+
+	lastPing atomic.Int64 // unix nanos, updated from the read goroutine
+	sendMu   sync.RWMutex // orders sends against closing Send
+	closed   atomic.Bool  // set once Send has been closed
+	index    int          // position in the shard's subscriber list
+}
+
+// Outbound is a message queued for one connection. Broadcasts carry a frame
+// prepared once for all subscribers; direct messages are encoded by the
+// connection's writer.
+type Outbound struct {
+	Message  models.RealTimeWebSocketMessage
+	Prepared *websocket.PreparedMessage
+}
+
+// WriteTo writes the message to a WebSocket connection
+func (m Outbound) WriteTo(conn *websocket.Conn) error {
+	if m.Prepared != nil {
+		return conn.WritePreparedMessage(m.Prepared)
+	}
+	return conn.WriteJSON(m.Message)
+}
+
+// prepareMessage encodes a message once and wraps it in a PreparedMessage.
+// gorilla builds each frame variant (plain or permessage-deflate) lazily and
+// only once, so every subscriber shares the same bytes.
+func prepareMessage(message models.RealTimeWebSocketMessage) (*websocket.PreparedMessage, error) {
+	data, err := json.Marshal(message)
+	if err != nil {
+		return nil, err
+	}
+	return websocket.NewPreparedMessage(websocket.TextMessage, data)
+}
+
+// TrySend queues a message without blocking. It reports false if the
+// connection is closed or its buffer is full.
+func (conn *LeaderboardConnection) TrySend(message models.RealTimeWebSocketMessage) bool {
+	return conn.trySend(Outbound{Message: message})
+}
+
+func (conn *LeaderboardConnection) trySend(message Outbound) bool {
+	conn.sendMu.RLock()
+	defer conn.sendMu.RUnlock()
+
+	if conn.closed.Load() {
+		return false
+	}
+	select {
+	case conn.Send <- message:
+		return true
+	default:
+		return false
+	}
+}
+
+// close closes Send exactly once and reports whether this call closed it
+func (conn *LeaderboardConnection) close() bool {
+	conn.sendMu.Lock()
+	defer conn.sendMu.Unlock()
+
+	if conn.closed.Load() {
+		return false
+	}
+	conn.closed.Store(true)
+	close(conn.Send)
+	return true
+}
+
+// HubStats is a point-in-time view of the connection hub counters
+type HubStats struct {
+	Contests          int   `json:"contests"`
+	Connections       int64 `json:"connections"`
+	Broadcasts        int64 `json:"broadcasts"`
+	MessagesDelivered int64 `json:"messages_delivered"`
+	DroppedUpdates    int64 `json:"dropped_updates"`
+	EvictedSlow       int64 `json:"evicted_slow"`
+	EvictedInactive   int64 `json:"evicted_inactive"`
+}
+
+// broadcastJob is one queued broadcast. Delta protocol subscribers receive
+// delta when it is set and message otherwise. A job with personal messages
+// instead goes only to the connections of the listed users.
+type broadcastJob struct {
+	message  models.RealTimeWebSocketMessage
+	delta    *models.RealTimeWebSocketMessage
+	personal map[int64]models.RealTimeWebSocketMessage // user_id -> message
+}
+
+// contestShard owns the subscribers of one contest. Its run loop is the only
+// writer of the subscriber list and publishes an immutable snapshot after
+// every batch of changes; the fan-out goroutine reads that snapshot without
+// taking any lock.
+type contestShard struct {
+	contestID int64
+	manager   *ConnectionManager
+
+	register   chan *LeaderboardConnection
+	unregister chan *LeaderboardConnection
+	broadcast  chan broadcastJob
+	quit       chan struct{}
+
+	members     atomic.Int64 // registrations sent and not yet unregistered
+	subscribers []*LeaderboardConnection
+	dirty       bool
+	snapshot    atomic.Pointer[subscriberSet]
+}
+
+// subscriberSet is an immutable view of a contest's subscribers, indexed by
+// user for personalized delivery
+type subscriberSet struct {
+	all    []*LeaderboardConnection
+	byUser map[int64][]*LeaderboardConnection
 }
 
 func NewConnectionManager() *ConnectionManager {
 	return &ConnectionManager{
-		connections: make(map[string]*LeaderboardConnection),
-		contestSubs: make(map[int64][]*LeaderboardConnection),
-		broadcast:   make(chan models.RealTimeLeaderboardUpdate),
-		register:    make(chan *LeaderboardConnection),
-		unregister:  make(chan *LeaderboardConnection),
+		shards: make(map[int64]*contestShard),
 	}
 }
 
@@ -43,51 +176,303 @@ func (cm *ConnectionManager) Start() {
 	go cm.run()
 }
 
+// run retires the shards of contests that no longer have subscribers
 func (cm *ConnectionManager) run() {
-	ticker := time.NewTicker(30 * time.Second) // Ping every 30 seconds
+	ticker := time.NewTicker(cleanupInterval)
 	defer ticker.Stop()
 
-	for {
-		select {
-		case conn := <-cm.register:
-			cm.registerConnection(conn)
+	for range ticker.C {
+		cm.mutex.Lock()
+		for contestID, shard := range cm.shards {
+			if shard.members.Load() == 0 && len(shard.broadcast) == 0 {
+				close(shard.quit)
+				delete(cm.shards, contestID)
+			}
+		}
+		cm.mutex.Unlock()
+	}
+}
 
-		case conn := <-cm.unregister:
-			cm.unregisterConnection(conn)
+// withShard runs fn with the contest's shard while holding the read lock, so
+// the shard cannot be retired between lookup and use. fn must not block:
+// the janitor waits for the lock, and registrations for every other contest
+// wait behind it. Blocking sends go through pinShard instead.
+func (cm *ConnectionManager) withShard(contestID int64, fn func(*contestShard)) {
+	cm.mutex.RLock()
+	defer cm.mutex.RUnlock()
+	if shard, exists := cm.shards[contestID]; exists {
+		fn(shard)
+	}
+}
 
-		case update := <-cm.broadcast:
-			cm.broadcastToContest(update)
+// pinShard returns the contest's shard with its member count raised, which
+// keeps the janitor from retiring it, or nil if there is none and create is
+// not set. The lock is released before returning, so a send to a backed-up
+// shard blocks only the caller.
+func (cm *ConnectionManager) pinShard(contestID int64, create bool) *contestShard {
+	cm.mutex.RLock()
+	shard, exists := cm.shards[contestID]
+	if exists {
+		shard.members.Add(1)
+	}
+	cm.mutex.RUnlock()
+	if exists || !create {
+		return shard
+	}
 
-		case <-ticker.C:
-			cm.cleanupInactiveConnections()
-		}
+	cm.mutex.Lock()
+	defer cm.mutex.Unlock()
+	shard, exists = cm.shards[contestID]
+	if !exists {
+		shard = newContestShard(contestID, cm)
+		cm.shards[contestID] = shard
 	}
+	shard.members.Add(1)
+	return shard
 }
 
 func (cm *ConnectionManager) RegisterConnection(conn *LeaderboardConnection) {
-	cm.register <- conn
+	conn.lastPing.Store(time.Now().UnixNano())
+	cm.connections.Store(conn.ConnectionID, conn)
+
+	// The pin is the connection's membership until it unregisters
+	shard := cm.pinShard(conn.ContestID, true)
+	shard.register <- conn
 }
 
+// UnregisterConnection removes a connection and closes its Send channel. It
+// is safe to call more than once and from any goroutine.
 func (cm *ConnectionManager) UnregisterConnection(conn *LeaderboardConnection) {
-	cm.unregister <- conn
+	if conn.closed.Load() {
+		return
+	}
+	shard := cm.pinShard(conn.ContestID, false)
+	if shard == nil {
+		return
+	}
+	shard.unregister <- conn
+	shard.members.Add(-1)
 }
 
+// BroadcastUpdate queues an update for every subscriber of its contest. It
+// never waits on the fan-out; if the contest's queue is full the update is
+// dropped and counted.
 func (cm *ConnectionManager) BroadcastUpdate(update models.RealTimeLeaderboardUpdate) {
-	cm.broadcast <- update
+	message := models.RealTimeWebSocketMessage{
+		Type:      "leaderboard_update",
+		ContestID: update.ContestID,
+		Data:      update,
+		Timestamp: time.Now(),
+		MessageID: generateMessageID(),
+	}
+	cm.BroadcastMessage(update.ContestID, message)
 }
 
-func (cm *ConnectionManager) registerConnection(conn *LeaderboardConnection) {
-	cm.mutex.Lock()
-	defer cm.mutex.Unlock()
+// BroadcastLeaderboard queues a leaderboard update in both protocol
+// versions: the full update for v1 subscribers and the delta for v2.
+func (cm *ConnectionManager) BroadcastLeaderboard(update models.RealTimeLeaderboardUpdate, delta models.LeaderboardDelta) {
+	now := time.Now()
+	messageID := generateMessageID()
+	cm.queueBroadcast(update.ContestID, broadcastJob{
+		message: models.RealTimeWebSocketMessage{
+			Type:      "leaderboard_update",
+			ContestID: update.ContestID,
+			Data:      update,
+			Timestamp: now,
+			MessageID: messageID,
+		},
+		delta: &models.RealTimeWebSocketMessage{
+			Type:      "leaderboard_delta",
+			ContestID: delta.ContestID,
+			Data:      delta,
+			Timestamp: now,
+			MessageID: messageID,
+		},
+	})
+}
 
-	// Add to connections map
-	cm.connections[conn.ConnectionID] = conn
+// BroadcastMessage queues an arbitrary message for every subscriber of a
+// contest. It reports false if the message was dropped.
+func (cm *ConnectionManager) BroadcastMessage(contestID int64, message models.RealTimeWebSocketMessage) bool {
+	return cm.queueBroadcast(contestID, broadcastJob{message: message})
+}
 
-	// Add to contest subscriptions
-	if cm.contestSubs[conn.ContestID] == nil {
-		cm.contestSubs[conn.ContestID] = make([]*LeaderboardConnection, 0)
+func (cm *ConnectionManager) queueBroadcast(contestID int64, job broadcastJob) bool {
+	queued := false
+	cm.withShard(contestID, func(shard *contestShard) {
+		select {
+		case shard.broadcast <- job:
+			cm.broadcasts.Add(1)
+			queued = true
+		default:
+			cm.droppedUpdates.Add(1)
+			log.Printf("Dropped leaderboard update for contest %d: broadcast queue full", contestID)
+		}
+	})
+	return queued
+}
+
+func (cm *ConnectionManager) GetContestConnectionCount(contestID int64) int {
+	count := 0
+	cm.withShard(contestID, func(shard *contestShard) {
+		count = len(shard.loadSnapshot())
+	})
+	return count
+}
+
+func (cm *ConnectionManager) UpdateConnectionPing(connectionID string) {
+	if value, exists := cm.connections.Load(connectionID); exists {
+		value.(*LeaderboardConnection).lastPing.Store(time.Now().UnixNano())
 	}
-	cm.contestSubs[conn.ContestID] = append(cm.contestSubs[conn.ContestID], conn)
+}
+
+// Stats returns the current hub counters
+func (cm *ConnectionManager) Stats() HubStats {
+	cm.mutex.RLock()
+	stats := HubStats{Contests: len(cm.shards)}
+	for _, shard := range cm.shards {
+		stats.Connections += int64(len(shard.loadSnapshot()))
+	}
+	cm.mutex.RUnlock()
+
+	stats.Broadcasts = cm.broadcasts.Load()
+	stats.MessagesDelivered = cm.delivered.Load()
+	stats.DroppedUpdates = cm.droppedUpdates.Load()
+	stats.EvictedSlow = cm.evictedSlow.Load()
+	stats.EvictedInactive = cm.evictedInactive.Load()
+	return stats
+}
+
+// Helper function to generate unique message IDs
+func generateMessageID() string {
+	return time.Now().Format("20060102150405.000000")
+}
+
+// SendPersonalizedUpdate sends an update specific to a user
+func (cm *ConnectionManager) SendPersonalizedUpdate(userID int64, contestID int64, update models.RealTimeWebSocketMessage) {
+	cm.withShard(contestID, func(shard *contestShard) {
+		for _, conn := range shard.userConnections(userID) {
+			// A blocked connection will be cleaned up later
+			conn.TrySend(update)
+		}
+	})
+}
+
+// ConnectedUserIDs returns the users with at least one open connection to a contest
+func (cm *ConnectionManager) ConnectedUserIDs(contestID int64) []int64 {
+	var userIDs []int64
+	cm.withShard(contestID, func(shard *contestShard) {
+		byUser := shard.snapshot.Load().byUser
+		userIDs = make([]int64, 0, len(byUser))
+		for userID := range byUser {
+			userIDs = append(userIDs, userID)
+		}
+	})
+	return userIDs
+}
+
+// SendPersonalizedLeaderboards queues each user's own rank update. It goes
+// through the contest's broadcast queue so it arrives after the shared
+// update it was computed with.
+func (cm *ConnectionManager) SendPersonalizedLeaderboards(contestID int64, updates map[int64]models.PersonalLeaderboardUpdate) {
+	now := time.Now()
+	messageID := generateMessageID()
+	personal := make(map[int64]models.RealTimeWebSocketMessage, len(updates))
+	for userID, update := range updates {
+		personal[userID] = models.RealTimeWebSocketMessage{
+			Type:      "my_rank_update",
+			ContestID: contestID,
+			Data:      update,
+			Timestamp: now,
+			MessageID: messageID,
+		}
+	}
+	cm.queueBroadcast(contestID, broadcastJob{personal: personal})
+}
+
+func newContestShard(contestID int64, cm *ConnectionManager) *contestShard {
+	shard := &contestShard{
+		contestID:  contestID,
+		manager:    cm,
+		register:   make(chan *LeaderboardConnection, registerBufferSize),
+		unregister: make(chan *LeaderboardConnection, registerBufferSize),
+		broadcast:  make(chan broadcastJob, broadcastBufferSize),
+		quit:       make(chan struct{}),
+	}
+	shard.snapshot.Store(&subscriberSet{byUser: make(map[int64][]*LeaderboardConnection)})
+
+	go shard.run()
+	go shard.fanOut()
+	return shard
+}
+
+func (s *contestShard) loadSnapshot() []*LeaderboardConnection {
+	return s.snapshot.Load().all
+}
+
+func (s *contestShard) userConnections(userID int64) []*LeaderboardConnection {
+	return s.snapshot.Load().byUser[userID]
+}
+
+func (s *contestShard) run() {
+	ticker := time.NewTicker(cleanupInterval)
+	defer ticker.Stop()
+
+	for {
+		select {
+		case conn := <-s.register:
+			s.registerConnection(conn)
+
+		case conn := <-s.unregister:
+			s.unregisterConnection(conn)
+
+		case <-ticker.C:
+			s.cleanupInactiveConnections()
+
+		case <-s.quit:
+			return
+		}
+
+		// Apply everything already queued before publishing, so a connect
+		// storm costs one snapshot copy per batch rather than per socket
+		s.drainPending()
+		s.publish()
+	}
+}
+
+func (s *contestShard) drainPending() {
+	for {
+		select {
+		case conn := <-s.register:
+			s.registerConnection(conn)
+		case conn := <-s.unregister:
+			s.unregisterConnection(conn)
+		default:
+			return
+		}
+	}
+}
+
+func (s *contestShard) publish() {
+	if !s.dirty {
+		return
+	}
+	snapshot := &subscriberSet{
+		all:    make([]*LeaderboardConnection, len(s.subscribers)),
+		byUser: make(map[int64][]*LeaderboardConnection, len(s.subscribers)),
+	}
+	copy(snapshot.all, s.subscribers)
+	for _, conn := range s.subscribers {
+		snapshot.byUser[conn.UserID] = append(snapshot.byUser[conn.UserID], conn)
+	}
+	s.snapshot.Store(snapshot)
+	s.dirty = false
+}
+
+func (s *contestShard) registerConnection(conn *LeaderboardConnection) {
+	conn.index = len(s.subscribers)
+	s.subscribers = append(s.subscribers, conn)
+	s.dirty = true
 
 	conn.IsActive = true
 	conn.LastPing = time.Now()
@@ -107,130 +492,139 @@ func (cm *ConnectionManager) registerConnection(conn *LeaderboardConnection) {
 		MessageID: generateMessageID(),
 	}
 
-	select {
-	case conn.Send <- confirmMsg:
-	default:
-		close(conn.Send)
+	if !conn.TrySend(confirmMsg) {
+		s.unregisterConnection(conn)
 	}
 }
 
-func (cm *ConnectionManager) unregisterConnection(conn *LeaderboardConnection) {
-	cm.mutex.Lock()
-	defer cm.mutex.Unlock()
-
-	// Remove from connections map
-	delete(cm.connections, conn.ConnectionID)
-
-	// Remove from contest subscriptions
-	if subs, exists := cm.contestSubs[conn.ContestID]; exists {
-		for i, sub := range subs {
-			if sub.ConnectionID == conn.ConnectionID {
-				cm.contestSubs[conn.ContestID] = append(subs[:i], subs[i+1:]...)
-				break
-			}
-		}
-		// Clean up empty contest subscription lists
-		if len(cm.contestSubs[conn.ContestID]) == 0 {
-			delete(cm.contestSubs, conn.ContestID)
-		}
+// unregisterConnection is only called from the run loop. Removal swaps the
+// last subscriber into the freed slot so it is O(1) at any contest size.
+func (s *contestShard) unregisterConnection(conn *LeaderboardConnection) {
+	last := len(s.subscribers) - 1
+	if conn.index <= last && s.subscribers[conn.index] == conn {
+		moved := s.subscribers[last]
+		s.subscribers[conn.index] = moved
+		moved.index = conn.index
+		s.subscribers[last] = nil
+		s.subscribers = s.subscribers[:last]
+		s.dirty = true
 	}
 
+	if !conn.close() {
+		return
+	}
+	s.manager.connections.Delete(conn.ConnectionID)
+	s.members.Add(-1)
 	conn.IsActive = false
-	close(conn.Send)
 
 	log.Printf("Unregistered leaderboard connection: User %d for Contest %d", conn.UserID, conn.ContestID)
 }
 
-func (cm *ConnectionManager) broadcastToContest(update models.RealTimeLeaderboardUpdate) {
-	cm.mutex.RLock()
-	defer cm.mutex.RUnlock()
+func (s *contestShard) cleanupInactiveConnections() {
+	cutoff := time.Now().Add(-inactiveTimeout).UnixNano()
+
+	// Iterate over a copy; removal reorders the live list
+	for _, conn := range s.loadSnapshot() {
+		if conn.lastPing.Load() < cutoff {
+			log.Printf("Cleaning up inactive connection: %s", conn.ConnectionID)
+			s.unregisterConnection(conn)
+			s.manager.evictedInactive.Add(1)
+		}
+	}
+}
+
+// fanOut delivers queued broadcasts in order from the latest published
+// snapshot. Slow connections are handed back to the run loop for removal;
+// since fanOut is a separate goroutine that send cannot deadlock the loop.
+func (s *contestShard) fanOut() {
+	for {
+		select {
+		case job := <-s.broadcast:
+			s.deliver(job)
+		case <-s.quit:
+			return
+		}
+	}
+}
 
-	connections, exists := cm.contestSubs[update.ContestID]
-	if !exists || len(connections) == 0 {
+func (s *contestShard) deliver(job broadcastJob) {
+	if job.personal != nil {
+		s.deliverPersonal(job.personal)
 		return
 	}
 
-	message := models.RealTimeWebSocketMessage{
-		Type:      "leaderboard_update",
-		ContestID: update.ContestID,
-		Data:      update,
-		Timestamp: time.Now(),
-		MessageID: generateMessageID(),
+	connections := s.loadSnapshot()
+	if len(connections) == 0 {
+		return
 	}
 
-	log.Printf("Broadcasting leaderboard update to %d connections for contest %d", len(connections), update.ContestID)
+	log.Printf("Broadcasting leaderboard update to %d connections for contest %d", len(connections), s.contestID)
+
+	// Serialize once for the whole contest instead of once per subscriber
+	outbound := s.prepareOutbound(job.message)
+	deltaOutbound := outbound
+	if job.delta != nil {
+		deltaOutbound = s.prepareOutbound(*job.delta)
+	}
 
+	var delivered int64
 	for _, conn := range connections {
-		if !conn.IsActive {
+		if conn.closed.Load() {
 			continue
 		}
 
-		select {
-		case conn.Send <- message:
-		default:
-			// Connection is blocked, close it
-			cm.unregister <- conn
+		message := outbound
+		if conn.ProtocolVersion == ProtocolDelta {
+			message = deltaOutbound
 		}
-	}
-}
-
-func (cm *ConnectionManager) GetContestConnectionCount(contestID int64) int {
-	cm.mutex.RLock()
-	defer cm.mutex.RUnlock()
 
-	if connections, exists := cm.contestSubs[contestID]; exists {
-		activeCount := 0
-		for _, conn := range connections {
-			if conn.IsActive {
-				activeCount++
+		if conn.trySend(message) {
+			delivered++
+		} else if !conn.closed.Load() {
+			// Connection is blocked, close it
+			s.manager.evictedSlow.Add(1)
+			select {
+			case s.unregister <- conn:
+			case <-s.quit:
+				return
 			}
 		}
-		return activeCount
 	}
-	return 0
+	s.manager.delivered.Add(delivered)
 }
 
-func (cm *ConnectionManager) cleanupInactiveConnections() {
-	cm.mutex.Lock()
-	defer cm.mutex.Unlock()
-
-	cutoff := time.Now().Add(-2 * time.Minute) // 2 minutes timeout
-
-	for connID, conn := range cm.connections {
-		if conn.LastPing.Before(cutoff) {
-			log.Printf("Cleaning up inactive connection: %s", connID)
-			cm.unregister <- conn
+// deliverPersonal routes each user's message through the user index. These
+// messages are small and differ per user, so the writer encodes them.
+func (s *contestShard) deliverPersonal(personal map[int64]models.RealTimeWebSocketMessage) {
+	var delivered int64
+	for userID, message := range personal {
+		for _, conn := range s.userConnections(userID) {
+			if conn.trySend(Outbound{Message: message}) {
+				delivered++
+			}
 		}
 	}
+	s.manager.delivered.Add(delivered)
 }
 
-func (cm *ConnectionManager) UpdateConnectionPing(connectionID string) {
-	cm.mutex.Lock()
-	defer cm.mutex.Unlock()
-
-	if conn, exists := cm.connections[connectionID]; exists {
-		conn.LastPing = time.Now()
+func (s *contestShard) prepareOutbound(message models.RealTimeWebSocketMessage) Outbound {
+	outbound := Outbound{Message: message}
+	if prepared, err := prepareMessage(message); err == nil {
+		outbound.Prepared = prepared
+	} else {
+		log.Printf("Failed to prepare broadcast for contest %d, encoding per connection: %v", s.contestID, err)
 	}
+	return outbound
 }
 
-// Helper function to generate unique message IDs
-func generateMessageID() string {
-	return time.Now().Format("20060102150405.000000")
+// PublishMatchCompletion queues match completion progress for every
+// subscriber of a contest of the match
+func (cm *ConnectionManager) PublishMatchCompletion(contestID int64, progress models.MatchCompletionProgress) {
+	cm.BroadcastMessage(contestID, models.RealTimeWebSocketMessage{
+		Type:      "match_completion",
+		ContestID: contestID,
+		Data:      progress,
+		Timestamp: time.Now(),
+		MessageID: generateMessageID(),
+	})
 }
-
-// SendPersonalizedUpdate sends an update specific to a user
-func (cm *ConnectionManager) SendPersonalizedUpdate(userID int64, contestID int64, update models.RealTimeWebSocketMessage) {
-	cm.mutex.RLock()
-	defer cm.mutex.RUnlock()
-
-	for _, conn := range cm.connections {
-		if conn.UserID == userID && conn.ContestID == contestID && conn.IsActive {
-			select {
-			case conn.Send <- update:
-			default:
-				// Connection blocked, will be cleaned up later
-			}
-			break
-		}
-	}
-}
\ No newline at end of file
@@ -0,0 +1,247 @@
+package websocket
+
+import (
+	"fmt"
+	"io"
+	"log"
+	"os"
+	"runtime"
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"fantasy-esports-backend/models"
+)
+
+func newTestConnection(id int, contestID int64, buffer int) *LeaderboardConnection {
+	return &LeaderboardConnection{
+		UserID:       int64(id),
+		ContestID:    contestID,
+		ConnectionID: fmt.Sprintf("conn-%d-%d", contestID, id),
+		Send:         make(chan Outbound, buffer),
+		ConnectedAt:  time.Now(),
+		LastPing:     time.Now(),
+		IsActive:     true,
+	}
+}
+
+func waitFor(t testing.TB, what string, cond func() bool) {
+	deadline := time.Now().Add(5 * time.Second)
+	for !cond() {
+		if time.Now().After(deadline) {
+			t.Fatalf("timed out waiting for %s", what)
+		}
+		time.Sleep(time.Millisecond)
+	}
+}
+
+func TestBroadcastEvictsSlowConnectionWithoutBlocking(t *testing.T) {
+	cm := NewConnectionManager()
+
+	// The confirmation message fills the slow connection's only slot
+	slow := newTestConnection(1, 7, 1)
+	fast := newTestConnection(2, 7, 16)
+	cm.RegisterConnection(slow)
+	cm.RegisterConnection(fast)
+	waitFor(t, "registrations", func() bool { return cm.GetContestConnectionCount(7) == 2 })
+
+	done := make(chan struct{})
+	go func() {
+		cm.BroadcastUpdate(models.RealTimeLeaderboardUpdate{ContestID: 7})
+		cm.BroadcastUpdate(models.RealTimeLeaderboardUpdate{ContestID: 7})
+		close(done)
+	}()
+	select {
+	case <-done:
+	case <-time.After(time.Second):
+		t.Fatal("BroadcastUpdate blocked on a slow connection")
+	}
+
+	waitFor(t, "slow connection eviction", func() bool { return cm.GetContestConnectionCount(7) == 1 })
+	if stats := cm.Stats(); stats.EvictedSlow == 0 {
+		t.Fatalf("expected a slow eviction, got %+v", stats)
+	}
+
+	// Unregistering an evicted connection again must not panic
+	cm.UnregisterConnection(slow)
+	if slow.TrySend(models.RealTimeWebSocketMessage{}) {
+		t.Fatal("TrySend succeeded on a closed connection")
+	}
+}
+
+func TestContestsAreIsolated(t *testing.T) {
+	cm := NewConnectionManager()
+
+	// A contest whose subscribers never read must not hold up another one
+	for i := 0; i < 100; i++ {
+		cm.RegisterConnection(newTestConnection(i, 1, 1))
+	}
+	other := newTestConnection(1, 2, 16)
+	cm.RegisterConnection(other)
+	waitFor(t, "registrations", func() bool {
+		return cm.GetContestConnectionCount(1) == 100 && cm.GetContestConnectionCount(2) == 1
+	})
+
+	for i := 0; i < broadcastBufferSize*2; i++ {
+		cm.BroadcastUpdate(models.RealTimeLeaderboardUpdate{ContestID: 1})
+	}
+	cm.BroadcastUpdate(models.RealTimeLeaderboardUpdate{ContestID: 2})
+
+	timeout := time.After(time.Second)
+	for {
+		select {
+		case msg := <-other.Send:
+			if msg.Message.Type == "leaderboard_update" {
+				return
+			}
+		case <-timeout:
+			t.Fatal("update for contest 2 was not delivered")
+		}
+	}
+}
+
+func TestPersonalizedUpdatesReachOnlyTheirUser(t *testing.T) {
+	cm := NewConnectionManager()
+
+	phone := newTestConnection(1, 3, 16)
+	laptop := newTestConnection(1, 3, 16)
+	laptop.ConnectionID = "laptop"
+	other := newTestConnection(2, 3, 16)
+	for _, conn := range []*LeaderboardConnection{phone, laptop, other} {
+		cm.RegisterConnection(conn)
+	}
+	waitFor(t, "registrations", func() bool { return len(cm.ConnectedUserIDs(3)) == 2 })
+
+	cm.SendPersonalizedLeaderboards(3, map[int64]models.PersonalLeaderboardUpdate{
+		1: {ContestID: 3, MyRank: 4},
+	})
+
+	for _, conn := range []*LeaderboardConnection{phone, laptop} {
+		waitFor(t, "personal update", func() bool {
+			select {
+			case msg := <-conn.Send:
+				return msg.Message.Type == "my_rank_update"
+			default:
+				return false
+			}
+		})
+	}
+	for len(other.Send) > 0 {
+		if msg := <-other.Send; msg.Message.Type == "my_rank_update" {
+			t.Fatal("personal update delivered to another user")
+		}
+	}
+}
+
+// latencyHistogram records delivery latencies in 50µs buckets
+type latencyHistogram struct {
+	buckets [200000]atomic.Int64
+}
+
+const latencyBucket = 50 * time.Microsecond
+
+func (h *latencyHistogram) observe(d time.Duration) {
+	i := int(d / latencyBucket)
+	if i >= len(h.buckets) {
+		i = len(h.buckets) - 1
+	}
+	h.buckets[i].Add(1)
+}
+
+func (h *latencyHistogram) quantile(q float64) time.Duration {
+	var total int64
+	for i := range h.buckets {
+		total += h.buckets[i].Load()
+	}
+	target := int64(float64(total) * q)
+	var seen int64
+	for i := range h.buckets {
+		seen += h.buckets[i].Load()
+		if seen >= target && seen > 0 {
+			return time.Duration(i+1) * latencyBucket
+		}
+	}
+	return 0
+}
+
+// benchmarkBroadcast fans b.N updates out to n subscribers of one contest and
+// reports delivered messages per second and p99 broadcast-to-receive latency.
+func benchmarkBroadcast(b *testing.B, n int) {
+	log.SetOutput(io.Discard)
+	defer log.SetOutput(os.Stderr)
+
+	cm := NewConnectionManager()
+	const contestID = 1
+
+	histogram := &latencyHistogram{}
+	var received atomic.Int64
+	var readers sync.WaitGroup
+
+	for i := 0; i < n; i++ {
+		conn := newTestConnection(i, contestID, 256)
+		readers.Add(1)
+		go func() {
+			defer readers.Done()
+			for msg := range conn.Send {
+				if msg.Message.Type != "bench" {
+					continue
+				}
+				histogram.observe(time.Since(msg.Message.Timestamp))
+				received.Add(1)
+			}
+		}()
+		cm.RegisterConnection(conn)
+	}
+	waitFor(b, "registrations", func() bool { return cm.GetContestConnectionCount(contestID) == n })
+
+	b.ResetTimer()
+	start := time.Now()
+	for i := 0; i < b.N; i++ {
+		msg := models.RealTimeWebSocketMessage{Type: "bench", ContestID: contestID, Timestamp: time.Now()}
+		for !cm.BroadcastMessage(contestID, msg) {
+			runtime.Gosched()
+			msg.Timestamp = time.Now()
+		}
+	}
+
+	// Wait for delivery to finish; evicted subscribers never catch up
+	expected := int64(b.N) * int64(n)
+	lastProgress := time.Now()
+	for last := received.Load(); last < expected; {
+		time.Sleep(100 * time.Microsecond)
+		if current := received.Load(); current != last {
+			last, lastProgress = current, time.Now()
+		} else if time.Since(lastProgress) > time.Second {
+			break
+		}
+	}
+	elapsed := time.Since(start)
+	b.StopTimer()
+
+	stats := cm.Stats()
+	b.ReportMetric(float64(received.Load())/elapsed.Seconds(), "msgs/s")
+	b.ReportMetric(float64(histogram.quantile(0.99).Microseconds())/1000.0, "p99-ms")
+	b.ReportMetric(float64(stats.EvictedSlow), "evicted")
+
+	for _, value := range cm.connectionsSnapshot(contestID) {
+		cm.UnregisterConnection(value)
+	}
+	readers.Wait()
+}
+
+func (cm *ConnectionManager) connectionsSnapshot(contestID int64) []*LeaderboardConnection {
+	var connections []*LeaderboardConnection
+	cm.withShard(contestID, func(shard *contestShard) {
+		connections = shard.loadSnapshot()
+	})
+	return connections
+}
+
+func BenchmarkBroadcast(b *testing.B) {
+	for _, n := range []int{10000, 50000, 100000} {
+		b.Run(fmt.Sprintf("connections=%d", n), func(b *testing.B) {
+			benchmarkBroadcast(b, n)
+		})
+	}
+}
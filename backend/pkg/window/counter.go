@@ -0,0 +1,94 @@
+package window
+
+import "time"
+
+// Counter counts events over a sliding window split into fixed-width
+// buckets, and keeps the times of the most recent events. It is not safe
+// for concurrent use; each counter is meant to be owned by one goroutine.
+type Counter struct {
+	width   time.Duration
+	buckets []uint32
+	head    int64 // absolute index of the newest bucket
+
+	recent []int64 // unix nanoseconds, a ring of the latest events
+	next   int
+	filled int
+}
+
+// NewCounter creates a counter over window with the given number of
+// buckets. Counts are exact to the width of one bucket. keepRecent is how
+// many event times Recent returns.
+func NewCounter(window time.Duration, buckets int, keepRecent int) *Counter {
+	if buckets < 1 {
+		buckets = 1
+	}
+	width := window / time.Duration(buckets)
+	if width <= 0 {
+		width = time.Nanosecond
+	}
+	return &Counter{
+		width:   width,
+		buckets: make([]uint32, buckets),
+		recent:  make([]int64, keepRecent),
+	}
+}
+
+// Add records an event at now
+func (c *Counter) Add(now time.Time) {
+	c.advance(now)
+	c.buckets[c.head%int64(len(c.buckets))]++
+
+	if len(c.recent) > 0 {
+		c.recent[c.next] = now.UnixNano()
+		c.next = (c.next + 1) % len(c.recent)
+		if c.filled < len(c.recent) {
+			c.filled++
+		}
+	}
+}
+
+// Count returns the events in the last within, up to the counter's window
+func (c *Counter) Count(now time.Time, within time.Duration) int {
+	c.advance(now)
+
+	n := int(within / c.width)
+	if within%c.width != 0 {
+		n++
+	}
+	if n > len(c.buckets) {
+		n = len(c.buckets)
+	}
+
+	total := 0
+	for i := 0; i < n; i++ {
+		total += int(c.buckets[(c.head-int64(i))%int64(len(c.buckets))])
+	}
+	return total
+}
+
+// Recent returns the times of the latest events, newest first
+func (c *Counter) Recent() []time.Time {
+	times := make([]time.Time, c.filled)
+	for i := range times {
+		index := (c.next - 1 - i + len(c.recent)) % len(c.recent)
+		times[i] = time.Unix(0, c.recent[index])
+	}
+	return times
+}
+
+// advance moves the head to now's bucket, clearing the buckets it passes
+func (c *Counter) advance(now time.Time) {
+	bucket := now.UnixNano() / int64(c.width)
+	if bucket <= c.head {
+		return
+	}
+
+	steps := bucket - c.head
+	if steps > int64(len(c.buckets)) {
+		steps = int64(len(c.buckets))
+	}
+	for i := int64(1); i <= steps; i++ {
+		c.buckets[(c.head+i)%int64(len(c.buckets))] = 0
+	}
+	c.head = bucket
+}
@@ -0,0 +1,60 @@
+package window
+
+import "time"
+
+// Distinct counts the distinct ids seen within a sliding window, up to a
+// limit. Once the limit is reached a new id replaces the least recently
+// seen one, so Count saturates at limit instead of growing with traffic.
+// It is not safe for concurrent use.
+type Distinct struct {
+	window time.Duration
+	limit  int
+	seen   []distinctEntry
+}
+
+type distinctEntry struct {
+	id       int64
+	lastSeen int64 // unix nanoseconds
+}
+
+// NewDistinct creates a set tracking up to limit ids over window
+func NewDistinct(window time.Duration, limit int) *Distinct {
+	if limit < 1 {
+		limit = 1
+	}
+	return &Distinct{window: window, limit: limit}
+}
+
+// Add records id as seen at now
+func (d *Distinct) Add(id int64, now time.Time) {
+	nanos := now.UnixNano()
+	oldest := -1
+	for i, entry := range d.seen {
+		if entry.id == id {
+			d.seen[i].lastSeen = nanos
+			return
+		}
+		if oldest < 0 || entry.lastSeen < d.seen[oldest].lastSeen {
+			oldest = i
+		}
+	}
+
+	if len(d.seen) < d.limit {
+		d.seen = append(d.seen, distinctEntry{id: id, lastSeen: nanos})
+		return
+	}
+	d.seen[oldest] = distinctEntry{id: id, lastSeen: nanos}
+}
+
+// Count returns the ids seen within the window, dropping older ones
+func (d *Distinct) Count(now time.Time) int {
+	cutoff := now.Add(-d.window).UnixNano()
+	kept := d.seen[:0]
+	for _, entry := range d.seen {
+		if entry.lastSeen >= cutoff {
+			kept = append(kept, entry)
+		}
+	}
+	d.seen = kept
+	return len(d.seen)
+}
@@ -0,0 +1,57 @@
+package window
+
+import (
+	"testing"
+	"time"
+)
+
+func TestCounterSlidesOut(t *testing.T) {
+	start := time.Unix(1700000000, 0)
+	counter := NewCounter(time.Hour, 60, 3)
+
+	for i := 0; i < 5; i++ {
+		counter.Add(start.Add(time.Duration(i) * 10 * time.Minute))
+	}
+	now := start.Add(40 * time.Minute)
+
+	if got := counter.Count(now, time.Hour); got != 5 {
+		t.Fatalf("count over the hour = %d, want 5", got)
+	}
+	if got := counter.Count(now, 10*time.Minute); got != 1 {
+		t.Fatalf("count over 10 minutes = %d, want 1", got)
+	}
+	if got := counter.Count(start.Add(75*time.Minute), time.Hour); got != 3 {
+		t.Fatalf("count after sliding = %d, want 3", got)
+	}
+	if got := counter.Count(start.Add(5*time.Hour), time.Hour); got != 0 {
+		t.Fatalf("count after idling = %d, want 0", got)
+	}
+
+	recent := counter.Recent()
+	if len(recent) != 3 || !recent[0].Equal(now) || !recent[2].Equal(start.Add(20*time.Minute)) {
+		t.Fatalf("unexpected recent events %v", recent)
+	}
+}
+
+func TestDistinctSaturatesAndExpires(t *testing.T) {
+	start := time.Unix(1700000000, 0)
+	distinct := NewDistinct(24*time.Hour, 3)
+
+	distinct.Add(1, start)
+	distinct.Add(2, start.Add(time.Hour))
+	distinct.Add(1, start.Add(2*time.Hour))
+	if got := distinct.Count(start.Add(2 * time.Hour)); got != 2 {
+		t.Fatalf("count = %d, want 2", got)
+	}
+
+	distinct.Add(3, start.Add(3*time.Hour))
+	distinct.Add(4, start.Add(4*time.Hour))
+	if got := distinct.Count(start.Add(4 * time.Hour)); got != 3 {
+		t.Fatalf("count past the limit = %d, want 3", got)
+	}
+
+	// Ids 1 and 2 were seen first; only 3 and 4 are within the next day
+	if got := distinct.Count(start.Add(26*time.Hour + 30*time.Minute)); got != 2 {
+		t.Fatalf("count after expiry = %d, want 2", got)
+	}
+}
@@ -0,0 +1,250 @@
+package writebehind
+
+import (
+	"sync"
+	"time"
+)
+
+// Config controls when a buffer writes its pending events
+type Config struct {
+	// FlushInterval is the longest an event waits before being written
+	FlushInterval time.Duration
+	// MaxPending starts a flush once this many entries are pending: rows of
+	// a Log, or distinct keys of a Counter. Writers wait while the buffer is
+	// full and the previous flush has not finished.
+	MaxPending int
+}
+
+// DefaultConfig flushes every second, or at 1000 pending entries
+var DefaultConfig = Config{FlushInterval: time.Second, MaxPending: 1000}
+
+// Stats reports a buffer's pending entries and what it has written
+type Stats struct {
+	Name        string  `json:"name"`
+	Pending     int     `json:"pending"`
+	Flushes     int64   `json:"flushes"`
+	Written     int64   `json:"written"`
+	Failed      int64   `json:"failed"`
+	Waits       int64   `json:"waits"` // writers that had to wait for space
+	LastFlushMs float64 `json:"last_flush_ms"`
+}
+
+// buffer is the batching shared by Log and Counter. B is the batch type,
+// such as a slice of rows or a map of summed deltas.
+type buffer[B any] struct {
+	name     string
+	config   Config
+	newBatch func() B
+	size     func(B) int
+	write    func(B) error
+	onError  func(name string, entries int, err error)
+
+	mutex    sync.Mutex
+	space    *sync.Cond
+	pending  B
+	flushing bool
+	closed   bool
+	kick     chan struct{}
+	stopped  chan struct{}
+
+	flushes   int64
+	written   int64
+	failed    int64
+	waits     int64
+	lastFlush time.Duration
+}
+
+func newBuffer[B any](name string, config Config, newBatch func() B, size func(B) int, write func(B) error) *buffer[B] {
+	if config.FlushInterval <= 0 {
+		config.FlushInterval = DefaultConfig.FlushInterval
+	}
+	if config.MaxPending < 1 {
+		config.MaxPending = DefaultConfig.MaxPending
+	}
+
+	b := &buffer[B]{
+		name:     name,
+		config:   config,
+		newBatch: newBatch,
+		size:     size,
+		write:    write,
+		onError:  logFlushError,
+		pending:  newBatch(),
+		kick:     make(chan struct{}, 1),
+		stopped:  make(chan struct{}),
+	}
+	b.space = sync.NewCond(&b.mutex)
+
+	go b.run()
+	register(b)
+	return b
+}
+
+// apply adds an event to the pending batch, waiting while the batch is full
+// and still being written. Events added after Close are written directly.
+func (b *buffer[B]) apply(add func(B) B) {
+	b.mutex.Lock()
+	if b.closed {
+		b.mutex.Unlock()
+		b.flushBatch(add(b.newBatch()))
+		return
+	}
+
+	for b.size(b.pending) >= b.config.MaxPending {
+		b.waits++
+		b.signal()
+		b.space.Wait()
+		// Close flushed while this writer waited and nothing flushes later
+		if b.closed {
+			b.mutex.Unlock()
+			b.flushBatch(add(b.newBatch()))
+			return
+		}
+	}
+
+	b.pending = add(b.pending)
+	full := b.size(b.pending) >= b.config.MaxPending
+	b.mutex.Unlock()
+
+	if full {
+		b.signal()
+	}
+}
+
+func (b *buffer[B]) signal() {
+	select {
+	case b.kick <- struct{}{}:
+	default:
+	}
+}
+
+func (b *buffer[B]) run() {
+	ticker := time.NewTicker(b.config.FlushInterval)
+	defer ticker.Stop()
+
+	for {
+		select {
+		case <-ticker.C:
+		case <-b.kick:
+		case <-b.stopped:
+			return
+		}
+		b.Flush()
+	}
+}
+
+// Flush writes the pending batch and returns once it is written
+func (b *buffer[B]) Flush() {
+	b.mutex.Lock()
+	for b.flushing {
+		b.space.Wait()
+	}
+	if b.size(b.pending) == 0 {
+		b.mutex.Unlock()
+		return
+	}
+	batch := b.pending
+	b.pending = b.newBatch()
+	b.flushing = true
+	b.space.Broadcast()
+	b.mutex.Unlock()
+
+	b.flushBatch(batch)
+
+	b.mutex.Lock()
+	b.flushing = false
+	b.space.Broadcast()
+	b.mutex.Unlock()
+}
+
+func (b *buffer[B]) flushBatch(batch B) {
+	entries := b.size(batch)
+	started := time.Now()
+	err := b.write(batch)
+	elapsed := time.Since(started)
+
+	b.mutex.Lock()
+	b.flushes++
+	b.lastFlush = elapsed
+	if err != nil {
+		b.failed += int64(entries)
+	} else {
+		b.written += int64(entries)
+	}
+	b.mutex.Unlock()
+
+	if err != nil {
+		b.onError(b.name, entries, err)
+	}
+}
+
+// Close stops the periodic flush and writes what is pending. Later events
+// are written one at a time.
+func (b *buffer[B]) Close() {
+	b.mutex.Lock()
+	if b.closed {
+		b.mutex.Unlock()
+		return
+	}
+	b.closed = true
+	close(b.stopped)
+	b.mutex.Unlock()
+
+	b.Flush()
+}
+
+// Stats returns the buffer's counters
+func (b *buffer[B]) Stats() Stats {
+	b.mutex.Lock()
+	defer b.mutex.Unlock()
+	return Stats{
+		Name:        b.name,
+		Pending:     b.size(b.pending),
+		Flushes:     b.flushes,
+		Written:     b.written,
+		Failed:      b.failed,
+		Waits:       b.waits,
+		LastFlushMs: float64(b.lastFlush.Microseconds()) / 1000.0,
+	}
+}
+
+// Log buffers rows for an append-only table, written in multi-row inserts
+type Log[T any] struct {
+	*buffer[[]T]
+}
+
+// NewLog creates a buffer that passes pending rows to write in batches of up
+// to config.MaxPending
+func NewLog[T any](name string, config Config, write func(rows []T) error) *Log[T] {
+	return &Log[T]{newBuffer(name, config,
+		func() []T { return make([]T, 0, config.MaxPending) },
+		func(rows []T) int { return len(rows) },
+		write)}
+}
+
+// Add queues a row
+func (l *Log[T]) Add(row T) {
+	l.apply(func(rows []T) []T { return append(rows, row) })
+}
+
+// Counter buffers increments, summing those for the same key so that a hot
+// row is updated once per flush instead of once per event
+type Counter[K comparable] struct {
+	*buffer[map[K]int64]
+}
+
+// NewCounter creates a buffer that passes the summed deltas per key to write
+func NewCounter[K comparable](name string, config Config, write func(deltas map[K]int64) error) *Counter[K] {
+	return &Counter[K]{newBuffer(name, config,
+		func() map[K]int64 { return make(map[K]int64) },
+		func(deltas map[K]int64) int { return len(deltas) },
+		write)}
+}
+
+// Add queues an increment of key by delta
+func (c *Counter[K]) Add(key K, delta int64) {
+	c.apply(func(deltas map[K]int64) map[K]int64 {
+		deltas[key] += delta
+		return deltas
+	})
+}
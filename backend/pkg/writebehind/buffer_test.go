@@ -0,0 +1,157 @@
+package writebehind
+
+import (
+	"errors"
+	"sync"
+	"testing"
+	"time"
+)
+
+func TestCounterSumsDeltasPerKey(t *testing.T) {
+	var mutex sync.Mutex
+	totals := make(map[string]int64)
+	writes := 0
+
+	counter := NewCounter("test_counter", Config{FlushInterval: time.Hour, MaxPending: 100},
+		func(deltas map[string]int64) error {
+			mutex.Lock()
+			defer mutex.Unlock()
+			writes++
+			for key, delta := range deltas {
+				totals[key] += delta
+			}
+			return nil
+		})
+	defer counter.Close()
+
+	var wg sync.WaitGroup
+	for i := 0; i < 8; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for j := 0; j < 1000; j++ {
+				counter.Add("banner:1", 1)
+			}
+		}()
+	}
+	wg.Wait()
+	counter.Flush()
+
+	mutex.Lock()
+	defer mutex.Unlock()
+	if totals["banner:1"] != 8000 {
+		t.Fatalf("total = %d, want 8000", totals["banner:1"])
+	}
+	if writes != 1 {
+		t.Fatalf("one hot key was written %d times, want 1", writes)
+	}
+}
+
+func TestLogAppliesBackpressureAndFlushesOnClose(t *testing.T) {
+	release := make(chan struct{})
+	var mutex sync.Mutex
+	var written []int
+
+	log := NewLog("test_log", Config{FlushInterval: time.Hour, MaxPending: 10},
+		func(rows []int) error {
+			<-release
+			mutex.Lock()
+			defer mutex.Unlock()
+			written = append(written, rows...)
+			return nil
+		})
+
+	// The first 10 rows start a flush that blocks; 10 more fill the next
+	// batch, and the 21st row has to wait
+	done := make(chan struct{})
+	go func() {
+		for i := 0; i < 21; i++ {
+			log.Add(i)
+		}
+		close(done)
+	}()
+
+	select {
+	case <-done:
+		t.Fatal("writer was not held back by a full buffer")
+	case <-time.After(50 * time.Millisecond):
+	}
+	if log.Stats().Waits == 0 {
+		t.Fatal("no wait recorded")
+	}
+
+	close(release)
+	<-done
+	log.Close()
+
+	mutex.Lock()
+	defer mutex.Unlock()
+	if len(written) != 21 {
+		t.Fatalf("wrote %d rows, want 21", len(written))
+	}
+	if stats := log.Stats(); stats.Written != 21 || stats.Pending != 0 {
+		t.Fatalf("unexpected stats %+v", stats)
+	}
+}
+
+func TestCloseWritesRowsOfWaitingWriters(t *testing.T) {
+	release := make(chan struct{})
+	var mutex sync.Mutex
+	var written []int
+
+	log := NewLog("test_log_close", Config{FlushInterval: time.Hour, MaxPending: 10},
+		func(rows []int) error {
+			<-release
+			mutex.Lock()
+			defer mutex.Unlock()
+			written = append(written, rows...)
+			return nil
+		})
+
+	done := make(chan struct{})
+	go func() {
+		for i := 0; i < 21; i++ {
+			log.Add(i)
+		}
+		close(done)
+	}()
+	for log.Stats().Waits == 0 {
+		time.Sleep(time.Millisecond)
+	}
+
+	// Close while the 21st row is held back; its final flush must not leave
+	// that row pending with nothing to write it
+	closed := make(chan struct{})
+	go func() {
+		log.Close()
+		close(closed)
+	}()
+	time.Sleep(10 * time.Millisecond)
+	close(release)
+	<-done
+	<-closed
+
+	mutex.Lock()
+	defer mutex.Unlock()
+	if len(written) != 21 {
+		t.Fatalf("wrote %d rows, want 21", len(written))
+	}
+	if stats := log.Stats(); stats.Pending != 0 {
+		t.Fatalf("rows left pending after close: %+v", stats)
+	}
+}
+
+func TestFailedFlushIsCounted(t *testing.T) {
+	counter := NewCounter("test_failing", Config{FlushInterval: time.Hour, MaxPending: 100},
+		func(deltas map[int64]int64) error { return errors.New("database down") })
+	counter.onError = func(string, int, error) {}
+	defer counter.Close()
+
+	counter.Add(1, 1)
+	counter.Add(2, 1)
+	counter.Flush()
+
+	if stats := counter.Stats(); stats.Failed != 2 || stats.Written != 0 {
+		t.Fatalf("unexpected stats %+v", stats)
+	}
+}
@@ -0,0 +1,55 @@
+package writebehind
+
+import (
+	"fmt"
+	"sort"
+	"sync"
+
+	"fantasy-esports-backend/pkg/logger"
+)
+
+type registered interface {
+	Close()
+	Stats() Stats
+}
+
+var (
+	registryMutex sync.Mutex
+	registry      []registered
+)
+
+func register(b registered) {
+	registryMutex.Lock()
+	defer registryMutex.Unlock()
+	registry = append(registry, b)
+}
+
+// CloseAll flushes and closes every buffer. Call it on shutdown so that
+// buffered events are not lost.
+func CloseAll() {
+	registryMutex.Lock()
+	buffers := append([]registered(nil), registry...)
+	registryMutex.Unlock()
+
+	for _, b := range buffers {
+		b.Close()
+	}
+}
+
+// AllStats returns the counters of every buffer
+func AllStats() []Stats {
+	registryMutex.Lock()
+	buffers := append([]registered(nil), registry...)
+	registryMutex.Unlock()
+
+	stats := make([]Stats, 0, len(buffers))
+	for _, b := range buffers {
+		stats = append(stats, b.Stats())
+	}
+	sort.Slice(stats, func(i, j int) bool { return stats[i].Name < stats[j].Name })
+	return stats
+}
+
+func logFlushError(name string, entries int, err error) {
+	logger.Error(fmt.Sprintf("Write-behind buffer %s failed to write %d entries: %v", name, entries, err))
+}
@@ -11,7 +11,7 @@ func main() {
 	cfg := config.Load()
 	
 	// Initialize database
-	database, err := db.Initialize(cfg.DatabaseURL)
+	database, err := db.Initialize(cfg.DatabaseURL, db.PoolConfig{})
 	if err != nil {
 		log.Fatal("Failed to initialize database:", err)
 	}
@@ -0,0 +1,543 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"fmt"
+	"sync"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/logger"
+)
+
+const (
+	// rollupLateHours is how many hours before the last run are re-aggregated,
+	// for transactions completed after the hour they were created in
+	rollupLateHours = 3
+	// rollupReconcileDays daily buckets are rebuilt from the source tables
+	// once a day, for status changes older than rollupLateHours
+	rollupReconcileDays = 7
+	// rollupHourlyRetentionDays is how long hourly buckets are kept
+	rollupHourlyRetentionDays = 7
+	// analyticsRollupLock is the advisory lock that lets one server run each
+	// rollup
+	analyticsRollupLock = 7316455
+)
+
+// Names of the rows in analytics_snapshots
+const (
+	userSnapshot    = "users"
+	revenueSnapshot = "revenue"
+	contestSnapshot = "contests"
+)
+
+// rollupBuckets describes one of the bucketed summary tables
+type rollupBuckets struct {
+	table  string
+	column string // bucket column
+	unit   string // date_trunc unit of a bucket
+	kind   string // type of the bucket column
+}
+
+var (
+	hourlyRollups = rollupBuckets{table: "analytics_hourly_rollups", column: "bucket_start", unit: "hour", kind: "timestamp"}
+	dailyRollups  = rollupBuckets{table: "analytics_daily_rollups", column: "bucket_date", unit: "day", kind: "date"}
+)
+
+const rollupColumns = "new_users, deposits, withdrawals, contest_revenue, completed_amount"
+
+// aggregate rebuilds the buckets from since onwards out of the users and
+// wallet_transactions tables. Every bucket up to the current one gets a row,
+// so quiet hours are stored as zeros and the latest bucket always exists.
+func (b rollupBuckets) aggregate(tx *sql.Tx, since time.Time) error {
+	if err := b.clear(tx, since); err != nil {
+		return err
+	}
+	_, err := tx.Exec(fmt.Sprintf(`
+		INSERT INTO %[1]s (%[2]s, %[5]s, refreshed_at)
+		SELECT b.bucket::%[4]s, COALESCE(u.new_users, 0), COALESCE(w.deposits, 0), COALESCE(w.withdrawals, 0),
+			COALESCE(w.contest_revenue, 0), COALESCE(w.completed_amount, 0), LOCALTIMESTAMP
+		FROM generate_series(date_trunc('%[3]s', $1::timestamp), date_trunc('%[3]s', LOCALTIMESTAMP), INTERVAL '1 %[3]s') AS b(bucket)
+		LEFT JOIN (
+			SELECT date_trunc('%[3]s', created_at) AS bucket, COUNT(*) AS new_users
+			FROM users
+			WHERE created_at >= date_trunc('%[3]s', $1::timestamp) AND is_active = true
+			GROUP BY 1
+		) u ON u.bucket = b.bucket
+		LEFT JOIN (
+			SELECT date_trunc('%[3]s', created_at) AS bucket,
+				SUM(amount) FILTER (WHERE transaction_type = 'deposit') AS deposits,
+				SUM(amount) FILTER (WHERE transaction_type = 'withdrawal') AS withdrawals,
+				SUM(amount) FILTER (WHERE transaction_type = 'contest_fee') AS contest_revenue,
+				SUM(amount) AS completed_amount
+			FROM wallet_transactions
+			WHERE created_at >= date_trunc('%[3]s', $1::timestamp) AND status = 'completed'
+			GROUP BY 1
+		) w ON w.bucket = b.bucket`,
+		b.table, b.column, b.unit, b.kind, rollupColumns), since)
+	if err != nil {
+		return fmt.Errorf("failed to aggregate %s: %w", b.table, err)
+	}
+	return nil
+}
+
+func (b rollupBuckets) clear(tx *sql.Tx, since time.Time) error {
+	_, err := tx.Exec(fmt.Sprintf(`DELETE FROM %s WHERE %s >= date_trunc('%s', $1::timestamp)`, b.table, b.column, b.unit), since)
+	if err != nil {
+		return fmt.Errorf("failed to clear %s: %w", b.table, err)
+	}
+	return nil
+}
+
+// sumHoursIntoDays rebuilds the daily buckets from the day of since onwards
+// out of the hourly buckets, which cover at least today and yesterday
+func sumHoursIntoDays(tx *sql.Tx, since time.Time) error {
+	since = startOfDay(since)
+	if err := dailyRollups.clear(tx, since); err != nil {
+		return err
+	}
+	_, err := tx.Exec(`
+		INSERT INTO analytics_daily_rollups (bucket_date, `+rollupColumns+`, refreshed_at)
+		SELECT date_trunc('day', bucket_start)::date, SUM(new_users), SUM(deposits), SUM(withdrawals),
+			SUM(contest_revenue), SUM(completed_amount), LOCALTIMESTAMP
+		FROM analytics_hourly_rollups
+		WHERE bucket_start >= $1::timestamp
+		GROUP BY 1`, since)
+	if err != nil {
+		return fmt.Errorf("failed to sum hourly rollups: %w", err)
+	}
+	return nil
+}
+
+func startOfDay(t time.Time) time.Time {
+	return time.Date(t.Year(), t.Month(), t.Day(), 0, 0, 0, 0, t.Location())
+}
+
+// analyticsRollup maintains the summary tables read by AnalyticsService.
+// Every server runs it; an advisory lock makes concurrent runs skip.
+type analyticsRollup struct {
+	db               *sql.DB
+	snapshotInterval time.Duration
+	reconciled       time.Time // day of the last reconcile, in database time
+}
+
+var analyticsRollupOnce sync.Once
+
+// StartRollups starts the job that keeps the analytics summary tables up to
+// date, re-aggregating recent buckets every interval and recomputing the
+// state snapshots every snapshotInterval. Later calls do nothing.
+func (s *AnalyticsService) StartRollups(interval, snapshotInterval time.Duration) {
+	analyticsRollupOnce.Do(func() {
+		rollup := &analyticsRollup{db: s.db, snapshotInterval: snapshotInterval}
+		go rollup.run(interval)
+	})
+}
+
+func (r *analyticsRollup) run(interval time.Duration) {
+	ticker := time.NewTicker(interval)
+	defer ticker.Stop()
+
+	for {
+		if err := r.refreshBuckets(); err != nil {
+			logger.Error("Error refreshing analytics rollups", map[string]interface{}{"error": err.Error()})
+		}
+		if err := r.refreshSnapshots(); err != nil {
+			logger.Error("Error refreshing analytics snapshots", map[string]interface{}{"error": err.Error()})
+		}
+		<-ticker.C
+	}
+}
+
+// locked runs fn in a transaction holding the rollup lock, or reports false
+// if another server holds it
+func (r *analyticsRollup) locked(fn func(tx *sql.Tx) error) (bool, error) {
+	tx, err := r.db.Begin()
+	if err != nil {
+		return false, err
+	}
+	defer tx.Rollback()
+
+	var acquired bool
+	if err := tx.QueryRow(`SELECT pg_try_advisory_xact_lock($1)`, analyticsRollupLock).Scan(&acquired); err != nil {
+		return false, err
+	}
+	if !acquired {
+		return false, nil
+	}
+	if err := fn(tx); err != nil {
+		return false, err
+	}
+	return true, tx.Commit()
+}
+
+// refreshBuckets re-aggregates the hourly buckets from rollupLateHours
+// before the previous run, then the days they fall in. The first run of
+// each day reconciles instead.
+func (r *analyticsRollup) refreshBuckets() error {
+	var reconciledDay time.Time
+	ran, err := r.locked(func(tx *sql.Tx) error {
+		var now time.Time
+		var last sql.NullTime
+		err := tx.QueryRow(`SELECT LOCALTIMESTAMP, MAX(bucket_start) FROM analytics_hourly_rollups`).Scan(&now, &last)
+		if err != nil {
+			return err
+		}
+
+		if today := startOfDay(now); !last.Valid || r.reconciled.Before(today) {
+			reconciledDay = today
+			return reconcileRollups(tx, today, !last.Valid)
+		}
+
+		since := last.Time.Add(-rollupLateHours * time.Hour)
+		if err := hourlyRollups.aggregate(tx, since); err != nil {
+			return err
+		}
+		return sumHoursIntoDays(tx, since)
+	})
+	if ran && !reconciledDay.IsZero() {
+		r.reconciled = reconciledDay
+	}
+	return err
+}
+
+// reconcileRollups rebuilds the hourly buckets since yesterday and the last
+// rollupReconcileDays daily buckets from the source tables, or every daily
+// bucket when backfilling an empty table, and drops expired hourly buckets
+func reconcileRollups(tx *sql.Tx, today time.Time, backfill bool) error {
+	days := today.AddDate(0, 0, -rollupReconcileDays)
+	if backfill {
+		var first sql.NullTime
+		if err := tx.QueryRow(`SELECT MIN(created_at) FROM users`).Scan(&first); err != nil {
+			return err
+		}
+		if first.Valid && first.Time.Before(days) {
+			days = first.Time
+		}
+	}
+
+	if err := hourlyRollups.aggregate(tx, today.AddDate(0, 0, -1)); err != nil {
+		return err
+	}
+	if err := dailyRollups.aggregate(tx, days); err != nil {
+		return err
+	}
+	_, err := tx.Exec(`DELETE FROM analytics_hourly_rollups WHERE bucket_start < $1::timestamp`,
+		today.AddDate(0, 0, -rollupHourlyRetentionDays))
+	return err
+}
+
+// userSnapshotData is stored as the users snapshot; both parts come from
+// the same scan of the users table
+type userSnapshotData struct {
+	Metrics    models.UserMetrics       `json:"metrics"`
+	Engagement models.EngagementMetrics `json:"engagement"`
+}
+
+// analyticsSnapshots compute the figures that depend on the current state
+// of rows rather than on when they were created
+var analyticsSnapshots = []struct {
+	name  string
+	build func(tx *sql.Tx) (interface{}, error)
+}{
+	{userSnapshot, snapshotUsers},
+	{revenueSnapshot, snapshotRevenue},
+	{contestSnapshot, snapshotContests},
+}
+
+// refreshSnapshots recomputes every snapshot once the oldest is more than
+// snapshotInterval old
+func (r *analyticsRollup) refreshSnapshots() error {
+	_, err := r.locked(func(tx *sql.Tx) error {
+		var due bool
+		err := tx.QueryRow(`
+			SELECT COUNT(*) < $1 OR MIN(refreshed_at) < LOCALTIMESTAMP - $2 * INTERVAL '1 second'
+			FROM analytics_snapshots`,
+			len(analyticsSnapshots), r.snapshotInterval.Seconds()).Scan(&due)
+		if err != nil || !due {
+			return err
+		}
+
+		for _, snapshot := range analyticsSnapshots {
+			data, err := snapshot.build(tx)
+			if err != nil {
+				return fmt.Errorf("failed to build %s snapshot: %w", snapshot.name, err)
+			}
+			encoded, err := json.Marshal(data)
+			if err != nil {
+				return fmt.Errorf("failed to encode %s snapshot: %w", snapshot.name, err)
+			}
+			_, err = tx.Exec(`
+				INSERT INTO analytics_snapshots (name, data, refreshed_at)
+				VALUES ($1, $2, LOCALTIMESTAMP)
+				ON CONFLICT (name) DO UPDATE SET data = EXCLUDED.data, refreshed_at = EXCLUDED.refreshed_at`,
+				snapshot.name, encoded)
+			if err != nil {
+				return fmt.Errorf("failed to save %s snapshot: %w", snapshot.name, err)
+			}
+		}
+		return nil
+	})
+	return err
+}
+
+func snapshotUsers(tx *sql.Tx) (interface{}, error) {
+	var data userSnapshotData
+	err := tx.QueryRow(`
+		SELECT
+			COUNT(*) FILTER (WHERE is_active = true) as total_users,
+			COUNT(*) FILTER (WHERE is_active = true AND is_verified = true) as verified_users,
+			COUNT(*) FILTER (WHERE is_active = true AND kyc_status = 'verified') as kyc_completed_users,
+			COUNT(*) FILTER (WHERE is_active = true AND last_login_at >= CURRENT_DATE - INTERVAL '1 day') as dau,
+			COUNT(*) FILTER (WHERE is_active = true AND last_login_at >= CURRENT_DATE - INTERVAL '7 days') as wau,
+			COUNT(*) FILTER (WHERE is_active = true AND last_login_at >= CURRENT_DATE - INTERVAL '30 days') as mau,
+			COALESCE(COUNT(*) FILTER (WHERE created_at <= CURRENT_DATE - INTERVAL '7 days'
+				AND last_login_at >= CURRENT_DATE - INTERVAL '7 days') * 100.0 /
+				NULLIF(COUNT(*) FILTER (WHERE created_at <= CURRENT_DATE - INTERVAL '7 days'), 0), 0) as retention_rate
+		FROM users
+	`).Scan(
+		&data.Metrics.TotalUsers,
+		&data.Metrics.VerifiedUsers,
+		&data.Metrics.KYCCompletedUsers,
+		&data.Engagement.DailyActiveUsers,
+		&data.Engagement.WeeklyActiveUsers,
+		&data.Engagement.MonthlyActiveUsers,
+		&data.Metrics.UserRetentionRate,
+	)
+	if err != nil {
+		return nil, err
+	}
+	data.Metrics.ActiveUsers = data.Engagement.DailyActiveUsers
+
+	rows, err := tx.Query(`
+		SELECT state, COUNT(*) as count
+		FROM users
+		WHERE state IS NOT NULL AND is_active = true
+		GROUP BY state
+		ORDER BY count DESC
+		LIMIT 10
+	`)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	for rows.Next() {
+		var region models.UsersByRegion
+		if err := rows.Scan(&region.Region, &region.Count); err != nil {
+			return nil, err
+		}
+		data.Metrics.UsersByState = append(data.Metrics.UsersByState, region)
+	}
+	return data, rows.Err()
+}
+
+func snapshotRevenue(tx *sql.Tx) (interface{}, error) {
+	metrics := models.RevenueMetrics{}
+	err := tx.QueryRow(`
+		SELECT COALESCE(SUM(amount), 0)
+		FROM wallet_transactions
+		WHERE transaction_type = 'withdrawal' AND status = 'pending'
+	`).Scan(&metrics.PendingWithdrawals)
+	if err != nil {
+		return nil, err
+	}
+
+	gameRows, err := tx.Query(`
+		SELECT g.name, COALESCE(SUM(wt.amount), 0) as revenue
+		FROM games g
+		LEFT JOIN contests c ON c.match_id IN (SELECT id FROM matches WHERE game_id = g.id)
+		LEFT JOIN contest_participants cp ON cp.contest_id = c.id
+		LEFT JOIN wallet_transactions wt ON wt.reference_id = cp.contest_id::text AND wt.transaction_type = 'contest_fee'
+		WHERE wt.status = 'completed'
+		GROUP BY g.id, g.name
+		ORDER BY revenue DESC
+		LIMIT 10
+	`)
+	if err != nil {
+		return nil, err
+	}
+	defer gameRows.Close()
+	for gameRows.Next() {
+		var gameRevenue models.RevenueByCategory
+		if err := gameRows.Scan(&gameRevenue.Category, &gameRevenue.Revenue); err != nil {
+			return nil, err
+		}
+		metrics.RevenueByGame = append(metrics.RevenueByGame, gameRevenue)
+	}
+	if err := gameRows.Err(); err != nil {
+		return nil, err
+	}
+
+	paymentRows, err := tx.Query(`
+		SELECT pt.gateway, SUM(pt.amount) as amount, COUNT(*) as count
+		FROM payment_transactions pt
+		WHERE pt.status = 'success' AND pt.type = 'deposit'
+		GROUP BY pt.gateway
+		ORDER BY amount DESC
+	`)
+	if err != nil {
+		return nil, err
+	}
+	defer paymentRows.Close()
+	for paymentRows.Next() {
+		var payment models.PaymentMethodStats
+		if err := paymentRows.Scan(&payment.Method, &payment.Amount, &payment.Count); err != nil {
+			return nil, err
+		}
+		metrics.PaymentMethodDistribution = append(metrics.PaymentMethodDistribution, payment)
+	}
+	return metrics, paymentRows.Err()
+}
+
+func snapshotContests(tx *sql.Tx) (interface{}, error) {
+	metrics := models.ContestMetrics{}
+	err := tx.QueryRow(`
+		SELECT
+			COUNT(*) as total_contests,
+			COUNT(CASE WHEN status = 'live' OR status = 'upcoming' THEN 1 END) as active_contests,
+			COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_contests,
+			COALESCE(SUM(current_participants), 0) as total_participations,
+			COALESCE(SUM(total_prize_pool), 0) as total_prize_distributed
+		FROM contests
+	`).Scan(
+		&metrics.TotalContests,
+		&metrics.ActiveContests,
+		&metrics.CompletedContests,
+		&metrics.TotalParticipations,
+		&metrics.TotalPrizeDistributed,
+	)
+	if err != nil {
+		return nil, err
+	}
+
+	entryFeeRows, err := tx.Query(`
+		SELECT
+			CASE
+				WHEN entry_fee = 0 THEN 'Free'
+				WHEN entry_fee <= 50 THEN 'Low (₹1-50)'
+				WHEN entry_fee <= 200 THEN 'Medium (₹51-200)'
+				WHEN entry_fee <= 1000 THEN 'High (₹201-1000)'
+				ELSE 'Premium (₹1000+)'
+			END as category,
+			COUNT(*) as count
+		FROM contests
+		GROUP BY 1
+		ORDER BY count DESC
+	`)
+	if err != nil {
+		return nil, err
+	}
+	defer entryFeeRows.Close()
+	for entryFeeRows.Next() {
+		var category models.ContestsByCategory
+		if err := entryFeeRows.Scan(&category.Category, &category.Count); err != nil {
+			return nil, err
+		}
+		metrics.ContestsByEntryFee = append(metrics.ContestsByEntryFee, category)
+	}
+	if err := entryFeeRows.Err(); err != nil {
+		return nil, err
+	}
+
+	typeRows, err := tx.Query(`
+		SELECT contest_type, SUM(current_participants) as participant_count
+		FROM contests
+		GROUP BY contest_type
+		ORDER BY participant_count DESC
+		LIMIT 5
+	`)
+	if err != nil {
+		return nil, err
+	}
+	defer typeRows.Close()
+	for typeRows.Next() {
+		var contestType models.PopularContest
+		if err := typeRows.Scan(&contestType.ContestType, &contestType.ParticipantCount); err != nil {
+			return nil, err
+		}
+		metrics.PopularContestTypes = append(metrics.PopularContestTypes, contestType)
+	}
+	return metrics, typeRows.Err()
+}
+
+// loadSnapshot decodes the named snapshot into into and returns when it was
+// computed, or the zero time if the rollup job has not produced it yet
+func (s *AnalyticsService) loadSnapshot(name string, into interface{}) (time.Time, error) {
+	var data []byte
+	var refreshedAt time.Time
+	err := s.db.QueryRow(`SELECT data, refreshed_at FROM analytics_snapshots WHERE name = $1`, name).Scan(&data, &refreshedAt)
+	if err == sql.ErrNoRows {
+		return time.Time{}, nil
+	}
+	if err != nil {
+		return time.Time{}, err
+	}
+	if err := json.Unmarshal(data, into); err != nil {
+		return time.Time{}, fmt.Errorf("failed to decode %s snapshot: %w", name, err)
+	}
+	return refreshedAt, nil
+}
+
+// rollupTotals are the dashboard figures summed from the daily buckets
+type rollupTotals struct {
+	newUsersToday           int64
+	newUsersThisWeek        int64
+	newUsersThisMonth       int64
+	deposits                float64
+	withdrawals             float64
+	contestRevenue          float64
+	contestRevenueLastMonth float64
+	revenueToday            float64
+	revenueThisWeek         float64
+	revenueThisMonth        float64
+	refreshedAt             time.Time
+}
+
+func (s *AnalyticsService) loadRollupTotals() (*rollupTotals, error) {
+	var totals rollupTotals
+	var refreshedAt sql.NullTime
+	err := s.db.QueryRow(`
+		SELECT
+			COALESCE(SUM(new_users) FILTER (WHERE bucket_date = CURRENT_DATE), 0),
+			COALESCE(SUM(new_users) FILTER (WHERE bucket_date >= CURRENT_DATE - 7), 0),
+			COALESCE(SUM(new_users) FILTER (WHERE bucket_date >= CURRENT_DATE - 30), 0),
+			COALESCE(SUM(deposits), 0),
+			COALESCE(SUM(withdrawals), 0),
+			COALESCE(SUM(contest_revenue), 0),
+			COALESCE(SUM(contest_revenue) FILTER (WHERE bucket_date >= CURRENT_DATE - 60 AND bucket_date < CURRENT_DATE - 30), 0),
+			COALESCE(SUM(completed_amount) FILTER (WHERE bucket_date = CURRENT_DATE), 0),
+			COALESCE(SUM(completed_amount) FILTER (WHERE bucket_date >= CURRENT_DATE - 7), 0),
+			COALESCE(SUM(completed_amount) FILTER (WHERE bucket_date >= CURRENT_DATE - 30), 0),
+			MAX(refreshed_at)
+		FROM analytics_daily_rollups
+	`).Scan(
+		&totals.newUsersToday,
+		&totals.newUsersThisWeek,
+		&totals.newUsersThisMonth,
+		&totals.deposits,
+		&totals.withdrawals,
+		&totals.contestRevenue,
+		&totals.contestRevenueLastMonth,
+		&totals.revenueToday,
+		&totals.revenueThisWeek,
+		&totals.revenueThisMonth,
+		&refreshedAt,
+	)
+	if err != nil {
+		return nil, err
+	}
+	totals.refreshedAt = refreshedAt.Time
+	return &totals, nil
+}
+
+// olderOf returns the earlier of two refresh times, or the zero time if
+// either summary has not been computed
+func olderOf(a, b time.Time) time.Time {
+	if a.IsZero() || b.IsZero() {
+		return time.Time{}
+	}
+	if a.Before(b) {
+		return a
+	}
+	return b
+}
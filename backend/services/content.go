@@ -224,16 +224,16 @@ func (s *ContentService) ToggleBannerStatus(id int64, updatedBy int64) error {
 	return nil
 }
 
+// IncrementBannerView counts a banner view; buffered like RecordContentView
 func (s *ContentService) IncrementBannerView(id int64) error {
-	query := `UPDATE banners SET view_count = view_count + 1 WHERE id = $1`
-	_, err := s.db.Exec(query, id)
-	return err
+	s.counters().banners.Add(contentCounterKey{contentType: "banner", contentID: id}, 1)
+	return nil
 }
 
+// IncrementBannerClick counts a banner click; buffered like RecordContentClick
 func (s *ContentService) IncrementBannerClick(id int64) error {
-	query := `UPDATE banners SET click_count = click_count + 1 WHERE id = $1`
-	_, err := s.db.Exec(query, id)
-	return err
+	s.counters().banners.Add(contentCounterKey{contentType: "banner", contentID: id, click: true}, 1)
+	return nil
 }
 
 // ========================= EMAIL TEMPLATE MANAGEMENT =========================
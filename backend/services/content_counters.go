@@ -0,0 +1,126 @@
+package services
+
+import (
+	"database/sql"
+	"sync"
+
+	"fantasy-esports-backend/pkg/writebehind"
+
+	"github.com/lib/pq"
+)
+
+// contentCounterKey is a view or click counter of a content item or banner
+type contentCounterKey struct {
+	contentType string
+	contentID   int64
+	click       bool
+}
+
+// contentCounters buffer the view and click counters written on every hit,
+// so that a popular banner's row is updated once per flush instead of being
+// locked by every request. They are shared by every ContentService.
+type contentCounters struct {
+	analytics *writebehind.Counter[contentCounterKey]
+	banners   *writebehind.Counter[contentCounterKey]
+	faqViews  *writebehind.Counter[int64]
+}
+
+var (
+	contentCountersOnce   sync.Once
+	sharedContentCounters *contentCounters
+)
+
+// counters returns the process-wide content counters, creating them with
+// this service's database on first use
+func (s *ContentService) counters() *contentCounters {
+	contentCountersOnce.Do(func() {
+		db := s.db
+		sharedContentCounters = &contentCounters{
+			analytics: writebehind.NewCounter("content_analytics", writebehind.DefaultConfig,
+				func(deltas map[contentCounterKey]int64) error { return writeContentAnalytics(db, deltas) }),
+			banners: writebehind.NewCounter("banners", writebehind.DefaultConfig,
+				func(deltas map[contentCounterKey]int64) error { return writeBannerCounts(db, deltas) }),
+			faqViews: writebehind.NewCounter("faq_items", writebehind.DefaultConfig,
+				func(deltas map[int64]int64) error { return writeFAQViews(db, deltas) }),
+		}
+	})
+	return sharedContentCounters
+}
+
+// contentCounts splits summed deltas into parallel id, view and click
+// arrays with one entry per content item
+type contentCounts struct {
+	types  []string
+	ids    []int64
+	views  []int64
+	clicks []int64
+}
+
+func sumContentCounts(deltas map[contentCounterKey]int64) contentCounts {
+	var counts contentCounts
+	index := make(map[contentCounterKey]int, len(deltas))
+	for key, delta := range deltas {
+		item := contentCounterKey{contentType: key.contentType, contentID: key.contentID}
+		i, exists := index[item]
+		if !exists {
+			i = len(counts.ids)
+			index[item] = i
+			counts.types = append(counts.types, key.contentType)
+			counts.ids = append(counts.ids, key.contentID)
+			counts.views = append(counts.views, 0)
+			counts.clicks = append(counts.clicks, 0)
+		}
+		if key.click {
+			counts.clicks[i] += delta
+		} else {
+			counts.views[i] += delta
+		}
+	}
+	return counts
+}
+
+func writeContentAnalytics(db *sql.DB, deltas map[contentCounterKey]int64) error {
+	counts := sumContentCounts(deltas)
+	_, err := db.Exec(`
+		INSERT INTO content_analytics (content_type, content_id, date, views, clicks)
+		SELECT d.content_type, d.content_id, CURRENT_DATE, d.views, d.clicks
+		FROM unnest($1::text[], $2::bigint[], $3::bigint[], $4::bigint[])
+			AS d(content_type, content_id, views, clicks)
+		ON CONFLICT (content_type, content_id, date)
+		DO UPDATE SET views = content_analytics.views + EXCLUDED.views,
+			clicks = content_analytics.clicks + EXCLUDED.clicks`,
+		pq.Array(counts.types), pq.Array(counts.ids), pq.Array(counts.views), pq.Array(counts.clicks))
+	return err
+}
+
+func writeBannerCounts(db *sql.DB, deltas map[contentCounterKey]int64) error {
+	counts := sumContentCounts(deltas)
+	_, err := db.Exec(`
+		UPDATE banners b
+		SET view_count = b.view_count + d.views, click_count = b.click_count + d.clicks
+		FROM unnest($1::bigint[], $2::bigint[], $3::bigint[]) AS d(id, views, clicks)
+		WHERE b.id = d.id`,
+		pq.Array(counts.ids), pq.Array(counts.views), pq.Array(counts.clicks))
+	return err
+}
+
+func writeFAQViews(db *sql.DB, deltas map[int64]int64) error {
+	ids, views := deltaArrays(deltas)
+	_, err := db.Exec(`
+		UPDATE faq_items f SET view_count = f.view_count + d.views
+		FROM unnest($1::bigint[], $2::bigint[]) AS d(id, views)
+		WHERE f.id = d.id`,
+		pq.Array(ids), pq.Array(views))
+	return err
+}
+
+// deltaArrays splits deltas keyed by row id into parallel arrays for unnest
+func deltaArrays(deltas map[int64]int64) ([]int64, []int64) {
+	ids := make([]int64, 0, len(deltas))
+	values := make([]int64, 0, len(deltas))
+	for id, delta := range deltas {
+		ids = append(ids, id)
+		values = append(values, delta)
+	}
+	return ids, values
+}
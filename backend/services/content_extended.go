@@ -473,10 +473,10 @@ func (s *ContentService) ListFAQItems(page, limit int, sectionID *int64, active
 	}, nil
 }
 
+// IncrementFAQView counts a FAQ view; buffered like RecordContentView
 func (s *ContentService) IncrementFAQView(id int64) error {
-	query := `UPDATE faq_items SET view_count = view_count + 1 WHERE id = $1`
-	_, err := s.db.Exec(query, id)
-	return err
+	s.counters().faqViews.Add(id, 1)
+	return nil
 }
 
 func (s *ContentService) IncrementFAQLike(id int64) error {
@@ -689,26 +689,18 @@ func (s *ContentService) DeleteLegalDocument(id, deletedBy int64) error {
 
 // ========================= CONTENT ANALYTICS =========================
 
+// RecordContentView counts a view in today's content_analytics row. The
+// count is buffered and written within a second.
 func (s *ContentService) RecordContentView(contentType string, contentID int64) error {
-	query := `
-		INSERT INTO content_analytics (content_type, content_id, date, views)
-		VALUES ($1, $2, CURRENT_DATE, 1)
-		ON CONFLICT (content_type, content_id, date)
-		DO UPDATE SET views = content_analytics.views + 1`
-	
-	_, err := s.db.Exec(query, contentType, contentID)
-	return err
+	s.counters().analytics.Add(contentCounterKey{contentType: contentType, contentID: contentID}, 1)
+	return nil
 }
 
+// RecordContentClick counts a click in today's content_analytics row. The
+// count is buffered and written within a second.
 func (s *ContentService) RecordContentClick(contentType string, contentID int64) error {
-	query := `
-		INSERT INTO content_analytics (content_type, content_id, date, clicks)
-		VALUES ($1, $2, CURRENT_DATE, 1)
-		ON CONFLICT (content_type, content_id, date)
-		DO UPDATE SET clicks = content_analytics.clicks + 1`
-	
-	_, err := s.db.Exec(query, contentType, contentID)
-	return err
+	s.counters().analytics.Add(contentCounterKey{contentType: contentType, contentID: contentID, click: true}, 1)
+	return nil
 }
 
 func (s *ContentService) GetContentAnalytics(contentType string, contentID int64, days int) ([]models.ContentAnalytics, error) {
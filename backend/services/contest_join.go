@@ -0,0 +1,108 @@
+package services
+
+import (
+	"database/sql"
+	"errors"
+
+	"fantasy-esports-backend/db"
+
+	"github.com/lib/pq"
+)
+
+var (
+	ErrContestNotFound     = errors.New("contest not found")
+	ErrContestNotJoinable  = errors.New("contest is not joinable")
+	ErrContestFull         = errors.New("contest is full")
+	ErrTeamNotFound        = errors.New("team not found")
+	ErrTeamNotOwned        = errors.New("team does not belong to user")
+	ErrAlreadyJoined       = errors.New("already joined this contest with this team")
+	ErrInsufficientBalance = errors.New("insufficient wallet balance")
+)
+
+// Postgres error codes the join statement fails with when it loses a race
+const (
+	pqUniqueViolation  = "23505"
+	pqNotNullViolation = "23502"
+)
+
+// ContestEntry is a place taken in a contest
+type ContestEntry struct {
+	ParticipantID       int64
+	EntryFee            float64
+	CurrentParticipants int
+}
+
+type ContestService struct {
+	db *sql.DB
+}
+
+func NewContestService(db *sql.DB) *ContestService {
+	return &ContestService{db: db}
+}
+
+// JoinContest enters a user's team into a contest and debits the entry fee
+// from the deposit, then winning, balance. The capacity and duplicate checks,
+// the entry, the participant count and the wallet debit are a single
+// statement, so they all happen or none do, and concurrent joins can never
+// take more places than max_participants.
+func (s *ContestService) JoinContest(userID, contestID, teamID int64) (*ContestEntry, error) {
+	var entryID sql.NullInt64
+	var participants sql.NullInt64
+	var exists, duplicate bool
+	var status string
+	var entryFee, balance float64
+	var current, max int
+	var teamOwner sql.NullInt64
+
+	err := db.QueryRow(s.db, db.StmtJoinContest, contestID, userID, teamID).Scan(
+		&entryID, &participants, &exists, &status, &entryFee,
+		&current, &max, &teamOwner, &duplicate, &balance,
+	)
+	if err != nil {
+		if pqErr, ok := err.(*pq.Error); ok {
+			switch pqErr.Code {
+			case pqUniqueViolation:
+				// The same team joined concurrently
+				return nil, ErrAlreadyJoined
+			case pqNotNullViolation:
+				// The balance was spent concurrently
+				return nil, ErrInsufficientBalance
+			}
+		}
+		return nil, err
+	}
+
+	if entryID.Valid {
+		return &ContestEntry{
+			ParticipantID:       entryID.Int64,
+			EntryFee:            entryFee,
+			CurrentParticipants: int(participants.Int64),
+		}, nil
+	}
+	return nil, joinRefusal(exists, status, current, max, teamOwner, userID, duplicate, entryFee, balance)
+}
+
+// joinRefusal explains a join that took no place from the rows as they were
+// before the statement. If they allowed it, a concurrent join took the last
+// place first.
+func joinRefusal(exists bool, status string, current, max int, teamOwner sql.NullInt64, userID int64,
+	duplicate bool, entryFee, balance float64) error {
+	switch {
+	case !exists:
+		return ErrContestNotFound
+	case status != "upcoming":
+		return ErrContestNotJoinable
+	case !teamOwner.Valid:
+		return ErrTeamNotFound
+	case teamOwner.Int64 != userID:
+		return ErrTeamNotOwned
+	case duplicate:
+		return ErrAlreadyJoined
+	case current >= max:
+		return ErrContestFull
+	case entryFee > 0 && balance < entryFee:
+		return ErrInsufficientBalance
+	default:
+		return ErrContestFull
+	}
+}
@@ -0,0 +1,294 @@
+package services
+
+import (
+	"database/sql"
+	"fmt"
+	"math"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/logger"
+
+	"github.com/lib/pq"
+)
+
+const (
+	CaptainMultiplier     = 2.0
+	ViceCaptainMultiplier = 1.5
+
+	// pointsWriteBatchSize bounds the rows sent in one UPDATE ... FROM unnest
+	pointsWriteBatchSize = 5000
+)
+
+// playerMultiplierSQL mirrors PlayerMultiplier for a team_players row aliased tp
+const playerMultiplierSQL = `CASE WHEN tp.is_captain THEN 2.0 WHEN tp.is_vice_captain THEN 1.5 ELSE 1.0 END`
+
+// sqlQuerier is satisfied by both *sql.DB and *sql.Tx
+type sqlQuerier interface {
+	Query(query string, args ...interface{}) (*sql.Rows, error)
+}
+
+// PlayerMultiplier returns the fantasy multiplier for a team player's role
+func PlayerMultiplier(isCaptain, isViceCaptain bool) float64 {
+	if isCaptain {
+		return CaptainMultiplier
+	} else if isViceCaptain {
+		return ViceCaptainMultiplier
+	}
+	return 1.0
+}
+
+// RecalculateFantasyPointsTx recomputes every team of a match inside tx with
+// a handful of set-based statements instead of per-team, per-player queries.
+func (s *LeaderboardService) RecalculateFantasyPointsTx(tx *sql.Tx, matchID int64) (*models.PointsRecalculationReport, error) {
+	report := &models.PointsRecalculationReport{MatchID: matchID}
+	started := time.Now()
+
+	_, err := s.recalculateMatchPoints(tx, matchID, report)
+	report.TotalDurationMs = elapsedMs(started)
+	if err != nil {
+		return nil, err
+	}
+	return report, nil
+}
+
+// recalculateMatchPoints runs the batched engine and returns the new total of
+// every team in the match.
+func (s *LeaderboardService) recalculateMatchPoints(tx *sql.Tx, matchID int64, report *models.PointsRecalculationReport) (map[int64]float64, error) {
+	// Phase 1: aggregate match events once per player
+	phaseStart := time.Now()
+	rows, err := tx.Query(`
+		SELECT player_id, COALESCE(SUM(points), 0)
+		FROM match_events
+		WHERE match_id = $1
+		GROUP BY player_id`, matchID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to aggregate match events: %w", err)
+	}
+
+	playerPoints := make(map[int64]float64)
+	for rows.Next() {
+		var playerID int64
+		var points float64
+		if err := rows.Scan(&playerID, &points); err != nil {
+			rows.Close()
+			return nil, fmt.Errorf("failed to scan player points: %w", err)
+		}
+		playerPoints[playerID] = points
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("failed to aggregate match events: %w", err)
+	}
+	report.PlayersScored = len(playerPoints)
+	recordPhase(report, "aggregate_events", phaseStart)
+
+	// Phase 2: stream every lineup of the match and apply multipliers in memory
+	phaseStart = time.Now()
+	rows, err = tx.Query(`
+		SELECT ut.id, ut.total_points, tp.player_id, tp.is_captain, tp.is_vice_captain, tp.points_earned
+		FROM user_teams ut
+		LEFT JOIN team_players tp ON tp.team_id = ut.id
+		WHERE ut.match_id = $1`, matchID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to load team lineups: %w", err)
+	}
+
+	teamTotals := make(map[int64]float64)
+	previousTotals := make(map[int64]float64)
+	var tpTeamIDs, tpPlayerIDs []int64
+	var tpPoints []float64
+
+	for rows.Next() {
+		var teamID int64
+		var teamTotal float64
+		var playerID sql.NullInt64
+		var isCaptain, isViceCaptain sql.NullBool
+		var pointsEarned sql.NullFloat64
+
+		if err := rows.Scan(&teamID, &teamTotal, &playerID, &isCaptain, &isViceCaptain, &pointsEarned); err != nil {
+			rows.Close()
+			return nil, fmt.Errorf("failed to scan team lineup: %w", err)
+		}
+
+		previousTotals[teamID] = teamTotal
+		if _, seen := teamTotals[teamID]; !seen {
+			teamTotals[teamID] = 0
+		}
+		if !playerID.Valid {
+			continue
+		}
+
+		points := playerPoints[playerID.Int64] * PlayerMultiplier(isCaptain.Bool, isViceCaptain.Bool)
+		teamTotals[teamID] += points
+
+		if roundPoints(points) != roundPoints(pointsEarned.Float64) {
+			tpTeamIDs = append(tpTeamIDs, teamID)
+			tpPlayerIDs = append(tpPlayerIDs, playerID.Int64)
+			tpPoints = append(tpPoints, points)
+		}
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("failed to load team lineups: %w", err)
+	}
+	report.TeamsRecalculated = len(teamTotals)
+	recordPhase(report, "score_lineups", phaseStart)
+
+	// Phase 3: write changed team_players rows in batches
+	phaseStart = time.Now()
+	for start := 0; start < len(tpTeamIDs); start += pointsWriteBatchSize {
+		end := start + pointsWriteBatchSize
+		if end > len(tpTeamIDs) {
+			end = len(tpTeamIDs)
+		}
+
+		result, err := tx.Exec(`
+			UPDATE team_players tp
+			SET points_earned = v.points
+			FROM unnest($1::bigint[], $2::bigint[], $3::numeric[]) AS v(team_id, player_id, points)
+			WHERE tp.team_id = v.team_id AND tp.player_id = v.player_id`,
+			pq.Array(tpTeamIDs[start:end]), pq.Array(tpPlayerIDs[start:end]), pq.Array(tpPoints[start:end]))
+		if err != nil {
+			return nil, fmt.Errorf("failed to update team player points: %w", err)
+		}
+		if affected, err := result.RowsAffected(); err == nil {
+			report.TeamPlayersUpdated += affected
+		}
+	}
+	recordPhase(report, "write_team_players", phaseStart)
+
+	// Phase 4: write changed user_teams totals in batches
+	phaseStart = time.Now()
+	var teamIDs []int64
+	var totals []float64
+	for teamID, total := range teamTotals {
+		if roundPoints(total) != roundPoints(previousTotals[teamID]) {
+			teamIDs = append(teamIDs, teamID)
+			totals = append(totals, total)
+		}
+	}
+
+	for start := 0; start < len(teamIDs); start += pointsWriteBatchSize {
+		end := start + pointsWriteBatchSize
+		if end > len(teamIDs) {
+			end = len(teamIDs)
+		}
+
+		result, err := tx.Exec(`
+			UPDATE user_teams ut
+			SET total_points = v.total_points, updated_at = NOW()
+			FROM unnest($1::bigint[], $2::numeric[]) AS v(id, total_points)
+			WHERE ut.id = v.id`,
+			pq.Array(teamIDs[start:end]), pq.Array(totals[start:end]))
+		if err != nil {
+			return nil, fmt.Errorf("failed to update team totals: %w", err)
+		}
+		if affected, err := result.RowsAffected(); err == nil {
+			report.TeamsUpdated += affected
+		}
+	}
+	recordPhase(report, "write_user_teams", phaseStart)
+
+	return teamTotals, nil
+}
+
+// ApplyPlayerPointsDeltas adds newly scored points (player_id -> base points)
+// to the teams of a match holding those players, applying the captain and
+// vice-captain multipliers, and returns the new total of every affected team.
+// The cost depends on the number of teams holding the players, not on the
+// number of teams in the match. contest_participants.rank is left to match
+// completion, which ranks each contest as it is finalized; live rankings are
+// read from the in-memory rank indexes.
+func (s *LeaderboardService) ApplyPlayerPointsDeltas(q sqlQuerier, matchID int64, deltas map[int64]float64) (map[int64]float64, error) {
+	playerIDs := make([]int64, 0, len(deltas))
+	points := make([]float64, 0, len(deltas))
+	for playerID, delta := range deltas {
+		if delta == 0 {
+			continue
+		}
+		playerIDs = append(playerIDs, playerID)
+		points = append(points, delta)
+	}
+
+	totals := make(map[int64]float64)
+	if len(playerIDs) == 0 {
+		return totals, nil
+	}
+
+	rows, err := q.Query(`
+		WITH deltas AS (
+			SELECT * FROM unnest($2::bigint[], $3::numeric[]) AS d(player_id, points)
+		),
+		scored AS (
+			UPDATE team_players tp
+			SET points_earned = tp.points_earned + d.points * `+playerMultiplierSQL+`
+			FROM deltas d, user_teams ut
+			WHERE tp.player_id = d.player_id AND ut.id = tp.team_id AND ut.match_id = $1
+			RETURNING tp.team_id, d.points * `+playerMultiplierSQL+` AS delta
+		),
+		team_deltas AS (
+			SELECT team_id, SUM(delta) AS delta FROM scored GROUP BY team_id
+		)
+		UPDATE user_teams ut
+		SET total_points = ut.total_points + td.delta, updated_at = NOW()
+		FROM team_deltas td
+		WHERE ut.id = td.team_id
+		RETURNING ut.id, ut.total_points`,
+		matchID, pq.Array(playerIDs), pq.Array(points))
+	if err != nil {
+		return nil, fmt.Errorf("failed to apply points delta: %w", err)
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var teamID int64
+		var total float64
+		if err := rows.Scan(&teamID, &total); err != nil {
+			return nil, fmt.Errorf("failed to scan team total: %w", err)
+		}
+		totals[teamID] = total
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("failed to apply points delta: %w", err)
+	}
+
+	return totals, nil
+}
+
+// ApplyTeamTotals moves teams to their new totals in every loaded contest
+// rank index and returns the IDs of the contests whose rankings changed.
+// Call it only once the totals are committed.
+func (s *LeaderboardService) ApplyTeamTotals(totals map[int64]float64) []int64 {
+	changed := make(map[int64]bool)
+	for teamID, total := range totals {
+		for _, contestID := range s.rankIndexes.UpdateTeamPoints(teamID, total) {
+			changed[contestID] = true
+		}
+	}
+
+	contestIDs := make([]int64, 0, len(changed))
+	for contestID := range changed {
+		contestIDs = append(contestIDs, contestID)
+	}
+	return contestIDs
+}
+
+// recordPhase appends a timed phase to the recalculation report
+func recordPhase(report *models.PointsRecalculationReport, name string, started time.Time) {
+	duration := elapsedMs(started)
+	report.Phases = append(report.Phases, models.RecalculationPhase{
+		Name:       name,
+		DurationMs: duration,
+	})
+	logger.Debug(fmt.Sprintf("Recalculation phase %s for match %d took %.2fms", name, report.MatchID, duration))
+}
+
+func elapsedMs(started time.Time) float64 {
+	return float64(time.Since(started).Microseconds()) / 1000.0
+}
+
+// roundPoints rounds to the DECIMAL(x,2) precision points are stored with
+func roundPoints(points float64) float64 {
+	return math.Round(points*100) / 100
+}
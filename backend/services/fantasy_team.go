@@ -0,0 +1,112 @@
+package services
+
+import (
+	"database/sql"
+	"fmt"
+
+	"fantasy-esports-backend/models"
+
+	"github.com/lib/pq"
+)
+
+// TeamService creates and edits fantasy teams. Lineups are validated against
+// the cached player catalog of the match, and a team is written with its
+// players in one transaction.
+type TeamService struct {
+	db *sql.DB
+}
+
+func NewTeamService(db *sql.DB) *TeamService {
+	return &TeamService{db: db}
+}
+
+// CreateTeam validates and saves a new team, returning its ID and lineup
+func (s *TeamService) CreateTeam(userID int64, req models.CreateTeamRequest) (int64, *TeamSelection, error) {
+	selection, err := s.validate(req.MatchID, req.Players)
+	if err != nil {
+		return 0, nil, err
+	}
+
+	tx, err := s.db.Begin()
+	if err != nil {
+		return 0, nil, err
+	}
+	defer tx.Rollback()
+
+	var teamID int64
+	err = tx.QueryRow(`
+		INSERT INTO user_teams (user_id, match_id, team_name, captain_player_id, vice_captain_player_id, total_credits_used, created_at, updated_at)
+		VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
+		RETURNING id`,
+		userID, req.MatchID, req.TeamName, selection.CaptainID, selection.ViceCaptainID, selection.TotalCredits).Scan(&teamID)
+	if err != nil {
+		return 0, nil, fmt.Errorf("failed to create team: %w", err)
+	}
+	if err := insertTeamPlayers(tx, teamID, selection); err != nil {
+		return 0, nil, err
+	}
+	return teamID, selection, tx.Commit()
+}
+
+// UpdateTeam replaces the lineup of a team, and its name unless teamName is
+// empty
+func (s *TeamService) UpdateTeam(teamID, matchID int64, teamName string, players []models.PlayerSelection) (*TeamSelection, error) {
+	selection, err := s.validate(matchID, players)
+	if err != nil {
+		return nil, err
+	}
+
+	tx, err := s.db.Begin()
+	if err != nil {
+		return nil, err
+	}
+	defer tx.Rollback()
+
+	_, err = tx.Exec(`
+		UPDATE user_teams
+		SET team_name = COALESCE(NULLIF($1, ''), team_name), captain_player_id = $2, vice_captain_player_id = $3,
+			total_credits_used = $4, updated_at = NOW()
+		WHERE id = $5`,
+		teamName, selection.CaptainID, selection.ViceCaptainID, selection.TotalCredits, teamID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to update team: %w", err)
+	}
+	if _, err := tx.Exec(`DELETE FROM team_players WHERE team_id = $1`, teamID); err != nil {
+		return nil, fmt.Errorf("failed to clear team players: %w", err)
+	}
+	if err := insertTeamPlayers(tx, teamID, selection); err != nil {
+		return nil, err
+	}
+	return selection, tx.Commit()
+}
+
+func (s *TeamService) validate(matchID int64, players []models.PlayerSelection) (*TeamSelection, error) {
+	catalog, err := GetPlayerCatalog(s.db, matchID)
+	if err != nil {
+		return nil, err
+	}
+	return catalog.Validate(players)
+}
+
+// insertTeamPlayers writes a whole lineup with one multi-row INSERT
+func insertTeamPlayers(tx *sql.Tx, teamID int64, selection *TeamSelection) error {
+	count := len(selection.Players)
+	playerIDs := make([]int64, count)
+	captains := make([]bool, count)
+	viceCaptains := make([]bool, count)
+	for i, player := range selection.Players {
+		playerIDs[i] = player.PlayerID
+		captains[i] = player.IsCaptain
+		viceCaptains[i] = player.IsViceCaptain
+	}
+
+	_, err := tx.Exec(`
+		INSERT INTO team_players (team_id, player_id, real_team_id, is_captain, is_vice_captain)
+		SELECT $1, v.player_id, v.real_team_id, v.is_captain, v.is_vice_captain
+		FROM unnest($2::bigint[], $3::bigint[], $4::boolean[], $5::boolean[]) AS v(player_id, real_team_id, is_captain, is_vice_captain)`,
+		teamID, pq.Array(playerIDs), pq.Array(selection.RealTeamIDs), pq.Array(captains), pq.Array(viceCaptains))
+	if err != nil {
+		return fmt.Errorf("failed to add team players: %w", err)
+	}
+	return nil
+}
@@ -18,115 +18,24 @@ func NewFraudDetectionService(db *sql.DB) *FraudDetectionService {
 	return &FraudDetectionService{db: db}
 }
 
-// Real-time fraud detection during user actions
+// CheckUserAction queues a user action for behavior logging and fraud
+// checks and returns without waiting for either. Actions are dropped, and
+// ErrFraudQueueFull returned, while the pipeline is backed up.
 func (s *FraudDetectionService) CheckUserAction(userID int64, action string, contextData map[string]interface{}, ipAddress, userAgent string) error {
-	// Log the behavior
-	err := s.logUserBehavior(userID, "", action, contextData, ipAddress, userAgent)
-	if err != nil {
-		return err
-	}
-
-	// Run multiple fraud checks
-	alerts := []models.FraudAlert{}
-
-	// Check for multiple accounts from same IP
-	if alert := s.checkMultipleAccounts(userID, ipAddress); alert != nil {
-		alerts = append(alerts, *alert)
-	}
-
-	// Check for suspicious wallet activity
-	if strings.Contains(action, "wallet") || strings.Contains(action, "payment") {
-		if alert := s.checkSuspiciousWalletActivity(userID, contextData); alert != nil {
-			alerts = append(alerts, *alert)
-		}
-	}
-
-	// Check for bot-like behavior
-	if alert := s.checkBotBehavior(userID, action, contextData); alert != nil {
-		alerts = append(alerts, *alert)
-	}
-
-	// Check for rapid team creation
-	if action == "team_created" {
-		if alert := s.checkRapidTeamCreation(userID); alert != nil {
-			alerts = append(alerts, *alert)
-		}
-	}
-
-	// Check for contest manipulation
-	if strings.Contains(action, "contest") {
-		if alert := s.checkContestManipulation(userID, contextData); alert != nil {
-			alerts = append(alerts, *alert)
-		}
-	}
-
-	// Check for referral fraud
-	if action == "referral_signup" {
-		if alert := s.checkReferralFraud(userID, contextData); alert != nil {
-			alerts = append(alerts, *alert)
-		}
-	}
-
-	// Store alerts
-	for _, alert := range alerts {
-		err = s.createAlert(alert)
-		if err != nil {
-			continue // Don't fail the entire process for logging issues
-		}
-	}
-
-	return nil
+	return s.pipeline().submit(behaviorEvent{
+		userID:      userID,
+		action:      action,
+		contextData: contextData,
+		ipAddress:   ipAddress,
+		userAgent:   userAgent,
+		at:          time.Now(),
+	})
 }
 
-func (s *FraudDetectionService) logUserBehavior(userID int64, sessionID, action string, contextData map[string]interface{}, ipAddress, userAgent string) error {
-	contextJSON, err := json.Marshal(contextData)
-	if err != nil {
-		contextJSON = []byte("{}")
-	}
-
-	var sessionIDPtr *string
-	if sessionID != "" {
-		sessionIDPtr = &sessionID
-	}
-
-	var userIDPtr *int64
-	if userID != 0 {
-		userIDPtr = &userID
-	}
-
-	var ipPtr *string
-	if ipAddress != "" {
-		ipPtr = &ipAddress
-	}
-
-	var uaPtr *string
-	if userAgent != "" {
-		uaPtr = &userAgent
-	}
-
-	_, err = s.db.Exec(`
-		INSERT INTO user_behavior_logs (user_id, session_id, action, context_data, ip_address, user_agent)
-		VALUES ($1, $2, $3, $4, $5, $6)
-	`, userIDPtr, sessionIDPtr, action, contextJSON, ipPtr, uaPtr)
-
-	return err
-}
-
-func (s *FraudDetectionService) checkMultipleAccounts(userID int64, ipAddress string) *models.FraudAlert {
-	if ipAddress == "" {
-		return nil
-	}
-
-	// Check for multiple accounts from same IP in last 24 hours
-	var count int
-	err := s.db.QueryRow(`
-		SELECT COUNT(DISTINCT user_id)
-		FROM user_behavior_logs
-		WHERE ip_address = $1 AND created_at >= CURRENT_TIMESTAMP - INTERVAL '24 hours'
-		AND user_id IS NOT NULL
-	`, ipAddress).Scan(&count)
-
-	if err != nil || count < 3 {
+// multipleAccountsAlert flags an IP address used by count accounts in the
+// last 24 hours
+func (s *FraudDetectionService) multipleAccountsAlert(userID int64, ipAddress string, count int) *models.FraudAlert {
+	if count < 3 {
 		return nil
 	}
 
@@ -220,28 +129,19 @@ func (s *FraudDetectionService) checkSuspiciousWalletActivity(userID int64, cont
 	}
 }
 
-func (s *FraudDetectionService) checkBotBehavior(userID int64, action string, contextData map[string]interface{}) *models.FraudAlert {
-	// Check action frequency in last hour
-	var actionCount int
-	err := s.db.QueryRow(`
-		SELECT COUNT(*)
-		FROM user_behavior_logs
-		WHERE user_id = $1 AND action = $2 AND created_at >= CURRENT_TIMESTAMP - INTERVAL '1 hour'
-	`, userID, action).Scan(&actionCount)
-
-	if err != nil {
-		return nil
-	}
-
-	// Define thresholds for different actions
-	thresholds := map[string]int{
-		"team_created":    20,
-		"contest_joined":  50,
-		"profile_updated": 10,
-		"api_call":       100,
-	}
+// botActionThresholds are the hourly counts of an action above which a user
+// is flagged as a possible bot
+var botActionThresholds = map[string]int{
+	"team_created":    20,
+	"contest_joined":  50,
+	"profile_updated": 10,
+	"api_call":       100,
+}
 
-	threshold, exists := thresholds[action]
+// botBehaviorAlert flags a user repeating an action more often in an hour
+// than its threshold. recent returns the latest occurrences, newest first.
+func (s *FraudDetectionService) botBehaviorAlert(userID int64, action string, actionCount int, recent func() []time.Time) *models.FraudAlert {
+	threshold, exists := botActionThresholds[action]
 	if !exists {
 		threshold = 30 // Default threshold
 	}
@@ -251,26 +151,7 @@ func (s *FraudDetectionService) checkBotBehavior(userID int64, action string, co
 	}
 
 	// Check for uniform timing patterns (bot indicator)
-	var timestamps []time.Time
-	rows, err := s.db.Query(`
-		SELECT created_at
-		FROM user_behavior_logs
-		WHERE user_id = $1 AND action = $2 AND created_at >= CURRENT_TIMESTAMP - INTERVAL '1 hour'
-		ORDER BY created_at DESC
-		LIMIT 10
-	`, userID, action)
-
-	if err == nil {
-		defer rows.Close()
-		for rows.Next() {
-			var ts time.Time
-			if rows.Scan(&ts) == nil {
-				timestamps = append(timestamps, ts)
-			}
-		}
-	}
-
-	// Calculate timing uniformity
+	timestamps := recent()
 	uniformityScore := s.calculateTimingUniformity(timestamps)
 
 	detectionData := map[string]interface{}{
@@ -295,16 +176,10 @@ func (s *FraudDetectionService) checkBotBehavior(userID int64, action string, co
 	}
 }
 
-func (s *FraudDetectionService) checkRapidTeamCreation(userID int64) *models.FraudAlert {
-	// Check team creation rate in last 10 minutes
-	var count int
-	err := s.db.QueryRow(`
-		SELECT COUNT(*)
-		FROM user_teams
-		WHERE user_id = $1 AND created_at >= CURRENT_TIMESTAMP - INTERVAL '10 minutes'
-	`, userID).Scan(&count)
-
-	if err != nil || count < 5 {
+// checkRapidTeamCreation flags a user who created count teams in the last
+// 10 minutes, noting how many of their recent teams are identical
+func (s *FraudDetectionService) checkRapidTeamCreation(userID int64, count int) *models.FraudAlert {
+	if count < 5 {
 		return nil
 	}
 
@@ -651,6 +526,7 @@ func (s *FraudDetectionService) GetFraudStatistics(days int) (map[string]interfa
 	stats["by_type"] = byType
 	stats["by_severity"] = bySeverity
 	stats["total_alerts"] = totalAlerts
+	stats["pipeline"] = s.pipeline().stats()
 
 	if totalAlerts > 0 {
 		stats["resolution_rate"] = float64(totalResolved) / float64(totalAlerts)
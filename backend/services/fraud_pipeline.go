@@ -0,0 +1,362 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"net"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/logger"
+	"fantasy-esports-backend/pkg/window"
+	"fantasy-esports-backend/pkg/writebehind"
+
+	"github.com/lib/pq"
+)
+
+const (
+	// fraudQueueSize bounds the actions waiting to be processed; further
+	// actions are dropped rather than slowing requests down
+	fraudQueueSize = 10000
+
+	// behavior logs are written in multi-row inserts of up to
+	// fraudLogBatchSize rows, at least every fraudLogFlushInterval
+	fraudLogBatchSize     = 500
+	fraudLogFlushInterval = time.Second
+
+	// fraudCheckWorkers run the checks that still need the database, such
+	// as wallet history, and write alerts
+	fraudCheckWorkers   = 4
+	fraudCheckQueueSize = 1000
+
+	// Per user and action, counts over the last hour in one-minute buckets
+	// and the times of the latest actions for the timing check
+	fraudActionWindow   = time.Hour
+	fraudActionBuckets  = 60
+	fraudRecentActions  = 10
+	fraudActionCapacity = 200000
+
+	// Per IP address, the accounts seen in the last day. Tracking more
+	// accounts than the critical threshold of 10 changes no alert.
+	fraudIPWindow       = 24 * time.Hour
+	fraudIPAccountLimit = 16
+	fraudIPCapacity     = 100000
+
+	// fraudAlertCooldown suppresses repeats of an alert for the same user,
+	// which would otherwise be raised on every action over a threshold
+	fraudAlertCooldown = time.Hour
+	fraudAlertCapacity = 50000
+)
+
+// ErrFraudQueueFull is returned when an action is dropped because the fraud
+// pipeline is backed up
+var ErrFraudQueueFull = errors.New("fraud detection queue is full")
+
+// behaviorEvent is a user action waiting to be logged and checked
+type behaviorEvent struct {
+	userID      int64
+	action      string
+	contextData map[string]interface{}
+	ipAddress   string
+	userAgent   string
+	at          time.Time
+
+	// drained, when set, marks the end of a drain instead of an action
+	drained chan struct{}
+}
+
+type actionKey struct {
+	userID int64
+	action string
+}
+
+type alertKey struct {
+	userID    int64
+	alertType string
+}
+
+// fraudPipeline logs and checks user actions off the request path. A single
+// goroutine owns the sliding-window counters, so the threshold checks need
+// neither locks nor queries; checks that read other tables and alert writes
+// go to a small worker pool. Behavior logs go through a write-behind buffer.
+type fraudPipeline struct {
+	service *FraudDetectionService
+	events  chan behaviorEvent
+	checks  chan func()
+
+	dropped       atomic.Int64
+	droppedChecks atomic.Int64
+	draining      atomic.Bool
+
+	actions *cache.LRU[actionKey, *window.Counter]
+	ips     *cache.LRU[string, *window.Distinct]
+	alerted *cache.LRU[alertKey, struct{}]
+	logs    *writebehind.Log[behaviorLogRow]
+}
+
+// behaviorLogRow is a user_behavior_logs row waiting to be written
+type behaviorLogRow struct {
+	userID      int64
+	action      string
+	contextData string
+	ipAddress   string
+	userAgent   string
+}
+
+var (
+	fraudPipelineOnce sync.Once
+	userActionChecks  atomic.Pointer[fraudPipeline]
+)
+
+// pipeline returns the process-wide fraud pipeline, starting it with this
+// service's database on first use
+func (s *FraudDetectionService) pipeline() *fraudPipeline {
+	fraudPipelineOnce.Do(func() {
+		pipeline := newFraudPipeline(s)
+		pipeline.start()
+		userActionChecks.Store(pipeline)
+	})
+	return userActionChecks.Load()
+}
+
+// DrainFraudPipeline processes the user actions still queued and sends
+// actions submitted after it straight to the behavior log buffer. Call it on
+// shutdown before writebehind.CloseAll so that queued actions are logged.
+func DrainFraudPipeline() {
+	if pipeline := userActionChecks.Load(); pipeline != nil {
+		pipeline.drain()
+	}
+}
+
+func newFraudPipeline(service *FraudDetectionService) *fraudPipeline {
+	logConfig := writebehind.Config{FlushInterval: fraudLogFlushInterval, MaxPending: fraudLogBatchSize}
+	return &fraudPipeline{
+		service: service,
+		logs: writebehind.NewLog("user_behavior_logs", logConfig, func(rows []behaviorLogRow) error {
+			return insertBehaviorLogs(service.db, rows)
+		}),
+		events:  make(chan behaviorEvent, fraudQueueSize),
+		checks:  make(chan func(), fraudCheckQueueSize),
+		actions: cache.NewLRU[actionKey, *window.Counter](fraudActionCapacity, fraudActionWindow),
+		ips:     cache.NewLRU[string, *window.Distinct](fraudIPCapacity, fraudIPWindow),
+		alerted: cache.NewLRU[alertKey, struct{}](fraudAlertCapacity, fraudAlertCooldown),
+	}
+}
+
+func (p *fraudPipeline) start() {
+	go p.run()
+	for i := 0; i < fraudCheckWorkers; i++ {
+		go func() {
+			for check := range p.checks {
+				check()
+			}
+		}()
+	}
+}
+
+// submit queues an event without blocking. Once the pipeline is draining,
+// the event is only logged.
+func (p *fraudPipeline) submit(event behaviorEvent) error {
+	if p.draining.Load() {
+		p.logs.Add(newBehaviorLogRow(event))
+		return nil
+	}
+	select {
+	case p.events <- event:
+		return nil
+	default:
+		p.dropped.Add(1)
+		return ErrFraudQueueFull
+	}
+}
+
+// stats reports the pipeline's backlog and what it has dropped
+func (p *fraudPipeline) stats() map[string]interface{} {
+	return map[string]interface{}{
+		"queued":          len(p.events),
+		"dropped_actions": p.dropped.Load(),
+		"dropped_checks":  p.droppedChecks.Load(),
+		"tracked_actions": p.actions.Len(),
+		"tracked_ips":     p.ips.Len(),
+	}
+}
+
+func (p *fraudPipeline) run() {
+	for event := range p.events {
+		if event.drained != nil {
+			close(event.drained)
+			continue
+		}
+		p.logs.Add(newBehaviorLogRow(event))
+		p.check(event)
+	}
+}
+
+// drain returns once every event queued before it has been logged
+func (p *fraudPipeline) drain() {
+	p.draining.Store(true)
+	drained := make(chan struct{})
+	p.events <- behaviorEvent{drained: drained}
+	<-drained
+}
+
+// check updates the counters with an event and raises the alerts its
+// thresholds call for
+func (p *fraudPipeline) check(event behaviorEvent) {
+	s := p.service
+	userID := event.userID
+
+	counter := p.actionCounter(actionKey{userID: userID, action: event.action})
+	counter.Add(event.at)
+
+	// Check for multiple accounts from same IP
+	if event.ipAddress != "" && userID != 0 {
+		accounts := p.ipAccounts(event.ipAddress)
+		accounts.Add(userID, event.at)
+		p.raise(s.multipleAccountsAlert(userID, event.ipAddress, accounts.Count(event.at)))
+	}
+
+	// Check for bot-like behavior
+	p.raise(s.botBehaviorAlert(userID, event.action, counter.Count(event.at, fraudActionWindow), counter.Recent))
+
+	// The remaining checks read other tables
+	contextData := event.contextData
+
+	// Check for rapid team creation
+	if event.action == "team_created" {
+		if recentTeams := counter.Count(event.at, 10*time.Minute); recentTeams >= 5 {
+			p.queueCheck(func() { p.raise(s.checkRapidTeamCreation(userID, recentTeams)) })
+		}
+	}
+
+	// Check for suspicious wallet activity
+	if strings.Contains(event.action, "wallet") || strings.Contains(event.action, "payment") {
+		p.queueCheck(func() { p.raise(s.checkSuspiciousWalletActivity(userID, contextData)) })
+	}
+
+	// Check for contest manipulation
+	if strings.Contains(event.action, "contest") {
+		if _, exists := contextData["contest_id"]; exists {
+			p.queueCheck(func() { p.raise(s.checkContestManipulation(userID, contextData)) })
+		}
+	}
+
+	// Check for referral fraud
+	if event.action == "referral_signup" {
+		p.queueCheck(func() { p.raise(s.checkReferralFraud(userID, contextData)) })
+	}
+}
+
+// actionCounter returns the counter of a user's action, refreshing its idle
+// expiry
+func (p *fraudPipeline) actionCounter(key actionKey) *window.Counter {
+	counter, exists := p.actions.Get(key)
+	if !exists {
+		counter = window.NewCounter(fraudActionWindow, fraudActionBuckets, fraudRecentActions)
+	}
+	p.actions.Set(key, counter)
+	return counter
+}
+
+// ipAccounts returns the accounts seen from an IP address, refreshing its
+// idle expiry
+func (p *fraudPipeline) ipAccounts(ipAddress string) *window.Distinct {
+	accounts, exists := p.ips.Get(ipAddress)
+	if !exists {
+		accounts = window.NewDistinct(fraudIPWindow, fraudIPAccountLimit)
+	}
+	p.ips.Set(ipAddress, accounts)
+	return accounts
+}
+
+// queueCheck hands a database-backed check to the workers, dropping it if
+// they are backed up. It reports whether the check was queued.
+func (p *fraudPipeline) queueCheck(check func()) bool {
+	select {
+	case p.checks <- check:
+		return true
+	default:
+		p.droppedChecks.Add(1)
+		return false
+	}
+}
+
+// raise stores an alert unless the same alert was raised for the user
+// within the cooldown. An alert that is dropped or fails to store does not
+// start the cooldown, so the next occurrence raises it again.
+func (p *fraudPipeline) raise(alert *models.FraudAlert) {
+	if alert == nil {
+		return
+	}
+
+	var userID int64
+	if alert.UserID != nil {
+		userID = *alert.UserID
+	}
+	key := alertKey{userID: userID, alertType: alert.AlertType}
+	if _, exists := p.alerted.Get(key); exists {
+		return
+	}
+	p.alerted.Set(key, struct{}{})
+
+	queued := p.queueCheck(func() {
+		if err := p.service.createAlert(*alert); err != nil {
+			p.alerted.Remove(key)
+			logger.Error(fmt.Sprintf("Failed to store %s fraud alert: %v", alert.AlertType, err))
+		}
+	})
+	if !queued {
+		p.alerted.Remove(key)
+	}
+}
+
+func newBehaviorLogRow(event behaviorEvent) behaviorLogRow {
+	contextJSON, err := json.Marshal(event.contextData)
+	if err != nil {
+		contextJSON = []byte("{}")
+	}
+
+	// An unparsable address would fail the whole batch's inet cast
+	ipAddress := event.ipAddress
+	if net.ParseIP(ipAddress) == nil {
+		ipAddress = ""
+	}
+
+	return behaviorLogRow{
+		userID:      event.userID,
+		action:      event.action,
+		contextData: string(contextJSON),
+		ipAddress:   ipAddress,
+		userAgent:   event.userAgent,
+	}
+}
+
+func insertBehaviorLogs(db *sql.DB, rows []behaviorLogRow) error {
+	userIDs := make([]int64, len(rows))
+	actions := make([]string, len(rows))
+	contexts := make([]string, len(rows))
+	ipAddresses := make([]string, len(rows))
+	userAgents := make([]string, len(rows))
+	for i, row := range rows {
+		userIDs[i] = row.userID
+		actions[i] = row.action
+		contexts[i] = row.contextData
+		ipAddresses[i] = row.ipAddress
+		userAgents[i] = row.userAgent
+	}
+
+	_, err := db.Exec(`
+		INSERT INTO user_behavior_logs (user_id, action, context_data, ip_address, user_agent)
+		SELECT NULLIF(r.user_id, 0), r.action, r.context_data::jsonb,
+			NULLIF(r.ip_address, '')::inet, NULLIF(r.user_agent, '')
+		FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[], $5::text[])
+			AS r(user_id, action, context_data, ip_address, user_agent)`,
+		pq.Array(userIDs), pq.Array(actions), pq.Array(contexts), pq.Array(ipAddresses), pq.Array(userAgents))
+	return err
+}
@@ -0,0 +1,104 @@
+package services
+
+import (
+	"sync"
+	"testing"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/writebehind"
+)
+
+func TestFraudPipelineRaisesEachAlertOnce(t *testing.T) {
+	pipeline := newFraudPipeline(&FraudDetectionService{})
+	start := time.Unix(1700000000, 0)
+
+	// Three accounts from one IP trip the multiple accounts check
+	for userID := int64(1); userID <= 3; userID++ {
+		pipeline.check(behaviorEvent{userID: userID, action: "api_call", ipAddress: "10.0.0.1", at: start})
+	}
+	if queued := len(pipeline.checks); queued != 1 {
+		t.Fatalf("queued %d alerts after three accounts, want 1", queued)
+	}
+
+	// Twenty team creations a few seconds apart trip the bot check once;
+	// the IP alert is not repeated within its cooldown
+	for i := 0; i < 20; i++ {
+		pipeline.check(behaviorEvent{userID: 3, action: "team_created", ipAddress: "10.0.0.1", at: start.Add(time.Duration(i) * 3 * time.Second)})
+	}
+	if _, exists := pipeline.alerted.Get(alertKey{userID: 3, alertType: "bot_like_behavior"}); !exists {
+		t.Fatal("bot behavior alert not raised")
+	}
+	if queued := len(pipeline.checks); queued < 2 {
+		t.Fatalf("queued %d checks, want the bot alert and team checks", queued)
+	}
+
+	counter := pipeline.actionCounter(actionKey{userID: 3, action: "team_created"})
+	if got := counter.Count(start.Add(time.Minute), fraudActionWindow); got != 20 {
+		t.Fatalf("team_created count = %d, want 20", got)
+	}
+}
+
+func TestFraudPipelineRetriesDroppedAlerts(t *testing.T) {
+	pipeline := newFraudPipeline(&FraudDetectionService{})
+	for len(pipeline.checks) < cap(pipeline.checks) {
+		pipeline.queueCheck(func() {})
+	}
+
+	userID := int64(7)
+	alert := &models.FraudAlert{UserID: &userID, AlertType: "multiple_accounts"}
+	pipeline.raise(alert)
+	if _, exists := pipeline.alerted.Get(alertKey{userID: userID, alertType: alert.AlertType}); exists {
+		t.Fatal("dropped alert started its cooldown")
+	}
+
+	<-pipeline.checks
+	pipeline.raise(alert)
+	if _, exists := pipeline.alerted.Get(alertKey{userID: userID, alertType: alert.AlertType}); !exists {
+		t.Fatal("queued alert did not start its cooldown")
+	}
+}
+
+func TestFraudPipelineDrainLogsQueuedEvents(t *testing.T) {
+	pipeline := newFraudPipeline(&FraudDetectionService{})
+	var mutex sync.Mutex
+	logged := 0
+	pipeline.logs = writebehind.NewLog("test_behavior_logs", writebehind.Config{FlushInterval: time.Hour, MaxPending: 100},
+		func(rows []behaviorLogRow) error {
+			mutex.Lock()
+			defer mutex.Unlock()
+			logged += len(rows)
+			return nil
+		})
+
+	for userID := int64(1); userID <= 500; userID++ {
+		if err := pipeline.submit(behaviorEvent{userID: userID, action: "page_view", at: time.Now()}); err != nil {
+			t.Fatal(err)
+		}
+	}
+	go pipeline.run()
+	pipeline.drain()
+	// Actions after the drain go straight to the log
+	pipeline.submit(behaviorEvent{userID: 501, action: "page_view", at: time.Now()})
+	pipeline.logs.Close()
+
+	mutex.Lock()
+	defer mutex.Unlock()
+	if logged != 501 {
+		t.Fatalf("logged %d actions, want 501", logged)
+	}
+}
+
+func BenchmarkCheckUserActionSubmit(b *testing.B) {
+	pipeline := newFraudPipeline(&FraudDetectionService{})
+	go func() {
+		for range pipeline.events {
+		}
+	}()
+	contextData := map[string]interface{}{"method": "POST", "path": "/api/v1/teams"}
+
+	b.ReportAllocs()
+	for i := 0; i < b.N; i++ {
+		pipeline.submit(behaviorEvent{userID: int64(i % 1000), action: "team_created", contextData: contextData, at: time.Now()})
+	}
+}
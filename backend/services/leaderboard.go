@@ -4,46 +4,37 @@ import (
 	"database/sql"
 	"fmt"
 	"time"
-	"sync"
+	"fantasy-esports-backend/db"
 	"fantasy-esports-backend/models"
 	"fantasy-esports-backend/pkg/logger"
+	"fantasy-esports-backend/pkg/ranking"
 )
 
+// contestRankIndexes is shared by every LeaderboardService in the process so
+// that handlers holding their own service instance read the same rankings.
+var contestRankIndexes = ranking.NewRegistry()
+
 type LeaderboardService struct {
 	db             *sql.DB
-	cache          map[string]*models.CachedLeaderboard
-	cacheMutex     sync.RWMutex
-	snapshots      map[int64]*models.RankingSnapshot
-	snapshotMutex  sync.RWMutex
-	updateChannel  chan models.RealTimeLeaderboardUpdate
+	cache          *leaderboardCache
+	stream         *leaderboardStream
+	rankIndexes    *ranking.Registry
 }
 
 func NewLeaderboardService(db *sql.DB) *LeaderboardService {
-	service := &LeaderboardService{
+	return &LeaderboardService{
 		db:             db,
-		cache:          make(map[string]*models.CachedLeaderboard),
-		snapshots:      make(map[int64]*models.RankingSnapshot),
-		updateChannel:  make(chan models.RealTimeLeaderboardUpdate, 100),
+		cache:          contestLeaderboards,
+		stream:         contestStream,
+		rankIndexes:    contestRankIndexes,
 	}
-	
-	// Start the real-time update processor
-	go service.processRealTimeUpdates()
-	
-	return service
 }
 
 // CalculateContestLeaderboard calculates real-time leaderboard for a contest
 func (s *LeaderboardService) CalculateContestLeaderboard(contestID int64) (*models.Leaderboard, error) {
 	logger.Info(fmt.Sprintf("Calculating leaderboard for contest %d", contestID))
 	
-	// Get contest info
-	var contest models.Contest
-	err := s.db.QueryRow(`
-		SELECT id, match_id, name, total_prize_pool, current_participants, status
-		FROM contests WHERE id = $1`, contestID).Scan(
-		&contest.ID, &contest.MatchID, &contest.Name, &contest.TotalPrizePool,
-		&contest.CurrentParticipants, &contest.Status,
-	)
+	index, err := s.getRankIndex(contestID)
 	if err != nil {
 		return nil, fmt.Errorf("failed to get contest info: %w", err)
 	}
@@ -56,7 +47,7 @@ func (s *LeaderboardService) CalculateContestLeaderboard(contestID int64) (*mode
 
 	leaderboard := &models.Leaderboard{
 		ContestID:         contestID,
-		TotalParticipants: contest.CurrentParticipants,
+		TotalParticipants: index.Len(),
 		TopPerformers:     topPerformers,
 		LastUpdated:       time.Now(),
 	}
@@ -101,280 +92,197 @@ func (s *LeaderboardService) GetLiveLeaderboard(contestID int64, userID int64) (
 }
 
 // RecalculateFantasyPoints recalculates fantasy points for all teams in a match
-func (s *LeaderboardService) RecalculateFantasyPoints(matchID int64) error {
+func (s *LeaderboardService) RecalculateFantasyPoints(matchID int64) (*models.PointsRecalculationReport, error) {
 	logger.Info(fmt.Sprintf("Recalculating fantasy points for match %d", matchID))
-	
-	// Get all teams in this match
-	teams, err := s.getTeamsInMatch(matchID)
+	started := time.Now()
+	report := &models.PointsRecalculationReport{MatchID: matchID}
+
+	tx, err := s.db.Begin()
 	if err != nil {
-		return fmt.Errorf("failed to get teams in match: %w", err)
+		return nil, fmt.Errorf("failed to start transaction: %w", err)
 	}
+	defer tx.Rollback()
 
-	// Update points for each team
-	for _, team := range teams {
-		totalPoints, err := s.calculateTeamPoints(team.ID, matchID)
-		if err != nil {
-			logger.Error(fmt.Sprintf("Failed to calculate points for team %d: %v", team.ID, err))
-			continue
-		}
+	// Aggregate events, score lineups and write points in bulk
+	teamTotals, err := s.recalculateMatchPoints(tx, matchID, report)
+	if err != nil {
+		return nil, err
+	}
 
-		// Update team total points
-		_, err = s.db.Exec(`
-			UPDATE user_teams 
-			SET total_points = $1, updated_at = NOW() 
-			WHERE id = $2`, totalPoints, team.ID)
-		if err != nil {
-			logger.Error(fmt.Sprintf("Failed to update points for team %d: %v", team.ID, err))
-		}
+	phaseStart := time.Now()
+	if err := tx.Commit(); err != nil {
+		return nil, fmt.Errorf("failed to commit recalculated points: %w", err)
 	}
+	recordPhase(report, "commit", phaseStart)
+
+	// Move every team in the loaded contest rank indexes
+	phaseStart = time.Now()
+	for teamID, total := range teamTotals {
+		s.rankIndexes.UpdateTeamPoints(teamID, total)
+	}
+	recordPhase(report, "update_rank_indexes", phaseStart)
 
 	// Update all contest leaderboards for this match
+	phaseStart = time.Now()
 	err = s.updateContestRankings(matchID)
 	if err != nil {
-		return fmt.Errorf("failed to update contest rankings: %w", err)
+		return nil, fmt.Errorf("failed to update contest rankings: %w", err)
 	}
+	recordPhase(report, "update_contest_rankings", phaseStart)
 
-	logger.Info(fmt.Sprintf("Successfully recalculated fantasy points for match %d", matchID))
-	return nil
+	report.TotalDurationMs = elapsedMs(started)
+	logger.Info(fmt.Sprintf("Successfully recalculated fantasy points for match %d: %d teams, %d players in %.2fms",
+		matchID, report.TeamsRecalculated, report.PlayersScored, report.TotalDurationMs))
+	return report, nil
 }
 
 // getTopPerformers gets top performing teams in a contest
 func (s *LeaderboardService) getTopPerformers(contestID int64, limit int) ([]models.LeaderboardEntry, error) {
-	query := `
-		SELECT 
-			ROW_NUMBER() OVER (ORDER BY ut.total_points DESC, ut.created_at ASC) as rank,
-			cp.user_id, 
-			COALESCE(u.first_name, '') || ' ' || COALESCE(u.last_name, '') as username,
-			ut.team_name,
-			ut.total_points,
-			u.avatar_url,
-			cp.prize_won
-		FROM contest_participants cp
-		JOIN user_teams ut ON cp.team_id = ut.id
-		JOIN users u ON cp.user_id = u.id
-		WHERE cp.contest_id = $1
-		ORDER BY ut.total_points DESC, ut.created_at ASC
-		LIMIT $2`
-
-	rows, err := s.db.Query(query, contestID, limit)
+	index, err := s.getRankIndex(contestID)
 	if err != nil {
 		return nil, fmt.Errorf("failed to query top performers: %w", err)
 	}
-	defer rows.Close()
 
-	var performers []models.LeaderboardEntry
-	for rows.Next() {
-		var entry models.LeaderboardEntry
-		var username sql.NullString
-		
-		err := rows.Scan(
-			&entry.Rank, &entry.UserID, &username, &entry.TeamName,
-			&entry.Points, &entry.AvatarURL, &entry.PrizeWon,
-		)
-		if err != nil {
-			logger.Error(fmt.Sprintf("Failed to scan leaderboard entry: %v", err))
-			continue
-		}
-		
-		if username.Valid {
-			entry.Username = username.String
-		} else {
-			entry.Username = "Anonymous"
-		}
-		
-		performers = append(performers, entry)
-	}
-
-	return performers, nil
+	return toLeaderboardEntries(index.Top(limit)), nil
 }
 
 // getUserRankInContest gets user's current rank in a contest
 func (s *LeaderboardService) GetUserRankInContest(contestID int64, userID int64) (int, float64, int64, error) {
-	query := `
-		WITH ranked_teams AS (
-			SELECT 
-				cp.user_id,
-				cp.team_id,
-				ut.total_points,
-				ROW_NUMBER() OVER (ORDER BY ut.total_points DESC, ut.created_at ASC) as rank
-			FROM contest_participants cp
-			JOIN user_teams ut ON cp.team_id = ut.id
-			WHERE cp.contest_id = $1
-		)
-		SELECT rank, total_points, team_id
-		FROM ranked_teams
-		WHERE user_id = $2`
-
-	var rank int
-	var points float64
-	var teamID int64
-	
-	err := s.db.QueryRow(query, contestID, userID).Scan(&rank, &points, &teamID)
+	index, err := s.getRankIndex(contestID)
 	if err != nil {
 		return 0, 0.0, 0, err
 	}
 
+	rank, points, teamID, ok := index.UserRank(userID)
+	if !ok {
+		return 0, 0.0, 0, sql.ErrNoRows
+	}
+
 	return rank, points, teamID, nil
 }
 
 // getRankingsAroundUser gets rankings around a specific user
 func (s *LeaderboardService) GetRankingsAroundUser(contestID int64, userRank int, radius int) ([]models.LeaderboardEntry, error) {
-	startRank := userRank - radius
-	if startRank < 1 {
-		startRank = 1
-	}
-	endRank := userRank + radius
-
-	query := `
-		WITH ranked_teams AS (
-			SELECT 
-				ROW_NUMBER() OVER (ORDER BY ut.total_points DESC, ut.created_at ASC) as rank,
-				cp.user_id,
-				COALESCE(u.first_name, '') || ' ' || COALESCE(u.last_name, '') as username,
-				ut.team_name,
-				ut.total_points,
-				u.avatar_url,
-				cp.prize_won
-			FROM contest_participants cp
-			JOIN user_teams ut ON cp.team_id = ut.id
-			JOIN users u ON cp.user_id = u.id
-			WHERE cp.contest_id = $1
-		)
-		SELECT rank, user_id, username, team_name, total_points, avatar_url, prize_won
-		FROM ranked_teams
-		WHERE rank BETWEEN $2 AND $3
-		ORDER BY rank`
-
-	rows, err := s.db.Query(query, contestID, startRank, endRank)
+	index, err := s.getRankIndex(contestID)
 	if err != nil {
 		return nil, fmt.Errorf("failed to query rankings around user: %w", err)
 	}
-	defer rows.Close()
 
-	var entries []models.LeaderboardEntry
-	for rows.Next() {
-		var entry models.LeaderboardEntry
-		var username sql.NullString
-		
-		err := rows.Scan(
-			&entry.Rank, &entry.UserID, &username, &entry.TeamName,
-			&entry.Points, &entry.AvatarURL, &entry.PrizeWon,
-		)
-		if err != nil {
-			continue
-		}
-		
-		if username.Valid {
-			entry.Username = username.String
-		} else {
-			entry.Username = "Anonymous"
-		}
-		
-		entries = append(entries, entry)
-	}
-
-	return entries, nil
+	return toLeaderboardEntries(index.Around(userRank, radius)), nil
 }
 
-// getTeamsInMatch gets all fantasy teams for a specific match
-func (s *LeaderboardService) getTeamsInMatch(matchID int64) ([]models.UserTeam, error) {
-	query := `
-		SELECT id, user_id, match_id, team_name, captain_player_id, vice_captain_player_id, 
-		       total_credits_used, total_points
-		FROM user_teams 
-		WHERE match_id = $1`
+// AddRankEntry adds a team that just joined a contest to its in-memory
+// ranking. Contests without a loaded ranking are left alone: their next load
+// reads the entry from the database.
+func (s *LeaderboardService) AddRankEntry(contestID, teamID int64) error {
+	if !s.rankIndexes.Tracks(contestID) {
+		return nil
+	}
 
-	rows, err := s.db.Query(query, matchID)
+	var entry ranking.Entry
+	var username sql.NullString
+	err := db.QueryRow(s.db, db.StmtContestEntry, contestID, teamID).Scan(
+		&entry.TeamID, &entry.UserID, &username, &entry.TeamName,
+		&entry.Points, &entry.CreatedAt, &entry.AvatarURL, &entry.PrizeWon,
+	)
 	if err != nil {
-		return nil, err
+		return fmt.Errorf("failed to read contest entry: %w", err)
 	}
-	defer rows.Close()
-
-	var teams []models.UserTeam
-	for rows.Next() {
-		var team models.UserTeam
-		err := rows.Scan(
-			&team.ID, &team.UserID, &team.MatchID, &team.TeamName,
-			&team.CaptainPlayerID, &team.ViceCaptainPlayerID,
-			&team.TotalCreditsUsed, &team.TotalPoints,
-		)
-		if err != nil {
-			continue
-		}
-		teams = append(teams, team)
+	if username.Valid {
+		entry.Username = username.String
+	} else {
+		entry.Username = "Anonymous"
 	}
 
-	return teams, nil
+	s.rankIndexes.AddEntry(contestID, entry)
+	return nil
+}
+
+// InvalidateRankIndex drops the in-memory ranking of a contest so the next
+// read reloads it.
+func (s *LeaderboardService) InvalidateRankIndex(contestID int64) {
+	s.rankIndexes.Remove(contestID)
 }
 
-// calculateTeamPoints calculates total fantasy points for a team
-func (s *LeaderboardService) calculateTeamPoints(teamID int64, matchID int64) (float64, error) {
-	// Get team players with their roles
-	query := `
-		SELECT tp.player_id, tp.is_captain, tp.is_vice_captain
-		FROM team_players tp
-		WHERE tp.team_id = $1`
+// InvalidateMatchRankIndexes drops the in-memory rankings of every contest in
+// a match after its points were rewritten outside the delta path.
+func (s *LeaderboardService) InvalidateMatchRankIndexes(matchID int64) {
+	s.rankIndexes.RemoveMatch(matchID)
+}
+
+// getRankIndex returns the in-memory rank index for a contest, loading it
+// from the database on first use.
+func (s *LeaderboardService) getRankIndex(contestID int64) (*ranking.Index, error) {
+	return s.rankIndexes.Load(contestID, func() (*ranking.Index, error) {
+		return s.loadRankIndex(contestID)
+	})
+}
 
-	rows, err := s.db.Query(query, teamID)
+// loadRankIndex builds the rank index for a contest with a single scan of
+// its participants.
+func (s *LeaderboardService) loadRankIndex(contestID int64) (*ranking.Index, error) {
+	var matchID int64
+	var currentParticipants int
+	err := db.QueryRow(s.db, db.StmtContestHeader, contestID).Scan(&matchID, &currentParticipants)
 	if err != nil {
-		return 0, fmt.Errorf("failed to get team players: %w", err)
+		return nil, err
+	}
+
+	rows, err := db.Query(s.db, db.StmtContestRankings, contestID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to load contest rankings: %w", err)
 	}
 	defer rows.Close()
 
-	var totalPoints float64
+	entries := make([]ranking.Entry, 0, currentParticipants)
 	for rows.Next() {
-		var playerID int64
-		var isCaptain, isViceCaptain bool
-		
-		err := rows.Scan(&playerID, &isCaptain, &isViceCaptain)
-		if err != nil {
-			continue
-		}
+		var entry ranking.Entry
+		var username sql.NullString
 
-		// Calculate player points from match events
-		playerPoints, err := s.calculatePlayerPoints(playerID, matchID)
+		err := rows.Scan(
+			&entry.TeamID, &entry.UserID, &username, &entry.TeamName,
+			&entry.Points, &entry.CreatedAt, &entry.AvatarURL, &entry.PrizeWon,
+		)
 		if err != nil {
-			logger.Warn(fmt.Sprintf("Failed to calculate points for player %d: %v", playerID, err))
+			logger.Error(fmt.Sprintf("Failed to scan leaderboard entry: %v", err))
 			continue
 		}
 
-		// Apply multipliers
-		if isCaptain {
-			playerPoints *= 2.0
-		} else if isViceCaptain {
-			playerPoints *= 1.5
+		if username.Valid {
+			entry.Username = username.String
+		} else {
+			entry.Username = "Anonymous"
 		}
 
-		totalPoints += playerPoints
-
-		// Update individual player points
-		_, err = s.db.Exec(`
-			UPDATE team_players 
-			SET points_earned = $1 
-			WHERE team_id = $2 AND player_id = $3`,
-			playerPoints, teamID, playerID)
-		if err != nil {
-			logger.Warn(fmt.Sprintf("Failed to update player points: %v", err))
-		}
+		entries = append(entries, entry)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, fmt.Errorf("failed to load contest rankings: %w", err)
 	}
 
-	return totalPoints, nil
-}
+	index := ranking.NewIndex(contestID, entries)
+	index.MatchID = matchID
 
-// calculatePlayerPoints calculates fantasy points for a player in a match
-func (s *LeaderboardService) calculatePlayerPoints(playerID int64, matchID int64) (float64, error) {
-	query := `
-		SELECT COALESCE(SUM(points), 0) as total_points
-		FROM match_events
-		WHERE player_id = $1 AND match_id = $2`
+	logger.Info(fmt.Sprintf("Loaded rank index for contest %d with %d entries", contestID, len(entries)))
+	return index, nil
+}
 
-	var points float64
-	err := s.db.QueryRow(query, playerID, matchID).Scan(&points)
-	if err != nil {
-		return 0, fmt.Errorf("failed to calculate player points: %w", err)
+// toLeaderboardEntries converts ranked index entries to the API model
+func toLeaderboardEntries(ranked []ranking.RankedEntry) []models.LeaderboardEntry {
+	entries := make([]models.LeaderboardEntry, len(ranked))
+	for i, r := range ranked {
+		entries[i] = models.LeaderboardEntry{
+			Rank:      r.Rank,
+			UserID:    r.UserID,
+			TeamID:    r.TeamID,
+			Username:  r.Username,
+			TeamName:  r.TeamName,
+			Points:    r.Points,
+			AvatarURL: r.AvatarURL,
+			PrizeWon:  r.PrizeWon,
+		}
 	}
-
-	return points, nil
+	return entries
 }
 
 // updateContestRankings updates rankings for all contests in a match
@@ -524,31 +432,21 @@ func (s *LeaderboardService) GetUserTeamPerformance(teamID int64, userID int64)
 // REAL-TIME LEADERBOARD METHODS ⭐
 // ================================
 
-// processRealTimeUpdates processes real-time leaderboard updates in background
-func (s *LeaderboardService) processRealTimeUpdates() {
-	logger.Info("Started real-time leaderboard update processor")
-	
-	for update := range s.updateChannel {
-		s.handleRealTimeUpdate(update)
-	}
-}
-
-// TriggerRealTimeUpdate triggers a real-time leaderboard update
-func (s *LeaderboardService) TriggerRealTimeUpdate(contestID int64, triggerSource string, matchEventID *int64) error {
-	// Create snapshot of current state
-	snapshot, err := s.createRankingSnapshot(contestID)
-	if err != nil {
-		return fmt.Errorf("failed to create ranking snapshot: %w", err)
-	}
-	
+// buildRealTimeUpdate recalculates a contest's leaderboard and assigns it the
+// contest's next sequence number
+func (s *LeaderboardService) buildRealTimeUpdate(contestID int64, triggerSource string, matchEventID *int64) (realTimeBroadcast, error) {
 	// Recalculate leaderboard
 	newLeaderboard, err := s.CalculateContestLeaderboard(contestID)
 	if err != nil {
-		return fmt.Errorf("failed to recalculate leaderboard: %w", err)
+		return realTimeBroadcast{}, fmt.Errorf("failed to recalculate leaderboard: %w", err)
 	}
 	
+	// Swap in the new snapshot and take the next sequence number, comparing
+	// against the rankings sent with the previous update
+	snapshot, previous := s.stream.advance(contestID, newLeaderboard, s.generateSnapshotID(contestID))
+	
 	// Detect rank changes
-	rankChanges := s.detectRankChanges(contestID, snapshot, newLeaderboard)
+	rankChanges := s.detectRankChanges(contestID, previous, newLeaderboard)
 	
 	// Create update message
 	update := models.RealTimeLeaderboardUpdate{
@@ -562,63 +460,16 @@ func (s *LeaderboardService) TriggerRealTimeUpdate(contestID int64, triggerSourc
 		TotalParticipants: newLeaderboard.TotalParticipants,
 		MatchEventID:      matchEventID,
 		TriggerSource:     triggerSource,
+		Sequence:          snapshot.Sequence,
 	}
+	delta := buildLeaderboardDelta(update, previous, snapshot)
 	
-	// Send to update channel
-	select {
-	case s.updateChannel <- update:
-		logger.Info(fmt.Sprintf("Triggered real-time update for contest %d", contestID))
-	default:
-		logger.Warn(fmt.Sprintf("Update channel full, dropped update for contest %d", contestID))
-	}
-	
-	return nil
-}
-
-// GetCachedLeaderboard gets leaderboard from cache or calculates fresh
-func (s *LeaderboardService) GetCachedLeaderboard(contestID int64, maxAge time.Duration) (*models.Leaderboard, error) {
-	cacheKey := s.generateCacheKey(contestID)
-	
-	s.cacheMutex.RLock()
-	cached, exists := s.cache[cacheKey]
-	s.cacheMutex.RUnlock()
-	
-	if exists && !cached.IsDirty && time.Since(cached.CachedAt) < maxAge {
-		logger.Info(fmt.Sprintf("Returning cached leaderboard for contest %d", contestID))
-		return cached.Leaderboard, nil
-	}
-	
-	// Calculate fresh leaderboard
-	leaderboard, err := s.CalculateContestLeaderboard(contestID)
-	if err != nil {
-		return nil, err
-	}
-	
-	// Cache the result
-	s.cacheLeaderboard(contestID, leaderboard)
-	
-	return leaderboard, nil
-}
-
-// InvalidateCache invalidates the cache for a contest
-func (s *LeaderboardService) InvalidateCache(contestID int64) {
-	cacheKey := s.generateCacheKey(contestID)
-	
-	s.cacheMutex.Lock()
-	defer s.cacheMutex.Unlock()
-	
-	if cached, exists := s.cache[cacheKey]; exists {
-		cached.IsDirty = true
-		logger.Info(fmt.Sprintf("Invalidated cache for contest %d", contestID))
-	}
+	return realTimeBroadcast{update: update, delta: delta}, nil
 }
 
 // GetRankingSnapshot gets the current ranking snapshot for a contest
 func (s *LeaderboardService) GetRankingSnapshot(contestID int64) (*models.RankingSnapshot, error) {
-	s.snapshotMutex.RLock()
-	snapshot, exists := s.snapshots[contestID]
-	s.snapshotMutex.RUnlock()
-	
+	snapshot, exists := s.stream.snapshot(contestID)
 	if !exists {
 		// Create initial snapshot
 		return s.createRankingSnapshot(contestID)
@@ -628,53 +479,37 @@ func (s *LeaderboardService) GetRankingSnapshot(contestID int64) (*models.Rankin
 }
 
 // handleRealTimeUpdate processes a single real-time update
-func (s *LeaderboardService) handleRealTimeUpdate(update models.RealTimeLeaderboardUpdate) {
+func (s *LeaderboardService) handleRealTimeUpdate(broadcast realTimeBroadcast) {
+	update := broadcast.update
 	logger.Info(fmt.Sprintf("Processing real-time update %s for contest %d", update.UpdateID, update.ContestID))
 	
 	// Update cache with fresh data
 	s.InvalidateCache(update.ContestID)
 	
-	// Store the snapshot for future comparisons
-	s.storeRankingSnapshot(update.ContestID, update.TopPerformers)
-	
-	// Here you would typically broadcast to WebSocket connections
-	// This will be handled by the connection manager
+	// Push to WebSocket subscribers; the snapshot was stored when the
+	// update's sequence number was assigned
+	if broadcaster := s.stream.getBroadcaster(); broadcaster != nil {
+		broadcaster.BroadcastLeaderboard(update, broadcast.delta)
+
+		// Then each connected user's own rank and window
+		if personal, ok := broadcaster.(PersonalizedBroadcaster); ok {
+			s.pushPersonalizedStandings(personal, update)
+		}
+	}
 	
 	logger.Info(fmt.Sprintf("Processed update affecting %d users", len(update.AffectedUserIDs)))
 }
 
-// createRankingSnapshot creates a snapshot of current rankings
+// createRankingSnapshot creates the initial snapshot of a contest's rankings.
+// If an update stored one meanwhile, that snapshot wins.
 func (s *LeaderboardService) createRankingSnapshot(contestID int64) (*models.RankingSnapshot, error) {
 	leaderboard, err := s.CalculateContestLeaderboard(contestID)
 	if err != nil {
 		return nil, err
 	}
 	
-	snapshot := &models.RankingSnapshot{
-		ContestID:   contestID,
-		SnapshotID:  s.generateSnapshotID(contestID),
-		CreatedAt:   time.Now(),
-		Rankings:    make(map[int64]models.RankPosition),
-		TotalPoints: make(map[int64]float64),
-	}
-	
-	for _, entry := range leaderboard.TopPerformers {
-		snapshot.Rankings[entry.UserID] = models.RankPosition{
-			Rank:     entry.Rank,
-			Points:   entry.Points,
-			TeamID:   0, // Will be filled from team query if needed
-			Username: entry.Username,
-			TeamName: entry.TeamName,
-		}
-		snapshot.TotalPoints[entry.UserID] = entry.Points
-	}
-	
-	// Store snapshot
-	s.snapshotMutex.Lock()
-	s.snapshots[contestID] = snapshot
-	s.snapshotMutex.Unlock()
-	
-	return snapshot, nil
+	snapshot := newRankingSnapshot(contestID, s.generateSnapshotID(contestID), leaderboard)
+	return s.stream.storeInitial(snapshot), nil
 }
 
 // detectRankChanges compares current leaderboard with previous snapshot
@@ -686,12 +521,12 @@ func (s *LeaderboardService) detectRankChanges(contestID int64, previousSnapshot
 	}
 	
 	for _, entry := range newLeaderboard.TopPerformers {
-		if prevPos, existed := previousSnapshot.Rankings[entry.UserID]; existed {
-			// User existed in previous snapshot, check for changes
+		if prevPos, existed := previousSnapshot.Rankings[entry.TeamID]; existed {
+			// Team existed in previous snapshot, check for changes
 			if prevPos.Rank != entry.Rank || prevPos.Points != entry.Points {
 				changes = append(changes, models.LeaderboardRankChange{
 					UserID:         entry.UserID,
-					TeamID:         0, // Will be filled if needed
+					TeamID:         entry.TeamID,
 					Username:       entry.Username,
 					TeamName:       entry.TeamName,
 					PreviousRank:   prevPos.Rank,
@@ -704,10 +539,10 @@ func (s *LeaderboardService) detectRankChanges(contestID int64, previousSnapshot
 				})
 			}
 		} else {
-			// New user in leaderboard
+			// New team in leaderboard
 			changes = append(changes, models.LeaderboardRankChange{
 				UserID:         entry.UserID,
-				TeamID:         0,
+				TeamID:         entry.TeamID,
 				Username:       entry.Username,
 				TeamName:       entry.TeamName,
 				PreviousRank:   0, // New entry
@@ -724,51 +559,6 @@ func (s *LeaderboardService) detectRankChanges(contestID int64, previousSnapshot
 	return changes
 }
 
-// storeRankingSnapshot stores a ranking snapshot for future comparisons
-func (s *LeaderboardService) storeRankingSnapshot(contestID int64, topPerformers []models.LeaderboardEntry) {
-	snapshot := &models.RankingSnapshot{
-		ContestID:   contestID,
-		SnapshotID:  s.generateSnapshotID(contestID),
-		CreatedAt:   time.Now(),
-		Rankings:    make(map[int64]models.RankPosition),
-		TotalPoints: make(map[int64]float64),
-	}
-	
-	for _, entry := range topPerformers {
-		snapshot.Rankings[entry.UserID] = models.RankPosition{
-			Rank:     entry.Rank,
-			Points:   entry.Points,
-			Username: entry.Username,
-			TeamName: entry.TeamName,
-		}
-		snapshot.TotalPoints[entry.UserID] = entry.Points
-	}
-	
-	s.snapshotMutex.Lock()
-	s.snapshots[contestID] = snapshot
-	s.snapshotMutex.Unlock()
-}
-
-// cacheLeaderboard caches a leaderboard result
-func (s *LeaderboardService) cacheLeaderboard(contestID int64, leaderboard *models.Leaderboard) {
-	cacheKey := s.generateCacheKey(contestID)
-	
-	cached := &models.CachedLeaderboard{
-		Leaderboard: leaderboard,
-		CacheKey:    cacheKey,
-		CachedAt:    time.Now(),
-		ExpiresAt:   time.Now().Add(5 * time.Minute), // 5-minute cache
-		IsDirty:     false,
-		LastEventID: 0, // Would be set based on latest match event
-	}
-	
-	s.cacheMutex.Lock()
-	s.cache[cacheKey] = cached
-	s.cacheMutex.Unlock()
-	
-	logger.Info(fmt.Sprintf("Cached leaderboard for contest %d", contestID))
-}
-
 // Helper methods
 func (s *LeaderboardService) generateCacheKey(contestID int64) string {
 	return fmt.Sprintf("leaderboard:contest:%d", contestID)
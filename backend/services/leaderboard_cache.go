@@ -0,0 +1,114 @@
+package services
+
+import (
+	"fmt"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/logger"
+	"fantasy-esports-backend/pkg/telemetry"
+)
+
+const (
+	// leaderboardCacheCapacity bounds how many contests keep a computed
+	// leaderboard in memory; the least recently read are evicted first
+	leaderboardCacheCapacity = 5000
+	leaderboardCacheTTL      = 5 * time.Minute
+
+	// snapshotCacheCapacity bounds the published snapshots kept for delta
+	// diffs and resyncs. Contests idle for snapshotCacheTTL are dropped.
+	snapshotCacheCapacity = 10000
+	snapshotCacheTTL      = 6 * time.Hour
+)
+
+// leaderboardCache holds computed leaderboards per contest. Concurrent misses
+// for the same contest share one computation.
+type leaderboardCache struct {
+	entries *cache.LRU[int64, *models.CachedLeaderboard]
+	fills   cache.Group[int64, *models.Leaderboard]
+
+	// generations keeps a fill that started before its contest was
+	// invalidated from storing a leaderboard that is already stale
+	generations cache.Generations[int64]
+}
+
+// contestLeaderboards is shared by every LeaderboardService in the process so
+// that an invalidation from the update processor reaches the cache the
+// HTTP handlers read.
+var contestLeaderboards = &leaderboardCache{
+	entries: cache.NewLRU[int64, *models.CachedLeaderboard](leaderboardCacheCapacity, leaderboardCacheTTL),
+}
+
+func init() {
+	telemetry.RegisterCache("leaderboards", contestLeaderboards.entries.Stats)
+	telemetry.RegisterCache("leaderboard_snapshots", contestStream.snapshots.Stats)
+}
+
+// GetLeaderboardCacheStats returns hit, miss, eviction and fill latency
+// counters of the leaderboard and snapshot caches.
+func GetLeaderboardCacheStats() models.LeaderboardCacheStats {
+	return models.LeaderboardCacheStats{
+		Leaderboards: contestLeaderboards.entries.Stats(),
+		Snapshots:    contestStream.snapshots.Stats(),
+	}
+}
+
+// GetCachedLeaderboard gets leaderboard from cache or calculates fresh. The
+// returned leaderboard is the caller's own copy and may be modified.
+func (s *LeaderboardService) GetCachedLeaderboard(contestID int64, maxAge time.Duration) (*models.Leaderboard, error) {
+	if cached, exists := s.cache.entries.Get(contestID); exists && !cached.IsDirty && time.Since(cached.CachedAt) < maxAge {
+		return copyLeaderboard(cached.Leaderboard), nil
+	}
+
+	leaderboard, err, _ := s.cache.fills.Do(contestID, func() (*models.Leaderboard, error) {
+		generation := s.cache.generations.Begin(contestID)
+		started := time.Now()
+
+		leaderboard, err := s.CalculateContestLeaderboard(contestID)
+		if err != nil {
+			s.cache.generations.Finish(contestID, generation, nil)
+			return nil, err
+		}
+		s.cache.entries.ObserveFill(time.Since(started))
+
+		s.cache.generations.Finish(contestID, generation, func() {
+			s.cacheLeaderboard(contestID, leaderboard)
+		})
+		return leaderboard, nil
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	return copyLeaderboard(leaderboard), nil
+}
+
+// InvalidateCache invalidates the cache for a contest
+func (s *LeaderboardService) InvalidateCache(contestID int64) {
+	s.cache.generations.Invalidate(contestID)
+	s.cache.entries.Remove(contestID)
+}
+
+// cacheLeaderboard caches a leaderboard result
+func (s *LeaderboardService) cacheLeaderboard(contestID int64, leaderboard *models.Leaderboard) {
+	now := time.Now()
+	cached := &models.CachedLeaderboard{
+		Leaderboard: leaderboard,
+		CacheKey:    s.generateCacheKey(contestID),
+		CachedAt:    now,
+		ExpiresAt:   now.Add(leaderboardCacheTTL),
+		IsDirty:     false,
+		LastEventID: 0, // Would be set based on latest match event
+	}
+
+	s.cache.entries.SetWithExpiry(contestID, cached, cached.ExpiresAt)
+	logger.Info(fmt.Sprintf("Cached leaderboard for contest %d", contestID))
+}
+
+// copyLeaderboard returns a shallow copy so that per-request fields such as
+// MyRank and AroundMe are never written into the shared cached value
+func copyLeaderboard(leaderboard *models.Leaderboard) *models.Leaderboard {
+	copied := *leaderboard
+	return &copied
+}
@@ -0,0 +1,141 @@
+package services
+
+import (
+	"fmt"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/logger"
+)
+
+// defaultUpdateWindow is used until SetRealTimeUpdateWindow is called
+const defaultUpdateWindow = 250 * time.Millisecond
+
+// updateScheduler coalesces real-time leaderboard triggers. Triggers for a
+// contest that arrive within the merge window become one update, and at most
+// one update per contest is being computed at any time; triggers arriving
+// meanwhile are merged into the next one.
+type updateScheduler struct {
+	mutex    sync.Mutex
+	window   time.Duration
+	contests map[int64]*contestSchedule
+
+	requested atomic.Int64
+	merged    atomic.Int64
+	dropped   atomic.Int64
+	emitted   atomic.Int64
+}
+
+// contestSchedule is the pending and in-flight state of one contest
+type contestSchedule struct {
+	pending       bool
+	inFlight      bool
+	triggerSource string
+	matchEventID  *int64
+	service       *LeaderboardService
+}
+
+func newUpdateScheduler(window time.Duration) *updateScheduler {
+	return &updateScheduler{
+		window:   window,
+		contests: make(map[int64]*contestSchedule),
+	}
+}
+
+// SetRealTimeUpdateWindow sets how long triggers for one contest are merged
+// before the leaderboard is recalculated and broadcast.
+func SetRealTimeUpdateWindow(window time.Duration) {
+	scheduler := contestStream.scheduler
+	scheduler.mutex.Lock()
+	defer scheduler.mutex.Unlock()
+	scheduler.window = window
+}
+
+// GetRealTimeSchedulerStats returns the coalescing scheduler counters
+func GetRealTimeSchedulerStats() models.RealTimeSchedulerStats {
+	scheduler := contestStream.scheduler
+	scheduler.mutex.Lock()
+	stats := models.RealTimeSchedulerStats{
+		WindowMs:       scheduler.window.Milliseconds(),
+		ActiveContests: len(scheduler.contests),
+	}
+	scheduler.mutex.Unlock()
+
+	stats.Requested = scheduler.requested.Load()
+	stats.Merged = scheduler.merged.Load()
+	stats.Dropped = scheduler.dropped.Load()
+	stats.Emitted = scheduler.emitted.Load()
+	return stats
+}
+
+// ScheduleRealTimeUpdate requests a real-time leaderboard update for a
+// contest without waiting for it. Bursts of triggers, such as every event of
+// a kill-heavy round, are merged into one recalculation per window.
+func (s *LeaderboardService) ScheduleRealTimeUpdate(contestID int64, triggerSource string, matchEventID *int64) {
+	s.stream.scheduler.schedule(s, contestID, triggerSource, matchEventID)
+}
+
+func (us *updateScheduler) schedule(service *LeaderboardService, contestID int64, triggerSource string, matchEventID *int64) {
+	us.requested.Add(1)
+
+	us.mutex.Lock()
+	defer us.mutex.Unlock()
+
+	cs, exists := us.contests[contestID]
+	if !exists {
+		cs = &contestSchedule{}
+		us.contests[contestID] = cs
+	}
+
+	if cs.pending {
+		us.merged.Add(1)
+	}
+	// The latest trigger describes the merged update
+	cs.pending = true
+	cs.triggerSource = triggerSource
+	cs.matchEventID = matchEventID
+	cs.service = service
+
+	if !exists {
+		us.armLocked(contestID)
+	}
+	// Otherwise a timer is already armed, or the in-flight update re-arms
+	// one when it finishes
+}
+
+func (us *updateScheduler) armLocked(contestID int64) {
+	time.AfterFunc(us.window, func() { us.fire(contestID) })
+}
+
+func (us *updateScheduler) fire(contestID int64) {
+	us.mutex.Lock()
+	cs := us.contests[contestID]
+	if cs == nil || !cs.pending || cs.inFlight {
+		us.mutex.Unlock()
+		return
+	}
+	cs.pending = false
+	cs.inFlight = true
+	service, triggerSource, matchEventID := cs.service, cs.triggerSource, cs.matchEventID
+	us.mutex.Unlock()
+
+	broadcast, err := service.buildRealTimeUpdate(contestID, triggerSource, matchEventID)
+	if err != nil {
+		us.dropped.Add(1)
+		logger.Error(fmt.Sprintf("Failed to build real-time update for contest %d: %v", contestID, err))
+	} else {
+		service.handleRealTimeUpdate(broadcast)
+		us.emitted.Add(1)
+	}
+
+	us.mutex.Lock()
+	defer us.mutex.Unlock()
+	cs.inFlight = false
+	if cs.pending {
+		us.armLocked(contestID)
+	} else {
+		delete(us.contests, contestID)
+	}
+}
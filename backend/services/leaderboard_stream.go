@@ -0,0 +1,250 @@
+package services
+
+import (
+	"fmt"
+	"sort"
+	"sync"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/logger"
+)
+
+// LeaderboardBroadcaster delivers real-time leaderboard updates to connected
+// clients: the full update to protocol v1 subscribers and the delta to
+// protocol v2 subscribers. The WebSocket connection manager implements it.
+type LeaderboardBroadcaster interface {
+	BroadcastLeaderboard(update models.RealTimeLeaderboardUpdate, delta models.LeaderboardDelta)
+}
+
+// PersonalizedBroadcaster is implemented by broadcasters that can also
+// deliver each connected user their own rank and surrounding window.
+type PersonalizedBroadcaster interface {
+	ConnectedUserIDs(contestID int64) []int64
+	SendPersonalizedLeaderboards(contestID int64, updates map[int64]models.PersonalLeaderboardUpdate)
+}
+
+// aroundMeRadius is how many ranks above and below a user's own rank are
+// included in their personalized update
+const aroundMeRadius = 5
+
+// leaderboardStream is the process-wide state of the real-time leaderboard
+// feed: the last snapshot published for each contest, which carries the
+// contest's sequence number, and the broadcaster updates go out through.
+// mutex serializes sequence assignment; the snapshot cache has its own lock.
+type leaderboardStream struct {
+	mutex       sync.RWMutex
+	snapshots   *cache.LRU[int64, *models.RankingSnapshot]
+	broadcaster LeaderboardBroadcaster
+	scheduler   *updateScheduler
+}
+
+// contestStream is shared by every LeaderboardService in the process so that
+// updates triggered from admin handlers and resyncs served to WebSocket
+// clients see the same sequence numbers.
+var contestStream = &leaderboardStream{
+	snapshots: cache.NewLRU[int64, *models.RankingSnapshot](snapshotCacheCapacity, snapshotCacheTTL),
+	scheduler: newUpdateScheduler(defaultUpdateWindow),
+}
+
+// realTimeBroadcast is one queued update in both protocol encodings
+type realTimeBroadcast struct {
+	update models.RealTimeLeaderboardUpdate
+	delta  models.LeaderboardDelta
+}
+
+// SetLeaderboardBroadcaster registers where real-time leaderboard updates
+// are published.
+func SetLeaderboardBroadcaster(broadcaster LeaderboardBroadcaster) {
+	contestStream.mutex.Lock()
+	defer contestStream.mutex.Unlock()
+	contestStream.broadcaster = broadcaster
+}
+
+func (ls *leaderboardStream) getBroadcaster() LeaderboardBroadcaster {
+	ls.mutex.RLock()
+	defer ls.mutex.RUnlock()
+	return ls.broadcaster
+}
+
+func (ls *leaderboardStream) snapshot(contestID int64) (*models.RankingSnapshot, bool) {
+	return ls.snapshots.Get(contestID)
+}
+
+// advance stores the snapshot of a new leaderboard under the contest's next
+// sequence number and returns it together with the snapshot it replaced.
+func (ls *leaderboardStream) advance(contestID int64, leaderboard *models.Leaderboard, snapshotID string) (*models.RankingSnapshot, *models.RankingSnapshot) {
+	snapshot := newRankingSnapshot(contestID, snapshotID, leaderboard)
+
+	ls.mutex.Lock()
+	defer ls.mutex.Unlock()
+
+	previous, _ := ls.snapshots.Peek(contestID)
+	if previous != nil {
+		snapshot.Sequence = previous.Sequence + 1
+	} else {
+		snapshot.Sequence = initialSequence()
+	}
+	ls.snapshots.Set(contestID, snapshot)
+	return snapshot, previous
+}
+
+// storeInitial stores a snapshot unless the contest already has one, and
+// returns whichever is current.
+func (ls *leaderboardStream) storeInitial(snapshot *models.RankingSnapshot) *models.RankingSnapshot {
+	ls.mutex.Lock()
+	defer ls.mutex.Unlock()
+
+	if existing, exists := ls.snapshots.Peek(snapshot.ContestID); exists {
+		return existing
+	}
+	snapshot.Sequence = initialSequence()
+	ls.snapshots.Set(snapshot.ContestID, snapshot)
+	return snapshot
+}
+
+// initialSequence starts a contest's sequence numbers at the current Unix
+// millisecond. A contest whose snapshot was evicted, or that outlives a
+// restart, restarts above any sequence its clients have already seen, since
+// updates are coalesced far below one per millisecond.
+func initialSequence() int64 {
+	return time.Now().UnixMilli()
+}
+
+func newRankingSnapshot(contestID int64, snapshotID string, leaderboard *models.Leaderboard) *models.RankingSnapshot {
+	snapshot := &models.RankingSnapshot{
+		ContestID:         contestID,
+		SnapshotID:        snapshotID,
+		CreatedAt:         time.Now(),
+		TotalParticipants: leaderboard.TotalParticipants,
+		Rankings:          make(map[int64]models.RankPosition, len(leaderboard.TopPerformers)),
+		TotalPoints:       make(map[int64]float64, len(leaderboard.TopPerformers)),
+	}
+
+	for _, entry := range leaderboard.TopPerformers {
+		snapshot.Rankings[entry.TeamID] = models.RankPosition{
+			Rank:      entry.Rank,
+			Points:    entry.Points,
+			TeamID:    entry.TeamID,
+			UserID:    entry.UserID,
+			Username:  entry.Username,
+			TeamName:  entry.TeamName,
+			AvatarURL: entry.AvatarURL,
+		}
+		snapshot.TotalPoints[entry.TeamID] = entry.Points
+	}
+	return snapshot
+}
+
+// buildLeaderboardDelta lists the rows of the current window that are new or
+// moved since the previous snapshot, and the teams that dropped out of it.
+func buildLeaderboardDelta(update models.RealTimeLeaderboardUpdate, previous, current *models.RankingSnapshot) models.LeaderboardDelta {
+	delta := models.LeaderboardDelta{
+		ContestID:         update.ContestID,
+		Sequence:          current.Sequence,
+		UpdateID:          update.UpdateID,
+		UpdateTimestamp:   update.UpdateTimestamp,
+		TotalParticipants: update.TotalParticipants,
+		MatchEventID:      update.MatchEventID,
+		TriggerSource:     update.TriggerSource,
+	}
+
+	for teamID, position := range current.Rankings {
+		var before models.RankPosition
+		existed := false
+		if previous != nil {
+			before, existed = previous.Rankings[teamID]
+		}
+
+		switch {
+		case !existed:
+			delta.Changed = append(delta.Changed, deltaRow(position))
+		case before.Rank != position.Rank || before.Points != position.Points:
+			delta.Changed = append(delta.Changed, models.LeaderboardDeltaRow{
+				TeamID: teamID,
+				Rank:   position.Rank,
+				Points: position.Points,
+			})
+		}
+	}
+	sort.Slice(delta.Changed, func(i, j int) bool { return delta.Changed[i].Rank < delta.Changed[j].Rank })
+
+	if previous != nil {
+		for teamID := range previous.Rankings {
+			if _, still := current.Rankings[teamID]; !still {
+				delta.Removed = append(delta.Removed, teamID)
+			}
+		}
+	}
+
+	return delta
+}
+
+func deltaRow(position models.RankPosition) models.LeaderboardDeltaRow {
+	return models.LeaderboardDeltaRow{
+		TeamID:    position.TeamID,
+		Rank:      position.Rank,
+		Points:    position.Points,
+		UserID:    position.UserID,
+		Username:  position.Username,
+		TeamName:  position.TeamName,
+		AvatarURL: position.AvatarURL,
+	}
+}
+
+// GetLeaderboardSnapshot returns the last published top window of a contest
+// with its sequence number, for protocol v2 clients that need to resync.
+func (s *LeaderboardService) GetLeaderboardSnapshot(contestID int64) (*models.LeaderboardSnapshot, error) {
+	snapshot, err := s.GetRankingSnapshot(contestID)
+	if err != nil {
+		return nil, err
+	}
+
+	rows := make([]models.LeaderboardDeltaRow, 0, len(snapshot.Rankings))
+	for _, position := range snapshot.Rankings {
+		rows = append(rows, deltaRow(position))
+	}
+	sort.Slice(rows, func(i, j int) bool { return rows[i].Rank < rows[j].Rank })
+
+	return &models.LeaderboardSnapshot{
+		ContestID:         contestID,
+		Sequence:          snapshot.Sequence,
+		SnapshotID:        snapshot.SnapshotID,
+		CreatedAt:         snapshot.CreatedAt,
+		TotalParticipants: snapshot.TotalParticipants,
+		Rows:              rows,
+	}, nil
+}
+
+// pushPersonalizedStandings sends every connected user of a contest their
+// rank, points and surrounding window. All users are answered from one walk
+// of the in-memory ranking; nothing is queried per user.
+func (s *LeaderboardService) pushPersonalizedStandings(personal PersonalizedBroadcaster, update models.RealTimeLeaderboardUpdate) {
+	userIDs := personal.ConnectedUserIDs(update.ContestID)
+	if len(userIDs) == 0 {
+		return
+	}
+
+	index, err := s.getRankIndex(update.ContestID)
+	if err != nil {
+		logger.Error(fmt.Sprintf("Failed to load rankings for personalized updates of contest %d: %v", update.ContestID, err))
+		return
+	}
+
+	standings := index.Standings(userIDs, aroundMeRadius)
+	updates := make(map[int64]models.PersonalLeaderboardUpdate, len(standings))
+	for userID, standing := range standings {
+		updates[userID] = models.PersonalLeaderboardUpdate{
+			ContestID:         update.ContestID,
+			Sequence:          update.Sequence,
+			MyRank:            standing.Rank,
+			MyPoints:          standing.Points,
+			MyTeamID:          standing.TeamID,
+			AroundMe:          toLeaderboardEntries(standing.Window),
+			TotalParticipants: update.TotalParticipants,
+		}
+	}
+
+	personal.SendPersonalizedLeaderboards(update.ContestID, updates)
+}
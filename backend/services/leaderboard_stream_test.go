@@ -0,0 +1,45 @@
+package services
+
+import (
+	"testing"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+)
+
+func TestLeaderboardDeltaCarriesOnlyChangedRows(t *testing.T) {
+	stream := &leaderboardStream{snapshots: cache.NewLRU[int64, *models.RankingSnapshot](10, 0)}
+
+	first := &models.Leaderboard{TotalParticipants: 3, TopPerformers: []models.LeaderboardEntry{
+		{Rank: 1, TeamID: 10, UserID: 1, Username: "a", Points: 50},
+		{Rank: 2, TeamID: 20, UserID: 2, Username: "b", Points: 40},
+		{Rank: 3, TeamID: 30, UserID: 3, Username: "c", Points: 30},
+	}}
+	snapshot, previous := stream.advance(7, first, "s1")
+	if previous != nil || snapshot.Sequence < 1 {
+		t.Fatalf("first snapshot: sequence %d, previous %v", snapshot.Sequence, previous)
+	}
+	firstSequence := snapshot.Sequence
+
+	// Team 30 overtakes team 20, team 40 enters and pushes team 20 out; team 10 is unchanged
+	second := &models.Leaderboard{TotalParticipants: 3, TopPerformers: []models.LeaderboardEntry{
+		{Rank: 1, TeamID: 10, UserID: 1, Username: "a", Points: 50},
+		{Rank: 2, TeamID: 30, UserID: 3, Username: "c", Points: 45},
+		{Rank: 3, TeamID: 40, UserID: 4, Username: "d", Points: 41},
+	}}
+	snapshot, previous = stream.advance(7, second, "s2")
+	delta := buildLeaderboardDelta(models.RealTimeLeaderboardUpdate{ContestID: 7}, previous, snapshot)
+
+	if delta.Sequence != firstSequence+1 {
+		t.Fatalf("delta sequence = %d, want %d", delta.Sequence, firstSequence+1)
+	}
+	if len(delta.Changed) != 2 || delta.Changed[0].TeamID != 30 || delta.Changed[1].TeamID != 40 {
+		t.Fatalf("unexpected changed rows: %+v", delta.Changed)
+	}
+	if delta.Changed[0].Username != "" || delta.Changed[1].Username != "d" {
+		t.Fatalf("display fields should only be sent for new rows: %+v", delta.Changed)
+	}
+	if len(delta.Removed) != 1 || delta.Removed[0] != 20 {
+		t.Fatalf("removed = %v, want [20]", delta.Removed)
+	}
+}
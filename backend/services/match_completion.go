@@ -0,0 +1,493 @@
+package services
+
+import (
+	"database/sql"
+	"errors"
+	"fmt"
+	"math"
+	"sync"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/logger"
+
+	"github.com/lib/pq"
+)
+
+const (
+	// defaultMatchCompletionWorkers is used when no worker count is configured
+	defaultMatchCompletionWorkers = 8
+	// contestFinalizeAttempts bounds how often a contest transaction that
+	// lost a deadlock or serialization conflict is retried
+	contestFinalizeAttempts = 3
+)
+
+// Match completion progress stages
+const (
+	CompletionStageNotStarted       = "not_started"
+	CompletionStageStarted          = "started"
+	CompletionStageContestFinalized = "contest_finalized"
+	CompletionStageContestFailed    = "contest_failed"
+	CompletionStageCompleted        = "completed"
+)
+
+var (
+	ErrMatchNotFound         = errors.New("match not found")
+	ErrMatchAlreadyCompleted = errors.New("match already completed")
+)
+
+// MatchCompletionOptions is how a match was decided and what completing it
+// should do besides finalizing its contests
+type MatchCompletionOptions struct {
+	WinnerTeamID      int64
+	MVPPlayerID       int64
+	DistributePrizes  bool
+	SendNotifications bool
+}
+
+// MatchCompletionPublisher delivers match completion progress to the
+// clients following a contest. The WebSocket connection manager implements
+// it.
+type MatchCompletionPublisher interface {
+	PublishMatchCompletion(contestID int64, progress models.MatchCompletionProgress)
+}
+
+var completionPublisher struct {
+	mutex     sync.RWMutex
+	publisher MatchCompletionPublisher
+}
+
+// SetMatchCompletionPublisher registers where match completion progress is
+// published.
+func SetMatchCompletionPublisher(publisher MatchCompletionPublisher) {
+	completionPublisher.mutex.Lock()
+	defer completionPublisher.mutex.Unlock()
+	completionPublisher.publisher = publisher
+}
+
+func publishCompletionProgress(contestIDs []int64, progress models.MatchCompletionProgress) {
+	logger.Info("Match completion progress", map[string]interface{}{
+		"match_id":        progress.MatchID,
+		"contest_id":      progress.ContestID,
+		"stage":           progress.Stage,
+		"contests_done":   progress.ContestsDone,
+		"contests_failed": progress.ContestsFailed,
+		"contests_total":  progress.ContestsTotal,
+	})
+
+	completionPublisher.mutex.RLock()
+	publisher := completionPublisher.publisher
+	completionPublisher.mutex.RUnlock()
+	if publisher == nil {
+		return
+	}
+	for _, contestID := range contestIDs {
+		publisher.PublishMatchCompletion(contestID, progress)
+	}
+}
+
+// MatchCompletionService completes matches in stages. The match is marked
+// completed and its teams locked in one short transaction, then each contest
+// is ranked, paid and marked finalized in its own transaction by a pool of
+// workers, and finally match statistics and prediction features are
+// recorded. Notifications go out after the last commit. The run is recorded
+// in match_completions and every finalized contest carries finalized_at, so
+// completing the match again after a failure or crash resumes with the
+// contests still left.
+type MatchCompletionService struct {
+	db          *sql.DB
+	leaderboard *LeaderboardService
+	workers     int
+}
+
+func NewMatchCompletionService(db *sql.DB, leaderboard *LeaderboardService, workers int) *MatchCompletionService {
+	if workers <= 0 {
+		workers = defaultMatchCompletionWorkers
+	}
+	return &MatchCompletionService{db: db, leaderboard: leaderboard, workers: workers}
+}
+
+// Complete completes a match, or resumes its unfinished completion with the
+// options the run was started with. It returns ErrMatchNotFound, or
+// ErrMatchAlreadyCompleted if the match was completed before.
+func (s *MatchCompletionService) Complete(matchID int64, opts MatchCompletionOptions) (*models.MatchCompletionReport, error) {
+	started := time.Now()
+	report := &models.MatchCompletionReport{MatchID: matchID}
+
+	opts, err := s.begin(matchID, opts, report)
+	if err != nil {
+		return nil, err
+	}
+	report.WinnerTeamID = opts.WinnerTeamID
+	report.MVPPlayerID = opts.MVPPlayerID
+	report.PrizesDistributed = opts.DistributePrizes
+
+	contestIDs, pending, err := s.matchContests(matchID)
+	if err != nil {
+		return nil, err
+	}
+	progress := models.MatchCompletionProgress{
+		MatchID:       matchID,
+		Stage:         CompletionStageStarted,
+		ContestsTotal: len(contestIDs),
+		ContestsDone:  len(contestIDs) - len(pending),
+		UpdatedAt:     time.Now(),
+	}
+	publishCompletionProgress(pending, progress)
+
+	progress, err = s.finalizeContests(pending, opts.DistributePrizes, progress, report)
+	if err != nil {
+		return nil, err
+	}
+
+	report.StatisticsUpdated, err = s.finish(matchID, opts)
+	if err != nil {
+		return nil, err
+	}
+
+	if opts.SendNotifications {
+		report.NotificationsSent, err = s.notifyParticipants(matchID)
+		if err != nil {
+			logger.Error("Failed to send match completion notifications", map[string]interface{}{
+				"match_id": matchID,
+				"error":    err.Error(),
+			})
+		}
+	}
+
+	s.leaderboard.InvalidateMatchRankIndexes(matchID)
+	for _, contestID := range contestIDs {
+		s.leaderboard.InvalidateCache(contestID)
+	}
+
+	progress.ContestID = 0
+	progress.Stage = CompletionStageCompleted
+	progress.UpdatedAt = time.Now()
+	publishCompletionProgress(contestIDs, progress)
+
+	report.DurationMs = elapsedMs(started)
+	return report, nil
+}
+
+// begin marks the match completed, records the run and locks its fantasy
+// teams, or returns the stored options of a run that is still going
+func (s *MatchCompletionService) begin(matchID int64, opts MatchCompletionOptions, report *models.MatchCompletionReport) (MatchCompletionOptions, error) {
+	tx, err := s.db.Begin()
+	if err != nil {
+		return opts, err
+	}
+	defer tx.Rollback()
+
+	var matchStatus string
+	var runStatus sql.NullString
+	var stored MatchCompletionOptions
+	err = tx.QueryRow(`
+		SELECT m.status, mc.status, COALESCE(mc.winner_team_id, 0), COALESCE(mc.mvp_player_id, 0),
+			COALESCE(mc.distribute_prizes, false), COALESCE(mc.send_notifications, false), COALESCE(mc.teams_locked, 0)
+		FROM matches m
+		LEFT JOIN match_completions mc ON mc.match_id = m.id
+		WHERE m.id = $1
+		FOR UPDATE OF m`, matchID).Scan(
+		&matchStatus, &runStatus, &stored.WinnerTeamID, &stored.MVPPlayerID,
+		&stored.DistributePrizes, &stored.SendNotifications, &report.TeamsLocked,
+	)
+	if err == sql.ErrNoRows {
+		return opts, ErrMatchNotFound
+	}
+	if err != nil {
+		return opts, err
+	}
+
+	if runStatus.String == "running" {
+		report.Resumed = true
+		return stored, nil
+	}
+	if runStatus.Valid || matchStatus == "completed" {
+		return opts, ErrMatchAlreadyCompleted
+	}
+
+	_, err = tx.Exec(`
+		UPDATE matches
+		SET status = 'completed', winner_team_id = NULLIF($1::bigint, 0), updated_at = NOW()
+		WHERE id = $2`, opts.WinnerTeamID, matchID)
+	if err != nil {
+		return opts, fmt.Errorf("failed to complete match: %w", err)
+	}
+
+	result, err := tx.Exec(`
+		UPDATE user_teams SET is_locked = true, updated_at = NOW()
+		WHERE match_id = $1 AND is_locked IS NOT TRUE`, matchID)
+	if err != nil {
+		return opts, fmt.Errorf("failed to lock fantasy teams: %w", err)
+	}
+	locked, _ := result.RowsAffected()
+	report.TeamsLocked = int(locked)
+
+	_, err = tx.Exec(`
+		INSERT INTO match_completions (match_id, winner_team_id, mvp_player_id, distribute_prizes, send_notifications, teams_locked)
+		VALUES ($1, NULLIF($2::bigint, 0), NULLIF($3::bigint, 0), $4, $5, $6)`,
+		matchID, opts.WinnerTeamID, opts.MVPPlayerID, opts.DistributePrizes, opts.SendNotifications, report.TeamsLocked)
+	if err != nil {
+		return opts, fmt.Errorf("failed to record match completion: %w", err)
+	}
+	return opts, tx.Commit()
+}
+
+// matchContests returns every contest of the match and those not yet
+// finalized
+func (s *MatchCompletionService) matchContests(matchID int64) ([]int64, []int64, error) {
+	rows, err := s.db.Query(`
+		SELECT id, finalized_at IS NOT NULL FROM contests WHERE match_id = $1 ORDER BY id`, matchID)
+	if err != nil {
+		return nil, nil, fmt.Errorf("failed to query contests: %w", err)
+	}
+	defer rows.Close()
+
+	var contestIDs, pending []int64
+	for rows.Next() {
+		var contestID int64
+		var finalized bool
+		if err := rows.Scan(&contestID, &finalized); err != nil {
+			return nil, nil, err
+		}
+		contestIDs = append(contestIDs, contestID)
+		if !finalized {
+			pending = append(pending, contestID)
+		}
+	}
+	return contestIDs, pending, rows.Err()
+}
+
+// finalizeContests finalizes the pending contests on the worker pool,
+// publishing progress after each one. Contests that fail stay pending and
+// the first failure is returned once the others are done.
+func (s *MatchCompletionService) finalizeContests(pending []int64, distributePrizes bool, progress models.MatchCompletionProgress, report *models.MatchCompletionReport) (models.MatchCompletionProgress, error) {
+	workers := s.workers
+	if workers > len(pending) {
+		workers = len(pending)
+	}
+
+	jobs := make(chan int64)
+	var mutex sync.Mutex
+	var firstErr error
+	var wg sync.WaitGroup
+	for i := 0; i < workers; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for contestID := range jobs {
+				prizes, finalized, err := s.finalizeContestWithRetry(contestID, distributePrizes)
+
+				mutex.Lock()
+				if err != nil {
+					progress.ContestsFailed++
+					progress.Stage = CompletionStageContestFailed
+					if firstErr == nil {
+						firstErr = fmt.Errorf("failed to finalize contest %d: %w", contestID, err)
+					}
+				} else {
+					progress.ContestsDone++
+					progress.Stage = CompletionStageContestFinalized
+					if finalized {
+						report.ContestsFinalized++
+					}
+					if prizes != nil {
+						report.Prizes.ContestsProcessed += prizes.ContestsProcessed
+						report.Prizes.WinnersRewarded += prizes.WinnersRewarded
+						report.Prizes.TotalAmount += prizes.TotalAmount
+						report.Prizes.DurationMs += prizes.DurationMs
+					}
+				}
+				progress.ContestID = contestID
+				progress.UpdatedAt = time.Now()
+				event := progress
+				mutex.Unlock()
+
+				publishCompletionProgress([]int64{contestID}, event)
+			}
+		}()
+	}
+	for _, contestID := range pending {
+		jobs <- contestID
+	}
+	close(jobs)
+	wg.Wait()
+
+	report.Prizes.TotalAmount = math.Round(report.Prizes.TotalAmount*100) / 100
+	return progress, firstErr
+}
+
+func (s *MatchCompletionService) finalizeContestWithRetry(contestID int64, distributePrizes bool) (*models.PrizeDistributionReport, bool, error) {
+	var err error
+	for attempt := 1; attempt <= contestFinalizeAttempts; attempt++ {
+		var prizes *models.PrizeDistributionReport
+		var finalized bool
+		prizes, finalized, err = s.finalizeContest(contestID, distributePrizes)
+		if err == nil || !isRetryableTxError(err) {
+			return prizes, finalized, err
+		}
+		time.Sleep(time.Duration(attempt*attempt) * 10 * time.Millisecond)
+	}
+	return nil, false, err
+}
+
+// finalizeContest ranks a contest, pays its prizes and marks it finalized
+// in one transaction. It reports false if the contest was already finalized.
+func (s *MatchCompletionService) finalizeContest(contestID int64, distributePrizes bool) (*models.PrizeDistributionReport, bool, error) {
+	tx, err := s.db.Begin()
+	if err != nil {
+		return nil, false, err
+	}
+	defer tx.Rollback()
+
+	var finalized bool
+	err = tx.QueryRow(`
+		SELECT finalized_at IS NOT NULL FROM contests WHERE id = $1 FOR UPDATE`, contestID).Scan(&finalized)
+	if err != nil || finalized {
+		return nil, false, err
+	}
+
+	_, err = tx.Exec(`
+		UPDATE contest_participants cp
+		SET rank = ranked.rank
+		FROM (
+			SELECT cp.id, ROW_NUMBER() OVER (ORDER BY ut.total_points DESC, ut.created_at, ut.id) AS rank
+			FROM contest_participants cp
+			JOIN user_teams ut ON ut.id = cp.team_id
+			WHERE cp.contest_id = $1
+		) ranked
+		WHERE cp.id = ranked.id AND cp.rank IS DISTINCT FROM ranked.rank`, contestID)
+	if err != nil {
+		return nil, false, fmt.Errorf("failed to rank contest: %w", err)
+	}
+
+	var prizes *models.PrizeDistributionReport
+	if distributePrizes {
+		prizes, err = s.leaderboard.DistributeContestPrizesTx(tx, []int64{contestID})
+		if err != nil {
+			return nil, false, err
+		}
+	}
+
+	_, err = tx.Exec(`
+		UPDATE contests SET status = 'completed', finalized_at = NOW() WHERE id = $1`, contestID)
+	if err != nil {
+		return nil, false, fmt.Errorf("failed to mark contest finalized: %w", err)
+	}
+	if err := tx.Commit(); err != nil {
+		return nil, false, err
+	}
+	return prizes, true, nil
+}
+
+// isRetryableTxError reports whether a transaction failed on a deadlock or
+// serialization conflict and can simply be run again
+func isRetryableTxError(err error) bool {
+	var pqErr *pq.Error
+	if errors.As(err, &pqErr) {
+		return pqErr.Code == "40P01" || pqErr.Code == "40001"
+	}
+	return false
+}
+
+// finish closes the run, records team and player statistics and adds the
+// match to the prediction feature store, once: a run that was already
+// closed reports false
+func (s *MatchCompletionService) finish(matchID int64, opts MatchCompletionOptions) (bool, error) {
+	tx, err := s.db.Begin()
+	if err != nil {
+		return false, err
+	}
+	defer tx.Rollback()
+
+	result, err := tx.Exec(`
+		UPDATE match_completions SET status = 'completed', finished_at = NOW()
+		WHERE match_id = $1 AND status = 'running'`, matchID)
+	if err != nil {
+		return false, fmt.Errorf("failed to close match completion: %w", err)
+	}
+	if closed, _ := result.RowsAffected(); closed == 0 {
+		return false, nil
+	}
+
+	_, err = tx.Exec(`
+		UPDATE teams
+		SET matches_played = matches_played + 1,
+			matches_won = matches_won + CASE WHEN id = $1 THEN 1 ELSE 0 END,
+			updated_at = NOW()
+		WHERE id IN (SELECT team_id FROM match_participants WHERE match_id = $2)`,
+		opts.WinnerTeamID, matchID)
+	if err != nil {
+		return false, fmt.Errorf("failed to update team statistics: %w", err)
+	}
+
+	_, err = tx.Exec(`
+		UPDATE players
+		SET matches_played = matches_played + 1,
+			mvp_awards = mvp_awards + CASE WHEN id = $1 THEN 1 ELSE 0 END,
+			updated_at = NOW()
+		WHERE team_id IN (SELECT team_id FROM match_participants WHERE match_id = $2)`,
+		opts.MVPPlayerID, matchID)
+	if err != nil {
+		return false, fmt.Errorf("failed to update player statistics: %w", err)
+	}
+
+	if err := refreshFeatureStoreTx(tx, matchID); err != nil {
+		return false, err
+	}
+
+	return true, tx.Commit()
+}
+
+// notifyParticipants sends every participant of the match one in-app
+// notification. The run is claimed in the same statement so that a resumed
+// completion does not notify anyone twice.
+func (s *MatchCompletionService) notifyParticipants(matchID int64) (int, error) {
+	result, err := s.db.Exec(`
+		WITH claim AS (
+			UPDATE match_completions SET notified_at = NOW()
+			WHERE match_id = $1 AND notified_at IS NULL
+			RETURNING match_id
+		)
+		INSERT INTO notifications (user_id, title, message, type, created_at)
+		SELECT DISTINCT cp.user_id, 'Match Completed!', 'The match has been completed. Check your contest results!',
+			'match_completed', NOW()
+		FROM claim
+		JOIN contests c ON c.match_id = claim.match_id
+		JOIN contest_participants cp ON cp.contest_id = c.id`, matchID)
+	if err != nil {
+		return 0, err
+	}
+	sent, _ := result.RowsAffected()
+	return int(sent), nil
+}
+
+// GetProgress returns how far the completion of a match has got, read from
+// the database so that it is accurate whichever process runs it
+func (s *MatchCompletionService) GetProgress(matchID int64) (*models.MatchCompletionProgress, error) {
+	progress := &models.MatchCompletionProgress{MatchID: matchID, UpdatedAt: time.Now()}
+	var runStatus sql.NullString
+	err := s.db.QueryRow(`
+		SELECT mc.status,
+			(SELECT COUNT(*) FROM contests WHERE match_id = m.id),
+			(SELECT COUNT(*) FROM contests WHERE match_id = m.id AND finalized_at IS NOT NULL)
+		FROM matches m
+		LEFT JOIN match_completions mc ON mc.match_id = m.id
+		WHERE m.id = $1`, matchID).Scan(&runStatus, &progress.ContestsTotal, &progress.ContestsDone)
+	if err == sql.ErrNoRows {
+		return nil, ErrMatchNotFound
+	}
+	if err != nil {
+		return nil, err
+	}
+
+	switch runStatus.String {
+	case "completed":
+		progress.Stage = CompletionStageCompleted
+	case "running":
+		progress.Stage = CompletionStageStarted
+	default:
+		progress.Stage = CompletionStageNotStarted
+	}
+	return progress, nil
+}
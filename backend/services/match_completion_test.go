@@ -0,0 +1,50 @@
+package services
+
+import (
+	"errors"
+	"fmt"
+	"testing"
+
+	"fantasy-esports-backend/models"
+
+	"github.com/lib/pq"
+)
+
+type recordingPublisher struct {
+	events map[int64][]models.MatchCompletionProgress
+}
+
+func (p *recordingPublisher) PublishMatchCompletion(contestID int64, progress models.MatchCompletionProgress) {
+	p.events[contestID] = append(p.events[contestID], progress)
+}
+
+func TestPublishCompletionProgressReachesEveryContest(t *testing.T) {
+	publisher := &recordingPublisher{events: map[int64][]models.MatchCompletionProgress{}}
+	SetMatchCompletionPublisher(publisher)
+	defer SetMatchCompletionPublisher(nil)
+
+	publishCompletionProgress([]int64{1, 2}, models.MatchCompletionProgress{MatchID: 9, Stage: CompletionStageCompleted, ContestsTotal: 2, ContestsDone: 2})
+	for _, contestID := range []int64{1, 2} {
+		events := publisher.events[contestID]
+		if len(events) != 1 || events[0].MatchID != 9 || events[0].Stage != CompletionStageCompleted {
+			t.Errorf("contest %d: got %v", contestID, events)
+		}
+	}
+}
+
+func TestIsRetryableTxError(t *testing.T) {
+	cases := []struct {
+		err  error
+		want bool
+	}{
+		{&pq.Error{Code: "40P01"}, true},
+		{fmt.Errorf("failed to rank contest: %w", &pq.Error{Code: "40001"}), true},
+		{&pq.Error{Code: "23505"}, false},
+		{errors.New("connection refused"), false},
+	}
+	for _, tc := range cases {
+		if got := isRetryableTxError(tc.err); got != tc.want {
+			t.Errorf("%v: got %v, want %v", tc.err, got, tc.want)
+		}
+	}
+}
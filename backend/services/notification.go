@@ -26,78 +26,18 @@ func NewNotificationService(db *sql.DB) *NotificationService {
 
 // SendNotification sends a single notification
 func (s *NotificationService) SendNotification(request *models.SendNotificationRequest) (*models.NotificationResponse, error) {
-	// Determine provider if not specified
-	provider := request.Provider
-	if provider == nil {
-		defaultProvider := s.getDefaultProvider(request.Channel)
-		provider = &defaultProvider
-	}
-
-	// Get template if template ID is provided
-	var template *models.NotificationTemplate
-	if request.TemplateID != nil {
-		var err error
-		template, err = s.GetTemplate(*request.TemplateID)
-		if err != nil {
-			errMsg := err.Error()
-			return &models.NotificationResponse{
-				Success: false,
-				Status:  models.StatusFailed,
-				Message: "Template not found",
-				Error:   &errMsg,
-			}, err
-		}
-		
-		// Override provider with template's provider
-		provider = &template.Provider
-	}
-
-	// Get configuration for the provider
-	config, err := s.getProviderConfig(*provider, request.Channel)
+	resolved, failure, err := s.resolveSend(request)
 	if err != nil {
 		errMsg := err.Error()
 		return &models.NotificationResponse{
 			Success: false,
 			Status:  models.StatusFailed,
-			Message: "Configuration error",
-			Error:   &errMsg,
-		}, err
-	}
-
-	// Process template variables if template is used
-	finalRequest := *request
-	if template != nil {
-		processedBody, err := s.processTemplate(template, request.Variables)
-		if err != nil {
-			errMsg := err.Error()
-			return &models.NotificationResponse{
-				Success: false,
-				Status:  models.StatusFailed,
-				Message: "Template processing failed",
-				Error:   &errMsg,
-			}, err
-		}
-		
-		finalRequest.Body = &processedBody
-		if template.Subject != nil {
-			processedSubject, err := s.processTemplateString(*template.Subject, request.Variables)
-			if err == nil {
-				finalRequest.Subject = &processedSubject
-			}
-		}
-	}
-
-	// Create notifier
-	notifier, err := s.notifierFactory.CreateNotifier(*provider, request.Channel)
-	if err != nil {
-		errMsg := err.Error()
-		return &models.NotificationResponse{
-			Success: false,
-			Status:  models.StatusFailed,
-			Message: "Notifier creation failed",
+			Message: failure,
 			Error:   &errMsg,
 		}, err
 	}
+	finalRequest := resolved.request
+	template, provider := resolved.template, &resolved.provider
 
 	// Create log entry
 	logID, err := s.createNotificationLog(&finalRequest, template, *provider)
@@ -106,7 +46,7 @@ func (s *NotificationService) SendNotification(request *models.SendNotificationR
 	}
 
 	// Send notification
-	response, err := notifier.Send(&finalRequest, config)
+	response, err := resolved.notifier.Send(&finalRequest, resolved.config)
 	if err != nil {
 		// Update log with error
 		if logID > 0 {
@@ -129,41 +69,73 @@ func (s *NotificationService) SendNotification(request *models.SendNotificationR
 	return response, nil
 }
 
-// SendBulkNotification sends notifications to multiple recipients
-func (s *NotificationService) SendBulkNotification(request *models.BulkNotificationRequest) ([]*models.NotificationResponse, error) {
-	var responses []*models.NotificationResponse
-	
-	recipients := request.Recipients
-	
-	// If user filter is provided, get filtered recipients
-	if request.UserFilter != nil {
-		filteredRecipients, err := s.getFilteredRecipients(request.Channel, request.UserFilter)
+// resolvedSend is everything needed to send a notification apart from the
+// recipient: the provider, its configuration and notifier, and the request
+// with its template applied
+type resolvedSend struct {
+	request  models.SendNotificationRequest
+	template *models.NotificationTemplate
+	provider models.NotificationProvider
+	config   map[string]string
+	notifier integrations.Notifier
+}
+
+// resolveSend resolves the provider, template, configuration and notifier
+// for a request. On failure it also returns a short description of the step
+// that failed.
+func (s *NotificationService) resolveSend(request *models.SendNotificationRequest) (*resolvedSend, string, error) {
+	// Determine provider if not specified
+	provider := request.Provider
+	if provider == nil {
+		defaultProvider := s.getDefaultProvider(request.Channel)
+		provider = &defaultProvider
+	}
+
+	// Get template if template ID is provided
+	var cached *cachedTemplate
+	var template *models.NotificationTemplate
+	if request.TemplateID != nil {
+		var err error
+		cached, err = s.getCachedTemplate(*request.TemplateID)
 		if err != nil {
-			return nil, err
-		}
-		recipients = append(recipients, filteredRecipients...)
-	}
-
-	// Send to each recipient
-	for _, recipient := range recipients {
-		singleRequest := &models.SendNotificationRequest{
-			Channel:    request.Channel,
-			Provider:   request.Provider,
-			TemplateID: request.TemplateID,
-			Recipient:  recipient,
-			Subject:    request.Subject,
-			Body:       request.Body,
-			Variables:  request.Variables,
+			return nil, "Template not found", err
 		}
+		template = cached.template
+		
+		// Override provider with template's provider
+		provider = &template.Provider
+	}
 
-		response, err := s.SendNotification(singleRequest)
-		if err != nil {
-			logger.Error(fmt.Sprintf("Failed to send notification to %s: %v", recipient, err))
+	// Get configuration for the provider
+	config, err := s.getProviderConfig(*provider, request.Channel)
+	if err != nil {
+		return nil, "Configuration error", err
+	}
+
+	// Process template variables if template is used
+	finalRequest := *request
+	if cached != nil {
+		processedBody := cached.body.render(request.Variables)
+		finalRequest.Body = &processedBody
+		if cached.subject != nil {
+			processedSubject := cached.subject.render(request.Variables)
+			finalRequest.Subject = &processedSubject
 		}
-		responses = append(responses, response)
 	}
 
-	return responses, nil
+	// Create notifier
+	notifier, err := s.notifierFactory.CreateNotifier(*provider, request.Channel)
+	if err != nil {
+		return nil, "Notifier creation failed", err
+	}
+
+	return &resolvedSend{
+		request:  finalRequest,
+		template: template,
+		provider: *provider,
+		config:   config,
+		notifier: notifier,
+	}, "", nil
 }
 
 // Template Management Methods
@@ -201,8 +173,26 @@ func (s *NotificationService) CreateTemplate(request *models.TemplateCreateReque
 	return &template, nil
 }
 
-// GetTemplate retrieves a template by ID
+// GetTemplate retrieves a template by ID. The returned template is the
+// caller's own copy.
 func (s *NotificationService) GetTemplate(templateID int64) (*models.NotificationTemplate, error) {
+	cached, err := s.getCachedTemplate(templateID)
+	if err != nil {
+		return nil, err
+	}
+
+	template := *cached.template
+	return &template, nil
+}
+
+// getCachedTemplate returns a template with its compiled body and subject,
+// loading and compiling it on a cache miss
+func (s *NotificationService) getCachedTemplate(templateID int64) (*cachedTemplate, error) {
+	if cached, exists := notificationCaches.templates.Get(templateID); exists {
+		return cached, nil
+	}
+	generation := notificationCaches.generation.Load()
+
 	query := `
 		SELECT id, name, channel, provider, subject, body, variables, is_dlt_approved, 
 			dlt_template_id, is_active, created_by, created_at, updated_at
@@ -219,7 +209,11 @@ func (s *NotificationService) GetTemplate(templateID int64) (*models.Notificatio
 		return nil, fmt.Errorf("failed to get template: %w", err)
 	}
 
-	return &template, nil
+	cached := newCachedTemplate(&template)
+	if notificationCaches.generation.Load() == generation {
+		notificationCaches.templates.Set(templateID, cached)
+	}
+	return cached, nil
 }
 
 // GetTemplates retrieves templates with pagination
@@ -342,7 +336,12 @@ func (s *NotificationService) UpdateTemplate(templateID int64, request *models.T
 	args = append(args, templateID)
 
 	_, err := s.db.Exec(query, args...)
-	return err
+	if err != nil {
+		return err
+	}
+
+	notificationCaches.invalidateTemplate(templateID)
+	return nil
 }
 
 // Configuration Management Methods
@@ -357,8 +356,12 @@ func (s *NotificationService) UpdateConfig(request *models.ConfigUpdateRequest,
 
 	_, err := s.db.Exec(query, request.Provider, request.Channel, request.ConfigKey,
 		request.ConfigValue, request.IsActive, updatedBy)
-	
-	return err
+	if err != nil {
+		return err
+	}
+
+	notificationCaches.invalidateConfig(request.Provider, request.Channel)
+	return nil
 }
 
 // GetConfig retrieves configuration for a provider and channel
@@ -493,8 +496,15 @@ func (s *NotificationService) getDefaultProvider(channel models.NotificationChan
 	return models.ProviderFast2SMS
 }
 
-// getProviderConfig retrieves configuration for a provider
+// getProviderConfig retrieves the active configuration for a provider. The
+// map is shared through the cache and must not be modified.
 func (s *NotificationService) getProviderConfig(provider models.NotificationProvider, channel models.NotificationChannel) (map[string]string, error) {
+	cacheKey := providerConfigKey(provider, channel)
+	if config, exists := notificationCaches.configs.Get(cacheKey); exists {
+		return config, nil
+	}
+	generation := notificationCaches.generation.Load()
+
 	query := `SELECT config_key, config_value FROM notification_config 
 		WHERE provider = $1 AND channel = $2 AND is_active = true`
 
@@ -513,27 +523,10 @@ func (s *NotificationService) getProviderConfig(provider models.NotificationProv
 		config[key] = value
 	}
 
-	return config, nil
-}
-
-// processTemplate processes template with variables
-func (s *NotificationService) processTemplate(template *models.NotificationTemplate, variables map[string]interface{}) (string, error) {
-	return s.processTemplateString(template.Body, variables)
-}
-
-// processTemplateString processes a template string with variables
-func (s *NotificationService) processTemplateString(templateStr string, variables map[string]interface{}) (string, error) {
-	result := templateStr
-	
-	if variables != nil {
-		for key, value := range variables {
-			placeholder := fmt.Sprintf("{%s}", key)
-			replacement := fmt.Sprintf("%v", value)
-			result = strings.ReplaceAll(result, placeholder, replacement)
-		}
+	if notificationCaches.generation.Load() == generation {
+		notificationCaches.configs.Set(cacheKey, config)
 	}
-	
-	return result, nil
+	return config, nil
 }
 
 // createNotificationLog creates a log entry
@@ -572,8 +565,10 @@ func (s *NotificationService) updateNotificationLog(logID int64, status models.N
 	s.db.Exec(query, logID, status, providerID, errorMsg)
 }
 
-// getFilteredRecipients gets recipients based on user filter
-func (s *NotificationService) getFilteredRecipients(channel models.NotificationChannel, filter *models.UserFilter) ([]string, error) {
+// filteredRecipientsQuery builds the keyset query for one page of users
+// matching a filter. Callers append the user id to continue after and the
+// page size to the returned arguments.
+func filteredRecipientsQuery(channel models.NotificationChannel, filter *models.UserFilter) (string, []interface{}) {
 	var whereClause []string
 	var args []interface{}
 	argIndex := 1
@@ -614,27 +609,11 @@ func (s *NotificationService) getFilteredRecipients(channel models.NotificationC
 		selectField = "mobile"
 	}
 
-	query := fmt.Sprintf("SELECT %s FROM users WHERE is_active = true", selectField)
+	query := fmt.Sprintf("SELECT id, %s FROM users WHERE is_active = true", selectField)
 	if len(whereClause) > 0 {
 		query += " AND " + strings.Join(whereClause, " AND ")
 	}
+	query += fmt.Sprintf(" AND id > $%d ORDER BY id LIMIT $%d", argIndex, argIndex+1)
 
-	rows, err := s.db.Query(query, args...)
-	if err != nil {
-		return nil, fmt.Errorf("failed to get filtered recipients: %w", err)
-	}
-	defer rows.Close()
-
-	var recipients []string
-	for rows.Next() {
-		var recipient sql.NullString
-		if err := rows.Scan(&recipient); err != nil {
-			continue
-		}
-		if recipient.Valid && recipient.String != "" {
-			recipients = append(recipients, recipient.String)
-		}
-	}
-
-	return recipients, nil
-}
\ No newline at end of file
+	return query, args
+}
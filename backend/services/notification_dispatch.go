@@ -0,0 +1,597 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"strconv"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/logger"
+	"fantasy-esports-backend/pkg/ratelimit"
+
+	"github.com/lib/pq"
+)
+
+const (
+	// bulkWorkerCount bounds the sends in flight for one bulk job
+	bulkWorkerCount = 32
+	// bulkLogBatchSize is how many notification_logs rows are written per INSERT
+	bulkLogBatchSize = 500
+
+	bulkJobCapacity  = 1000
+	bulkJobRetention = 24 * time.Hour
+
+	// bulkJobLease is how long a server owns a queued or running bulk job
+	// without renewing it. A job whose lease ran out, because its server
+	// stopped, can be resumed elsewhere.
+	bulkJobLease = 5 * time.Minute
+
+	// rateLimitConfigKey in notification_config overrides a provider's
+	// default requests per second
+	rateLimitConfigKey = "rate_limit_per_second"
+)
+
+var (
+	// ErrBulkJobNotFound is returned when resuming an unknown bulk job
+	ErrBulkJobNotFound = errors.New("bulk notification job not found")
+	// ErrBulkJobNotResumable is returned when resuming a bulk job that is
+	// still running or has completed
+	ErrBulkJobNotResumable = errors.New("bulk notification job is running or completed")
+)
+
+// defaultProviderRates are the requests per second allowed for each provider
+// unless its configuration sets rate_limit_per_second. Batch providers carry
+// up to MaxBatchSize recipients per request.
+var defaultProviderRates = map[models.NotificationProvider]float64{
+	models.ProviderFast2SMS:      10,
+	models.ProviderSMTP:          10,
+	models.ProviderSES:           14,
+	models.ProviderMailchimp:     10,
+	models.ProviderFCM:           100,
+	models.ProviderOneSignal:     20,
+	models.ProviderWhatsAppCloud: 80,
+}
+
+// bulkDispatcher owns the provider rate limits and the job registry. It is
+// shared by every NotificationService so that concurrent jobs for the same
+// provider draw from one limit, and any handler can report a job's progress.
+type bulkDispatcher struct {
+	limitersMutex sync.Mutex
+	limiters      map[models.NotificationProvider]*ratelimit.TokenBucket
+	jobs          *cache.LRU[string, *bulkJob]
+}
+
+var notificationDispatcher = &bulkDispatcher{
+	limiters: make(map[models.NotificationProvider]*ratelimit.TokenBucket),
+	jobs:     cache.NewLRU[string, *bulkJob](bulkJobCapacity, bulkJobRetention),
+}
+
+// limiter returns the provider's shared token bucket, applying the rate
+// from its current configuration
+func (d *bulkDispatcher) limiter(provider models.NotificationProvider, config map[string]string) *ratelimit.TokenBucket {
+	rate := defaultProviderRates[provider]
+	if configured, err := strconv.ParseFloat(config[rateLimitConfigKey], 64); err == nil && configured > 0 {
+		rate = configured
+	}
+	if rate <= 0 {
+		rate = 10
+	}
+	burst := int(rate)
+
+	d.limitersMutex.Lock()
+	defer d.limitersMutex.Unlock()
+
+	bucket, exists := d.limiters[provider]
+	if !exists {
+		bucket = ratelimit.NewTokenBucket(rate, burst)
+		d.limiters[provider] = bucket
+	} else if bucket.Rate() != rate {
+		bucket.SetRate(rate, burst)
+	}
+	return bucket
+}
+
+// bulkJob tracks one bulk send. The counters are updated by the workers
+// while the job is being polled. resumedFrom holds the sends a resumed job
+// loaded from its checkpoint, which the rate leaves out.
+type bulkJob struct {
+	mutex       sync.Mutex
+	info        models.BulkNotificationJob
+	total       atomic.Int64
+	sent        atomic.Int64
+	failed      atomic.Int64
+	checkpoint  atomic.Int64
+	resumedFrom int64
+}
+
+func (j *bulkJob) setStatus(status models.BulkJobStatus, err error) {
+	j.mutex.Lock()
+	defer j.mutex.Unlock()
+
+	now := time.Now()
+	j.info.Status = status
+	switch status {
+	case models.BulkJobRunning:
+		j.info.StartedAt = &now
+	case models.BulkJobCompleted, models.BulkJobFailed:
+		j.info.CompletedAt = &now
+	}
+	if err != nil {
+		errMsg := err.Error()
+		j.info.Error = &errMsg
+	}
+}
+
+func (j *bulkJob) snapshot() *models.BulkNotificationJob {
+	j.mutex.Lock()
+	info := j.info
+	j.mutex.Unlock()
+
+	info.Total = j.total.Load()
+	info.Sent = j.sent.Load()
+	info.Failed = j.failed.Load()
+	info.Pending = info.Total - info.Sent - info.Failed
+	info.CheckpointUserID = j.checkpoint.Load()
+	if info.StartedAt != nil {
+		end := time.Now()
+		if info.CompletedAt != nil {
+			end = *info.CompletedAt
+		}
+		if elapsed := end.Sub(*info.StartedAt).Seconds(); elapsed > 0 {
+			info.RatePerSec = float64(info.Sent+info.Failed-j.resumedFrom) / elapsed
+		}
+	}
+	return &info
+}
+
+// SendBulkNotification starts sending a notification to many recipients and
+// returns the job immediately. The template, provider configuration and
+// notifier are resolved once for the whole job; recipients are then sent to
+// in provider-sized batches by a bounded worker pool, within the provider's
+// rate limit of requests per second. Users matching the filter are read in
+// keyset pages as the senders catch up, and the job checkpoints its
+// progress so that ResumeBulkNotification can continue it if it is
+// interrupted. Poll progress with GetBulkNotificationJob.
+func (s *NotificationService) SendBulkNotification(request *models.BulkNotificationRequest) (*models.BulkNotificationJob, error) {
+	resolved, err := s.resolveBulkSend(request)
+	if err != nil {
+		return nil, err
+	}
+
+	job := newBulkJob(fmt.Sprintf("bulk_%d", time.Now().UnixNano()), request, resolved)
+
+	requestJSON, err := json.Marshal(request)
+	if err != nil {
+		return nil, fmt.Errorf("failed to encode bulk request: %w", err)
+	}
+	_, err = s.db.Exec(`
+		INSERT INTO notification_bulk_jobs (job_id, request, status, checkpoint_user_id, lease_until)
+		VALUES ($1, $2, $3, $4, NOW() + $5 * INTERVAL '1 second')`,
+		job.info.JobID, requestJSON, models.BulkJobQueued, recipientCursorStart, bulkJobLease.Seconds())
+	if err != nil {
+		return nil, fmt.Errorf("failed to create bulk job: %w", err)
+	}
+
+	notificationDispatcher.jobs.Set(job.info.JobID, job)
+	go s.runBulkSend(job, resolved, request, recipientCursorStart)
+
+	return job.snapshot(), nil
+}
+
+// ResumeBulkNotification continues a bulk job that was interrupted, for
+// example by a restart, from its last checkpoint. Recipients after the
+// checkpoint may already have been sent to and are sent to again. The job is
+// claimed in the database, so a job still queued or running under a live
+// lease, on this server or another, is never resumed twice.
+func (s *NotificationService) ResumeBulkNotification(jobID string) (*models.BulkNotificationJob, error) {
+	if job, exists := notificationDispatcher.jobs.Get(jobID); exists {
+		if status := job.snapshot().Status; status == models.BulkJobQueued || status == models.BulkJobRunning {
+			return nil, ErrBulkJobNotResumable
+		}
+	}
+
+	var requestJSON []byte
+	var status models.BulkJobStatus
+	err := s.db.QueryRow(`
+		SELECT request, status FROM notification_bulk_jobs WHERE job_id = $1`, jobID).Scan(&requestJSON, &status)
+	if err == sql.ErrNoRows {
+		return nil, ErrBulkJobNotFound
+	}
+	if err != nil {
+		return nil, fmt.Errorf("failed to get bulk job: %w", err)
+	}
+	if status == models.BulkJobCompleted {
+		return nil, ErrBulkJobNotResumable
+	}
+
+	var request models.BulkNotificationRequest
+	if err := json.Unmarshal(requestJSON, &request); err != nil {
+		return nil, fmt.Errorf("failed to decode bulk request: %w", err)
+	}
+	resolved, err := s.resolveBulkSend(&request)
+	if err != nil {
+		return nil, err
+	}
+
+	var cursor, sent, failed int64
+	err = s.db.QueryRow(`
+		UPDATE notification_bulk_jobs
+		SET status = $2, lease_until = NOW() + $3 * INTERVAL '1 second', updated_at = NOW()
+		WHERE job_id = $1 AND status <> $4
+			AND (status NOT IN ($5, $2) OR lease_until IS NULL OR lease_until < NOW())
+		RETURNING checkpoint_user_id, sent_count, failed_count`,
+		jobID, models.BulkJobRunning, bulkJobLease.Seconds(), models.BulkJobCompleted, models.BulkJobQueued).Scan(
+		&cursor, &sent, &failed)
+	if err == sql.ErrNoRows {
+		return nil, ErrBulkJobNotResumable
+	}
+	if err != nil {
+		return nil, fmt.Errorf("failed to claim bulk job: %w", err)
+	}
+
+	job := newBulkJob(jobID, &request, resolved)
+	job.checkpoint.Store(cursor)
+	job.total.Store(sent + failed)
+	job.sent.Store(sent)
+	job.failed.Store(failed)
+	job.resumedFrom = sent + failed
+
+	notificationDispatcher.jobs.Set(jobID, job)
+	go s.runBulkSend(job, resolved, &request, cursor)
+
+	return job.snapshot(), nil
+}
+
+// GetBulkNotificationJob returns the progress of a bulk notification job.
+// Jobs this server is not tracking, because it restarted, evicted them or
+// never ran them, are reported from their last saved checkpoint.
+func (s *NotificationService) GetBulkNotificationJob(jobID string) (*models.BulkNotificationJob, error) {
+	if job, exists := notificationDispatcher.jobs.Get(jobID); exists {
+		return job.snapshot(), nil
+	}
+
+	var requestJSON []byte
+	var errorMsg sql.NullString
+	var updatedAt time.Time
+	info := models.BulkNotificationJob{JobID: jobID}
+	err := s.db.QueryRow(`
+		SELECT request, status, checkpoint_user_id, COALESCE(sent_count, 0), COALESCE(failed_count, 0),
+			error_msg, created_at, updated_at
+		FROM notification_bulk_jobs WHERE job_id = $1`, jobID).Scan(
+		&requestJSON, &info.Status, &info.CheckpointUserID, &info.Sent, &info.Failed,
+		&errorMsg, &info.CreatedAt, &updatedAt)
+	if err == sql.ErrNoRows {
+		return nil, ErrBulkJobNotFound
+	}
+	if err != nil {
+		return nil, fmt.Errorf("failed to get bulk job: %w", err)
+	}
+
+	var request models.BulkNotificationRequest
+	if err := json.Unmarshal(requestJSON, &request); err != nil {
+		return nil, fmt.Errorf("failed to decode bulk request: %w", err)
+	}
+	info.Channel = request.Channel
+	if request.Provider != nil {
+		info.Provider = *request.Provider
+	}
+	info.TemplateID = request.TemplateID
+	// Only the recipients up to the checkpoint are known
+	info.Total = info.Sent + info.Failed
+	if errorMsg.Valid {
+		info.Error = &errorMsg.String
+	}
+	if info.Status == models.BulkJobCompleted || info.Status == models.BulkJobFailed {
+		info.CompletedAt = &updatedAt
+	}
+	return &info, nil
+}
+
+// resolveBulkSend resolves a bulk request once for all of its recipients
+func (s *NotificationService) resolveBulkSend(request *models.BulkNotificationRequest) (*resolvedSend, error) {
+	resolved, _, err := s.resolveSend(&models.SendNotificationRequest{
+		Channel:    request.Channel,
+		Provider:   request.Provider,
+		TemplateID: request.TemplateID,
+		Subject:    request.Subject,
+		Body:       request.Body,
+		Variables:  request.Variables,
+	})
+	if err != nil {
+		return nil, err
+	}
+	if err := resolved.notifier.ValidateConfig(resolved.config); err != nil {
+		return nil, fmt.Errorf("invalid %s configuration: %w", resolved.provider, err)
+	}
+	return resolved, nil
+}
+
+func newBulkJob(jobID string, request *models.BulkNotificationRequest, resolved *resolvedSend) *bulkJob {
+	job := &bulkJob{info: models.BulkNotificationJob{
+		JobID:      jobID,
+		Status:     models.BulkJobQueued,
+		Channel:    request.Channel,
+		Provider:   resolved.provider,
+		TemplateID: request.TemplateID,
+		CreatedAt:  time.Now(),
+	}}
+	job.checkpoint.Store(recipientCursorStart)
+	return job
+}
+
+// recipientBatch is one provider request's worth of recipients
+type recipientBatch struct {
+	recipients []string
+	page       *pageProgress
+}
+
+func (s *NotificationService) runBulkSend(job *bulkJob, resolved *resolvedSend, request *models.BulkNotificationRequest, cursor int64) {
+	job.setStatus(models.BulkJobRunning, nil)
+
+	limiter := notificationDispatcher.limiter(resolved.provider, resolved.config)
+	logs := &notificationLogBatch{db: s.db, send: resolved}
+
+	progress := &checkpointTracker{cursor: cursor, sent: job.sent.Load(), failed: job.failed.Load()}
+	s.saveBulkCheckpoint(job, progress, models.BulkJobRunning, nil)
+
+	// Checkpoints renew the lease; this keeps it while a slow page is sent
+	stopLease := make(chan struct{})
+	defer close(stopLease)
+	go s.renewBulkLease(job.info.JobID, stopLease)
+
+	// The checkpoint only moves past recipients whose log rows are written.
+	// It is read before the flush: every row of a page is added before the
+	// page completes, so the flush covers all the rows up to it.
+	var checkpointMutex sync.Mutex
+	checkpoint := func() {
+		checkpointMutex.Lock()
+		defer checkpointMutex.Unlock()
+
+		cursor, sent, failed := progress.checkpoint()
+		logs.flush()
+		s.writeBulkCheckpoint(job, cursor, sent, failed, models.BulkJobRunning, nil)
+	}
+
+	// Each unit of work is one provider request: a single recipient, or a
+	// batch for providers with a batch API
+	batchSize := resolved.notifier.MaxBatchSize()
+	if batchSize < 1 {
+		batchSize = 1
+	}
+
+	pages := make(chan recipientPage, recipientPagesAhead)
+	streamErr := make(chan error, 1)
+	go func() {
+		streamErr <- s.streamRecipients(request, cursor, pages)
+	}()
+
+	work := make(chan recipientBatch, bulkWorkerCount*2)
+	var wg sync.WaitGroup
+	for i := 0; i < bulkWorkerCount; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for batch := range work {
+				limiter.Wait()
+
+				responses, err := resolved.notifier.SendBatch(&resolved.request, batch.recipients, resolved.config)
+				if err != nil {
+					logger.Error(fmt.Sprintf("Bulk notification %s: batch of %d failed: %v", job.info.JobID, len(batch.recipients), err))
+				}
+
+				var sent, failed int64
+				for i, recipient := range batch.recipients {
+					row := notificationLogRow{recipient: recipient, status: models.StatusFailed}
+					var response *models.NotificationResponse
+					if i < len(responses) {
+						response = responses[i]
+					}
+
+					switch {
+					case response != nil && response.Success:
+						row.status = response.Status
+						if response.ProviderID != nil {
+							row.providerID = *response.ProviderID
+						}
+						sent++
+					case response != nil && response.Error != nil:
+						row.errorMsg = *response.Error
+						failed++
+					default:
+						row.errorMsg = "No response for recipient"
+						if err != nil {
+							row.errorMsg = err.Error()
+						}
+						failed++
+					}
+					logs.add(row)
+				}
+				job.sent.Add(sent)
+				job.failed.Add(failed)
+
+				if progress.complete(batch.page, sent, failed) {
+					checkpoint()
+				}
+			}
+		}()
+	}
+
+	for page := range pages {
+		job.total.Add(int64(len(page.recipients)))
+		batches := (len(page.recipients) + batchSize - 1) / batchSize
+
+		tracked, advanced := progress.add(page.cursor, batches)
+		if advanced {
+			checkpoint()
+		}
+		for start := 0; start < len(page.recipients); start += batchSize {
+			end := start + batchSize
+			if end > len(page.recipients) {
+				end = len(page.recipients)
+			}
+			work <- recipientBatch{recipients: page.recipients[start:end], page: tracked}
+		}
+	}
+	close(work)
+	wg.Wait()
+	logs.flush()
+
+	if err := <-streamErr; err != nil {
+		logger.Error(fmt.Sprintf("Bulk notification %s failed to load recipients: %v", job.info.JobID, err))
+		job.setStatus(models.BulkJobFailed, err)
+		s.saveBulkCheckpoint(job, progress, models.BulkJobFailed, err)
+		return
+	}
+
+	job.setStatus(models.BulkJobCompleted, nil)
+	s.saveBulkCheckpoint(job, progress, models.BulkJobCompleted, nil)
+	logger.Info(fmt.Sprintf("Bulk notification %s finished: %d sent, %d failed",
+		job.info.JobID, job.sent.Load(), job.failed.Load()))
+}
+
+// renewBulkLease extends the lease of a running job until stop is closed
+func (s *NotificationService) renewBulkLease(jobID string, stop <-chan struct{}) {
+	ticker := time.NewTicker(bulkJobLease / 3)
+	defer ticker.Stop()
+
+	for {
+		select {
+		case <-ticker.C:
+			_, err := s.db.Exec(`
+				UPDATE notification_bulk_jobs SET lease_until = NOW() + $2 * INTERVAL '1 second'
+				WHERE job_id = $1 AND status = $3`,
+				jobID, bulkJobLease.Seconds(), models.BulkJobRunning)
+			if err != nil {
+				logger.Error(fmt.Sprintf("Failed to renew lease of bulk notification %s: %v", jobID, err))
+			}
+		case <-stop:
+			return
+		}
+	}
+}
+
+// saveBulkCheckpoint records the job's status and checkpoint so that it can
+// be resumed. A running job's lease is renewed; a finished one gives it up.
+func (s *NotificationService) saveBulkCheckpoint(job *bulkJob, progress *checkpointTracker, status models.BulkJobStatus, jobErr error) {
+	cursor, sent, failed := progress.checkpoint()
+	s.writeBulkCheckpoint(job, cursor, sent, failed, status, jobErr)
+}
+
+// writeBulkCheckpoint is saveBulkCheckpoint for a checkpoint read earlier
+func (s *NotificationService) writeBulkCheckpoint(job *bulkJob, cursor, sent, failed int64, status models.BulkJobStatus, jobErr error) {
+	job.checkpoint.Store(cursor)
+
+	var errorMsg *string
+	if jobErr != nil {
+		msg := jobErr.Error()
+		errorMsg = &msg
+	}
+
+	_, err := s.db.Exec(`
+		UPDATE notification_bulk_jobs
+		SET status = $2, checkpoint_user_id = $3, sent_count = $4, failed_count = $5,
+			error_msg = $6, updated_at = NOW(),
+			lease_until = CASE WHEN $2 = $7 THEN NOW() + $8 * INTERVAL '1 second' END
+		WHERE job_id = $1`,
+		job.info.JobID, status, cursor, sent, failed, errorMsg, models.BulkJobRunning, bulkJobLease.Seconds())
+	if err != nil {
+		logger.Error(fmt.Sprintf("Failed to checkpoint bulk notification %s: %v", job.info.JobID, err))
+	}
+}
+
+// notificationLogRow is the per-recipient part of a bulk notification log
+type notificationLogRow struct {
+	recipient  string
+	status     models.NotificationStatus
+	providerID string
+	errorMsg   string
+}
+
+// notificationLogBatch buffers the log rows of a bulk job and writes them to
+// notification_logs in multi-row inserts
+type notificationLogBatch struct {
+	mutex sync.Mutex
+	db    *sql.DB
+	send  *resolvedSend
+	rows  []notificationLogRow
+	// inserting is read-held by every insert of a full batch taken out of
+	// rows, so that flush can wait for them
+	inserting sync.RWMutex
+}
+
+func (b *notificationLogBatch) add(row notificationLogRow) {
+	b.mutex.Lock()
+	b.rows = append(b.rows, row)
+	var full []notificationLogRow
+	if len(b.rows) >= bulkLogBatchSize {
+		full, b.rows = b.rows, nil
+		b.inserting.RLock()
+	}
+	b.mutex.Unlock()
+
+	if full != nil {
+		b.insert(full)
+		b.inserting.RUnlock()
+	}
+}
+
+// flush writes the buffered rows and returns once every row added before it
+// was called is written, including full batches still being inserted by add
+func (b *notificationLogBatch) flush() {
+	b.mutex.Lock()
+	rows := b.rows
+	b.rows = nil
+	b.mutex.Unlock()
+
+	if len(rows) > 0 {
+		b.insert(rows)
+	}
+	b.inserting.Lock()
+	b.inserting.Unlock()
+}
+
+func (b *notificationLogBatch) insert(rows []notificationLogRow) {
+	recipients := make([]string, len(rows))
+	statuses := make([]string, len(rows))
+	providerIDs := make([]string, len(rows))
+	errorMsgs := make([]string, len(rows))
+	for i, row := range rows {
+		recipients[i] = row.recipient
+		statuses[i] = string(row.status)
+		providerIDs[i] = row.providerID
+		errorMsgs[i] = row.errorMsg
+	}
+
+	var templateID *int64
+	if b.send.template != nil {
+		templateID = &b.send.template.ID
+	}
+	subject := ""
+	if b.send.request.Subject != nil {
+		subject = *b.send.request.Subject
+	}
+	body := ""
+	if b.send.request.Body != nil {
+		body = *b.send.request.Body
+	}
+
+	query := `
+		INSERT INTO notification_logs (template_id, channel, provider, recipient, subject, body,
+			status, provider_id, error_msg, created_at, sent_at)
+		SELECT $1, $2, $3, r.recipient, $4, $5, r.status,
+			NULLIF(r.provider_id, ''), NULLIF(r.error_msg, ''), NOW(), NOW()
+		FROM unnest($6::text[], $7::text[], $8::text[], $9::text[])
+			AS r(recipient, status, provider_id, error_msg)`
+
+	_, err := b.db.Exec(query, templateID, b.send.request.Channel, b.send.provider, subject, body,
+		pq.Array(recipients), pq.Array(statuses), pq.Array(providerIDs), pq.Array(errorMsgs))
+	if err != nil {
+		logger.Error(fmt.Sprintf("Failed to write %d bulk notification logs: %v", len(rows), err))
+	}
+}
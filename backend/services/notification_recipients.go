@@ -0,0 +1,157 @@
+package services
+
+import (
+	"database/sql"
+	"fmt"
+	"sync"
+
+	"fantasy-esports-backend/models"
+)
+
+const (
+	// recipientPageSize is how many users are read per keyset page
+	recipientPageSize = 1000
+	// recipientPagesAhead bounds the pages read ahead of the senders, so a
+	// slow provider holds back the scan instead of buffering the user base
+	recipientPagesAhead = 4
+
+	// recipientCursorStart is the checkpoint of a job that has not finished
+	// its explicit recipient list yet. User ids start at 1, so a cursor of 0
+	// means the list is done and no filtered user has been sent to.
+	recipientCursorStart int64 = -1
+)
+
+// recipientPage is a page of recipients and the checkpoint cursor reached
+// once every recipient in it has been sent to
+type recipientPage struct {
+	recipients []string
+	cursor     int64
+}
+
+// streamRecipients sends the request's recipients to pages, starting after
+// cursor: first the explicit recipient list, then the users matching the
+// filter in keyset pages ordered by id. It closes pages when done.
+func (s *NotificationService) streamRecipients(request *models.BulkNotificationRequest, cursor int64, pages chan<- recipientPage) error {
+	defer close(pages)
+
+	if cursor < 0 {
+		pages <- recipientPage{recipients: request.Recipients, cursor: 0}
+		cursor = 0
+	}
+	if request.UserFilter == nil {
+		return nil
+	}
+
+	query, filterArgs := filteredRecipientsQuery(request.Channel, request.UserFilter)
+	args := append(filterArgs, cursor, recipientPageSize)
+	for {
+		args[len(args)-2] = cursor
+		page, rows, err := s.readRecipientPage(query, args)
+		if err != nil {
+			return err
+		}
+		if rows == 0 {
+			return nil
+		}
+
+		cursor = page.cursor
+		pages <- page
+		if rows < recipientPageSize {
+			return nil
+		}
+	}
+}
+
+// readRecipientPage reads one keyset page. Users without a mobile or email
+// are skipped but still move the cursor; rows is the number of users read.
+func (s *NotificationService) readRecipientPage(query string, args []interface{}) (recipientPage, int, error) {
+	rows, err := s.db.Query(query, args...)
+	if err != nil {
+		return recipientPage{}, 0, fmt.Errorf("failed to get filtered recipients: %w", err)
+	}
+	defer rows.Close()
+
+	page := recipientPage{recipients: make([]string, 0, recipientPageSize)}
+	count := 0
+	for rows.Next() {
+		var userID int64
+		var recipient sql.NullString
+		if err := rows.Scan(&userID, &recipient); err != nil {
+			return recipientPage{}, 0, fmt.Errorf("failed to scan recipient: %w", err)
+		}
+		count++
+		page.cursor = userID
+		if recipient.Valid && recipient.String != "" {
+			page.recipients = append(page.recipients, recipient.String)
+		}
+	}
+	if err := rows.Err(); err != nil {
+		return recipientPage{}, 0, fmt.Errorf("failed to get filtered recipients: %w", err)
+	}
+
+	return page, count, nil
+}
+
+// pageProgress counts the batches of a page still being sent and the
+// outcomes of those already sent
+type pageProgress struct {
+	cursor    int64
+	remaining int
+	sent      int64
+	failed    int64
+}
+
+// checkpointTracker turns batches finishing in any order into a checkpoint:
+// the cursor of the last page before which every page has been fully sent,
+// and the sent and failed counts up to it. Resuming from the checkpoint
+// sends to each recipient at least once.
+type checkpointTracker struct {
+	mutex   sync.Mutex
+	pending []*pageProgress
+	cursor  int64
+	sent    int64
+	failed  int64
+}
+
+// add registers a page split into batches. A page without batches is
+// complete at once; ok reports whether that moved the checkpoint.
+func (t *checkpointTracker) add(cursor int64, batches int) (page *pageProgress, ok bool) {
+	t.mutex.Lock()
+	defer t.mutex.Unlock()
+
+	page = &pageProgress{cursor: cursor, remaining: batches}
+	t.pending = append(t.pending, page)
+	return page, t.advance()
+}
+
+// complete records a sent batch of page and reports whether the checkpoint
+// moved
+func (t *checkpointTracker) complete(page *pageProgress, sent, failed int64) bool {
+	t.mutex.Lock()
+	defer t.mutex.Unlock()
+
+	page.remaining--
+	page.sent += sent
+	page.failed += failed
+	return t.advance()
+}
+
+func (t *checkpointTracker) advance() bool {
+	advanced := false
+	for len(t.pending) > 0 && t.pending[0].remaining <= 0 {
+		page := t.pending[0]
+		t.pending = t.pending[1:]
+		t.cursor = page.cursor
+		t.sent += page.sent
+		t.failed += page.failed
+		advanced = true
+	}
+	return advanced
+}
+
+// checkpoint returns the cursor and the counts up to it
+func (t *checkpointTracker) checkpoint() (cursor, sent, failed int64) {
+	t.mutex.Lock()
+	defer t.mutex.Unlock()
+	return t.cursor, t.sent, t.failed
+}
@@ -0,0 +1,34 @@
+package services
+
+import "testing"
+
+func TestCheckpointWaitsForEarlierPages(t *testing.T) {
+	progress := &checkpointTracker{cursor: recipientCursorStart}
+
+	explicit, advanced := progress.add(0, 0)
+	if !advanced || explicit.remaining != 0 {
+		t.Fatal("an empty recipient list should complete at once")
+	}
+	first, _ := progress.add(1000, 2)
+	second, _ := progress.add(2000, 1)
+
+	// The later page finishing first must not move the checkpoint past the
+	// earlier page's unsent batch
+	if progress.complete(second, 3, 0) {
+		t.Fatal("checkpoint moved past an unfinished page")
+	}
+	if progress.complete(first, 2, 1) {
+		t.Fatal("checkpoint moved with a batch of the page outstanding")
+	}
+	if cursor, _, _ := progress.checkpoint(); cursor != 0 {
+		t.Fatalf("cursor = %d, want 0", cursor)
+	}
+
+	if !progress.complete(first, 2, 0) {
+		t.Fatal("checkpoint did not move when the earliest page finished")
+	}
+	cursor, sent, failed := progress.checkpoint()
+	if cursor != 2000 || sent != 7 || failed != 1 {
+		t.Fatalf("checkpoint = (%d, %d, %d), want (2000, 7, 1)", cursor, sent, failed)
+	}
+}
@@ -0,0 +1,189 @@
+package services
+
+import (
+	"bytes"
+	"fmt"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/telemetry"
+)
+
+const (
+	// templateCacheTTL only bounds staleness from writes made outside this
+	// process; UpdateTemplate invalidates the entry directly
+	templateCacheCapacity = 1000
+	templateCacheTTL      = 10 * time.Minute
+
+	// providerConfigCacheTTL bounds how long another instance's UpdateConfig
+	// takes to be picked up; this instance's updates invalidate immediately
+	providerConfigCacheCapacity = 100
+	providerConfigCacheTTL      = time.Minute
+)
+
+// cachedTemplate is a template row together with its compiled body and
+// subject
+type cachedTemplate struct {
+	template *models.NotificationTemplate
+	body     *compiledTemplate
+	subject  *compiledTemplate
+}
+
+// notificationCache holds templates and active provider configurations. It
+// is shared by every NotificationService so that an update made through one
+// handler invalidates what the senders read.
+type notificationCache struct {
+	templates *cache.LRU[int64, *cachedTemplate]
+	configs   *cache.LRU[string, map[string]string]
+
+	// generation is bumped by every invalidation so that a read which
+	// started before it does not store a row that is already stale
+	generation atomic.Uint64
+}
+
+var notificationCaches = &notificationCache{
+	templates: cache.NewLRU[int64, *cachedTemplate](templateCacheCapacity, templateCacheTTL),
+	configs:   cache.NewLRU[string, map[string]string](providerConfigCacheCapacity, providerConfigCacheTTL),
+}
+
+func init() {
+	telemetry.RegisterCache("notification_templates", notificationCaches.templates.Stats)
+	telemetry.RegisterCache("notification_provider_configs", notificationCaches.configs.Stats)
+}
+
+func providerConfigKey(provider models.NotificationProvider, channel models.NotificationChannel) string {
+	return string(provider) + ":" + string(channel)
+}
+
+func newCachedTemplate(template *models.NotificationTemplate) *cachedTemplate {
+	cached := &cachedTemplate{
+		template: template,
+		body:     compileTemplate(template.Body),
+	}
+	if template.Subject != nil {
+		cached.subject = compileTemplate(*template.Subject)
+	}
+	return cached
+}
+
+func (c *notificationCache) invalidateTemplate(templateID int64) {
+	c.generation.Add(1)
+	c.templates.Remove(templateID)
+}
+
+func (c *notificationCache) invalidateConfig(provider models.NotificationProvider, channel models.NotificationChannel) {
+	c.generation.Add(1)
+	c.configs.Remove(providerConfigKey(provider, channel))
+}
+
+// compiledTemplate is a notification template body split once into literal
+// text and {variable} placeholders, so rendering is a single pass over the
+// segments instead of one strings.ReplaceAll per variable.
+type compiledTemplate struct {
+	segments []templateSegment
+	literal  int // bytes of literal text, used to presize the output
+}
+
+// templateSegment is literal text, or a placeholder when variable is set
+type templateSegment struct {
+	text     string
+	variable string
+}
+
+// renderBuffers are reused across renders; bulk campaigns render the same
+// template for every recipient
+var renderBuffers = sync.Pool{
+	New: func() interface{} { return new(bytes.Buffer) },
+}
+
+// compileTemplate parses {name} placeholders. Braces that do not enclose a
+// name, such as "{}" or an unclosed "{", are kept as literal text.
+func compileTemplate(text string) *compiledTemplate {
+	compiled := &compiledTemplate{}
+	literalStart := 0
+
+	for i := 0; i < len(text); {
+		if text[i] != '{' {
+			i++
+			continue
+		}
+		end := strings.IndexAny(text[i+1:], "{}")
+		if end <= 0 || text[i+1+end] != '}' {
+			i++
+			continue
+		}
+
+		compiled.appendLiteral(text[literalStart:i])
+		compiled.segments = append(compiled.segments, templateSegment{
+			text:     text[i : i+end+2],
+			variable: text[i+1 : i+1+end],
+		})
+		i += end + 2
+		literalStart = i
+	}
+	compiled.appendLiteral(text[literalStart:])
+
+	return compiled
+}
+
+func (t *compiledTemplate) appendLiteral(text string) {
+	if text == "" {
+		return
+	}
+	t.segments = append(t.segments, templateSegment{text: text})
+	t.literal += len(text)
+}
+
+// render substitutes variables into the template. Placeholders without a
+// value are left as they are, as before templates were compiled.
+func (t *compiledTemplate) render(variables map[string]interface{}) string {
+	if len(t.segments) == 1 && t.segments[0].variable == "" {
+		return t.segments[0].text
+	}
+
+	buf := renderBuffers.Get().(*bytes.Buffer)
+	buf.Reset()
+	buf.Grow(t.literal + 16*len(t.segments))
+
+	for _, segment := range t.segments {
+		if segment.variable == "" {
+			buf.WriteString(segment.text)
+			continue
+		}
+		value, exists := variables[segment.variable]
+		if !exists {
+			buf.WriteString(segment.text)
+			continue
+		}
+		writeTemplateValue(buf, value)
+	}
+
+	rendered := buf.String()
+	renderBuffers.Put(buf)
+	return rendered
+}
+
+// writeTemplateValue formats a value like fmt's %v, without fmt for the
+// common types
+func writeTemplateValue(buf *bytes.Buffer, value interface{}) {
+	var scratch [32]byte
+	switch v := value.(type) {
+	case string:
+		buf.WriteString(v)
+	case int:
+		buf.Write(strconv.AppendInt(scratch[:0], int64(v), 10))
+	case int64:
+		buf.Write(strconv.AppendInt(scratch[:0], v, 10))
+	case float64:
+		buf.Write(strconv.AppendFloat(scratch[:0], v, 'g', -1, 64))
+	case bool:
+		buf.Write(strconv.AppendBool(scratch[:0], v))
+	default:
+		fmt.Fprintf(buf, "%v", v)
+	}
+}
@@ -0,0 +1,66 @@
+package services
+
+import (
+	"fmt"
+	"strings"
+	"testing"
+)
+
+// replaceEach is the per-variable strings.ReplaceAll rendering that compiled
+// templates replaced
+func replaceEach(text string, variables map[string]interface{}) string {
+	for key, value := range variables {
+		text = strings.ReplaceAll(text, fmt.Sprintf("{%s}", key), fmt.Sprintf("%v", value))
+	}
+	return text
+}
+
+func TestCompiledTemplateMatchesReplaceAll(t *testing.T) {
+	variables := map[string]interface{}{
+		"name":    "Asha",
+		"amount":  250.5,
+		"rank":    3,
+		"teams":   int64(12),
+		"winner":  true,
+		"contest": []string{"a", "b"},
+	}
+
+	for _, text := range []string{
+		"",
+		"no placeholders",
+		"{name}",
+		"Hi {name}, you won ₹{amount} at rank {rank}!",
+		"{name}{name} {missing} {rank}",
+		"{} { name} {unclosed {teams} }{winner}{",
+		"{contest} in {{name}}",
+	} {
+		got := compileTemplate(text).render(variables)
+		if want := replaceEach(text, variables); got != want {
+			t.Errorf("render(%q) = %q, want %q", text, got, want)
+		}
+	}
+}
+
+func BenchmarkTemplateRender(b *testing.B) {
+	text := "Hi {name}, your team {team} finished rank {rank} in {contest} and won ₹{amount}. " +
+		"Withdraw from your wallet or join the next match {match} before {deadline}."
+	variables := map[string]interface{}{
+		"name": "Asha", "team": "Night Owls", "rank": 3, "contest": "Mega Contest",
+		"amount": 250.5, "match": "TSM vs FNC", "deadline": "8 PM",
+	}
+
+	b.Run("replace_all", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			replaceEach(text, variables)
+		}
+	})
+	b.Run("compiled", func(b *testing.B) {
+		compiled := compileTemplate(text)
+		b.ReportAllocs()
+		b.ResetTimer()
+		for i := 0; i < b.N; i++ {
+			compiled.render(variables)
+		}
+	})
+}
@@ -0,0 +1,196 @@
+package services
+
+import (
+	"database/sql"
+	"errors"
+	"fmt"
+	"strconv"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/cache"
+	"fantasy-esports-backend/pkg/telemetry"
+	"fantasy-esports-backend/utils"
+)
+
+const (
+	// playerCatalogCapacity bounds how many matches keep their players in
+	// memory; the least recently used are evicted first
+	playerCatalogCapacity = 2000
+	// playerCatalogTTL bounds how long a player edited outside this process
+	// keeps its old credit value or playing status here
+	playerCatalogTTL = time.Minute
+
+	// maxTeamCredits is the credit budget of a fantasy team
+	maxTeamCredits = 100.0
+)
+
+var ErrInvalidMatch = errors.New("invalid match")
+
+// CatalogPlayer is what team validation needs to know about a player
+type CatalogPlayer struct {
+	ID          int64
+	RealTeamID  int64
+	Role        string
+	CreditValue float64
+	IsPlaying   bool
+}
+
+// PlayerCatalog is the players of the teams taking part in a match, with
+// the team size rules of its game
+type PlayerCatalog struct {
+	MatchID int64
+	Game    models.Game
+	Players map[int64]CatalogPlayer
+}
+
+// TeamSelection is a validated lineup ready to be saved
+type TeamSelection struct {
+	Players       []models.PlayerSelection
+	RealTeamIDs   []int64 // by position in Players
+	CaptainID     int64
+	ViceCaptainID int64
+	TotalCredits  float64
+}
+
+// TeamError is a lineup rejected by validation. Code is the API error code.
+type TeamError struct {
+	Code    string
+	Message string
+}
+
+func (e *TeamError) Error() string {
+	return e.Message
+}
+
+// Validate checks a lineup against the match entirely in memory
+func (c *PlayerCatalog) Validate(players []models.PlayerSelection) (*TeamSelection, error) {
+	if errs := utils.ValidateTeamComposition(players, c.Game); len(errs) > 0 {
+		return nil, &TeamError{Code: "VALIDATION_FAILED", Message: errs[0]}
+	}
+
+	selection := &TeamSelection{Players: players, RealTeamIDs: make([]int64, len(players))}
+	seen := make(map[int64]bool, len(players))
+	for i, player := range players {
+		catalogPlayer, exists := c.Players[player.PlayerID]
+		if !exists || !catalogPlayer.IsPlaying {
+			return nil, &TeamError{
+				Code:    "INVALID_PLAYER",
+				Message: "Invalid player ID: " + strconv.FormatInt(player.PlayerID, 10),
+			}
+		}
+		if seen[player.PlayerID] {
+			return nil, &TeamError{
+				Code:    "VALIDATION_FAILED",
+				Message: "Player selected more than once: " + strconv.FormatInt(player.PlayerID, 10),
+			}
+		}
+		seen[player.PlayerID] = true
+
+		selection.RealTeamIDs[i] = catalogPlayer.RealTeamID
+		selection.TotalCredits += catalogPlayer.CreditValue
+		if player.IsCaptain {
+			selection.CaptainID = player.PlayerID
+		}
+		if player.IsViceCaptain {
+			selection.ViceCaptainID = player.PlayerID
+		}
+	}
+
+	if selection.TotalCredits > maxTeamCredits {
+		return nil, &TeamError{
+			Code:    "CREDITS_EXCEEDED",
+			Message: fmt.Sprintf("Total credits (%.1f) exceed limit of 100", selection.TotalCredits),
+		}
+	}
+	return selection, nil
+}
+
+// playerCatalogCache holds a catalog per match. Concurrent misses for the
+// same match share one load.
+type playerCatalogCache struct {
+	entries *cache.LRU[int64, *PlayerCatalog]
+	fills   cache.Group[int64, *PlayerCatalog]
+
+	// generations keeps a load that started before its match was
+	// invalidated from storing a catalog that is already stale
+	generations cache.Generations[int64]
+}
+
+var playerCatalogs = &playerCatalogCache{
+	entries: cache.NewLRU[int64, *PlayerCatalog](playerCatalogCapacity, playerCatalogTTL),
+}
+
+func init() {
+	telemetry.RegisterCache("player_catalogs", playerCatalogs.entries.Stats)
+}
+
+// GetPlayerCatalog returns the catalog of a match, loading it on first use.
+// It returns ErrInvalidMatch if the match does not exist.
+func GetPlayerCatalog(db *sql.DB, matchID int64) (*PlayerCatalog, error) {
+	if catalog, exists := playerCatalogs.entries.Get(matchID); exists {
+		return catalog, nil
+	}
+
+	catalog, err, _ := playerCatalogs.fills.Do(matchID, func() (*PlayerCatalog, error) {
+		generation := playerCatalogs.generations.Begin(matchID)
+		started := time.Now()
+
+		catalog, err := loadPlayerCatalog(db, matchID)
+		if err != nil {
+			playerCatalogs.generations.Finish(matchID, generation, nil)
+			return nil, err
+		}
+		playerCatalogs.entries.ObserveFill(time.Since(started))
+
+		playerCatalogs.generations.Finish(matchID, generation, func() {
+			playerCatalogs.entries.Set(matchID, catalog)
+		})
+		return catalog, nil
+	})
+	return catalog, err
+}
+
+// InvalidatePlayerCatalog drops the catalog of a match after its players or
+// participating teams change. Players edited outside this process are picked
+// up once playerCatalogTTL has passed.
+func InvalidatePlayerCatalog(matchID int64) {
+	playerCatalogs.generations.Invalidate(matchID)
+	playerCatalogs.entries.Remove(matchID)
+}
+
+func loadPlayerCatalog(db *sql.DB, matchID int64) (*PlayerCatalog, error) {
+	catalog := &PlayerCatalog{MatchID: matchID, Players: make(map[int64]CatalogPlayer)}
+	err := db.QueryRow(`
+		SELECT g.id, g.total_team_size, g.max_players_per_team, g.min_players_per_team
+		FROM games g
+		JOIN matches m ON g.id = m.game_id
+		WHERE m.id = $1`, matchID).Scan(
+		&catalog.Game.ID, &catalog.Game.TotalTeamSize, &catalog.Game.MaxPlayersPerTeam, &catalog.Game.MinPlayersPerTeam,
+	)
+	if err == sql.ErrNoRows {
+		return nil, ErrInvalidMatch
+	}
+	if err != nil {
+		return nil, err
+	}
+
+	rows, err := db.Query(`
+		SELECT p.id, p.team_id, COALESCE(p.role, ''), p.credit_value, COALESCE(p.is_playing, true)
+		FROM players p
+		JOIN match_participants mp ON mp.team_id = p.team_id
+		WHERE mp.match_id = $1`, matchID)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var player CatalogPlayer
+		if err := rows.Scan(&player.ID, &player.RealTeamID, &player.Role, &player.CreditValue, &player.IsPlaying); err != nil {
+			return nil, err
+		}
+		catalog.Players[player.ID] = player
+	}
+	return catalog, rows.Err()
+}
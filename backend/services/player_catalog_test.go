@@ -0,0 +1,61 @@
+package services
+
+import (
+	"testing"
+
+	"fantasy-esports-backend/models"
+)
+
+func testPlayerCatalog() *PlayerCatalog {
+	catalog := &PlayerCatalog{MatchID: 1, Game: models.Game{TotalTeamSize: 3, MaxPlayersPerTeam: 2}, Players: map[int64]CatalogPlayer{}}
+	for id := int64(1); id <= 5; id++ {
+		catalog.Players[id] = CatalogPlayer{ID: id, RealTeamID: 100 + id%2, CreditValue: 9, IsPlaying: id != 5}
+	}
+	return catalog
+}
+
+func lineup(ids ...int64) []models.PlayerSelection {
+	players := make([]models.PlayerSelection, len(ids))
+	for i, id := range ids {
+		players[i] = models.PlayerSelection{PlayerID: id, IsCaptain: i == 0, IsViceCaptain: i == 1}
+	}
+	return players
+}
+
+func TestPlayerCatalogValidatesLineupInMemory(t *testing.T) {
+	selection, err := testPlayerCatalog().Validate(lineup(1, 2, 3))
+	if err != nil {
+		t.Fatalf("valid lineup: %v", err)
+	}
+	if selection.TotalCredits != 27 || selection.CaptainID != 1 || selection.ViceCaptainID != 2 {
+		t.Errorf("credits %.1f, captain %d, vice captain %d", selection.TotalCredits, selection.CaptainID, selection.ViceCaptainID)
+	}
+	if got := selection.RealTeamIDs; len(got) != 3 || got[0] != 101 || got[1] != 100 || got[2] != 101 {
+		t.Errorf("real teams %v", got)
+	}
+}
+
+func TestPlayerCatalogRejectsLineups(t *testing.T) {
+	expensive := testPlayerCatalog()
+	expensive.Players[4] = CatalogPlayer{ID: 4, RealTeamID: 100, CreditValue: 90, IsPlaying: true}
+
+	cases := []struct {
+		name    string
+		catalog *PlayerCatalog
+		players []models.PlayerSelection
+		code    string
+	}{
+		{"wrong size", testPlayerCatalog(), lineup(1, 2), "VALIDATION_FAILED"},
+		{"not in match", testPlayerCatalog(), lineup(1, 2, 9), "INVALID_PLAYER"},
+		{"not playing", testPlayerCatalog(), lineup(1, 2, 5), "INVALID_PLAYER"},
+		{"duplicate", testPlayerCatalog(), lineup(1, 2, 2), "VALIDATION_FAILED"},
+		{"over budget", expensive, lineup(1, 2, 4), "CREDITS_EXCEEDED"},
+	}
+	for _, tc := range cases {
+		_, err := tc.catalog.Validate(tc.players)
+		teamErr, ok := err.(*TeamError)
+		if !ok || teamErr.Code != tc.code {
+			t.Errorf("%s: got %v, want %s", tc.name, err, tc.code)
+		}
+	}
+}
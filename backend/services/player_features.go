@@ -0,0 +1,254 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"fmt"
+
+	"github.com/lib/pq"
+)
+
+// pointsTally is the total and number of per-match points in some split of
+// a player's results
+type pointsTally struct {
+	Sum   float64 `json:"sum"`
+	Count int     `json:"count"`
+}
+
+// playerFeatures is a player's row of the feature store: the rolling
+// statistics predictions are made from. A player's points in a match are
+// the average points_earned over the fantasy teams that picked them.
+type playerFeatures struct {
+	RecentPoints   []float64 // newest first
+	MapPoints      map[string]pointsTally
+	OpponentPoints map[int64]pointsTally // by opposing team
+}
+
+func newPlayerFeatures() *playerFeatures {
+	return &playerFeatures{MapPoints: map[string]pointsTally{}, OpponentPoints: map[int64]pointsTally{}}
+}
+
+// record adds the result of a newly completed match
+func (f *playerFeatures) record(points float64, mapName string, opponentIDs []int64) {
+	f.RecentPoints = append([]float64{points}, f.RecentPoints...)
+	if len(f.RecentPoints) > recentFormMatches {
+		f.RecentPoints = f.RecentPoints[:recentFormMatches]
+	}
+	if mapName != "" {
+		tally := f.MapPoints[mapName]
+		f.MapPoints[mapName] = pointsTally{Sum: tally.Sum + points, Count: tally.Count + 1}
+	}
+	for _, opponentID := range opponentIDs {
+		tally := f.OpponentPoints[opponentID]
+		f.OpponentPoints[opponentID] = pointsTally{Sum: tally.Sum + points, Count: tally.Count + 1}
+	}
+}
+
+// mapAverage is the player's average points on a map
+func (f *playerFeatures) mapAverage(mapName string) sql.NullFloat64 {
+	tally, exists := f.MapPoints[mapName]
+	if !exists || tally.Count == 0 {
+		return sql.NullFloat64{}
+	}
+	return sql.NullFloat64{Float64: tally.Sum / float64(tally.Count), Valid: true}
+}
+
+// headToHeadAverage is the player's average points against any of the
+// opponents
+func (f *playerFeatures) headToHeadAverage(opponentIDs []int64) sql.NullFloat64 {
+	var total pointsTally
+	for _, opponentID := range opponentIDs {
+		tally := f.OpponentPoints[opponentID]
+		total.Sum += tally.Sum
+		total.Count += tally.Count
+	}
+	if total.Count == 0 {
+		return sql.NullFloat64{}
+	}
+	return sql.NullFloat64{Float64: total.Sum / float64(total.Count), Valid: true}
+}
+
+// loadPlayerFeatures reads the feature store rows of the players. Players
+// without a completed match yet have no row.
+func loadPlayerFeatures(q sqlQuerier, playerIDs []int64, forUpdate bool) (map[int64]*playerFeatures, error) {
+	query := `
+		SELECT player_id, recent_points, map_points, opponent_points
+		FROM player_features
+		WHERE player_id = ANY($1)`
+	if forUpdate {
+		query += ` ORDER BY player_id FOR UPDATE`
+	}
+	rows, err := q.Query(query, pq.Array(playerIDs))
+	if err != nil {
+		return nil, fmt.Errorf("failed to read player features: %w", err)
+	}
+	defer rows.Close()
+
+	features := make(map[int64]*playerFeatures, len(playerIDs))
+	for rows.Next() {
+		var playerID int64
+		var recent pq.Float64Array
+		var mapJSON, opponentJSON []byte
+		if err := rows.Scan(&playerID, &recent, &mapJSON, &opponentJSON); err != nil {
+			return nil, err
+		}
+		f := newPlayerFeatures()
+		f.RecentPoints = recent
+		if err := json.Unmarshal(mapJSON, &f.MapPoints); err != nil {
+			return nil, err
+		}
+		if err := json.Unmarshal(opponentJSON, &f.OpponentPoints); err != nil {
+			return nil, err
+		}
+		features[playerID] = f
+	}
+	return features, rows.Err()
+}
+
+// loadTeamMorale reads the morale score of the teams from their recent
+// results in the feature store
+func loadTeamMorale(q sqlQuerier, teamIDs []int64) (map[int64]float64, error) {
+	rows, err := q.Query(`
+		SELECT team_id, cardinality(recent_results), cardinality(array_positions(recent_results, true))
+		FROM team_features
+		WHERE team_id = ANY($1)`, pq.Array(teamIDs))
+	if err != nil {
+		return nil, fmt.Errorf("failed to read team features: %w", err)
+	}
+	defer rows.Close()
+
+	morale := make(map[int64]float64, len(teamIDs))
+	for rows.Next() {
+		var teamID int64
+		var matches, wins int
+		if err := rows.Scan(&teamID, &matches, &wins); err != nil {
+			return nil, err
+		}
+		morale[teamID] = winRateScore(matches, wins)
+	}
+	return morale, rows.Err()
+}
+
+// refreshFeatureStoreTx adds the results of a completed match to the
+// feature store of its players and teams. It must run once per match, in
+// the transaction that closes the match's completion.
+func refreshFeatureStoreTx(tx *sql.Tx, matchID int64) error {
+	_, err := tx.Exec(`
+		INSERT INTO team_features (team_id, recent_results, updated_at)
+		SELECT mp.team_id, ARRAY[COALESCE(m.winner_team_id = mp.team_id, false)], NOW()
+		FROM match_participants mp
+		JOIN matches m ON m.id = mp.match_id
+		WHERE mp.match_id = $1
+		ON CONFLICT (team_id) DO UPDATE
+		SET recent_results = (EXCLUDED.recent_results || team_features.recent_results)[1:$2], updated_at = NOW()`,
+		matchID, teamMoraleMatches)
+	if err != nil {
+		return fmt.Errorf("failed to refresh team features: %w", err)
+	}
+
+	var mapName sql.NullString
+	var teamIDs pq.Int64Array
+	err = tx.QueryRow(`
+		SELECT m.map, ARRAY(SELECT team_id FROM match_participants WHERE match_id = m.id)
+		FROM matches m
+		WHERE m.id = $1`, matchID).Scan(&mapName, &teamIDs)
+	if err != nil {
+		return fmt.Errorf("failed to read match: %w", err)
+	}
+
+	rows, err := tx.Query(`
+		SELECT tp.player_id, p.team_id, AVG(tp.points_earned)
+		FROM team_players tp
+		JOIN user_teams ut ON ut.id = tp.team_id
+		JOIN players p ON p.id = tp.player_id
+		WHERE ut.match_id = $1
+		GROUP BY tp.player_id, p.team_id
+		ORDER BY tp.player_id`, matchID)
+	if err != nil {
+		return fmt.Errorf("failed to read match results: %w", err)
+	}
+	var playerIDs, playerTeamIDs []int64
+	var points []float64
+	for rows.Next() {
+		var playerID, teamID int64
+		var playerPoints float64
+		if err := rows.Scan(&playerID, &teamID, &playerPoints); err != nil {
+			rows.Close()
+			return err
+		}
+		playerIDs = append(playerIDs, playerID)
+		playerTeamIDs = append(playerTeamIDs, teamID)
+		points = append(points, playerPoints)
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return err
+	}
+	if len(playerIDs) == 0 {
+		return nil
+	}
+
+	// Create missing rows first so that every row can be locked: two matches
+	// of the same player completing at once must not lose either result
+	_, err = tx.Exec(`
+		INSERT INTO player_features (player_id)
+		SELECT unnest($1::bigint[])
+		ON CONFLICT (player_id) DO NOTHING`, pq.Array(playerIDs))
+	if err != nil {
+		return fmt.Errorf("failed to create player features: %w", err)
+	}
+	features, err := loadPlayerFeatures(tx, playerIDs, true)
+	if err != nil {
+		return err
+	}
+
+	recent := make([]string, len(playerIDs))
+	mapPoints := make([]string, len(playerIDs))
+	opponentPoints := make([]string, len(playerIDs))
+	for i, playerID := range playerIDs {
+		f, exists := features[playerID]
+		if !exists {
+			f = newPlayerFeatures()
+		}
+		f.record(points[i], mapName.String, opponentsOf(teamIDs, playerTeamIDs[i]))
+
+		recentArray, err := pq.Float64Array(f.RecentPoints).Value()
+		if err != nil {
+			return err
+		}
+		recent[i] = recentArray.(string)
+		mapJSON, err := json.Marshal(f.MapPoints)
+		if err != nil {
+			return err
+		}
+		mapPoints[i] = string(mapJSON)
+		opponentJSON, err := json.Marshal(f.OpponentPoints)
+		if err != nil {
+			return err
+		}
+		opponentPoints[i] = string(opponentJSON)
+	}
+
+	_, err = tx.Exec(`
+		UPDATE player_features pf
+		SET recent_points = v.recent_points::numeric[], map_points = v.map_points::jsonb,
+			opponent_points = v.opponent_points::jsonb, updated_at = NOW()
+		FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[]) AS v(player_id, recent_points, map_points, opponent_points)
+		WHERE pf.player_id = v.player_id`,
+		pq.Array(playerIDs), pq.Array(recent), pq.Array(mapPoints), pq.Array(opponentPoints))
+	if err != nil {
+		return fmt.Errorf("failed to refresh player features: %w", err)
+	}
+	return nil
+}
+
+// opponentsOf returns the teams of a match other than the player's own
+func opponentsOf(matchTeamIDs []int64, teamID int64) []int64 {
+	opponents := make([]int64, 0, len(matchTeamIDs))
+	for _, matchTeamID := range matchTeamIDs {
+		if matchTeamID != teamID {
+			opponents = append(opponents, matchTeamID)
+		}
+	}
+	return opponents
+}
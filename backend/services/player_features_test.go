@@ -0,0 +1,61 @@
+package services
+
+import (
+	"encoding/json"
+	"testing"
+)
+
+func TestPlayerFeaturesRecordRollsRecentPoints(t *testing.T) {
+	f := newPlayerFeatures()
+	for points := 1.0; points <= 7; points++ {
+		f.record(points, "", nil)
+	}
+	want := []float64{7, 6, 5, 4, 3}
+	if len(f.RecentPoints) != len(want) {
+		t.Fatalf("recent points %v, want %v", f.RecentPoints, want)
+	}
+	for i := range want {
+		if f.RecentPoints[i] != want[i] {
+			t.Fatalf("recent points %v, want %v", f.RecentPoints, want)
+		}
+	}
+}
+
+func TestPlayerFeaturesAverageByMapAndOpponent(t *testing.T) {
+	f := newPlayerFeatures()
+	f.record(10, "Ascent", []int64{2})
+	f.record(20, "Ascent", []int64{3})
+	f.record(6, "Bind", []int64{2, 3})
+
+	if got := f.mapAverage("Ascent"); !got.Valid || got.Float64 != 15 {
+		t.Errorf("Ascent average %v", got)
+	}
+	if got := f.mapAverage("Haven"); got.Valid {
+		t.Errorf("unplayed map %v", got)
+	}
+	if got := f.headToHeadAverage([]int64{2}); !got.Valid || got.Float64 != 8 {
+		t.Errorf("against team 2 %v", got)
+	}
+	if got := f.headToHeadAverage([]int64{4}); got.Valid {
+		t.Errorf("never faced team 4 %v", got)
+	}
+
+	// Tallies survive the JSON round trip through the store
+	encoded, err := json.Marshal(f.OpponentPoints)
+	if err != nil {
+		t.Fatal(err)
+	}
+	decoded := newPlayerFeatures()
+	if err := json.Unmarshal(encoded, &decoded.OpponentPoints); err != nil {
+		t.Fatal(err)
+	}
+	if decoded.OpponentPoints[3] != f.OpponentPoints[3] {
+		t.Errorf("decoded %v, want %v", decoded.OpponentPoints, f.OpponentPoints)
+	}
+}
+
+func TestOpponentsOf(t *testing.T) {
+	if got := opponentsOf([]int64{1, 2, 3}, 2); len(got) != 2 || got[0] != 1 || got[1] != 3 {
+		t.Errorf("opponents %v", got)
+	}
+}
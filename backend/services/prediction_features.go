@@ -0,0 +1,280 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"fmt"
+	"math"
+
+	"fantasy-esports-backend/models"
+
+	"github.com/lib/pq"
+)
+
+// Positions of the prediction factors in a featureVector
+const (
+	featureRecentForm = iota
+	featureHeadToHead
+	featureTeamStrength
+	featureMapPerformance
+	featureTeamMorale
+	featureCount
+)
+
+const (
+	// neutralFeature is the score of a factor with no history behind it
+	neutralFeature = 5.0
+	// recentFormMatches is how many of a player's latest results make up
+	// their form
+	recentFormMatches = 5
+	// teamMoraleMatches is how many of a team's latest matches make up its
+	// morale
+	teamMoraleMatches = 10
+
+	predictionModelVersion = "1.0"
+)
+
+// featureVector holds a player's prediction factors, each on a 0-10 scale
+type featureVector [featureCount]float64
+
+// predictionWeights is the weight of each factor in the predicted points
+var predictionWeights = featureVector{0.3, 0.2, 0.2, 0.15, 0.15}
+
+func neutralFeatureVector() featureVector {
+	var v featureVector
+	for i := range v {
+		v[i] = neutralFeature
+	}
+	return v
+}
+
+func featureVectorOf(factors *models.PredictionFactors) featureVector {
+	return featureVector{
+		featureRecentForm:     factors.RecentForm,
+		featureHeadToHead:     factors.HeadToHeadRecord,
+		featureTeamStrength:   factors.TeamStrength,
+		featureMapPerformance: factors.MapPerformance,
+		featureTeamMorale:     factors.TeamMorale,
+	}
+}
+
+func (v featureVector) factors() *models.PredictionFactors {
+	return &models.PredictionFactors{
+		RecentForm:       v[featureRecentForm],
+		HeadToHeadRecord: v[featureHeadToHead],
+		TeamStrength:     v[featureTeamStrength],
+		MapPerformance:   v[featureMapPerformance],
+		TeamMorale:       v[featureTeamMorale],
+	}
+}
+
+// predictedPoints scales the weighted factors to the typical fantasy points
+// range of 0-50
+func (v featureVector) predictedPoints() float64 {
+	weightedSum := 0.0
+	for i, weight := range predictionWeights {
+		weightedSum += v[i] * weight
+	}
+	return math.Max(0.0, math.Min(50.0, weightedSum*2.5))
+}
+
+// confidence is higher the more the factors agree with each other
+func (v featureVector) confidence() float64 {
+	mean := 0.0
+	for _, score := range v {
+		mean += score
+	}
+	mean /= featureCount
+
+	variance := 0.0
+	for _, score := range v {
+		variance += (score - mean) * (score - mean)
+	}
+	stdDev := math.Sqrt(variance / featureCount)
+
+	return math.Max(0.1, math.Min(1.0, 1.0-(stdDev/5.0)))
+}
+
+// recentFormScore averages a player's latest points, newest first, giving
+// more recent matches more weight
+func recentFormScore(points []float64) float64 {
+	if len(points) == 0 {
+		return neutralFeature
+	}
+	totalWeight := 0.0
+	weightedSum := 0.0
+	for i, point := range points {
+		weight := float64(len(points) - i)
+		weightedSum += point * weight
+		totalWeight += weight
+	}
+	return weightedSum / totalWeight
+}
+
+// averagePointsScore normalizes an average of fantasy points to 0-10
+func averagePointsScore(avgPoints sql.NullFloat64) float64 {
+	if !avgPoints.Valid {
+		return neutralFeature
+	}
+	return math.Min(10.0, math.Max(0.0, avgPoints.Float64/2.0))
+}
+
+// winRateScore scales a win rate to 0-10
+func winRateScore(matches, wins int) float64 {
+	if matches == 0 {
+		return neutralFeature
+	}
+	return float64(wins) / float64(matches) * 10.0
+}
+
+// matchFeatures is the feature matrix of the players of a match, one row
+// per player
+type matchFeatures struct {
+	matchID     int64
+	matchName   sql.NullString
+	playerIDs   []int64
+	teamIDs     []int64
+	playerNames []string
+	teamNames   []string
+	vectors     []featureVector
+}
+
+// loadMatchFeatures extracts the features of every playing player of a
+// match: the roster with team strength in one query, then the players' and
+// teams' rows of the feature store
+func (s *PlayerPredictionService) loadMatchFeatures(matchID int64) (*matchFeatures, error) {
+	features := &matchFeatures{matchID: matchID}
+	var mapName sql.NullString
+
+	rows, err := s.db.Query(`
+		SELECT DISTINCT p.id, p.team_id, AVG(p.form_score) OVER (PARTITION BY p.team_id),
+			p.name, t.name, m.name, m.map
+		FROM matches m
+		JOIN match_participants mp ON mp.match_id = m.id
+		JOIN players p ON p.team_id = mp.team_id
+		JOIN teams t ON t.id = p.team_id
+		WHERE m.id = $1 AND p.is_playing = true
+		ORDER BY p.id`, matchID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to query match players: %w", err)
+	}
+	for rows.Next() {
+		var playerID, teamID int64
+		var teamStrength sql.NullFloat64
+		var playerName, teamName string
+		if err := rows.Scan(&playerID, &teamID, &teamStrength, &playerName, &teamName, &features.matchName, &mapName); err != nil {
+			rows.Close()
+			return nil, err
+		}
+		vector := neutralFeatureVector()
+		if teamStrength.Valid {
+			vector[featureTeamStrength] = teamStrength.Float64
+		}
+		features.playerIDs = append(features.playerIDs, playerID)
+		features.teamIDs = append(features.teamIDs, teamID)
+		features.playerNames = append(features.playerNames, playerName)
+		features.teamNames = append(features.teamNames, teamName)
+		features.vectors = append(features.vectors, vector)
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	if len(features.playerIDs) == 0 {
+		return features, nil
+	}
+
+	if err := s.loadPlayerHistoryFeatures(features, mapName.String); err != nil {
+		return nil, err
+	}
+	if err := s.loadTeamMoraleFeatures(features); err != nil {
+		return nil, err
+	}
+	return features, nil
+}
+
+// loadPlayerHistoryFeatures fills recent form, head-to-head record against
+// this match's opponents and performance on its map from the players' rows
+// of the feature store
+func (s *PlayerPredictionService) loadPlayerHistoryFeatures(features *matchFeatures, mapName string) error {
+	history, err := loadPlayerFeatures(s.db, features.playerIDs, false)
+	if err != nil {
+		return err
+	}
+
+	matchTeamIDs := distinctInt64s(features.teamIDs)
+	for i, playerID := range features.playerIDs {
+		f, exists := history[playerID]
+		if !exists {
+			continue
+		}
+		vector := &features.vectors[i]
+		vector[featureRecentForm] = recentFormScore(f.RecentPoints)
+		vector[featureHeadToHead] = averagePointsScore(f.headToHeadAverage(opponentsOf(matchTeamIDs, features.teamIDs[i])))
+		vector[featureMapPerformance] = averagePointsScore(f.mapAverage(mapName))
+	}
+	return nil
+}
+
+// loadTeamMoraleFeatures fills team morale from each team's recent results
+// in the feature store
+func (s *PlayerPredictionService) loadTeamMoraleFeatures(features *matchFeatures) error {
+	morale, err := loadTeamMorale(s.db, distinctInt64s(features.teamIDs))
+	if err != nil {
+		return err
+	}
+	for i, teamID := range features.teamIDs {
+		if score, exists := morale[teamID]; exists {
+			features.vectors[i][featureTeamMorale] = score
+		}
+	}
+	return nil
+}
+
+func distinctInt64s(values []int64) []int64 {
+	seen := make(map[int64]bool, len(values))
+	var distinct []int64
+	for _, value := range values {
+		if !seen[value] {
+			seen[value] = true
+			distinct = append(distinct, value)
+		}
+	}
+	return distinct
+}
+
+// storeMatchPredictions scores every player of the matrix and saves the
+// predictions with one statement, replacing any made earlier the same day
+func (s *PlayerPredictionService) storeMatchPredictions(features *matchFeatures) error {
+	count := len(features.playerIDs)
+	points := make([]float64, count)
+	confidence := make([]float64, count)
+	factors := make([]string, count)
+	for i, vector := range features.vectors {
+		points[i] = vector.predictedPoints()
+		confidence[i] = vector.confidence()
+		factorsJSON, err := json.Marshal(vector.factors())
+		if err != nil {
+			return err
+		}
+		factors[i] = string(factorsJSON)
+	}
+
+	_, err := s.db.Exec(`
+		INSERT INTO player_predictions (player_id, match_id, prediction_date, predicted_points,
+			confidence_score, factors, model_version, player_name, team_name, match_name)
+		SELECT v.player_id, $1, CURRENT_DATE, v.points, v.confidence, v.factors::jsonb, $2, v.player_name, v.team_name, $3
+		FROM unnest($4::bigint[], $5::numeric[], $6::numeric[], $7::text[], $8::text[], $9::text[])
+			AS v(player_id, points, confidence, factors, player_name, team_name)
+		ON CONFLICT (player_id, match_id, prediction_date) DO UPDATE
+		SET predicted_points = EXCLUDED.predicted_points, confidence_score = EXCLUDED.confidence_score,
+			factors = EXCLUDED.factors, model_version = EXCLUDED.model_version, player_name = EXCLUDED.player_name,
+			team_name = EXCLUDED.team_name, match_name = EXCLUDED.match_name, updated_at = CURRENT_TIMESTAMP`,
+		features.matchID, predictionModelVersion, features.matchName,
+		pq.Array(features.playerIDs), pq.Array(points), pq.Array(confidence), pq.Array(factors),
+		pq.Array(features.playerNames), pq.Array(features.teamNames))
+	if err != nil {
+		return fmt.Errorf("failed to store predictions: %w", err)
+	}
+	return nil
+}
@@ -0,0 +1,61 @@
+package services
+
+import (
+	"database/sql"
+	"math"
+	"testing"
+
+	"fantasy-esports-backend/models"
+)
+
+func TestFeatureVectorScoresLikeFactors(t *testing.T) {
+	vector := featureVector{8, 6, 7, 4, 5}
+	factors := vector.factors()
+	if featureVectorOf(factors) != vector {
+		t.Fatalf("round trip through factors: %v", featureVectorOf(factors))
+	}
+
+	// 0.3*8 + 0.2*6 + 0.2*7 + 0.15*4 + 0.15*5 = 6.35
+	if got := vector.predictedPoints(); math.Abs(got-6.35*2.5) > 1e-9 {
+		t.Errorf("predicted points %.4f", got)
+	}
+	if got := neutralFeatureVector().confidence(); got != 1.0 {
+		t.Errorf("neutral confidence %.2f", got)
+	}
+	if got := (featureVector{10, 0, 10, 0, 10}).confidence(); got >= 0.1+1e-9 {
+		t.Errorf("disagreeing factors should floor confidence, got %.2f", got)
+	}
+	if got := (featureVector{50, 50, 50, 50, 50}).predictedPoints(); got != 50 {
+		t.Errorf("predicted points should cap at 50, got %.2f", got)
+	}
+}
+
+func TestFeatureScoresDefaultToNeutral(t *testing.T) {
+	if got := recentFormScore(nil); got != neutralFeature {
+		t.Errorf("empty form %.2f", got)
+	}
+	// Newest first: (10*3 + 4*2 + 1*1) / 6
+	if got := recentFormScore([]float64{10, 4, 1}); math.Abs(got-6.5) > 1e-9 {
+		t.Errorf("weighted form %.4f", got)
+	}
+	if got := averagePointsScore(sql.NullFloat64{}); got != neutralFeature {
+		t.Errorf("no average %.2f", got)
+	}
+	if got := averagePointsScore(sql.NullFloat64{Float64: 30, Valid: true}); got != 10 {
+		t.Errorf("average should cap at 10, got %.2f", got)
+	}
+	if got := winRateScore(0, 0); got != neutralFeature {
+		t.Errorf("no matches %.2f", got)
+	}
+	if got := winRateScore(10, 7); got != 7 {
+		t.Errorf("win rate %.2f", got)
+	}
+}
+
+func TestPredictionFactorsKeepTheirScale(t *testing.T) {
+	s := &PlayerPredictionService{}
+	factors := &models.PredictionFactors{RecentForm: 5, HeadToHeadRecord: 5, TeamStrength: 5, MapPerformance: 5, TeamMorale: 5}
+	if s.calculatePredictedPoints(factors) != 12.5 || s.calculateConfidenceScore(factors) != 1.0 {
+		t.Errorf("neutral factors: %.2f points, %.2f confidence", s.calculatePredictedPoints(factors), s.calculateConfidenceScore(factors))
+	}
+}
@@ -0,0 +1,360 @@
+package services
+
+import (
+	"database/sql"
+	"encoding/json"
+	"fmt"
+	"math"
+	"sort"
+	"time"
+
+	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/logger"
+
+	"github.com/lib/pq"
+)
+
+const (
+	// prizeWriteBatchSize bounds the payouts sent in one bulk statement
+	prizeWriteBatchSize = 5000
+	// prizePercentageTolerance is how far, in percentage points of the pool,
+	// a tier's prize may stray from its percentage before the percentage wins
+	prizePercentageTolerance = 0.01
+)
+
+// prizeTier pays amount to every rank from..to
+type prizeTier struct {
+	from, to int
+	amount   float64
+}
+
+// prizeTable is a contest's payout per rank, tiers sorted by rank
+type prizeTable []prizeTier
+
+// prizeTierJSON is one entry of a prize_distribution array. Prize is paid to
+// each rank of the tier and percentage of the pool is shared by the tier's
+// ranks; when both are given and disagree, the percentage is used.
+type prizeTierJSON struct {
+	RankFrom   int     `json:"rank_from"`
+	RankTo     int     `json:"rank_to"`
+	Prize      float64 `json:"prize"`
+	Percentage float64 `json:"percentage"`
+}
+
+// parsePrizeTable reads a contest's prize_distribution: an array of rank
+// tiers, or the older {"positions": [{"percentage": ...}]} object paying one
+// rank per position. Anything else pays 50% and 30% of the pool to the top
+// two ranks. The table may still pay out more than the pool; see capToPool.
+func parsePrizeTable(raw []byte, pool float64) prizeTable {
+	var tiers []prizeTierJSON
+	if err := json.Unmarshal(raw, &tiers); err == nil && len(tiers) > 0 {
+		table := make(prizeTable, 0, len(tiers))
+		for _, tier := range tiers {
+			if tier.RankTo < tier.RankFrom {
+				tier.RankTo = tier.RankFrom
+			}
+			if tier.RankFrom < 1 {
+				continue
+			}
+			ranks := float64(tier.RankTo - tier.RankFrom + 1)
+			amount := tier.Prize
+			if tier.Percentage > 0 && math.Abs(amount*ranks-pool*tier.Percentage/100) > pool*prizePercentageTolerance/100 {
+				amount = pool * tier.Percentage / 100 / ranks
+			}
+			if amount > 0 {
+				table = append(table, prizeTier{from: tier.RankFrom, to: tier.RankTo, amount: amount})
+			}
+		}
+		sort.Slice(table, func(i, j int) bool { return table[i].from < table[j].from })
+		return table
+	}
+
+	var legacy struct {
+		Positions []struct {
+			Percentage float64 `json:"percentage"`
+		} `json:"positions"`
+	}
+	if err := json.Unmarshal(raw, &legacy); err == nil && len(legacy.Positions) >= 2 {
+		table := make(prizeTable, 0, len(legacy.Positions))
+		for i, position := range legacy.Positions {
+			if position.Percentage > 0 {
+				table = append(table, prizeTier{from: i + 1, to: i + 1, amount: pool * position.Percentage / 100})
+			}
+		}
+		return table
+	}
+
+	return prizeTable{{from: 1, to: 1, amount: pool * 0.5}, {from: 2, to: 2, amount: pool * 0.3}}
+}
+
+// amountAt returns the prize for a rank
+func (t prizeTable) amountAt(rank int) float64 {
+	i := sort.Search(len(t), func(i int) bool { return t[i].to >= rank })
+	if i < len(t) && t[i].from <= rank {
+		return t[i].amount
+	}
+	return 0
+}
+
+// total returns the amount paid over every rank of the table
+func (t prizeTable) total() float64 {
+	total := 0.0
+	for _, tier := range t {
+		total += tier.amount * float64(tier.to-tier.from+1)
+	}
+	return total
+}
+
+// capToPool scales the table down, to the paisa, when its ranks would pay
+// out more than the pool. It reports whether the table had to be scaled.
+func (t prizeTable) capToPool(pool float64) (prizeTable, bool) {
+	total := t.total()
+	if total <= pool {
+		return t, false
+	}
+	scaled := make(prizeTable, len(t))
+	for i, tier := range t {
+		tier.amount = math.Floor(tier.amount*pool/total*100) / 100
+		scaled[i] = tier
+	}
+	return scaled, true
+}
+
+// lastPaidRank returns the lowest rank that wins anything
+func (t prizeTable) lastPaidRank() int {
+	last := 0
+	for _, tier := range t {
+		if tier.to > last {
+			last = tier.to
+		}
+	}
+	return last
+}
+
+// rankedEntry is a contest entry in rank order
+type rankedEntry struct {
+	participantID int64
+	userID        int64
+	rank          int
+	points        float64
+}
+
+// prizePayout is the prize won by one contest entry
+type prizePayout struct {
+	participantID int64
+	userID        int64
+	contestID     int64
+	amount        float64
+}
+
+// computePayouts pays entries, given in rank order, from the table. Entries
+// tied on points share the prizes of every rank they occupy equally, so a
+// tie across a tier boundary is paid the average of both tiers.
+func computePayouts(contestID int64, table prizeTable, entries []rankedEntry) []prizePayout {
+	var payouts []prizePayout
+	for start := 0; start < len(entries); {
+		end := start + 1
+		for end < len(entries) && entries[end].points == entries[start].points {
+			end++
+		}
+
+		// Tied entries take consecutive places from the first one's rank
+		firstRank := entries[start].rank
+		pooled := 0.0
+		for place := 0; place < end-start; place++ {
+			pooled += table.amountAt(firstRank + place)
+		}
+		if share := roundPaise(pooled / float64(end-start)); share > 0 {
+			for _, entry := range entries[start:end] {
+				payouts = append(payouts, prizePayout{
+					participantID: entry.participantID,
+					userID:        entry.userID,
+					contestID:     contestID,
+					amount:        share,
+				})
+			}
+		}
+		start = end
+	}
+	return payouts
+}
+
+func roundPaise(amount float64) float64 {
+	return math.Floor(amount*100+1e-6) / 100
+}
+
+// DistributeContestPrizesTx pays out the given contests inside tx from the
+// ranks already stored on contest_participants. Payouts are computed in
+// memory; prize_won, winning balances and prize_credit transactions are then
+// written with a few bulk statements.
+func (s *LeaderboardService) DistributeContestPrizesTx(tx *sql.Tx, contestIDs []int64) (*models.PrizeDistributionReport, error) {
+	started := time.Now()
+	report := &models.PrizeDistributionReport{}
+
+	rows, err := tx.Query(`
+		SELECT id, total_prize_pool, prize_distribution
+		FROM contests
+		WHERE id = ANY($1) AND total_prize_pool > 0`, pq.Array(contestIDs))
+	if err != nil {
+		return nil, fmt.Errorf("failed to query prize contests: %w", err)
+	}
+
+	// Contests usually share a handful of payout templates; parse each once
+	tables := make(map[int64]prizeTable)
+	type parsedTable struct {
+		table  prizeTable
+		capped bool
+	}
+	parsed := make(map[string]parsedTable)
+	var prizeContestIDs []int64
+	var lastRanks []int64
+	for rows.Next() {
+		var contestID int64
+		var pool float64
+		var raw []byte
+		if err := rows.Scan(&contestID, &pool, &raw); err != nil {
+			rows.Close()
+			return nil, err
+		}
+		key := fmt.Sprintf("%g:%s", pool, raw)
+		p, exists := parsed[key]
+		if !exists {
+			p.table, p.capped = parsePrizeTable(raw, pool).capToPool(pool)
+			parsed[key] = p
+		}
+		if p.capped {
+			logger.Warn(fmt.Sprintf("Prize distribution of contest %d pays out more than its pool of %.2f, scaled down to fit", contestID, pool))
+		}
+		table := p.table
+		tables[contestID] = table
+		prizeContestIDs = append(prizeContestIDs, contestID)
+		lastRanks = append(lastRanks, int64(table.lastPaidRank()))
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	report.ContestsProcessed = len(prizeContestIDs)
+	if len(prizeContestIDs) == 0 {
+		report.DurationMs = elapsedMs(started)
+		return report, nil
+	}
+
+	// Paid ranks of every contest, plus entries tied with the last paid rank
+	rows, err = tx.Query(`
+		WITH limits AS (
+			SELECT * FROM unnest($1::bigint[], $2::bigint[]) AS l(contest_id, last_rank)
+		),
+		boundary AS (
+			SELECT l.contest_id, ut.total_points
+			FROM limits l
+			JOIN contest_participants cp ON cp.contest_id = l.contest_id AND cp.rank = l.last_rank
+			JOIN user_teams ut ON ut.id = cp.team_id
+		)
+		SELECT cp.contest_id, cp.id, cp.user_id, cp.rank, ut.total_points
+		FROM limits l
+		JOIN contest_participants cp ON cp.contest_id = l.contest_id
+		JOIN user_teams ut ON ut.id = cp.team_id
+		LEFT JOIN boundary b ON b.contest_id = l.contest_id
+		WHERE cp.rank > 0 AND (cp.rank <= l.last_rank OR ut.total_points = b.total_points)
+		ORDER BY cp.contest_id, cp.rank`,
+		pq.Array(prizeContestIDs), pq.Array(lastRanks))
+	if err != nil {
+		return nil, fmt.Errorf("failed to query ranked entries: %w", err)
+	}
+
+	var payouts []prizePayout
+	var contestID int64
+	var entries []rankedEntry
+	for rows.Next() {
+		var entryContestID int64
+		var entry rankedEntry
+		if err := rows.Scan(&entryContestID, &entry.participantID, &entry.userID, &entry.rank, &entry.points); err != nil {
+			rows.Close()
+			return nil, err
+		}
+		if entryContestID != contestID && len(entries) > 0 {
+			payouts = append(payouts, computePayouts(contestID, tables[contestID], entries)...)
+			entries = entries[:0]
+		}
+		contestID = entryContestID
+		entries = append(entries, entry)
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	if len(entries) > 0 {
+		payouts = append(payouts, computePayouts(contestID, tables[contestID], entries)...)
+	}
+
+	for start := 0; start < len(payouts); start += prizeWriteBatchSize {
+		end := start + prizeWriteBatchSize
+		if end > len(payouts) {
+			end = len(payouts)
+		}
+		if err := creditPayouts(tx, payouts[start:end]); err != nil {
+			return nil, err
+		}
+	}
+
+	report.WinnersRewarded = len(payouts)
+	for _, payout := range payouts {
+		report.TotalAmount += payout.amount
+	}
+	report.TotalAmount = math.Round(report.TotalAmount*100) / 100
+	report.DurationMs = elapsedMs(started)
+	return report, nil
+}
+
+// creditPayouts records a batch of prizes on the entries, credits the
+// winning balances and logs one prize_credit transaction per prize
+func creditPayouts(tx *sql.Tx, payouts []prizePayout) error {
+	participantIDs := make([]int64, len(payouts))
+	userIDs := make([]int64, len(payouts))
+	contestIDs := make([]int64, len(payouts))
+	amounts := make([]float64, len(payouts))
+	for i, payout := range payouts {
+		participantIDs[i] = payout.participantID
+		userIDs[i] = payout.userID
+		contestIDs[i] = payout.contestID
+		amounts[i] = payout.amount
+	}
+
+	_, err := tx.Exec(`
+		UPDATE contest_participants cp
+		SET prize_won = v.amount
+		FROM unnest($1::bigint[], $2::numeric[]) AS v(id, amount)
+		WHERE cp.id = v.id`,
+		pq.Array(participantIDs), pq.Array(amounts))
+	if err != nil {
+		return fmt.Errorf("failed to record prizes: %w", err)
+	}
+
+	// A user may win in several contests. Wallets are locked in user order so
+	// that contests finalized in parallel cannot deadlock on them.
+	_, err = tx.Exec(`
+		INSERT INTO user_wallets (user_id, winning_balance)
+		SELECT user_id, SUM(amount)
+		FROM unnest($1::bigint[], $2::numeric[]) AS v(user_id, amount)
+		GROUP BY user_id
+		ORDER BY user_id
+		ON CONFLICT (user_id) DO UPDATE
+		SET winning_balance = user_wallets.winning_balance + EXCLUDED.winning_balance,
+			updated_at = CURRENT_TIMESTAMP`,
+		pq.Array(userIDs), pq.Array(amounts))
+	if err != nil {
+		return fmt.Errorf("failed to credit winnings: %w", err)
+	}
+
+	_, err = tx.Exec(`
+		INSERT INTO wallet_transactions (user_id, transaction_type, amount, balance_type,
+			description, reference_id, status, completed_at)
+		SELECT user_id, 'prize_credit', amount, 'winning', 'Contest prize', contest_id::text, 'completed', CURRENT_TIMESTAMP
+		FROM unnest($1::bigint[], $2::numeric[], $3::bigint[]) AS v(user_id, amount, contest_id)`,
+		pq.Array(userIDs), pq.Array(amounts), pq.Array(contestIDs))
+	if err != nil {
+		return fmt.Errorf("failed to log prize transactions: %w", err)
+	}
+	return nil
+}
@@ -0,0 +1,104 @@
+package services
+
+import "testing"
+
+func TestParsePrizeTableTiers(t *testing.T) {
+	table := parsePrizeTable([]byte(`[
+		{"rank_from": 2, "rank_to": 10, "prize": 100},
+		{"rank_from": 1, "rank_to": 1, "prize": 500},
+		{"rank_from": 11, "rank_to": 20, "percentage": 10}
+	]`), 1000)
+
+	for rank, want := range map[int]float64{1: 500, 2: 100, 10: 100, 11: 10, 20: 10, 21: 0} {
+		if got := table.amountAt(rank); got != want {
+			t.Errorf("rank %d: got %.2f, want %.2f", rank, got, want)
+		}
+	}
+	if last := table.lastPaidRank(); last != 20 {
+		t.Errorf("last paid rank %d, want 20", last)
+	}
+}
+
+func TestParsePrizeTableFallbacks(t *testing.T) {
+	legacy := parsePrizeTable([]byte(`{"positions": [{"percentage": 60}, {"percentage": 40}]}`), 1000)
+	if legacy.amountAt(1) != 600 || legacy.amountAt(2) != 400 || legacy.amountAt(3) != 0 {
+		t.Errorf("legacy positions: %v", legacy)
+	}
+
+	fallback := parsePrizeTable([]byte(`{}`), 1000)
+	if fallback.amountAt(1) != 500 || fallback.amountAt(2) != 300 || fallback.lastPaidRank() != 2 {
+		t.Errorf("default split: %v", fallback)
+	}
+}
+
+func TestComputePayoutsSplitsTies(t *testing.T) {
+	table := prizeTable{{from: 1, to: 1, amount: 300}, {from: 2, to: 3, amount: 100}}
+	entries := []rankedEntry{
+		{participantID: 1, userID: 11, rank: 1, points: 90},
+		{participantID: 2, userID: 12, rank: 2, points: 80},
+		{participantID: 3, userID: 13, rank: 3, points: 70},
+		{participantID: 4, userID: 14, rank: 4, points: 70},
+		{participantID: 5, userID: 15, rank: 5, points: 60},
+	}
+
+	payouts := computePayouts(7, table, entries)
+	want := map[int64]float64{1: 300, 2: 100, 3: 50, 4: 50}
+	if len(payouts) != len(want) {
+		t.Fatalf("got %d payouts, want %d: %v", len(payouts), len(want), payouts)
+	}
+	for _, payout := range payouts {
+		if payout.amount != want[payout.participantID] || payout.contestID != 7 {
+			t.Errorf("entry %d: got %.2f in contest %d", payout.participantID, payout.amount, payout.contestID)
+		}
+	}
+
+	// A tie for first shares the first two prizes, rounded down to the paisa
+	tied := computePayouts(7, prizeTable{{from: 1, to: 1, amount: 100}, {from: 2, to: 2, amount: 0.01}}, []rankedEntry{
+		{participantID: 1, rank: 1, points: 50},
+		{participantID: 2, rank: 2, points: 50},
+	})
+	if len(tied) != 2 || tied[0].amount != 50 || tied[1].amount != 50 {
+		t.Errorf("tie for first: %v", tied)
+	}
+}
+
+func TestParsePrizeTableStaysWithinPool(t *testing.T) {
+	// The seeded Mega Contest: its prizes sum to 622,500 over the pool of
+	// 450,000, while its percentages add up to the pool
+	const pool = 450000
+	table, capped := parsePrizeTable([]byte(`[
+		{"rank_from": 1, "rank_to": 1, "prize": 150000.00, "percentage": 33.33},
+		{"rank_from": 2, "rank_to": 10, "prize": 25000.00, "percentage": 55.56},
+		{"rank_from": 11, "rank_to": 100, "prize": 2750.00, "percentage": 11.11}
+	]`), pool).capToPool(pool)
+
+	if !capped {
+		t.Errorf("expected the table to be scaled to the pool")
+	}
+	if total := table.total(); total > pool || total < pool-1 {
+		t.Errorf("table pays out %.2f of a pool of %d", total, pool)
+	}
+	if table.lastPaidRank() != 100 {
+		t.Errorf("last paid rank %d, want 100", table.lastPaidRank())
+	}
+	if table.amountAt(2) < 27775 || table.amountAt(11) < 555 || table.amountAt(11) > 555.5 {
+		t.Errorf("tiers not paid by percentage: %v", table)
+	}
+
+	entries := make([]rankedEntry, 150)
+	for i := range entries {
+		entries[i] = rankedEntry{participantID: int64(i + 1), rank: i + 1, points: float64(1000 - i)}
+	}
+	paid := 0.0
+	for _, payout := range computePayouts(1, table, entries) {
+		paid += payout.amount
+	}
+	if paid > pool {
+		t.Errorf("paid out %.2f of a pool of %d", paid, pool)
+	}
+
+	exact, capped := parsePrizeTable([]byte(`[{"rank_from": 1, "rank_to": 2, "prize": 300, "percentage": 60}]`), 1000).capToPool(1000)
+	if capped || exact.amountAt(2) != 300 {
+		t.Errorf("consistent table changed: %v", exact)
+	}
+}
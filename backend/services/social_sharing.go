@@ -4,9 +4,13 @@ import (
 	"database/sql"
 	"encoding/json"
 	"fantasy-esports-backend/models"
+	"fantasy-esports-backend/pkg/writebehind"
 	"fmt"
 	"net/url"
 	"strings"
+	"sync"
+
+	"github.com/lib/pq"
 )
 
 type SocialSharingService struct {
@@ -21,6 +25,31 @@ func NewSocialSharingService(db *sql.DB, baseURL string) *SocialSharingService {
 	}
 }
 
+var (
+	shareClicksOnce   sync.Once
+	sharedShareClicks *writebehind.Counter[int64]
+)
+
+// shareClicks returns the process-wide social_shares click counter
+func (s *SocialSharingService) shareClicks() *writebehind.Counter[int64] {
+	shareClicksOnce.Do(func() {
+		db := s.db
+		sharedShareClicks = writebehind.NewCounter("social_shares", writebehind.DefaultConfig,
+			func(deltas map[int64]int64) error { return writeShareClicks(db, deltas) })
+	})
+	return sharedShareClicks
+}
+
+func writeShareClicks(db *sql.DB, deltas map[int64]int64) error {
+	ids, clicks := deltaArrays(deltas)
+	_, err := db.Exec(`
+		UPDATE social_shares s SET click_count = s.click_count + d.clicks
+		FROM unnest($1::bigint[], $2::bigint[]) AS d(id, clicks)
+		WHERE s.id = d.id`,
+		pq.Array(ids), pq.Array(clicks))
+	return err
+}
+
 func (s *SocialSharingService) CreateShare(userID int64, req models.CreateShareRequest) (*models.SocialShare, error) {
 	shareData, err := json.Marshal(req.ShareData)
 	if err != nil {
@@ -218,9 +247,11 @@ func (s *SocialSharingService) GenerateAchievementContent(userID int64, achievem
 	return content, nil
 }
 
+// TrackShareClick counts a click on a shared link. Clicks are buffered and
+// written within a second, summed per share.
 func (s *SocialSharingService) TrackShareClick(shareID int64) error {
-	_, err := s.db.Exec("UPDATE social_shares SET click_count = click_count + 1 WHERE id = $1", shareID)
-	return err
+	s.shareClicks().Add(shareID, 1)
+	return nil
 }
 
 func (s *SocialSharingService) GetUserShares(userID int64, platform string) ([]models.SocialShare, error) {
@@ -625,6 +625,7 @@ func (s *TournamentService) createMatch(stageID int64, team1ID, team2ID int64, m
 	if err != nil {
 		return 0, fmt.Errorf("failed to add participants: %w", err)
 	}
+	InvalidatePlayerCatalog(matchID)
 
 	return matchID, nil
 }
\ No newline at end of file